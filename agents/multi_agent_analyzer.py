@@ -25,6 +25,7 @@ from openai import OpenAI
 
 # S/R Zone Calculator (v3.8: Multi-source support/resistance detection)
 from utils.sr_zone_calculator import SRZoneCalculator
+from utils.sr_zone_service import SRZoneSnapshot, get_sr_zone_service, report_inputs
 
 # Import shared constants for consistency (Phase 3: migrated to functions)
 from strategy.trading_logic import (
@@ -604,8 +605,17 @@ class MultiAgentAnalyzer:
             logger=self.logger,
         )
 
-        # Cache for S/R zones (updated in analyze())
+        # v6.0: 进程级 S/R 结果缓存 (按输入 K 线 / 价格分桶 / 配置复用不可变快照)
+        cache_cfg = sr_cfg.get('cache', {})
+        self.sr_zone_service = get_sr_zone_service(
+            price_bucket_pct=cache_cfg.get('price_bucket_pct', 0.05),
+            enabled=cache_cfg.get('enabled', True),
+        )
+
+        # Cache for S/R zones (updated in analyze(), read-only snapshot result)
         self._sr_zones_cache: Optional[Dict[str, Any]] = None
+        # v6.0: 本周期使用的快照 (来源 / 计算耗时 / 年龄，供周期指标)
+        self.sr_zone_snapshot: Optional[SRZoneSnapshot] = None
 
     def _call_api_with_retry(
         self,
@@ -3336,6 +3346,13 @@ ORDER FLOW (Binance Taker Data):
 - Recent 10 Bars: [{recent_str}]
 """
 
+    @staticmethod
+    def _format_data_age(age_sec: float) -> str:
+        """v6.0: 数据年龄显示 (秒 → "45s" / "12m")"""
+        if age_sec < 120:
+            return f"{age_sec:.0f}s"
+        return f"{age_sec / 60:.0f}m"
+
     def _format_derivatives_report(
         self,
         data: Optional[Dict[str, Any]],
@@ -3369,6 +3386,10 @@ ORDER FLOW (Binance Taker Data):
         # =========================================================================
         if data and data.get('enabled', True):
             parts.append("DERIVATIVES DATA:")
+            # v6.0: 缓存数据年龄 (TTL 缓存命中时数据可能不是本周期获取的)
+            coinalyze_age = (data.get('_cache') or {}).get('max_age_sec')
+            if coinalyze_age is not None:
+                parts.append(f"- Coinalyze Data Age: {self._format_data_age(coinalyze_age)}")
 
             # Open Interest (v5.2: add hourly history series for OI×Price analysis)
             trends = data.get('trends', {})
@@ -3452,7 +3473,9 @@ ORDER FLOW (Binance Taker Data):
                     rates_str = " → ".join(
                         [f"{r['rate_pct']:.5f}%" for r in history]
                     )
-                    parts.append(f"- Funding History (last {len(history)}): {rates_str}")
+                    history_age = funding.get('history_age_sec')
+                    age_str = f" [age {self._format_data_age(history_age)}]" if history_age is not None else ""
+                    parts.append(f"- Funding History (last {len(history)}): {rates_str}{age_str}")
 
                     # 趋势
                     trend = funding.get('trend', 'N/A')
@@ -3517,7 +3540,9 @@ ORDER FLOW (Binance Taker Data):
         # v3.24: Unhide full history series (previously only showed latest)
         # =========================================================================
         if binance_derivatives:
-            parts.append("\nBINANCE DERIVATIVES (Top Traders & Taker):")
+            binance_age = (binance_derivatives.get('_metadata') or {}).get('max_data_age_sec')
+            age_str = f" [data age {self._format_data_age(binance_age)}]" if binance_age is not None else ""
+            parts.append(f"\nBINANCE DERIVATIVES (Top Traders & Taker):{age_str}")
 
             # Top Traders Position Ratio — with full history series
             top_pos = binance_derivatives.get('top_long_short_position', {})
@@ -3652,58 +3677,30 @@ ORDER FLOW (Binance Taker Data):
         Dict
             S/R zones result from SRZoneCalculator
         """
+        self.sr_zone_snapshot = None
         if current_price <= 0:
             return self.sr_calculator._empty_result()
 
-        # Extract BB data
-        bb_data = None
-        if technical_data:
-            bb_upper = technical_data.get('bb_upper')
-            bb_lower = technical_data.get('bb_lower')
-            bb_middle = technical_data.get('bb_middle')
-            if bb_upper and bb_lower:
-                bb_data = {
-                    'upper': bb_upper,
-                    'lower': bb_lower,
-                    'middle': bb_middle,
-                }
-
-        # Extract SMA data
-        sma_data = None
-        if technical_data:
-            sma_50 = technical_data.get('sma_50')
-            sma_200 = technical_data.get('sma_200')
-            if sma_50 or sma_200:
-                sma_data = {
-                    'sma_50': sma_50,
-                    'sma_200': sma_200,
-                }
-
-        # Extract Order Book anomalies (walls)
-        orderbook_anomalies = None
-        if orderbook_data:
-            anomalies = orderbook_data.get('anomalies', {})
-            if anomalies:
-                orderbook_anomalies = {
-                    'bid_anomalies': anomalies.get('bid_anomalies', []),
-                    'ask_anomalies': anomalies.get('ask_anomalies', []),
-                }
+        # Extract BB / SMA / Order Book anomalies (walls)
+        inputs = report_inputs(technical_data, orderbook_data)
 
         # Calculate S/R zones with detailed report (v3.0: bars_data for swing/touch)
         # v4.0: Pass MTF bars for pivot points + volume profile
+        # v6.0: 经 SRZoneService 计算，输入未变化时直接复用快照
         try:
-            result = self.sr_calculator.calculate_with_detailed_report(
+            snapshot = self.sr_zone_service.get(
+                self.sr_calculator,
                 current_price=current_price,
-                bb_data=bb_data,
-                sma_data=sma_data,
-                orderbook_anomalies=orderbook_anomalies,
                 bars_data=bars_data,
                 bars_data_4h=bars_data_4h,
                 bars_data_1d=bars_data_1d,
                 daily_bar=daily_bar,
                 weekly_bar=weekly_bar,
                 atr_value=atr_value,
+                **inputs,
             )
+            self.sr_zone_snapshot = snapshot
+            result = snapshot.result
 
             # Log S/R zone detection
             if result.get('nearest_resistance'):
@@ -3834,6 +3831,24 @@ Reason: {status.get('message', 'Unknown')}
                 parts.append(f"  OBI Trend ({len(obi_trend)} samples): {trend_str}")
         else:
             parts.append("  [First snapshot - no historical data yet] ⚠️ COLD_START (dynamics available after 2nd cycle)")
+
+        # v6.0: Sub-minute OBI dynamics from the local WebSocket order book
+        intraminute = dynamics.get('intraminute') if dynamics else None
+        if intraminute and intraminute.get('samples', 0) >= 2:
+            interval = _safe_float(intraminute.get('sample_interval_sec', 5), 5)
+            window_min = _safe_float(intraminute.get('window_sec', 300), 300) / 60
+            parts.append(f"  Intraminute ({intraminute['samples']} samples @ {interval:.0f}s, last {window_min:.0f}m):")
+            if intraminute.get('obi_change_1m') is not None:
+                parts.append(f"    OBI Change 1m: {_safe_float(intraminute['obi_change_1m']):+.2f}")
+            if intraminute.get('obi_change_window') is not None:
+                parts.append(
+                    f"    OBI Change {window_min:.0f}m: {_safe_float(intraminute['obi_change_window']):+.2f} "
+                    f"(range {_safe_float(intraminute.get('obi_min')):+.2f} to {_safe_float(intraminute.get('obi_max')):+.2f})"
+                )
+            series = intraminute.get('obi_series', [])
+            if len(series) >= 2:
+                step = max(1, len(series) // 6)
+                parts.append(f"    OBI Path: {' → '.join(f'{v:+.2f}' for v in series[::step][-6:])}")
         parts.append("")
 
         # ========== PRESSURE GRADIENT Section (v2.0) ==========
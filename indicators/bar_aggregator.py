@@ -0,0 +1,285 @@
+"""
+Local higher-timeframe bar aggregation.
+
+Builds 1H / 4H / 1D / 1W bars from a lower-timeframe stream (15M execution
+bars, or 1D bars for weekly) with Binance-compatible UTC alignment.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+MINUTE_NS = 60 * 1_000_000_000
+
+# Bar length per timeframe (ns)
+TIMEFRAME_NS: Dict[str, int] = {
+    "1m": MINUTE_NS,
+    "5m": 5 * MINUTE_NS,
+    "15m": 15 * MINUTE_NS,
+    "30m": 30 * MINUTE_NS,
+    "1h": 60 * MINUTE_NS,
+    "4h": 240 * MINUTE_NS,
+    "1d": 1440 * MINUTE_NS,
+    "1w": 7 * 1440 * MINUTE_NS,
+}
+
+# Unix epoch (1970-01-01) is a Thursday; Binance weekly bars open Monday 00:00 UTC
+WEEK_OFFSET_NS = 4 * TIMEFRAME_NS["1d"]
+
+
+def bucket_start(ts_ns: int, timeframe: str) -> int:
+    """
+    Open time (ns, UTC) of the ``timeframe`` bar containing ``ts_ns``.
+
+    Hours/days are aligned to UTC midnight, weeks to Monday 00:00 UTC.
+    Works for both bar timestamp conventions in this codebase: REST-prefetched
+    bars stamped with their open time, and live NautilusTrader Binance bars
+    stamped with their close time (open + interval - 1 ms).
+    """
+    step = TIMEFRAME_NS[timeframe]
+    offset = WEEK_OFFSET_NS if timeframe == "1w" else 0
+    return ts_ns - (ts_ns - offset) % step
+
+
+class AggregatedBar(NamedTuple):
+    """One higher-timeframe bar built from ``bar_count`` source bars."""
+
+    timeframe: str
+    open_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    bar_count: int
+    expected_count: int
+
+    @property
+    def complete(self) -> bool:
+        """True if every source bar of the period was seen."""
+        return self.bar_count >= self.expected_count
+
+    @property
+    def close_ns(self) -> int:
+        """Close timestamp in the live-bar convention (open + interval - 1 ms)."""
+        return self.open_ns + TIMEFRAME_NS[self.timeframe] - 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OHLCV dict (same keys as TechnicalIndicatorManager.get_kline_data)."""
+        return {
+            'timestamp': self.open_ns,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+        }
+
+
+class _Bucket:
+    """Forming bar state for one timeframe."""
+
+    __slots__ = ("open_ns", "open", "high", "low", "close", "volume", "count")
+
+    def __init__(self, open_ns: int, o: float, h: float, l: float, c: float, v: float):
+        self.open_ns = open_ns
+        self.open = o
+        self.high = h
+        self.low = l
+        self.close = c
+        self.volume = v
+        self.count = 1
+
+    def add(self, h: float, l: float, c: float, v: float):
+        if h > self.high:
+            self.high = h
+        if l < self.low:
+            self.low = l
+        self.close = c
+        self.volume += v
+        self.count += 1
+
+
+class HigherTimeframeAggregator:
+    """
+    Aggregate a base-timeframe bar stream into higher timeframes (v6.0).
+
+    add() returns the bars completed by the incoming source bar:
+
+    - a period is emitted as soon as its last source bar arrives (e.g. the
+      12:00-15:59 4H bar on the 15:45 15M bar), not one bar late
+    - if source bars are missing (stream gap, process started mid-period) the
+      period is emitted when the next period starts, with
+      ``complete == False`` so the caller can backfill that bar from REST
+    - periods that received no source bar at all (gap longer than a whole
+      period) are emitted in order as placeholders with ``bar_count == 0``
+      (flat at the last seen close, zero volume) so they can be backfilled too
+    - duplicate / out-of-order source bars are ignored
+    """
+
+    def __init__(self, base_timeframe: str = "15m", timeframes: Iterable[str] = ("4h", "1d")):
+        """
+        Parameters
+        ----------
+        base_timeframe : str
+            Timeframe of the source bars
+        timeframes : Iterable[str]
+            Timeframes to build (each a multiple of base_timeframe)
+        """
+        if base_timeframe not in TIMEFRAME_NS:
+            raise ValueError(f"unsupported base timeframe: {base_timeframe}")
+        self.base_timeframe = base_timeframe
+        self.base_ns = TIMEFRAME_NS[base_timeframe]
+        self.timeframes: Tuple[str, ...] = tuple(timeframes)
+        for tf in self.timeframes:
+            if tf not in TIMEFRAME_NS or TIMEFRAME_NS[tf] % self.base_ns or TIMEFRAME_NS[tf] <= self.base_ns:
+                raise ValueError(f"{tf} is not a multiple of {base_timeframe}")
+
+        self._buckets: Dict[str, Optional[_Bucket]] = {tf: None for tf in self.timeframes}
+        self._last_completed: Dict[str, AggregatedBar] = {}
+        self._last_period_open: Dict[str, int] = {}
+        self._last_base_open: Optional[int] = None
+        self._last_close: Optional[float] = None
+
+        self._bars_in = 0
+        self._ignored = 0
+        self._emitted = {tf: 0 for tf in self.timeframes}
+        self._incomplete = {tf: 0 for tf in self.timeframes}
+        self._missing = {tf: 0 for tf in self.timeframes}
+
+    def expected_count(self, timeframe: str) -> int:
+        """Source bars per ``timeframe`` bar."""
+        return TIMEFRAME_NS[timeframe] // self.base_ns
+
+    def add(
+        self,
+        ts_ns: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> List[AggregatedBar]:
+        """
+        Add one source bar.
+
+        Parameters
+        ----------
+        ts_ns : int
+            Source bar timestamp (open time, or live close time; see bucket_start)
+        open_, high, low, close, volume : float
+            Source bar OHLCV
+
+        Returns
+        -------
+        List[AggregatedBar]
+            Bars completed by this source bar (oldest first)
+        """
+        base_open = bucket_start(ts_ns, self.base_timeframe)
+        if self._last_base_open is not None and base_open <= self._last_base_open:
+            self._ignored += 1
+            return []
+        self._last_base_open = base_open
+        self._bars_in += 1
+
+        completed: List[AggregatedBar] = []
+        base_end = base_open + self.base_ns
+        for tf in self.timeframes:
+            period_open = bucket_start(base_open, tf)
+            bucket = self._buckets[tf]
+            if bucket is not None and bucket.open_ns != period_open:
+                # Last source bar(s) of the previous period never arrived
+                completed.append(self._emit(tf, bucket))
+                bucket = None
+            prev_open = self._last_period_open.get(tf)
+            if prev_open is not None:
+                # Whole periods without any source bar
+                step = TIMEFRAME_NS[tf]
+                for missing_open in range(prev_open + step, period_open, step):
+                    completed.append(self._emit_missing(tf, missing_open))
+            self._last_period_open[tf] = period_open
+            if bucket is None:
+                bucket = _Bucket(period_open, open_, high, low, close, volume)
+            else:
+                bucket.add(high, low, close, volume)
+            if base_end == period_open + TIMEFRAME_NS[tf]:
+                completed.append(self._emit(tf, bucket))
+                bucket = None
+            self._buckets[tf] = bucket
+        self._last_close = close
+        return completed
+
+    def add_bar(self, bar) -> List[AggregatedBar]:
+        """Add a NautilusTrader Bar (or any object with OHLCV + ts_event)."""
+        return self.add(
+            bar.ts_event, float(bar.open), float(bar.high), float(bar.low),
+            float(bar.close), float(bar.volume),
+        )
+
+    def _emit(self, tf: str, bucket: _Bucket) -> AggregatedBar:
+        return self._record(AggregatedBar(
+            timeframe=tf,
+            open_ns=bucket.open_ns,
+            open=bucket.open,
+            high=bucket.high,
+            low=bucket.low,
+            close=bucket.close,
+            volume=bucket.volume,
+            bar_count=bucket.count,
+            expected_count=self.expected_count(tf),
+        ))
+
+    def _emit_missing(self, tf: str, open_ns: int) -> AggregatedBar:
+        self._missing[tf] += 1
+        price = self._last_close
+        return self._record(AggregatedBar(
+            tf, open_ns, price, price, price, price, 0.0, 0, self.expected_count(tf),
+        ))
+
+    def _record(self, agg: AggregatedBar) -> AggregatedBar:
+        tf = agg.timeframe
+        self._last_completed[tf] = agg
+        self._emitted[tf] += 1
+        if not agg.complete:
+            self._incomplete[tf] += 1
+        return agg
+
+    def forming(self, timeframe: str) -> Optional[AggregatedBar]:
+        """The still-forming bar of ``timeframe`` (None if no source bars yet)."""
+        bucket = self._buckets.get(timeframe)
+        if bucket is None:
+            return None
+        return AggregatedBar(
+            timeframe, bucket.open_ns, bucket.open, bucket.high, bucket.low,
+            bucket.close, bucket.volume, bucket.count, self.expected_count(timeframe),
+        )
+
+    def last_completed(self, timeframe: str) -> Optional[AggregatedBar]:
+        """Most recently completed bar of ``timeframe``."""
+        return self._last_completed.get(timeframe)
+
+    def reset(self):
+        """Drop all forming bars (statistics are kept)."""
+        self._buckets = {tf: None for tf in self.timeframes}
+        self._last_completed = {}
+        self._last_period_open = {}
+        self._last_base_open = None
+        self._last_close = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Aggregation statistics.
+
+        Returns
+        -------
+        Dict
+            {"base", "bars_in", "ignored", "emitted": {tf: n}, "incomplete": {tf: n},
+             "missing": {tf: n}} (missing = periods without any source bar, also counted as incomplete)
+        """
+        return {
+            'base': self.base_timeframe,
+            'bars_in': self._bars_in,
+            'ignored': self._ignored,
+            'emitted': dict(self._emitted),
+            'incomplete': dict(self._incomplete),
+            'missing': dict(self._missing),
+        }
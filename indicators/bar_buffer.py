@@ -0,0 +1,259 @@
+"""
+Columnar OHLCV bar buffer for TechnicalIndicatorManager.
+
+Replaces the former ``recent_bars: List[Bar]`` (Python list of NautilusTrader
+Bar objects trimmed with ``pop(0)``).
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+# Column order of the float64 block
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+
+class BarRow(NamedTuple):
+    """
+    One stored bar (plain floats / ints).
+
+    Attribute names match NautilusTrader Bar, so existing callers using
+    ``float(bar.close)`` / ``bar.ts_init`` keep working.
+    """
+
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ts_event: int
+    ts_init: int
+
+
+class OHLCVRingBuffer(Sequence):
+    """
+    Fixed-capacity OHLCV store backed by NumPy arrays (v6.0).
+
+    Prices/volume are converted to float once in append() and kept in a
+    (5, capacity + headroom) float64 block plus a (2, capacity + headroom)
+    int64 block for ts_event / ts_init. The newest ``capacity`` bars are always
+    the contiguous column range ``[start, end)``, so:
+
+    - ``closes(n)`` / ``highs(n)`` / ... are zero-copy, read-only views (O(1))
+    - append is amortized O(1): when the headroom is used up the newest bars are
+      copied into a freshly allocated block (no per-bar ``pop(0)``)
+    - views handed out earlier stay valid: appends only write past ``end`` and
+      compaction switches to a new block instead of shifting in place
+
+    Memory is ~84 bytes per bar (56 bytes of data + 50% headroom), compared with
+    ~300 bytes for a NautilusTrader Bar object plus its list slot.
+
+    Also acts as a read-only sequence of BarRow (len / index / slice / iter)
+    for callers that used ``recent_bars``.
+    """
+
+    def __init__(self, capacity: int, headroom: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        capacity : int
+            Number of bars retained
+        headroom : int, optional
+            Extra slots before compaction (default capacity // 2, at least 16)
+        """
+        self.capacity = max(1, int(capacity))
+        self.headroom = max(16, self.capacity // 2) if headroom is None else max(1, int(headroom))
+        self._values = np.zeros((5, self.capacity + self.headroom), dtype=np.float64)
+        self._ts = np.zeros((2, self.capacity + self.headroom), dtype=np.int64)
+        self._start = 0
+        self._end = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        ts_event: int,
+        ts_init: int,
+    ):
+        """Append one bar, evicting the oldest when full."""
+        if self._end == self._values.shape[1]:
+            self._compact()
+        end = self._end
+        values = self._values
+        values[OPEN, end] = open_
+        values[HIGH, end] = high
+        values[LOW, end] = low
+        values[CLOSE, end] = close
+        values[VOLUME, end] = volume
+        self._ts[0, end] = ts_event
+        self._ts[1, end] = ts_init
+        self._end = end + 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def append_bar(self, bar) -> None:
+        """Append a NautilusTrader Bar."""
+        self.append(
+            float(bar.open), float(bar.high), float(bar.low), float(bar.close),
+            float(bar.volume), bar.ts_event, bar.ts_init,
+        )
+
+    def _compact(self):
+        """Move the retained bars to the front of a new block."""
+        size = self.capacity + self.headroom
+        n = self._end - self._start
+        values = np.zeros((5, size), dtype=np.float64)
+        ts = np.zeros((2, size), dtype=np.int64)
+        values[:, :n] = self._values[:, self._start:self._end]
+        ts[:, :n] = self._ts[:, self._start:self._end]
+        self._values = values
+        self._ts = ts
+        self._start = 0
+        self._end = n
+
+    def clear(self):
+        """Drop all bars."""
+        self._values = np.zeros_like(self._values)
+        self._ts = np.zeros_like(self._ts)
+        self._start = 0
+        self._end = 0
+
+    # ------------------------------------------------------------------
+    # Zero-copy column views
+    # ------------------------------------------------------------------
+
+    def _view(self, block: np.ndarray, row: int, count: Optional[int]) -> np.ndarray:
+        start = self._start if count is None else max(self._start, self._end - max(0, count))
+        view = block[row, start:self._end]
+        view.flags.writeable = False
+        return view
+
+    def opens(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` opens (all retained bars if None)."""
+        return self._view(self._values, OPEN, count)
+
+    def highs(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` highs."""
+        return self._view(self._values, HIGH, count)
+
+    def lows(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` lows."""
+        return self._view(self._values, LOW, count)
+
+    def closes(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` closes."""
+        return self._view(self._values, CLOSE, count)
+
+    def volumes(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` volumes."""
+        return self._view(self._values, VOLUME, count)
+
+    def ts_events(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` ts_event values (ns)."""
+        return self._view(self._ts, 0, count)
+
+    def ts_inits(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` ts_init values (ns)."""
+        return self._view(self._ts, 1, count)
+
+    def ohlcv(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` bars as a (5, n) view: open, high, low, close, volume."""
+        start = self._start if count is None else max(self._start, self._end - max(0, count))
+        view = self._values[:, start:self._end]
+        view.flags.writeable = False
+        return view
+
+    # ------------------------------------------------------------------
+    # Adapters for list-of-Bar callers
+    # ------------------------------------------------------------------
+
+    def to_dicts(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Last ``count`` bars as kline dicts.
+
+        Returns
+        -------
+        List[Dict]
+            [{'timestamp' (ts_init), 'open', 'high', 'low', 'close', 'volume'}, ...]
+        """
+        o, h, l, c, v = self.ohlcv(count).tolist()
+        ts = self.ts_inits(count).tolist()
+        return [
+            {'timestamp': ts[i], 'open': o[i], 'high': h[i], 'low': l[i], 'close': c[i], 'volume': v[i]}
+            for i in range(len(ts))
+        ]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Compact copies of the retained bars (for snapshots)."""
+        return {
+            'ohlcv': self._values[:, self._start:self._end].copy(),
+            'ts': self._ts[:, self._start:self._end].copy(),
+        }
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]):
+        """Replace contents with arrays from to_arrays() (newest ``capacity`` bars kept)."""
+        ohlcv = np.asarray(arrays['ohlcv'], dtype=np.float64)[:, -self.capacity:]
+        ts = np.asarray(arrays['ts'], dtype=np.int64)[:, -self.capacity:]
+        if ohlcv.shape[0] != 5 or ts.shape[0] != 2 or ohlcv.shape[1] != ts.shape[1]:
+            raise ValueError(f"invalid bar arrays: ohlcv={ohlcv.shape} ts={ts.shape}")
+        self.clear()
+        n = ohlcv.shape[1]
+        self._values[:, :n] = ohlcv
+        self._ts[:, :n] = ts
+        self._end = n
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated bytes of the backing arrays."""
+        return self._values.nbytes + self._ts.nbytes
+
+    # ------------------------------------------------------------------
+    # Sequence protocol (BarRow items)
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        n = self._end - self._start
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return []
+            base = self._start
+            o, h, l, c, v = self._values[:, base + start:base + stop].tolist()
+            ts_event, ts_init = self._ts[:, base + start:base + stop].tolist()
+            return [BarRow(*row) for row in zip(o, h, l, c, v, ts_event, ts_init)]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("OHLCVRingBuffer index out of range")
+        i = self._start + index
+        o, h, l, c, v = self._values[:, i].tolist()
+        ts_event, ts_init = self._ts[:, i].tolist()
+        return BarRow(o, h, l, c, v, ts_event, ts_init)
+
+    def __iter__(self) -> Iterator[BarRow]:
+        return iter(self[:])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, OHLCVRingBuffer):
+            return self[:] == other[:]
+        if isinstance(other, (list, tuple)):
+            return self[:] == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"OHLCVRingBuffer(len={len(self)}, capacity={self.capacity})"
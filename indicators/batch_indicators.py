@@ -0,0 +1,314 @@
+"""
+Vectorized batch indicator computation for historical replays (v6.0).
+
+Computes every TechnicalIndicatorManager series for a full OHLCV array in one
+pass with NumPy, instead of pushing bars one at a time through update() and
+the NautilusTrader Cython indicators. The arithmetic follows the streaming
+path indicator by indicator:
+
+- SMA: mean of the last ``period`` values (NautilusTrader SimpleMovingAverage)
+- EMA: alpha = 2 / (period + 1), seeded with the first value
+  (NautilusTrader ExponentialMovingAverage)
+- RSI: EMA of gains / losses, first bar counts as a zero change
+  (NautilusTrader RelativeStrengthIndex, EXPONENTIAL)
+- MACD: fast EMA - slow EMA, signal = EMA of the MACD value from the first bar
+- Bollinger: rolling mean and population standard deviation (RollingWindowStats)
+- ADX / DI: Wilder smoothing with sum / mean seeds (WilderADX)
+
+Values agree with the streaming path to floating-point rounding
+(see tests/test_batch_indicators.py).
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators.bar_buffer import HIGH, LOW, CLOSE, VOLUME
+
+
+# Largest decay^-k factor used by the blocked recurrence (keeps the
+# rescaled cumulative sum well inside float64 range)
+_MAX_RESCALE = 1e100
+_MAX_BLOCK = 512
+
+
+def ohlcv_from_klines(klines: Sequence[Sequence[Any]]) -> np.ndarray:
+    """
+    Convert Binance klines to a (5, n) OHLCV array.
+
+    Parameters
+    ----------
+    klines : List[List]
+        [[open_time_ms, open, high, low, close, volume, ...], ...]
+
+    Returns
+    -------
+    np.ndarray
+        (5, n) float64: open, high, low, close, volume
+    """
+    if not len(klines):
+        return np.empty((5, 0), dtype=np.float64)
+    return np.array([k[1:6] for k in klines], dtype=np.float64).T
+
+
+def ohlcv_from_dicts(bars: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    Convert bar dicts (get_kline_data() / bars_data format) to a (5, n) OHLCV array.
+    """
+    return np.array(
+        [[b['open'], b['high'], b['low'], b['close'], b.get('volume', 0.0)] for b in bars],
+        dtype=np.float64,
+    ).reshape(-1, 5).T
+
+
+def linear_recurrence(u: np.ndarray, decay: float, initial: float) -> np.ndarray:
+    """
+    Solve y[i] = decay * y[i-1] + u[i] with y[-1] = initial.
+
+    Blocked closed form: within a block, y[j] = decay^(j+1) * y_prev
+    + decay^j * cumsum(u[k] / decay^k). Blocks are short enough that
+    decay^-k stays below _MAX_RESCALE, so the cost is O(n) NumPy work plus
+    one Python iteration per block.
+
+    Parameters
+    ----------
+    u : np.ndarray
+        Inputs
+    decay : float
+        Multiplier in [0, 1)
+    initial : float
+        State before the first input
+
+    Returns
+    -------
+    np.ndarray
+        y, same length as u
+    """
+    u = np.asarray(u, dtype=np.float64)
+    n = len(u)
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    if decay <= 0.0:
+        out[:] = u
+        return out
+
+    block = int(min(_MAX_BLOCK, max(1, np.log(_MAX_RESCALE) / -np.log(decay))))
+    powers = decay ** np.arange(block + 1, dtype=np.float64)
+    prev = float(initial)
+    for start in range(0, n, block):
+        chunk = u[start:start + block]
+        size = len(chunk)
+        scaled = np.cumsum(chunk / powers[:size])
+        out[start:start + size] = powers[1:size + 1] * prev + powers[:size] * scaled
+        prev = out[start + size - 1]
+    return out
+
+
+def sma_series(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; NaN until ``period`` values have been seen."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    # Rolling sums of deviations from a reference value keep the cumulative sum small
+    ref = values[0]
+    csum = np.concatenate(([0.0], np.cumsum(values - ref)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period + ref
+    return out
+
+
+def ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average over all values (no NaN warm-up)."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values.copy()
+    alpha = 2.0 / (period + 1.0)
+    return linear_recurrence(alpha * values, 1.0 - alpha, values[0])
+
+
+def rsi_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """RSI on the 0-1 scale (NautilusTrader convention) for every bar."""
+    closes = np.asarray(closes, dtype=np.float64)
+    if not len(closes):
+        return closes.copy()
+    change = np.diff(closes, prepend=closes[0])
+    avg_gain = ema_series(np.where(change > 0, change, 0.0), period)
+    avg_loss = ema_series(np.where(change < 0, -change, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 1.0 - 1.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 1.0, rsi)
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation of the last ``period`` values; NaN before."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1:] = sliding_window_view(values, period).std(axis=1)
+    return out
+
+
+def rolling_extreme(values: np.ndarray, period: int, highest: bool) -> np.ndarray:
+    """Rolling max (``highest``) or min of the last ``period`` values; NaN before."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    windows = sliding_window_view(values, period)
+    out[period - 1:] = windows.max(axis=1) if highest else windows.min(axis=1)
+    return out
+
+
+def adx_series(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    period: int = 14,
+) -> Dict[str, np.ndarray]:
+    """
+    ADX / +DI / -DI with Wilder smoothing (same steps as WilderADX).
+
+    Returns
+    -------
+    Dict
+        {"adx", "di_plus", "di_minus"}; NaN until the ADX is initialized
+        (bar index 2 * period)
+    """
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+    n = len(closes)
+    result = {name: np.full(n, np.nan) for name in ('adx', 'di_plus', 'di_minus')}
+    if n < 2 * period + 1:
+        return result
+
+    prev_close = closes[:-1]
+    tr = np.maximum.reduce([
+        highs[1:] - lows[1:],
+        np.abs(highs[1:] - prev_close),
+        np.abs(lows[1:] - prev_close),
+    ])
+    up_move = highs[1:] - highs[:-1]
+    down_move = lows[:-1] - lows[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Seed = sum of the first `period` values, then Wilder smoothing
+    decay = 1.0 - 1.0 / period
+    smoothed_tr = linear_recurrence(tr[period:], decay, tr[:period].sum())
+    smoothed_plus = linear_recurrence(plus_dm[period:], decay, plus_dm[:period].sum())
+    smoothed_minus = linear_recurrence(minus_dm[period:], decay, minus_dm[:period].sum())
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_plus = np.where(smoothed_tr > 0, smoothed_plus / smoothed_tr * 100, 0.0)
+        di_minus = np.where(smoothed_tr > 0, smoothed_minus / smoothed_tr * 100, 0.0)
+        di_sum = di_plus + di_minus
+        dx = np.where(di_sum > 0, np.abs(di_plus - di_minus) / di_sum * 100, 0.0)
+
+    # ADX seed = mean of the first `period` DX values
+    adx = linear_recurrence(dx[period:] / period, (period - 1) / period, dx[:period].mean())
+
+    # dx[m] belongs to bar m + period + 1; ADX is first available at bar 2 * period
+    first = 2 * period
+    result['adx'][first] = dx[:period].mean()
+    result['adx'][first + 1:] = adx
+    result['di_plus'][first:] = di_plus[period - 1:]
+    result['di_minus'][first:] = di_minus[period - 1:]
+    return result
+
+
+def compute_indicator_series(
+    ohlcv: np.ndarray,
+    sma_periods: Sequence[int] = (5, 20, 50),
+    ema_periods: Sequence[int] = (12, 26),
+    rsi_period: int = 14,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_signal: int = 9,
+    bb_period: int = 20,
+    bb_std: float = 2.0,
+    volume_ma_period: int = 20,
+    support_resistance_lookback: int = 20,
+    adx_period: int = 14,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all indicator series for a full OHLCV history.
+
+    Element i of every series is the value TechnicalIndicatorManager reports
+    after update() of bar i (get_technical_data() scale: RSI 0-100), or NaN
+    while that indicator is not yet initialized. Values are unrounded; the
+    streaming history buffers round (RSI 2, MACD 4, ADX/DI 1, SMA/BB 2 decimals).
+
+    Parameters
+    ----------
+    ohlcv : np.ndarray
+        (5, n) array: open, high, low, close, volume (OHLCVRingBuffer.ohlcv() layout)
+    Other parameters
+        Same as TechnicalIndicatorManager.__init__
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        sma_{p}, ema_{p}, rsi, macd, macd_signal, macd_histogram,
+        bb_upper, bb_middle, bb_lower, bb_width, bb_position (vs close),
+        volume_ratio, support, resistance, adx, di_plus, di_minus
+    """
+    ohlcv = np.asarray(ohlcv, dtype=np.float64)
+    if ohlcv.ndim != 2 or ohlcv.shape[0] != 5:
+        raise ValueError(f"expected a (5, n) OHLCV array, got shape {ohlcv.shape}")
+    highs = ohlcv[HIGH]
+    lows = ohlcv[LOW]
+    closes = ohlcv[CLOSE]
+    volumes = ohlcv[VOLUME]
+    n = ohlcv.shape[1]
+    index = np.arange(n)
+
+    def warm(values: np.ndarray, period: int) -> np.ndarray:
+        """NaN before the indicator's ``period``-th input (initialized flag)."""
+        return np.where(index >= period - 1, values, np.nan)
+
+    series: Dict[str, np.ndarray] = {}
+
+    for period in sma_periods:
+        series[f'sma_{period}'] = sma_series(closes, period)
+    for period in ema_periods:
+        series[f'ema_{period}'] = warm(ema_series(closes, period), period)
+
+    series['rsi'] = warm(rsi_series(closes, rsi_period) * 100, rsi_period)
+
+    macd = ema_series(closes, macd_fast) - ema_series(closes, macd_slow)
+    # The signal EMA is fed the MACD value from the first bar (before MACD is initialized)
+    signal = ema_series(macd, macd_signal)
+    macd = warm(macd, max(macd_fast, macd_slow))
+    signal = warm(signal, macd_signal)
+    series['macd'] = macd
+    series['macd_signal'] = signal
+    series['macd_histogram'] = macd - signal
+
+    middle = sma_series(closes, bb_period)
+    std_dev = rolling_std(closes, bb_period)
+    upper = middle + bb_std * std_dev
+    lower = middle - bb_std * std_dev
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width = np.where(middle > 0, (upper - lower) / middle * 100, 0.0)
+        position = np.where(upper != lower, (closes - lower) / (upper - lower), 0.5)
+    series['bb_upper'] = upper
+    series['bb_middle'] = middle
+    series['bb_lower'] = lower
+    series['bb_width'] = np.where(np.isnan(middle), np.nan, width)
+    series['bb_position'] = np.where(np.isnan(middle), np.nan, position)
+
+    volume_ma = sma_series(volumes, volume_ma_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(volume_ma > 0, volumes / volume_ma, 1.0)
+    series['volume_ratio'] = np.where(np.isnan(volume_ma), np.nan, ratio)
+
+    series['support'] = rolling_extreme(lows, support_resistance_lookback, highest=False)
+    series['resistance'] = rolling_extreme(highs, support_resistance_lookback, highest=True)
+
+    series.update(adx_series(highs, lows, closes, adx_period))
+    return series
+
@@ -15,13 +15,76 @@ v3.0 更新:
 - 添加 SMA_200 支持 (需要在 TechnicalIndicatorManager 初始化时指定)
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
 import logging
 
 from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.bar_aggregator import AggregatedBar, HigherTimeframeAggregator, bucket_start
 from indicators.technical_manager import TechnicalIndicatorManager
 
 
+# v6.0: 本地聚合周期 → 指标层
+AGGREGATED_LAYERS = {'4h': 'decision', '1d': 'trend'}
+
+
+LAYERS = ('trend', 'decision', 'execution')
+
+
+class InstrumentLayers:
+    """
+    v6.0: 单个品种的三层指标管理器及本地聚合状态
+
+    由 MultiTimeframeManager.register_instrument() 创建，外部一般只读。
+    """
+
+    def __init__(
+        self,
+        instrument: str,
+        bar_types: Dict[str, Optional[BarType]],
+        managers: Dict[str, Optional[TechnicalIndicatorManager]],
+        aggregate_timeframes: Optional[List[str]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        instrument : str
+            品种标识 (如 "ETHUSDT-PERP.BINANCE")
+        bar_types : Dict[str, BarType]
+            {"trend" / "decision" / "execution": BarType}
+        managers : Dict[str, TechnicalIndicatorManager]
+            各层指标管理器 (MTF 禁用时为 None)
+        aggregate_timeframes : List[str], optional
+            由 15M 本地聚合的周期 (None 表示不聚合)
+        """
+        self.instrument = instrument
+        self.bar_types = bar_types
+        self.managers = managers
+        self.aggregator: Optional[HigherTimeframeAggregator] = None
+        self.extra_bars: Dict[str, List[AggregatedBar]] = {}
+        if aggregate_timeframes:
+            self.aggregator = HigherTimeframeAggregator('15m', aggregate_timeframes)
+            self.extra_bars = {tf: [] for tf in aggregate_timeframes if tf not in AGGREGATED_LAYERS}
+        self.weekly_aggregator = HigherTimeframeAggregator('1d', ('1w',))
+        self.backfill_fn: Optional[Callable[[str, int], Optional[Tuple[float, ...]]]] = None
+        self.backfilled = 0
+        self.unfilled = 0
+        self.bars_routed = 0
+
+    @property
+    def nbytes(self) -> int:
+        """各层 K 线缓冲区占用字节数"""
+        total = 0
+        for mgr in self.managers.values():
+            if mgr is not None:
+                total += mgr.bars.nbytes + mgr.history_bars.nbytes
+        return total
+
+    def __repr__(self) -> str:
+        return f"InstrumentLayers({self.instrument})"
+
+
 class MultiTimeframeManager:
     """
     多时间框架管理器 v3.3
@@ -32,6 +95,12 @@ class MultiTimeframeManager:
     - execution_layer (5M/15M): 入场执行
 
     v3.3: 仅负责数据收集和路由，所有决策交由 AI 完成
+
+    v6.0: 支持多品种 (N 个品种 × 3 层)。构造参数中的 BarType 对应主品种，
+    其它品种通过 register_instrument() 注册；所有品种共用同一套层参数
+    (_layer_specs) 和同一个 BarType → (品种, 层) 路由表，route_bar() 为 O(1)。
+    trend_manager / decision_manager / execution_manager 等属性指向主品种，
+    其它方法的 instrument 参数为 None 时同样作用于主品种。
     """
 
     def __init__(
@@ -62,35 +131,99 @@ class MultiTimeframeManager:
         self.enabled = config.get('enabled', False)
         self.logger = logger or logging.getLogger(__name__)
 
-        # 存储 BarType 用于精确匹配
-        self.trend_bar_type = trend_bar_type
-        self.decision_bar_type = decision_bar_type
-        self.execution_bar_type = execution_bar_type
+        # v6.0: 本地聚合 — 由 15M 执行层 K 线生成 4H / 1D (及可选 1H 等) K 线，
+        # 取代 4H / 1D 独立订阅；周线由日线聚合 (周一 00:00 UTC 对齐)
+        self.local_aggregation = bool(config.get('local_aggregation', False)) and self.enabled
+        self._aggregate_timeframes: Optional[List[str]] = None
+        if self.local_aggregation:
+            extra = [tf for tf in config.get('extra_timeframes', []) if tf not in AGGREGATED_LAYERS]
+            self._aggregate_timeframes = list(AGGREGATED_LAYERS) + extra
+
+        # v6.0: 品种注册表 + 共享路由表
+        self.instruments: Dict[str, InstrumentLayers] = {}
+        self._routes: Dict[BarType, Tuple[InstrumentLayers, str]] = {}
+        self._layer_specs: Dict[str, Dict[str, Any]] = {}
+
+        primary_bar_types = {
+            'trend': trend_bar_type,
+            'decision': decision_bar_type,
+            'execution': execution_bar_type,
+        }
+        primary_key = next(
+            (str(bt.instrument_id) for bt in primary_bar_types.values() if bt is not None),
+            'default',
+        )
 
         if not self.enabled:
             self.logger.info("MultiTimeframeManager: disabled")
-            # 初始化为 None 以避免属性访问错误
-            self.trend_manager = None
-            self.decision_manager = None
-            self.execution_manager = None
+            # 各层管理器为 None 以避免属性访问错误
+            self.primary = InstrumentLayers(primary_key, primary_bar_types, {layer: None for layer in LAYERS})
             return
 
-        # 初始化三层指标管理器
-        self.trend_manager: Optional[TechnicalIndicatorManager] = None
-        self.decision_manager: Optional[TechnicalIndicatorManager] = None
-        self.execution_manager: Optional[TechnicalIndicatorManager] = None
-
         # 初始化各层管理器
         self._init_managers()
+        self.primary = self.register_instrument(primary_key, **{f"{k}_bar_type": v for k, v in primary_bar_types.items()})
+
+        self.logger.info(
+            f"MultiTimeframeManager: initialized with 3 layers"
+            f"{' (4H/1D aggregated from 15M)' if self.local_aggregation else ''}"
+        )
+
+    # =========================================================================
+    # 主品种兼容属性
+    # =========================================================================
+
+    @property
+    def trend_bar_type(self) -> Optional[BarType]:
+        return self.primary.bar_types['trend']
+
+    @property
+    def decision_bar_type(self) -> Optional[BarType]:
+        return self.primary.bar_types['decision']
+
+    @property
+    def execution_bar_type(self) -> Optional[BarType]:
+        return self.primary.bar_types['execution']
+
+    @property
+    def trend_manager(self) -> Optional[TechnicalIndicatorManager]:
+        return self.primary.managers['trend']
 
-        self.logger.info("MultiTimeframeManager: initialized with 3 layers")
+    @trend_manager.setter
+    def trend_manager(self, manager: Optional[TechnicalIndicatorManager]):
+        self.primary.managers['trend'] = manager
+
+    @property
+    def decision_manager(self) -> Optional[TechnicalIndicatorManager]:
+        return self.primary.managers['decision']
+
+    @decision_manager.setter
+    def decision_manager(self, manager: Optional[TechnicalIndicatorManager]):
+        self.primary.managers['decision'] = manager
+
+    @property
+    def execution_manager(self) -> Optional[TechnicalIndicatorManager]:
+        return self.primary.managers['execution']
+
+    @execution_manager.setter
+    def execution_manager(self, manager: Optional[TechnicalIndicatorManager]):
+        self.primary.managers['execution'] = manager
+
+    @property
+    def aggregator(self) -> Optional[HigherTimeframeAggregator]:
+        return self.primary.aggregator
+
+    @property
+    def weekly_aggregator(self) -> HigherTimeframeAggregator:
+        return self.primary.weekly_aggregator
 
     def _init_managers(self):
         """
-        初始化各层技术指标管理器
+        初始化各层技术指标参数
 
         v3.2.7 修正: 必须传递所有必需参数，确保指标正确初始化
         v3.2.10 修正: 从配置读取参数，移除硬编码
+        v6.0: 只计算一次各层参数 (_layer_specs)，每个品种据此创建管理器
         TechnicalIndicatorManager 参数参考 indicators/technical_manager.py:29-40
         """
         trend_config = self.config.get('trend_layer', {})
@@ -114,7 +247,7 @@ class MultiTimeframeManager:
         # 关键: SMA_200 需要至少 200 根 bar 才能计算
         # ========================================
         sma_period = trend_config.get('sma_period', 200)
-        self.trend_manager = TechnicalIndicatorManager(
+        self._layer_specs['trend'] = dict(
             sma_periods=[sma_period],      # SMA_200 用于趋势判断
             ema_periods=default_ema_periods,
             rsi_period=default_rsi_period,
@@ -126,14 +259,14 @@ class MultiTimeframeManager:
             volume_ma_period=default_volume_ma_period,
             support_resistance_lookback=default_support_resistance_lookback,
         )
-        self.logger.debug(f"趋势层管理器初始化: SMA_{sma_period}")
+        self.logger.debug(f"趋势层参数: SMA_{sma_period}")
 
         # ========================================
         # 决策层 (4H) - Bull/Bear 辩论使用的指标
         # 从 decision_layer.indicators 读取配置
         # ========================================
         decision_indicators = decision_config.get('indicators', {})
-        self.decision_manager = TechnicalIndicatorManager(
+        self._layer_specs['decision'] = dict(
             sma_periods=decision_indicators.get('sma_periods', [20, 50]),
             ema_periods=default_ema_periods,
             rsi_period=decision_indicators.get('rsi_period', default_rsi_period),
@@ -145,14 +278,14 @@ class MultiTimeframeManager:
             volume_ma_period=default_volume_ma_period,
             support_resistance_lookback=default_support_resistance_lookback,
         )
-        self.logger.debug("决策层管理器初始化")
+        self.logger.debug("决策层参数初始化")
 
         # ========================================
         # 执行层 (5M/15M) - 入场确认指标
         # 从 execution_layer.indicators 读取配置
         # ========================================
         exec_indicators = exec_config.get('indicators', {})
-        self.execution_manager = TechnicalIndicatorManager(
+        self._layer_specs['execution'] = dict(
             sma_periods=exec_indicators.get('sma_periods', [5, 20]),
             ema_periods=exec_indicators.get('ema_periods', [10, 20]),
             rsi_period=exec_indicators.get('rsi_period', default_rsi_period),
@@ -164,9 +297,92 @@ class MultiTimeframeManager:
             volume_ma_period=default_volume_ma_period,
             support_resistance_lookback=exec_indicators.get('support_resistance_lookback', default_support_resistance_lookback),
         )
-        self.logger.debug("执行层管理器初始化")
+        self.logger.debug("执行层参数初始化")
+
+    # =========================================================================
+    # v6.0: 品种注册表
+    # =========================================================================
+
+    def register_instrument(
+        self,
+        instrument: str,
+        trend_bar_type: Optional[BarType] = None,
+        decision_bar_type: Optional[BarType] = None,
+        execution_bar_type: Optional[BarType] = None,
+    ) -> InstrumentLayers:
+        """
+        注册一个品种 (创建其三层指标管理器并加入路由表)
+
+        Parameters
+        ----------
+        instrument : str
+            品种标识 (如 "ETHUSDT-PERP.BINANCE")
+        trend_bar_type, decision_bar_type, execution_bar_type : BarType
+            各层 BarType；本地聚合时 4H / 1D 可不订阅，但仍用于生成 Bar
+
+        Returns
+        -------
+        InstrumentLayers
+            该品种的状态 (已注册则返回已有实例)
+        """
+        if not self.enabled:
+            raise RuntimeError("MultiTimeframeManager is disabled")
+        if instrument in self.instruments:
+            return self.instruments[instrument]
+
+        bar_types = {
+            'trend': trend_bar_type,
+            'decision': decision_bar_type,
+            'execution': execution_bar_type,
+        }
+        for layer, bar_type in bar_types.items():
+            if bar_type is not None and bar_type in self._routes:
+                raise ValueError(
+                    f"{bar_type} already routed to {self._routes[bar_type][0].instrument}/{self._routes[bar_type][1]}"
+                )
+
+        managers = {layer: TechnicalIndicatorManager(**self._layer_specs[layer]) for layer in LAYERS}
+        state = InstrumentLayers(instrument, bar_types, managers, self._aggregate_timeframes)
+        self.instruments[instrument] = state
+        for layer, bar_type in bar_types.items():
+            if bar_type is not None:
+                self._routes[bar_type] = (state, layer)
+        self.logger.debug(f"MTF: 注册品种 {instrument} ({len(self.instruments)} total)")
+        return state
+
+    def get_instrument(self, instrument: Optional[str] = None) -> Optional[InstrumentLayers]:
+        """按品种标识读取状态 (None 表示主品种)"""
+        if instrument is None:
+            return self.primary
+        return self.instruments.get(instrument)
+
+    def _state(self, instrument: Optional[str]) -> InstrumentLayers:
+        state = self.get_instrument(instrument)
+        if state is None:
+            raise KeyError(f"instrument not registered: {instrument}")
+        return state
+
+    def get_registry_stats(self) -> Dict[str, Any]:
+        """
+        品种注册表统计
 
-    def is_initialized(self, layer: str = None) -> bool:
+        Returns
+        -------
+        Dict
+            {"instruments", "routes", "nbytes", "per_instrument": {instrument: {"bars_routed", "nbytes"}}}
+        """
+        per_instrument = {
+            key: {'bars_routed': state.bars_routed, 'nbytes': state.nbytes}
+            for key, state in self.instruments.items()
+        }
+        return {
+            'instruments': len(self.instruments),
+            'routes': len(self._routes),
+            'nbytes': sum(item['nbytes'] for item in per_instrument.values()),
+            'per_instrument': per_instrument,
+        }
+
+    def is_initialized(self, layer: str = None, instrument: Optional[str] = None) -> bool:
         """
         v3.2.7 新增: 检查指标管理器是否已初始化
 
@@ -174,6 +390,8 @@ class MultiTimeframeManager:
         ----------
         layer : str, optional
             指定层级 ("trend"/"decision"/"execution")，None 检查全部
+        instrument : str, optional
+            v6.0: 品种标识 (None 表示主品种)
 
         Returns
         -------
@@ -189,11 +407,10 @@ class MultiTimeframeManager:
             'execution': 20,   # RSI_14 + EMA_10 需要 ~20 根
         }
 
-        managers = {
-            'trend': self.trend_manager,
-            'decision': self.decision_manager,
-            'execution': self.execution_manager,
-        }
+        state = self.get_instrument(instrument)
+        if state is None:
+            return False
+        managers = state.managers
 
         if layer:
             if layer not in managers:
@@ -232,30 +449,240 @@ class MultiTimeframeManager:
         if not self.enabled:
             return "disabled"
 
-        # 使用精确的 BarType 匹配
-        if self.trend_bar_type and bar.bar_type == self.trend_bar_type:
-            if self.trend_manager:
-                self.trend_manager.update(bar)
-            self.logger.debug(f"[1D] 趋势层 bar 更新: close={bar.close}")
-            return "trend"
-
-        elif self.decision_bar_type and bar.bar_type == self.decision_bar_type:
-            if self.decision_manager:
-                self.decision_manager.update(bar)
-            self.logger.debug(f"[4H] 决策层 bar 更新: close={bar.close}")
-            return "decision"
-
-        elif self.execution_bar_type and bar.bar_type == self.execution_bar_type:
-            if self.execution_manager:
-                self.execution_manager.update(bar)
-            self.logger.debug(f"[15M] 执行层 bar 更新: close={bar.close}")
-            return "execution"
-
-        else:
+        # v6.0: BarType → (品种, 层) 查表
+        route = self._routes.get(bar.bar_type)
+        if route is None:
             self.logger.warning(f"Unknown bar type: {bar.bar_type}")
             return "unknown"
 
-    def get_technical_data_for_layer(self, layer: str, current_price: float) -> Dict[str, Any]:
+        state, layer = route
+        self._update_layer(state, layer, bar)
+        return layer
+
+    def route_bars(self, bars: Iterable[Bar]) -> Dict[str, int]:
+        """
+        v6.0: 批量路由 (多品种同一时刻收盘的 K 线 / 历史回放)
+
+        Parameters
+        ----------
+        bars : Iterable[Bar]
+            按时间排序的 K 线 (可混合多个品种和层)
+
+        Returns
+        -------
+        Dict[str, int]
+            {层或 "unknown": 路由数量}
+        """
+        counts: Dict[str, int] = {}
+        if not self.enabled:
+            return counts
+        routes = self._routes
+        for bar in bars:
+            route = routes.get(bar.bar_type)
+            if route is None:
+                counts['unknown'] = counts.get('unknown', 0) + 1
+                continue
+            self._update_layer(route[0], route[1], bar)
+            counts[route[1]] = counts.get(route[1], 0) + 1
+        if counts.get('unknown'):
+            self.logger.warning(f"Unknown bar type: {counts['unknown']} bars skipped")
+        return counts
+
+    def _update_layer(self, state: InstrumentLayers, layer: str, bar: Bar):
+        """更新品种的一层 (执行层同时驱动本地聚合，趋势层驱动周线)"""
+        manager = state.managers[layer]
+        if manager is not None:
+            manager.update(bar)
+        state.bars_routed += 1
+
+        if layer == 'trend':
+            state.weekly_aggregator.add_bar(bar)
+        elif layer == 'execution' and state.aggregator is not None:
+            # v6.0: 本地聚合 4H / 1D
+            self._route_aggregated(
+                state, state.aggregator.add_bar(bar), bar.close.precision, bar.volume.precision,
+            )
+
+    # =========================================================================
+    # v6.0: 本地高周期聚合
+    # =========================================================================
+
+    def set_backfill(
+        self,
+        fn: Callable[[str, int], Optional[Tuple[float, ...]]],
+        instrument: Optional[str] = None,
+    ):
+        """
+        设置缺口回补函数
+
+        Parameters
+        ----------
+        fn : Callable[[timeframe, open_ns], (open, high, low, close, volume) or None]
+            聚合 K 线不完整 (15M 流有缺口 / 启动于周期中途) 时，从 REST 读取该根 K 线
+        instrument : str, optional
+            品种标识 (None 表示主品种)
+        """
+        self._state(instrument).backfill_fn = fn
+
+    def seed_aggregator(
+        self,
+        klines: List[List],
+        price_precision: int,
+        size_precision: int,
+        instrument: Optional[str] = None,
+    ):
+        """
+        用已收盘 15M K 线 (Binance kline 格式，按时间排序) 预热聚合器
+
+        启动时喂入当前 1D 周期内已收盘的 15M K 线，使正在形成的 4H / 1D K 线完整；
+        之前已由 REST 预取进各层的周期会被跳过。
+
+        Parameters
+        ----------
+        klines : List[List]
+            [[open_time_ms, open, high, low, close, volume, ...], ...]
+        price_precision : int
+            价格精度 (生成 Bar 用)
+        size_precision : int
+            数量精度
+        instrument : str, optional
+            品种标识 (None 表示主品种)
+        """
+        state = self._state(instrument)
+        if state.aggregator is None:
+            return
+        for k in klines:
+            completed = state.aggregator.add(
+                int(k[0]) * 1_000_000, float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]),
+            )
+            self._route_aggregated(state, completed, price_precision, size_precision)
+
+    def _route_aggregated(
+        self,
+        state: InstrumentLayers,
+        completed: List[AggregatedBar],
+        price_precision: int,
+        size_precision: int,
+    ):
+        """
+        把聚合完成的 K 线按时间顺序送入对应层
+
+        不完整 / 整段缺失的周期先尝试 REST 回补；缺失周期回补失败时跳过
+        (占位 K 线没有真实价格)，不完整周期按已有数据使用。
+        """
+        for agg in completed:
+            layer = AGGREGATED_LAYERS.get(agg.timeframe)
+            manager = state.managers.get(layer) if layer else None
+            if manager is not None:
+                last_ts = manager.last_bar_ts
+                if last_ts is not None and bucket_start(last_ts, agg.timeframe) >= agg.open_ns:
+                    continue  # 该周期已由 REST 预取 / 快照提供
+
+            if not agg.complete:
+                ohlcv = None
+                if state.backfill_fn is not None:
+                    try:
+                        ohlcv = state.backfill_fn(agg.timeframe, agg.open_ns)
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ [MTF] {state.instrument} {agg.timeframe} 回补失败: {e}")
+                if ohlcv:
+                    o, h, l, c, v = ohlcv
+                    agg = agg._replace(open=o, high=h, low=l, close=c, volume=v, bar_count=agg.expected_count)
+                    state.backfilled += 1
+                elif agg.bar_count == 0:
+                    # 整个周期都没有 15M K 线: 占位 K 线没有真实价格，不能送入指标
+                    state.unfilled += 1
+                    self.logger.warning(
+                        f"⚠️ [MTF] {state.instrument} {agg.timeframe} 周期 {agg.open_ns} 缺失且无法回补，已跳过"
+                    )
+                    continue
+                else:
+                    self.logger.warning(
+                        f"⚠️ [MTF] {state.instrument} {agg.timeframe} 聚合 K 线不完整 "
+                        f"({agg.bar_count}/{agg.expected_count})，按已有数据使用"
+                    )
+
+            if manager is None:
+                history = state.extra_bars.get(agg.timeframe)
+                if history is not None:
+                    history.append(agg)
+                    if len(history) > 500:
+                        history.pop(0)
+                continue
+
+            bar = Bar(
+                bar_type=state.bar_types[layer],
+                open=Price(agg.open, price_precision),
+                high=Price(agg.high, price_precision),
+                low=Price(agg.low, price_precision),
+                close=Price(agg.close, price_precision),
+                volume=Quantity(agg.volume, size_precision),
+                ts_event=agg.close_ns,
+                ts_init=agg.close_ns,
+            )
+            manager.update(bar)
+            if layer == 'trend':
+                state.weekly_aggregator.add_bar(bar)
+            self.logger.debug(f"[MTF] 本地聚合 {agg.timeframe} bar → {layer}: close={agg.close}")
+
+    def rebuild_weekly(self, instrument: Optional[str] = None):
+        """由趋势层 (1D) 已有 K 线重建周线聚合 (预取 / 快照恢复后调用)"""
+        state = self._state(instrument)
+        state.weekly_aggregator.reset()
+        trend_manager = state.managers['trend']
+        if not trend_manager:
+            return
+        history = trend_manager.history_bars
+        o, h, l, c, v = history.ohlcv().tolist()
+        for i, ts in enumerate(history.ts_events().tolist()):
+            state.weekly_aggregator.add(ts, o[i], h[i], l[i], c[i], v[i])
+
+    def get_weekly_bar(self, instrument: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        上一根已收盘周线 (周一 00:00 UTC 对齐，缺少日线时返回 None)
+
+        Returns
+        -------
+        Dict or None
+            {'timestamp', 'open', 'high', 'low', 'close', 'volume'}
+        """
+        weekly = self._state(instrument).weekly_aggregator.last_completed('1w')
+        return weekly.to_dict() if weekly is not None and weekly.complete else None
+
+    def get_aggregated_bars(
+        self,
+        timeframe: str,
+        count: int = 50,
+        instrument: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        本地聚合的附加周期 K 线 (extra_timeframes，如 1h)
+
+        Returns
+        -------
+        List[Dict]
+            最近 count 根已完成 K 线
+        """
+        history = self._state(instrument).extra_bars.get(timeframe, [])
+        return [agg.to_dict() for agg in history[-count:]]
+
+    def get_aggregation_stats(self, instrument: Optional[str] = None) -> Dict[str, Any]:
+        """本地聚合统计"""
+        state = self._state(instrument)
+        if state.aggregator is None:
+            return {'enabled': False}
+        stats = state.aggregator.get_stats()
+        stats['enabled'] = True
+        stats['backfilled'] = state.backfilled
+        stats['unfilled'] = state.unfilled
+        return stats
+
+    def get_technical_data_for_layer(
+        self,
+        layer: str,
+        current_price: float,
+        instrument: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         获取指定层的技术数据
 
@@ -265,17 +692,16 @@ class MultiTimeframeManager:
             "trend" / "decision" / "execution"
         current_price : float
             当前价格
+        instrument : str, optional
+            v6.0: 品种标识 (None 表示主品种)
 
         Returns
         -------
         Dict
             技术指标数据
         """
-        manager = {
-            "trend": self.trend_manager,
-            "decision": self.decision_manager,
-            "execution": self.execution_manager,
-        }.get(layer)
+        state = self.get_instrument(instrument)
+        manager = state.managers.get(layer) if state is not None else None
 
         if manager and manager.is_initialized():
             data = manager.get_technical_data(current_price)
@@ -288,14 +714,22 @@ class MultiTimeframeManager:
             return data
         return {'_layer': layer, '_initialized': False}
 
-    def is_all_layers_initialized(self) -> bool:
+    def layer_managers(self, instrument: Optional[str] = None) -> Dict[str, TechnicalIndicatorManager]:
+        """v6.0: 各层指标管理器 (用于状态快照)，禁用时返回空字典"""
+        if not self.enabled:
+            return {}
+        state = self.get_instrument(instrument)
+        if state is None:
+            return {}
+        return {layer: mgr for layer, mgr in state.managers.items() if mgr is not None}
+
+    def is_all_layers_initialized(self, instrument: Optional[str] = None) -> bool:
         """检查所有层是否都已初始化"""
         if not self.enabled:
             return True
 
-        return (
-            self.trend_manager is not None and self.trend_manager.is_initialized() and
-            self.decision_manager is not None and self.decision_manager.is_initialized() and
-            self.execution_manager is not None and self.execution_manager.is_initialized()
-        )
+        state = self.get_instrument(instrument)
+        if state is None:
+            return False
+        return all(mgr is not None and mgr.is_initialized() for mgr in state.managers.values())
 
@@ -0,0 +1,70 @@
+"""
+Rolling-window mean / variance for per-bar indicator histories.
+"""
+
+from typing import Optional, Sequence
+
+
+class RollingWindowStats:
+    """
+    Mean and population variance over the last ``period`` values (v6.0).
+
+    O(1) per bar using Welford's update for a sliding window: the value that
+    leaves the window is supplied by the caller (it is still in the
+    OHLCVRingBuffer), so no separate window copy is kept.
+
+    Floating-point drift from the add/remove updates is bounded by resyncing
+    from the window every ``period`` values (amortized O(1)); the resync uses
+    the same plain sum as the former per-call recomputation.
+    """
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+    @property
+    def initialized(self) -> bool:
+        """True once the window holds ``period`` values."""
+        return self.count >= self.period
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the window."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the window."""
+        return self.variance ** 0.5
+
+    def push(self, value: float, leaving: Optional[float] = None):
+        """
+        Add ``value``; ``leaving`` is the value dropping out once the window is full.
+        """
+        if self.count < self.period:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (value - leaving) / self.period
+            self._m2 += (value - leaving) * (value - self.mean + leaving - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0
+        self._updates += 1
+
+    def needs_resync(self) -> bool:
+        """True every ``period`` updates once the window is full."""
+        return self.initialized and self._updates >= self.period
+
+    def resync(self, window: Sequence[float]):
+        """Recompute exactly from the current window (last ``period`` values)."""
+        values = list(window)[-self.period:]
+        self.count = len(values)
+        self.mean = sum(values) / self.count if self.count else 0.0
+        self._m2 = sum((x - self.mean) ** 2 for x in values)
+        self._updates = 0
@@ -4,7 +4,7 @@ Technical Indicator Manager for NautilusTrader Strategy
 Manages all technical indicators using NautilusTrader's built-in indicators.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # Use Cython indicators (not Rust PyO3) to avoid thread safety panics
 # Reference: https://github.com/Patrick-code-Bot/nautilus_AItrader
@@ -17,6 +17,97 @@ from nautilus_trader.indicators import (
 )
 from nautilus_trader.model.data import Bar
 
+from indicators.bar_buffer import OHLCVRingBuffer
+from indicators.batch_indicators import compute_indicator_series
+from indicators.rolling_stats import RollingWindowStats
+
+
+def _detached(value: Any) -> Any:
+    """Copy nested dict / list containers so a caller never holds the memoized object (v6.0)."""
+    if isinstance(value, dict):
+        return {k: _detached(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_detached(v) for v in value]
+    return value
+
+
+class WilderADX:
+    """
+    Incremental ADX / +DI / -DI (Wilder's smoothing), O(1) per bar (v6.0).
+
+    Same interface style as the NautilusTrader indicators (update_raw / value /
+    initialized). The arithmetic follows the former full-recompute
+    implementation step by step (TR/+DM/-DM seed sums over the first `period`
+    bars, Wilder smoothing, ADX seed = mean of the first `period` DX values),
+    so the values are identical for the same bar sequence.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.initialized = False
+        self.value = 0.0          # ADX
+        self.di_plus = 0.0
+        self.di_minus = 0.0
+        self._prev: Optional[tuple] = None  # (high, low, close) of the previous bar
+        self._tr_count = 0
+        self._smoothed_tr = 0
+        self._smoothed_plus_dm = 0
+        self._smoothed_minus_dm = 0
+        self._dx_count = 0
+        self._dx_sum = 0
+
+    def update_raw(self, high: float, low: float, close: float):
+        """Feed one bar."""
+        prev = self._prev
+        self._prev = (high, low, close)
+        if prev is None:
+            return
+        prev_high, prev_low, prev_close = prev
+        period = self.period
+
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+
+        # First smoothed value is the simple sum of the first `period` values
+        self._tr_count += 1
+        if self._tr_count <= period:
+            self._smoothed_tr += tr
+            self._smoothed_plus_dm += plus_dm
+            self._smoothed_minus_dm += minus_dm
+            return
+
+        # Wilder's smoothing: prev - (prev / period) + current
+        self._smoothed_tr = self._smoothed_tr - (self._smoothed_tr / period) + tr
+        self._smoothed_plus_dm = self._smoothed_plus_dm - (self._smoothed_plus_dm / period) + plus_dm
+        self._smoothed_minus_dm = self._smoothed_minus_dm - (self._smoothed_minus_dm / period) + minus_dm
+
+        if self._smoothed_tr > 0:
+            self.di_plus = (self._smoothed_plus_dm / self._smoothed_tr) * 100
+            self.di_minus = (self._smoothed_minus_dm / self._smoothed_tr) * 100
+        else:
+            self.di_plus = 0.0
+            self.di_minus = 0.0
+
+        di_sum = self.di_plus + self.di_minus
+        dx = abs(self.di_plus - self.di_minus) / di_sum * 100 if di_sum > 0 else 0.0
+
+        # ADX = smoothed DX, seeded with the mean of the first `period` DX values
+        self._dx_count += 1
+        if self._dx_count < period:
+            self._dx_sum += dx
+        elif self._dx_count == period:
+            self._dx_sum += dx
+            self.value = self._dx_sum / period
+            self.initialized = True
+        else:
+            self.value = (self.value * (period - 1) + dx) / period
+
 
 class TechnicalIndicatorManager:
     """
@@ -25,6 +116,9 @@ class TechnicalIndicatorManager:
     Uses NautilusTrader's built-in indicators for efficiency and consistency.
     """
 
+    # v6.0: Max memoized results per bar (distinct current_price / count arguments)
+    MEMO_MAX_ENTRIES = 32
+
     def __init__(
         self,
         sma_periods: List[int] = [5, 20, 50],
@@ -37,6 +131,7 @@ class TechnicalIndicatorManager:
         bb_std: float = 2.0,
         volume_ma_period: int = 20,
         support_resistance_lookback: int = 20,
+        lookback_requirements: Optional[Dict[str, int]] = None,
     ):
         """
         Initialize technical indicator manager.
@@ -63,6 +158,9 @@ class TechnicalIndicatorManager:
             Period for volume moving average
         support_resistance_lookback : int
             Lookback period for support/resistance calculation
+        lookback_requirements : Dict[str, int], optional
+            v6.0: Raw-bar depth needed by downstream consumers of get_kline_data()
+            (e.g. {"sr_zones": 200, "volume_profile": 96}); sizes history_bars
         """
         # SMA indicators
         self.smas = {period: SimpleMovingAverage(period) for period in sma_periods}
@@ -88,8 +186,6 @@ class TechnicalIndicatorManager:
         # Volume MA
         self.volume_sma = SimpleMovingAverage(volume_ma_period)
 
-        # Store recent bars for calculations
-        self.recent_bars: List[Bar] = []
         # v5.5: Increased max_bars to support historical context calculations
         # ADX history needs 2*period + count + 1, SMA history needs max_sma + count
         history_count = 35  # Default count for get_historical_context()
@@ -99,6 +195,24 @@ class TechnicalIndicatorManager:
             2 * 14 + history_count + 10,            # ADX history (2*14 + 35 + 10 = 73)
         )
 
+        # v6.0: Store recent bars as NumPy OHLCV columns (was List[Bar] + pop(0))
+        self.bars = OHLCVRingBuffer(self.max_bars)
+
+        # v6.0: Lookback requirements. Internal history series read self.bars (sized by
+        # max_bars above); consumers of get_kline_data() read a separate raw OHLCV ring
+        # sized from their declarations, so e.g. S/R detection gets its full 200 bars
+        # without enlarging the indicator-state buffer.
+        self._internal_lookbacks: Dict[str, int] = {
+            'adx_history': 2 * 14 + history_count + 1,
+            'sma_history': max(sma_periods) + history_count,
+            'bb_width_history': bb_period + history_count,
+            'support_resistance': support_resistance_lookback,
+        }
+        self.lookback_requirements: Dict[str, int] = {
+            name: int(bars) for name, bars in (lookback_requirements or {}).items()
+        }
+        self.history_bars = OHLCVRingBuffer(self._history_capacity())
+
         # Configuration
         self.support_resistance_lookback = support_resistance_lookback
         self.sma_periods = sma_periods
@@ -108,11 +222,96 @@ class TechnicalIndicatorManager:
         self.macd_fast_period = macd_fast
         self.macd_signal_period = macd_signal
 
+        # v6.0: ADX/DI maintained incrementally in update() (was recomputed over all bars per call)
+        self.adx_period = 14
+        self.adx = WilderADX(self.adx_period)
+
         # v5.5: History buffers — store official NT indicator values on each update()
         # Eliminates RSI/MACD series vs snapshot mismatch caused by simplified recalculation
         self._rsi_history: List[float] = []
         self._macd_history: List[float] = []
         self._macd_signal_history: List[float] = []
+        self._adx_history: List[float] = []
+        self._di_plus_history: List[float] = []
+        self._di_minus_history: List[float] = []
+
+        # v6.0: Rolling window statistics (per-bar SMA / Bollinger histories)
+        self._rolling: Dict[int, RollingWindowStats] = {
+            period: RollingWindowStats(period) for period in sorted(set(sma_periods) | {bb_period})
+        }
+        self._sma_history: Dict[int, List[float]] = {period: [] for period in sma_periods}
+        self._bb_middle_history: List[float] = []
+        self._bb_upper_history: List[float] = []
+        self._bb_lower_history: List[float] = []
+        self._bb_width_history: List[float] = []
+
+        # v6.0: Per-bar memoization of get_technical_data / get_historical_context / get_kline_data.
+        # Results only change in update(), so repeated calls within one bar
+        # (on_timer, heartbeat, Telegram, SL/TP re-evaluation, MTF) share one result.
+        self._version = 0
+        self._memo: Dict[tuple, Any] = {}
+        self._memo_hits = 0
+        self._memo_misses = 0
+
+    # =========================================================================
+    # v6.0: Lookback requirements
+    # =========================================================================
+
+    def _history_capacity(self) -> int:
+        """Raw history ring size: the largest declared requirement (at least max_bars)."""
+        return max([self.max_bars] + list(self.lookback_requirements.values()))
+
+    def declare_lookback(self, consumer: str, bars: int):
+        """
+        Declare the raw-bar depth a get_kline_data() consumer needs.
+
+        Grows history_bars if required (existing bars are kept).
+
+        Parameters
+        ----------
+        consumer : str
+            Consumer name (for get_lookback_report)
+        bars : int
+            Number of bars the consumer reads
+        """
+        self.lookback_requirements[consumer] = int(bars)
+        capacity = self._history_capacity()
+        if capacity > self.history_bars.capacity:
+            history = OHLCVRingBuffer(capacity)
+            history.load_arrays(self.history_bars.to_arrays())
+            self.history_bars = history
+
+    def get_lookback_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Depth each consumer actually gets.
+
+        Returns
+        -------
+        Dict
+            consumer → {"required", "available", "capacity", "buffer", "ok"}
+            ("buffer" is "indicator" for internal series, "history" for get_kline_data consumers)
+        """
+        report = {}
+        for buffer, buf, requirements in (
+            ('indicator', self.bars, self._internal_lookbacks),
+            ('history', self.history_bars, self.lookback_requirements),
+        ):
+            for consumer, required in requirements.items():
+                available = min(len(buf), required)
+                report[consumer] = {
+                    'required': required,
+                    'available': available,
+                    'capacity': buf.capacity,
+                    'buffer': buffer,
+                    'ok': available >= required,
+                }
+        return report
+
+    def _append_history(self, history: List[float], value: float):
+        """Append to a history buffer capped at max_bars."""
+        history.append(value)
+        if len(history) > self.max_bars:
+            history.pop(0)
 
     def update(self, bar: Bar):
         """
@@ -123,31 +322,53 @@ class TechnicalIndicatorManager:
         bar : Bar
             New bar data
         """
-        # Store bar for manual calculations
-        self.recent_bars.append(bar)
-        if len(self.recent_bars) > self.max_bars:
-            self.recent_bars.pop(0)
+        # v6.0: New bar invalidates memoized results
+        self._version += 1
+        self._memo = {}
+
+        # v6.0: Convert once, store as OHLCV columns
+        high = float(bar.high)
+        low = float(bar.low)
+        close = float(bar.close)
+        volume = float(bar.volume)
+        ts_init = int(bar.ts_init)
+        ts_event = getattr(bar, 'ts_event', None)
+        if not isinstance(ts_event, int):
+            ts_event = ts_init  # bar-like objects that only carry ts_init
+        open_ = float(bar.open)
+        self.bars.append(open_, high, low, close, volume, ts_event, ts_init)
+        self.history_bars.append(open_, high, low, close, volume, ts_event, ts_init)
 
         # Update SMA indicators
         for sma in self.smas.values():
-            sma.update_raw(float(bar.close))
+            sma.update_raw(close)
 
         # Update EMA indicators
         for ema in self.emas.values():
-            ema.update_raw(float(bar.close))
+            ema.update_raw(close)
 
         # Update RSI
-        self.rsi.update_raw(float(bar.close))
+        self.rsi.update_raw(close)
 
         # Update MACD
-        self.macd.update_raw(float(bar.close))
+        self.macd.update_raw(close)
         self.macd_signal.update_raw(self.macd.value)
 
         # Update Bollinger Band SMA
-        self.bb_sma.update_raw(float(bar.close))
+        self.bb_sma.update_raw(close)
 
         # Update Volume SMA
-        self.volume_sma.update_raw(float(bar.volume))
+        self.volume_sma.update_raw(volume)
+
+        # v6.0: Update ADX/DI (Wilder state)
+        self.adx.update_raw(high, low, close)
+
+        # v6.0: Rolling window statistics; the value leaving each window is still in self.bars
+        for period, stats in self._rolling.items():
+            leaving = float(self.bars.closes(period + 1)[0]) if stats.initialized else None
+            stats.push(close, leaving)
+            if stats.needs_resync():
+                stats.resync(self.bars.closes(period).tolist())
 
         # v5.5: Store official NT indicator values for history series
         # These stored values are used by get_historical_context() to build
@@ -165,11 +386,249 @@ class TechnicalIndicatorManager:
             self._macd_signal_history.append(round(self.macd_signal.value, 4))
             if len(self._macd_signal_history) > self.max_bars:
                 self._macd_signal_history.pop(0)
+        if self.adx.initialized:
+            self._adx_history.append(round(self.adx.value, 1))
+            self._di_plus_history.append(round(self.adx.di_plus, 1))
+            self._di_minus_history.append(round(self.adx.di_minus, 1))
+            if len(self._adx_history) > self.max_bars:
+                self._adx_history.pop(0)
+                self._di_plus_history.pop(0)
+                self._di_minus_history.pop(0)
+
+        # v6.0: Per-bar SMA / Bollinger values (same formulas as the former per-call recomputation)
+        for period in self.sma_periods:
+            stats = self._rolling[period]
+            if stats.initialized:
+                self._append_history(self._sma_history[period], round(stats.mean, 2))
+        bb = self._rolling[self.bb_period]
+        if bb.initialized:
+            middle = bb.mean
+            std_dev = bb.std
+            upper = middle + self.bb_std * std_dev
+            lower = middle - self.bb_std * std_dev
+            width = ((upper - lower) / middle * 100) if middle > 0 else 0
+            self._append_history(self._bb_middle_history, round(middle, 2))
+            self._append_history(self._bb_upper_history, round(upper, 2))
+            self._append_history(self._bb_lower_history, round(lower, 2))
+            self._append_history(self._bb_width_history, round(width, 2))
+
+    # =========================================================================
+    # v6.0: Warm-restart state (see utils/indicator_snapshot.py)
+    # =========================================================================
+
+    def _config_fingerprint(self) -> Dict[str, Any]:
+        """Indicator parameters; a snapshot is only valid for identical parameters."""
+        return {
+            'sma_periods': list(self.sma_periods),
+            'ema_periods': list(self.ema_periods),
+            'rsi_period': self.rsi_period,
+            'macd': [self.macd_fast_period, self.macd_slow_period, self.macd_signal_period],
+            'bb': [self.bb_period, self.bb_std],
+            'volume_ma_period': self.volume_sma.period,
+            'adx_period': self.adx_period,
+            'support_resistance_lookback': self.support_resistance_lookback,
+            'max_bars': self.max_bars,
+        }
+
+    @property
+    def recent_bars(self) -> OHLCVRingBuffer:
+        """
+        Recent bars (oldest first), read-only.
+
+        v6.0: Sequence adapter over the OHLCV buffer. Items are BarRow tuples with
+        the Bar attribute names (open/high/low/close/volume/ts_event/ts_init) as
+        plain floats/ints; use self.bars.closes(n) etc. for array access.
+        """
+        return self.bars
+
+    @property
+    def last_bar_ts(self) -> Optional[int]:
+        """ts_event (ns) of the most recent bar, None if no bars yet."""
+        return int(self.bars.ts_events(1)[0]) if len(self.bars) else None
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Export bars, history buffers and indicator internals.
+
+        NautilusTrader Cython indicators support pickling with their full
+        internal state (input windows, running averages), so restoring them
+        continues exactly where the previous process stopped. Bars are stored
+        as the OHLCV buffer arrays.
+
+        Returns
+        -------
+        Dict
+            Picklable state for set_state()
+        """
+        return {
+            'config': self._config_fingerprint(),
+            'bars': self.bars.to_arrays(),
+            'history_bars': self.history_bars.to_arrays(),
+            'last_ts_event': self.last_bar_ts,
+            'indicators': {
+                'smas': self.smas,
+                'emas': self.emas,
+                'rsi': self.rsi,
+                'macd': self.macd,
+                'macd_signal': self.macd_signal,
+                'bb_sma': self.bb_sma,
+                'volume_sma': self.volume_sma,
+                'adx': self.adx,
+            },
+            'rsi_history': list(self._rsi_history),
+            'macd_history': list(self._macd_history),
+            'macd_signal_history': list(self._macd_signal_history),
+            'adx_history': list(self._adx_history),
+            'di_plus_history': list(self._di_plus_history),
+            'di_minus_history': list(self._di_minus_history),
+            'rolling': self._rolling,
+            'sma_history': {period: list(h) for period, h in self._sma_history.items()},
+            'bb_history': {
+                'middle': list(self._bb_middle_history),
+                'upper': list(self._bb_upper_history),
+                'lower': list(self._bb_lower_history),
+                'width': list(self._bb_width_history),
+            },
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """
+        Restore state exported by get_state().
+
+        Raises
+        ------
+        ValueError
+            If the snapshot was taken with different indicator parameters
+        """
+        if state.get('config') != self._config_fingerprint():
+            raise ValueError(
+                f"indicator config mismatch: snapshot={state.get('config')} "
+                f"current={self._config_fingerprint()}"
+            )
+
+        bars = OHLCVRingBuffer(self.max_bars)
+        bars.load_arrays(state['bars'])
+        history_bars = OHLCVRingBuffer(self.history_bars.capacity)
+        history_bars.load_arrays(state['history_bars'])
+
+        indicators = state['indicators']
+        adx = indicators['adx']
+        rolling = state['rolling']
+        bb_history = state['bb_history']
+        self.smas = indicators['smas']
+        self.emas = indicators['emas']
+        self.rsi = indicators['rsi']
+        self.macd = indicators['macd']
+        self.macd_signal = indicators['macd_signal']
+        self.bb_sma = indicators['bb_sma']
+        self.volume_sma = indicators['volume_sma']
+        self.adx = adx
+
+        self.bars = bars
+        self.history_bars = history_bars
+        self._rsi_history = list(state['rsi_history'])
+        self._macd_history = list(state['macd_history'])
+        self._macd_signal_history = list(state['macd_signal_history'])
+        self._adx_history = list(state['adx_history'])
+        self._di_plus_history = list(state['di_plus_history'])
+        self._di_minus_history = list(state['di_minus_history'])
+        self._rolling = rolling
+        self._sma_history = {period: list(h) for period, h in state['sma_history'].items()}
+        self._bb_middle_history = list(bb_history['middle'])
+        self._bb_upper_history = list(bb_history['upper'])
+        self._bb_lower_history = list(bb_history['lower'])
+        self._bb_width_history = list(bb_history['width'])
+        self._version += 1
+        self._memo = {}
+
+    # =========================================================================
+    # v6.0: Batch computation (see indicators/batch_indicators.py)
+    # =========================================================================
+
+    def compute_series(self, ohlcv) -> Dict[str, Any]:
+        """
+        Compute all indicator series for a full OHLCV history with this manager's parameters.
+
+        Vectorized equivalent of calling update() for every bar and reading the
+        indicator values after each one; does not change the manager's state.
+
+        Parameters
+        ----------
+        ohlcv : np.ndarray
+            (5, n) array: open, high, low, close, volume
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Per-bar series (NaN until each indicator is initialized), see compute_indicator_series()
+        """
+        return compute_indicator_series(
+            ohlcv,
+            sma_periods=self.sma_periods,
+            ema_periods=self.ema_periods,
+            rsi_period=self.rsi_period,
+            macd_fast=self.macd_fast_period,
+            macd_slow=self.macd_slow_period,
+            macd_signal=self.macd_signal_period,
+            bb_period=self.bb_period,
+            bb_std=self.bb_std,
+            volume_ma_period=self.volume_sma.period,
+            support_resistance_lookback=self.support_resistance_lookback,
+            adx_period=self.adx_period,
+        )
+
+    # =========================================================================
+    # v6.0: Per-bar memoization
+    # =========================================================================
+
+    @property
+    def version(self) -> int:
+        """Incremented on every update() / set_state(); memoized results are per version."""
+        return self._version
+
+    def _memoized(self, key: tuple, compute):
+        """
+        Return the result cached for ``key`` in the current version, computing it once.
+
+        Every caller gets its own copy of the cached containers, so mutating a
+        returned dict / list never leaks into later reads within the bar.
+        """
+        memo = self._memo
+        if key in memo:
+            self._memo_hits += 1
+            return _detached(memo[key])
+        self._memo_misses += 1
+        result = compute()
+        if len(memo) >= self.MEMO_MAX_ENTRIES:
+            memo.pop(next(iter(memo)))
+        memo[key] = result
+        return _detached(result)
+
+    def get_memo_stats(self) -> Dict[str, Any]:
+        """
+        Memoization statistics.
+
+        Returns
+        -------
+        Dict
+            {"version", "last_bar_ts", "entries", "hits", "misses", "hit_rate"}
+        """
+        total = self._memo_hits + self._memo_misses
+        return {
+            'version': self._version,
+            'last_bar_ts': self.last_bar_ts,
+            'entries': len(self._memo),
+            'hits': self._memo_hits,
+            'misses': self._memo_misses,
+            'hit_rate': round(self._memo_hits / total, 3) if total else 0.0,
+        }
 
     def get_technical_data(self, current_price: float) -> Dict[str, Any]:
         """
         Get all technical indicator values.
 
+        v6.0: Memoized per bar and current_price; each call returns a fresh copy.
+
         Parameters
         ----------
         current_price : float
@@ -180,6 +639,13 @@ class TechnicalIndicatorManager:
         Dict
             Dictionary containing all technical indicator values
         """
+        return self._memoized(
+            ('technical_data', float(current_price)),
+            lambda: self._compute_technical_data(current_price),
+        )
+
+    def _compute_technical_data(self, current_price: float) -> Dict[str, Any]:
+        """Compute get_technical_data() (uncached)."""
         # Basic SMA values
         sma_values = {f'sma_{period}': self.smas[period].value for period in self.sma_periods}
 
@@ -202,7 +668,7 @@ class TechnicalIndicatorManager:
 
         # Volume analysis
         volume_ma = self.volume_sma.value
-        current_volume = float(self.recent_bars[-1].volume) if self.recent_bars else 0
+        current_volume = float(self.bars.volumes(1)[0]) if len(self.bars) else 0
         volume_ratio = current_volume / volume_ma if volume_ma > 0 else 1.0
 
         # Support and Resistance
@@ -214,7 +680,7 @@ class TechnicalIndicatorManager:
         )
 
         # ADX (trend strength)
-        adx_data = self._calculate_adx(period=14)
+        adx_data = self._calculate_adx()
 
         # Combine all data
         technical_data = {
@@ -252,28 +718,33 @@ class TechnicalIndicatorManager:
 
     def _calculate_std_dev(self, period: int) -> float:
         """Calculate standard deviation for Bollinger Bands."""
-        if len(self.recent_bars) < period:
+        if len(self.bars) < period:
             return 0.0
 
-        recent_closes = [float(bar.close) for bar in self.recent_bars[-period:]]
+        # v6.0: O(1) read from the rolling statistics
+        stats = self._rolling.get(period)
+        if stats is not None and stats.initialized:
+            return stats.std
+
+        recent_closes = self.bars.closes(period).tolist()
         mean = sum(recent_closes) / len(recent_closes)
         variance = sum((x - mean) ** 2 for x in recent_closes) / len(recent_closes)
         return variance ** 0.5
 
     def _calculate_support_resistance(self) -> tuple:
         """Calculate support and resistance levels."""
-        if len(self.recent_bars) < self.support_resistance_lookback:
+        if len(self.bars) < self.support_resistance_lookback:
             return 0.0, 0.0
 
-        recent = self.recent_bars[-self.support_resistance_lookback:]
-        support = min(float(bar.low) for bar in recent)
-        resistance = max(float(bar.high) for bar in recent)
+        lookback = self.support_resistance_lookback
+        support = float(self.bars.lows(lookback).min())
+        resistance = float(self.bars.highs(lookback).max())
 
         return support, resistance
 
-    def _calculate_adx(self, period: int = 14) -> Dict[str, Any]:
+    def _calculate_adx(self) -> Dict[str, Any]:
         """
-        Calculate ADX (Average Directional Index) from recent bars.
+        Return ADX (Average Directional Index) from the incremental Wilder state.
 
         ADX measures trend strength (not direction):
         - ADX < 20: No trend / ranging market
@@ -285,100 +756,23 @@ class TechnicalIndicatorManager:
         - +DI > -DI: Bullish trend
         - -DI > +DI: Bearish trend
 
-        Parameters
-        ----------
-        period : int
-            ADX smoothing period (default 14, Wilder's standard)
+        v6.0: Values are maintained by WilderADX in update(); this is an O(1) read
+        instead of a full TR/DM/smoothing pass over recent_bars.
 
         Returns
         -------
         Dict with adx, di_plus, di_minus, adx_regime
         """
-        bars = self.recent_bars
-        n = len(bars)
         # Need at least 2 * period + 1 bars for meaningful ADX
-        if n < 2 * period + 1:
+        if not self.adx.initialized:
             return {
                 'adx': 0.0, 'di_plus': 0.0, 'di_minus': 0.0,
                 'adx_regime': 'INSUFFICIENT_DATA',
             }
 
-        # Step 1: Calculate TR, +DM, -DM for each bar
-        tr_list = []
-        plus_dm_list = []
-        minus_dm_list = []
-
-        for i in range(1, n):
-            high = float(bars[i].high)
-            low = float(bars[i].low)
-            prev_close = float(bars[i - 1].close)
-            prev_high = float(bars[i - 1].high)
-            prev_low = float(bars[i - 1].low)
-
-            # True Range
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            tr_list.append(tr)
-
-            # +DM and -DM
-            up_move = high - prev_high
-            down_move = prev_low - low
-
-            if up_move > down_move and up_move > 0:
-                plus_dm_list.append(up_move)
-            else:
-                plus_dm_list.append(0.0)
-
-            if down_move > up_move and down_move > 0:
-                minus_dm_list.append(down_move)
-            else:
-                minus_dm_list.append(0.0)
-
-        if len(tr_list) < period:
-            return {
-                'adx': 0.0, 'di_plus': 0.0, 'di_minus': 0.0,
-                'adx_regime': 'INSUFFICIENT_DATA',
-            }
-
-        # Step 2: Wilder's smoothing for TR, +DM, -DM
-        # First value is simple sum of first 'period' values
-        smoothed_tr = sum(tr_list[:period])
-        smoothed_plus_dm = sum(plus_dm_list[:period])
-        smoothed_minus_dm = sum(minus_dm_list[:period])
-
-        dx_list = []
-
-        for i in range(period, len(tr_list)):
-            # Wilder's smoothing: prev - (prev / period) + current
-            smoothed_tr = smoothed_tr - (smoothed_tr / period) + tr_list[i]
-            smoothed_plus_dm = smoothed_plus_dm - (smoothed_plus_dm / period) + plus_dm_list[i]
-            smoothed_minus_dm = smoothed_minus_dm - (smoothed_minus_dm / period) + minus_dm_list[i]
-
-            # +DI and -DI
-            if smoothed_tr > 0:
-                di_plus = (smoothed_plus_dm / smoothed_tr) * 100
-                di_minus = (smoothed_minus_dm / smoothed_tr) * 100
-            else:
-                di_plus = 0.0
-                di_minus = 0.0
-
-            # DX
-            di_sum = di_plus + di_minus
-            if di_sum > 0:
-                dx = abs(di_plus - di_minus) / di_sum * 100
-            else:
-                dx = 0.0
-            dx_list.append(dx)
-
-        if len(dx_list) < period:
-            return {
-                'adx': 0.0, 'di_plus': di_plus, 'di_minus': di_minus,
-                'adx_regime': 'INSUFFICIENT_DATA',
-            }
-
-        # Step 3: ADX = smoothed DX (Wilder's method)
-        adx = sum(dx_list[:period]) / period
-        for i in range(period, len(dx_list)):
-            adx = (adx * (period - 1) + dx_list[i]) / period
+        adx = self.adx.value
+        di_plus = self.adx.di_plus
+        di_minus = self.adx.di_minus
 
         # Determine regime
         if adx < 20:
@@ -457,7 +851,7 @@ class TechnicalIndicatorManager:
             min(self.sma_periods) if self.sma_periods else 0  # At least shortest SMA
         )
         
-        if len(self.recent_bars) < min_required_bars:
+        if len(self.bars) < min_required_bars:
             return False
 
         # Check if key indicators are initialized
@@ -485,23 +879,13 @@ class TechnicalIndicatorManager:
         Returns
         -------
         List[Dict]
-            List of K-line data dictionaries
+            List of K-line data dictionaries (v6.0: memoized per bar, fresh copy per call)
         """
-        if not self.recent_bars:
+        if not len(self.history_bars):
             return []
 
-        kline_data = []
-        for bar in self.recent_bars[-count:]:
-            kline_data.append({
-                'timestamp': bar.ts_init,
-                'open': float(bar.open),
-                'high': float(bar.high),
-                'low': float(bar.low),
-                'close': float(bar.close),
-                'volume': float(bar.volume),
-            })
-
-        return kline_data
+        # v6.0: Raw history ring (depth from lookback requirements, see declare_lookback)
+        return self._memoized(('kline_data', count), lambda: self.history_bars.to_dicts(count))
 
     def get_historical_context(self, count: int = 20) -> Dict[str, Any]:
         """
@@ -526,9 +910,13 @@ class TechnicalIndicatorManager:
         Returns
         -------
         Dict[str, Any]
-            Historical context data for AI analysis
+            Historical context data for AI analysis (v6.0: memoized per bar, fresh copy per call)
         """
-        if len(self.recent_bars) < count:
+        return self._memoized(('historical_context', count), lambda: self._compute_historical_context(count))
+
+    def _compute_historical_context(self, count: int) -> Dict[str, Any]:
+        """Compute get_historical_context() (uncached)."""
+        if len(self.bars) < count:
             # Not enough data yet
             return {
                 "price_trend": [],
@@ -537,17 +925,15 @@ class TechnicalIndicatorManager:
                 "macd_trend": [],
                 "trend_direction": "INSUFFICIENT_DATA",
                 "momentum_shift": "INSUFFICIENT_DATA",
-                "data_points": len(self.recent_bars),
+                "data_points": len(self.bars),
                 "required_points": count,
             }
 
-        recent = self.recent_bars[-count:]
-
         # Extract price trend (closing prices)
-        price_trend = [float(bar.close) for bar in recent]
+        price_trend = self.bars.closes(count).tolist()
 
         # Extract volume trend
-        volume_trend = [float(bar.volume) for bar in recent]
+        volume_trend = self.bars.volumes(count).tolist()
 
         # Calculate RSI trend from stored bars
         # Note: We recalculate RSI for each bar to get the trend
@@ -659,132 +1045,56 @@ class TechnicalIndicatorManager:
 
         return ema
 
-    def _calculate_adx_history(self, count: int = 20, period: int = 14) -> Dict[str, List[float]]:
+    def _calculate_adx_history(self, count: int = 20) -> Dict[str, List[float]]:
         """
-        Calculate ADX/DI+/DI- time series for last N bars (v3.24).
+        Return ADX/DI+/DI- time series for last N bars (v3.24).
 
-        Uses a sliding window approach: for each output point, we use all bars
-        up to that point to calculate ADX. This gives a proper time series.
+        v6.0: Reads the per-bar values stored in update() (O(count)) instead of
+        recomputing ADX over bars[:i] for every output point.
 
         Returns
         -------
         Dict with 'adx', 'di_plus', 'di_minus' lists (same length)
         """
-        bars = self.recent_bars
-        min_required = 2 * period + count + 1
-        if len(bars) < min_required:
+        min_required = 2 * self.adx_period + count + 1
+        if len(self.bars) < min_required or len(self._adx_history) < count:
             return {"adx": [], "di_plus": [], "di_minus": []}
 
-        adx_series = []
-        di_plus_series = []
-        di_minus_series = []
-
-        # For each output point, calculate ADX using all bars up to that point
-        for end_idx in range(len(bars) - count, len(bars)):
-            sub_bars = bars[:end_idx + 1]
-            n = len(sub_bars)
-            if n < 2 * period + 1:
-                continue
-
-            tr_list = []
-            plus_dm_list = []
-            minus_dm_list = []
-
-            for i in range(1, n):
-                high = float(sub_bars[i].high)
-                low = float(sub_bars[i].low)
-                prev_close = float(sub_bars[i - 1].close)
-                prev_high = float(sub_bars[i - 1].high)
-                prev_low = float(sub_bars[i - 1].low)
-
-                tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-                tr_list.append(tr)
-
-                up_move = high - prev_high
-                down_move = prev_low - low
-                plus_dm_list.append(up_move if (up_move > down_move and up_move > 0) else 0.0)
-                minus_dm_list.append(down_move if (down_move > up_move and down_move > 0) else 0.0)
-
-            if len(tr_list) < period:
-                continue
-
-            smoothed_tr = sum(tr_list[:period])
-            smoothed_plus_dm = sum(plus_dm_list[:period])
-            smoothed_minus_dm = sum(minus_dm_list[:period])
-
-            di_plus = 0.0
-            di_minus = 0.0
-            dx_list = []
-
-            for i in range(period, len(tr_list)):
-                smoothed_tr = smoothed_tr - (smoothed_tr / period) + tr_list[i]
-                smoothed_plus_dm = smoothed_plus_dm - (smoothed_plus_dm / period) + plus_dm_list[i]
-                smoothed_minus_dm = smoothed_minus_dm - (smoothed_minus_dm / period) + minus_dm_list[i]
-
-                if smoothed_tr > 0:
-                    di_plus = (smoothed_plus_dm / smoothed_tr) * 100
-                    di_minus = (smoothed_minus_dm / smoothed_tr) * 100
-
-                di_sum = di_plus + di_minus
-                dx = abs(di_plus - di_minus) / di_sum * 100 if di_sum > 0 else 0.0
-                dx_list.append(dx)
-
-            if len(dx_list) >= period:
-                adx = sum(dx_list[:period]) / period
-                for i in range(period, len(dx_list)):
-                    adx = (adx * (period - 1) + dx_list[i]) / period
-                adx_series.append(round(adx, 1))
-                di_plus_series.append(round(di_plus, 1))
-                di_minus_series.append(round(di_minus, 1))
-
         return {
-            "adx": adx_series,
-            "di_plus": di_plus_series,
-            "di_minus": di_minus_series,
+            "adx": list(self._adx_history[-count:]),
+            "di_plus": list(self._di_plus_history[-count:]),
+            "di_minus": list(self._di_minus_history[-count:]),
         }
 
     def _calculate_bb_width_history(self, count: int = 20) -> List[float]:
         """
-        Calculate Bollinger Band width time series for last N bars (v3.24).
+        Return Bollinger Band width time series for last N bars (v3.24).
 
         BB Width = (Upper - Lower) / Middle * 100 (as percentage)
         Shows squeeze (narrowing) or expansion (widening) of volatility.
+
+        v6.0: Slice of the per-bar values stored in update().
         """
-        if len(self.recent_bars) < self.bb_period + count:
+        if len(self.bars) < self.bb_period + count:
             return []
 
-        bb_widths = []
-        for end_idx in range(len(self.recent_bars) - count, len(self.recent_bars)):
-            window = [float(b.close) for b in self.recent_bars[end_idx - self.bb_period + 1:end_idx + 1]]
-            if len(window) < self.bb_period:
-                continue
-            middle = sum(window) / len(window)
-            variance = sum((x - middle) ** 2 for x in window) / len(window)
-            std_dev = variance ** 0.5
-            upper = middle + self.bb_std * std_dev
-            lower = middle - self.bb_std * std_dev
-            width = ((upper - lower) / middle * 100) if middle > 0 else 0
-            bb_widths.append(round(width, 2))
-
-        return bb_widths
+        return list(self._bb_width_history[-count:])
 
     def _calculate_sma_history(self, count: int = 20) -> Dict[str, List[float]]:
         """
-        Calculate SMA time series for last N bars (v3.24).
+        Return SMA time series for last N bars (v3.24).
 
         Returns price and SMA values so AI can see crossovers.
+
+        v6.0: Slices of the per-bar values stored in update().
         """
         result = {}
         for period in self.sma_periods:
-            if len(self.recent_bars) < period + count:
+            if len(self.bars) < period + count:
                 continue
-            sma_values = []
-            for end_idx in range(len(self.recent_bars) - count, len(self.recent_bars)):
-                window = [float(b.close) for b in self.recent_bars[end_idx - period + 1:end_idx + 1]]
-                if len(window) >= period:
-                    sma_values.append(round(sum(window) / len(window), 2))
+            sma_values = self._sma_history[period][-count:]
             if sma_values:
-                result[f"sma_{period}"] = sma_values
+                result[f"sma_{period}"] = list(sma_values)
 
         return result
 
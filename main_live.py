@@ -187,6 +187,10 @@ def get_strategy_config(config_manager: ConfigManager) -> DeepSeekAIStrategyConf
         bb_std=config_manager.get('indicators', 'bb_std', default=2.0),
         volume_ma_period=config_manager.get('indicators', 'volume_ma_period', default=20),
         support_resistance_lookback=config_manager.get('indicators', 'support_resistance_lookback', default=20),
+        sr_lookback_bars=config_manager.get('indicators', 'sr_lookback_bars', default=200),
+        indicator_snapshot_enabled=config_manager.get('indicators', 'snapshot', 'enabled', default=True),
+        indicator_snapshot_path=config_manager.get('indicators', 'snapshot', 'path', default='data/indicator_snapshot.bin'),
+        indicator_snapshot_interval_sec=config_manager.get('indicators', 'snapshot', 'interval_sec', default=900.0),
 
         # v3.0: S/R Zone Calculator config (passed as dict to MultiAgentAnalyzer)
         sr_zones_config=config_manager.get('sr_zones', default={}),
@@ -276,6 +280,9 @@ def get_strategy_config(config_manager: ConfigManager) -> DeepSeekAIStrategyConf
         network_telegram_polling_base_delay=config_manager.get('network', 'telegram', 'polling_base_delay', default=10.0),
         network_binance_recv_window=config_manager.get('network', 'binance', 'recv_window', default=5000),
         network_binance_balance_cache_ttl=config_manager.get('network', 'binance', 'balance_cache_ttl', default=5.0),
+        network_binance_freshness=config_manager.get('network', 'binance', 'freshness', default={}),
+        network_binance_weight_limit=config_manager.get('network', 'binance', 'weight_limit', default=2400),
+        network_binance_weight_low_reserve=config_manager.get('network', 'binance', 'weight_low_reserve', default=0.4),
         network_bar_persistence_max_limit=config_manager.get('network', 'bar_persistence', 'max_limit', default=1500),
         network_bar_persistence_timeout=config_manager.get('network', 'bar_persistence', 'timeout', default=10.0),
         sentiment_timeout=config_manager.get('sentiment', 'timeout', default=10.0),
@@ -284,6 +291,8 @@ def get_strategy_config(config_manager: ConfigManager) -> DeepSeekAIStrategyConf
         multi_timeframe_enabled=config_manager.get('multi_timeframe', 'enabled', default=False),
         mtf_trend_sma_period=config_manager.get('multi_timeframe', 'trend_layer', 'sma_period', default=200),
         mtf_decision_debate_rounds=config_manager.get('multi_timeframe', 'decision_layer', 'debate_rounds', default=2),
+        mtf_local_aggregation=config_manager.get('multi_timeframe', 'local_aggregation', default=True),
+        mtf_extra_timeframes=tuple(config_manager.get('multi_timeframe', 'extra_timeframes', default=[]) or ()),
 
         # Network: Instrument Discovery (previously hardcoded in on_start)
         network_instrument_discovery_max_retries=config_manager.get('network', 'instrument_discovery', 'max_retries', default=60),
@@ -294,6 +303,17 @@ def get_strategy_config(config_manager: ConfigManager) -> DeepSeekAIStrategyConf
 
         # Network: Telegram message timeout
         network_telegram_message_timeout=config_manager.get('network', 'telegram', 'message_timeout', default=30.0),
+        network_data_fetch_deadline_sec=config_manager.get('network', 'data_fetch', 'deadline_sec', default=20.0),
+        network_data_fetch_max_workers=config_manager.get('network', 'data_fetch', 'max_workers', default=8),
+        network_data_prefetch_enabled=config_manager.get('network', 'data_fetch', 'prefetch_enabled', default=True),
+        network_data_prefetch_lead_sec=config_manager.get('network', 'data_fetch', 'prefetch_lead_sec', default=45.0),
+        network_http_pool_maxsize=config_manager.get('network', 'http', 'pool_maxsize', default=10),
+        network_http_max_retries=config_manager.get('network', 'http', 'max_retries', default=2),
+        network_http_backoff_factor=config_manager.get('network', 'http', 'backoff_factor', default=0.5),
+        data_cache_enabled=config_manager.get('network', 'data_cache', 'enabled', default=True),
+        data_cache_persist_path=config_manager.get('network', 'data_cache', 'persist_path', default=''),
+        data_cache_max_stale_factor=config_manager.get('network', 'data_cache', 'max_stale_factor', default=3.0),
+        data_cache_ttls=config_manager.get('network', 'data_cache', 'ttls', default={}),
 
         # v3.12: Risk Controller / Circuit Breakers configuration
         risk_config=config_manager.get('risk', default={}),
@@ -309,6 +329,12 @@ def get_strategy_config(config_manager: ConfigManager) -> DeepSeekAIStrategyConf
         order_book_weighted_decay=config_manager.get('order_book', 'processing', 'weighted_obi', 'base_decay', default=0.8),
         order_book_adaptive_decay=config_manager.get('order_book', 'processing', 'weighted_obi', 'adaptive', default=True),
         order_book_history_size=config_manager.get('order_book', 'processing', 'history', 'size', default=10),
+        order_book_stream_enabled=config_manager.get('order_book', 'stream', 'enabled', default=False),
+        order_book_stream_update_speed_ms=config_manager.get('order_book', 'stream', 'update_speed_ms', default=100),
+        order_book_stream_snapshot_limit=config_manager.get('order_book', 'stream', 'snapshot_limit', default=1000),
+        order_book_stream_sample_interval_sec=config_manager.get('order_book', 'stream', 'sample_interval_sec', default=5.0),
+        order_book_stream_history_seconds=config_manager.get('order_book', 'stream', 'history_seconds', default=600.0),
+        order_book_stream_stale_after_sec=config_manager.get('order_book', 'stream', 'stale_after_sec', default=10.0),
     )
 
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+指标历史序列性能基线测试
+
+对比 TechnicalIndicatorManager 的 SMA / 布林带宽度历史:
+- 旧实现: 每次调用对每个输出点重建窗口列表并重新求和 (O(count × period))
+- v6.0: update() 中滚动统计，调用时只做切片读取
+
+Usage:
+    python3 scripts/benchmark_indicators.py
+    python3 scripts/benchmark_indicators.py --iterations 2000 --bars 500
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+class _Bar:
+    """最小 K 线对象 (TechnicalIndicatorManager.update 只读取这些字段)"""
+
+    def __init__(self, i: int, close: float):
+        self.open = close
+        self.high = close * 1.002
+        self.low = close * 0.998
+        self.close = close
+        self.volume = 100.0 + i % 17
+        self.ts_event = self.ts_init = i * 900_000_000_000
+
+
+def build_manager(bars: int) -> TechnicalIndicatorManager:
+    """喂入随机游走 K 线"""
+    rnd = random.Random(42)
+    manager = TechnicalIndicatorManager()
+    price = 60000.0
+    for i in range(bars):
+        price = round(price * (1 + rnd.gauss(0, 0.004)), 1)
+        manager.update(_Bar(i, price))
+    return manager
+
+
+def legacy_bb_width_history(closes, bb_period, bb_std, count):
+    """v3.24 实现: 每个点重建窗口"""
+    bb_widths = []
+    for end_idx in range(len(closes) - count, len(closes)):
+        window = closes[end_idx - bb_period + 1:end_idx + 1]
+        middle = sum(window) / len(window)
+        variance = sum((x - middle) ** 2 for x in window) / len(window)
+        std_dev = variance ** 0.5
+        width = ((2 * bb_std * std_dev) / middle * 100) if middle > 0 else 0
+        bb_widths.append(round(width, 2))
+    return bb_widths
+
+
+def legacy_sma_history(closes, sma_periods, count):
+    """v3.24 实现: 每个 SMA 周期、每个点重新求和"""
+    result = {}
+    for period in sma_periods:
+        if len(closes) < period + count:
+            continue
+        result[f"sma_{period}"] = [
+            round(sum(closes[end_idx - period + 1:end_idx + 1]) / period, 2)
+            for end_idx in range(len(closes) - count, len(closes))
+        ]
+    return result
+
+
+def timed(fn, iterations: int) -> float:
+    """平均耗时 (微秒)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='指标历史序列性能基线测试')
+    parser.add_argument('--iterations', type=int, default=1000,
+                        help='每项测试调用次数 (默认 1000)')
+    parser.add_argument('--bars', type=int, default=300,
+                        help='喂入的 K 线数 (默认 300)')
+    parser.add_argument('--count', type=int, default=35,
+                        help='历史序列长度 (默认 35，同 get_historical_context)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  指标历史序列性能基线测试")
+    print("=" * 60)
+    print()
+
+    manager = build_manager(args.bars)
+    closes = manager.bars.closes().tolist()
+    count = args.count
+
+    rows = [
+        ("BB 宽度历史",
+         lambda: legacy_bb_width_history(closes, manager.bb_period, manager.bb_std, count),
+         lambda: manager._calculate_bb_width_history(count)),
+        ("SMA 历史",
+         lambda: legacy_sma_history(closes, manager.sma_periods, count),
+         lambda: manager._calculate_sma_history(count)),
+    ]
+
+    print(f"K 线: {len(closes)} 根 (max_bars={manager.max_bars}), count={count}, "
+          f"SMA={manager.sma_periods}, BB={manager.bb_period}")
+    print("-" * 60)
+    print(f"  {'项目':<14}{'旧实现 (μs)':>14}{'v6.0 (μs)':>14}{'加速':>10}")
+    for name, legacy_fn, new_fn in rows:
+        legacy_us = timed(legacy_fn, args.iterations)
+        new_us = timed(new_fn, args.iterations)
+        print(f"  {name:<14}{legacy_us:>14.2f}{new_us:>14.2f}{legacy_us / new_us:>9.1f}x")
+    print()
+
+    context_us = timed(lambda: manager.get_historical_context(count), args.iterations)
+    print(f"  get_historical_context({count}): {context_us:.2f} μs")
+
+    update_bars = [_Bar(args.bars + i, closes[-1]) for i in range(args.iterations)]
+    start = time.perf_counter()
+    for bar in update_bars:
+        manager.update(bar)
+    update_us = (time.perf_counter() - start) / len(update_bars) * 1_000_000
+    print(f"  update() (含滚动统计):          {update_us:.2f} μs/bar")
+    print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+多品种 MTF 吞吐量基准测试
+
+在单核上为 N 个品种各注册 3 层指标管理器 (1D/4H/15M，4H/1D 由 15M 本地聚合)，
+按时间顺序批量路由 15M K 线，统计:
+- 路由吞吐量 (bars/s)
+- 每品种 K 线缓冲区内存 (应随品种数线性增长)
+
+Usage:
+    python3 scripts/benchmark_mtf_instruments.py
+    python3 scripts/benchmark_mtf_instruments.py --instruments 1 10 50 --bars 960
+"""
+
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.multi_timeframe_manager import MultiTimeframeManager
+
+
+M15_NS = 15 * 60 * 1_000_000_000
+# 2024-01-01 00:00 UTC (周一)
+START_NS = 1_704_067_200 * 1_000_000_000
+
+
+def bar_types(symbol: str):
+    """某品种三层 BarType"""
+    return {
+        f"{layer}_bar_type": BarType.from_str(f"{symbol}-PERP.BINANCE-{spec}-LAST-EXTERNAL")
+        for layer, spec in (("trend", "1-DAY"), ("decision", "4-HOUR"), ("execution", "15-MINUTE"))
+    }
+
+
+def build_bars(symbols, count: int):
+    """生成随机游走 15M K 线，按时间交错排列 (同一时刻所有品种收盘)"""
+    rnd = random.Random(42)
+    exec_types = [bar_types(s)["execution_bar_type"] for s in symbols]
+    prices = [1000.0 + 100 * i for i in range(len(symbols))]
+    bars = []
+    for i in range(count):
+        ts = START_NS + i * M15_NS + M15_NS - 1_000_000
+        for j, bar_type in enumerate(exec_types):
+            prices[j] = prices[j] * (1 + rnd.gauss(0, 0.003))
+            close = prices[j]
+            bars.append(Bar(
+                bar_type=bar_type,
+                open=Price(close * 0.999, 2),
+                high=Price(close * 1.002, 2),
+                low=Price(close * 0.998, 2),
+                close=Price(close, 2),
+                volume=Quantity(10 + i % 7, 3),
+                ts_event=ts,
+                ts_init=ts,
+            ))
+    return bars
+
+
+def build_manager(symbols) -> MultiTimeframeManager:
+    """主品种 + 其余品种注册"""
+    mtf = MultiTimeframeManager(
+        config={"enabled": True, "local_aggregation": True},
+        **bar_types(symbols[0]),
+    )
+    for symbol in symbols[1:]:
+        mtf.register_instrument(f"{symbol}-PERP.BINANCE", **bar_types(symbol))
+    return mtf
+
+
+def run(n: int, count: int):
+    """单次测试: 返回 (bars/s, 每品种缓冲区字节, 每品种 tracemalloc 峰值字节)"""
+    symbols = ["BTCUSDT"] + [f"SYM{i}USDT" for i in range(n - 1)]
+    bars = build_bars(symbols, count)
+
+    # 吞吐量 (不开 tracemalloc，避免计时失真)
+    mtf = build_manager(symbols)
+    start = time.perf_counter()
+    mtf.route_bars(bars)
+    elapsed = time.perf_counter() - start
+    per_instrument = mtf.get_registry_stats()["nbytes"] / n
+
+    # 内存 (单独一轮)
+    tracemalloc.start()
+    mtf = build_manager(symbols)
+    mtf.route_bars(bars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(bars) / elapsed, per_instrument, peak / n
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='多品种 MTF 吞吐量基准测试')
+    parser.add_argument('--instruments', type=int, nargs='+', default=[1, 10, 50],
+                        help='品种数量 (默认 1 10 50)')
+    parser.add_argument('--bars', type=int, default=960,
+                        help='每品种 15M K 线数 (默认 960 = 10 天)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  多品种 MTF 吞吐量基准测试 (单核)")
+    print("=" * 60)
+    print()
+    print(f"每品种 {args.bars} 根 15M K 线 (4H/1D 本地聚合)")
+    print("-" * 60)
+    print(f"  {'品种数':>6}{'bars/s':>14}{'μs/bar':>10}{'缓冲区/品种':>14}{'峰值/品种':>12}")
+    for n in args.instruments:
+        rate, per_instrument, peak = run(n, args.bars)
+        print(f"  {n:>6}{rate:>14,.0f}{1_000_000 / rate:>10.1f}"
+              f"{per_instrument / 1024:>12.1f}KB{peak / 1024:>10.1f}KB")
+    print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
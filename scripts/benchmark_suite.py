@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+指标与 S/R 热路径性能基准套件 (带回归门禁)
+
+在录制的行情夹具 (tests/fixtures/benchmark_market_fixture.json) 上测量:
+- TechnicalIndicatorManager: update / get_technical_data / get_historical_context
+- SRZoneCalculator.calculate / calculate_volume_profile / detect_swing_points / SwingDetector
+- calculate_zone_history (S/R 历史批量模式，夹具上每根 15M K 线一次)
+- OrderBookProcessor.process / OrderFlowProcessor.process_klines
+- MultiAgentAnalyzer._format_*_report
+
+结果与基线 (scripts/benchmark_baselines.json) 对比，任一用例超过阈值即返回 1。
+基线记录了参考机器的校准耗时；在其它机器上运行时可加 --normalize，
+按校准比例换算后再比较。
+
+Usage:
+    python3 scripts/benchmark_suite.py                      # 对比基线
+    python3 scripts/benchmark_suite.py --filter sr.         # 只跑 S/R 用例
+    python3 scripts/benchmark_suite.py --threshold 0.5      # 允许 50% 波动
+    python3 scripts/benchmark_suite.py --normalize          # 按校准负载换算 (跨机器)
+    python3 scripts/benchmark_suite.py --update-baseline    # 重写基线
+    python3 scripts/benchmark_suite.py --record synthetic   # 重新生成夹具
+    python3 scripts/benchmark_suite.py --record live        # 从 Binance 录制夹具
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+FIXTURE_PATH = project_root / "tests" / "fixtures" / "benchmark_market_fixture.json"
+BASELINE_PATH = project_root / "scripts" / "benchmark_baselines.json"
+
+DEFAULT_THRESHOLD = 0.30   # 允许比基线慢 30%
+DEFAULT_REPEATS = 5
+DEFAULT_MIN_TIME = 0.05    # 每轮至少运行 50ms
+
+
+# =============================================================================
+# 夹具
+# =============================================================================
+
+def _kline_rows(rnd: random.Random, start_ms: int, interval_ms: int, count: int,
+                price: float, sigma: float, base_volume: float) -> List[List]:
+    """Binance 12 列 K 线 (字符串数值，与 API 返回格式一致)"""
+    rows = []
+    for i in range(count):
+        open_ = price
+        price = price * (1 + rnd.gauss(0, sigma))
+        high = max(open_, price) * (1 + abs(rnd.gauss(0, sigma / 2)))
+        low = min(open_, price) * (1 - abs(rnd.gauss(0, sigma / 2)))
+        volume = base_volume * (0.5 + rnd.random())
+        taker_buy = volume * rnd.uniform(0.35, 0.65)
+        trades = int(volume * rnd.uniform(8, 15))
+        open_time = start_ms + i * interval_ms
+        rows.append([
+            open_time, f"{open_:.1f}", f"{high:.1f}", f"{low:.1f}", f"{price:.1f}",
+            f"{volume:.3f}", open_time + interval_ms - 1, f"{volume * price:.2f}",
+            trades, f"{taker_buy:.3f}", f"{taker_buy * price:.2f}", "0",
+        ])
+    return rows
+
+
+def build_synthetic_fixture(seed: int = 20241016) -> Dict[str, Any]:
+    """确定性随机游走夹具 (15M 300 根 / 4H 120 根 / 1D 220 根 + 100 档订单簿)"""
+    rnd = random.Random(seed)
+    end_ms = 1_728_000_000_000  # 2024-10-04 00:00 UTC
+    klines_1d = _kline_rows(rnd, end_ms - 220 * 86_400_000, 86_400_000, 220, 42000.0, 0.025, 250_000.0)
+    price = float(klines_1d[-1][4])
+    klines_4h = _kline_rows(rnd, end_ms - 120 * 14_400_000, 14_400_000, 120, price * 0.97, 0.008, 40_000.0)
+    price = float(klines_4h[-1][4])
+    klines_15m = _kline_rows(rnd, end_ms - 300 * 900_000, 900_000, 300, price * 0.995, 0.002, 2_500.0)
+    price = float(klines_15m[-1][4])
+
+    bids, asks = [], []
+    for i in range(100):
+        bid_qty = rnd.uniform(0.05, 4.0) * (25 if i in (17, 58) else 1)
+        ask_qty = rnd.uniform(0.05, 4.0) * (30 if i in (23, 71) else 1)
+        bids.append([f"{price - 0.1 - i * 2.5:.1f}", f"{bid_qty:.3f}"])
+        asks.append([f"{price + 0.1 + i * 2.5:.1f}", f"{ask_qty:.3f}"])
+
+    return {
+        "description": f"BTCUSDT synthetic random walk (seed {seed}): 15m/4h/1d Binance klines, "
+                       "100-level depth, sentiment and derivatives samples",
+        "symbol": "BTCUSDT",
+        "klines_15m": klines_15m,
+        "klines_4h": klines_4h,
+        "klines_1d": klines_1d,
+        "order_book": {"lastUpdateId": 1, "bids": bids, "asks": asks},
+        "sentiment": {
+            "positive_ratio": 0.52, "negative_ratio": 0.48, "net_sentiment": 0.04,
+            "history": [{"long": 0.50 + i * 0.004, "short": 0.50 - i * 0.004, "ratio": 1.0 + i * 0.016}
+                        for i in range(6)],
+        },
+        "derivatives": {
+            "enabled": True,
+            "open_interest": {"value": 85000.0},
+            "open_interest_history": {"history": [{"c": 84000.0 + i * 150} for i in range(8)]},
+            "trends": {"oi_trend": "RISING", "long_short_trend": "STABLE"},
+            "funding_rate": {
+                "current_pct": 0.0100, "predicted_rate_pct": 0.0123, "premium_index": 0.00012,
+                "mark_price": price, "index_price": price - 4.2, "next_funding_countdown_min": 185,
+                "history": [{"rate_pct": 0.008 + i * 0.0005} for i in range(10)], "trend": "RISING",
+            },
+            "liquidations": {"history": [{"l": 3.1 + i * 0.2, "s": 2.4 - i * 0.1} for i in range(24)]},
+            "long_short_ratio_history": {"history": [{"r": 1.08, "l": 51.9, "s": 48.1}]},
+        },
+    }
+
+
+def record_live_fixture(symbol: str = "BTCUSDT") -> Dict[str, Any]:
+    """从 Binance Futures 录制 K 线和订单簿 (情绪 / 衍生品样本沿用合成数据)"""
+    import requests
+    from scripts.diagnostics.base import fetch_binance_klines
+
+    fixture = build_synthetic_fixture()
+    for key, interval, limit in (("klines_15m", "15m", 300), ("klines_4h", "4h", 120), ("klines_1d", "1d", 220)):
+        klines = fetch_binance_klines(symbol, interval, limit)
+        if len(klines) < limit:
+            raise RuntimeError(f"{symbol} {interval}: got {len(klines)}/{limit} klines")
+        fixture[key] = klines
+    response = requests.get(
+        "https://fapi.binance.com/fapi/v1/depth", params={"symbol": symbol, "limit": 100}, timeout=15,
+    )
+    response.raise_for_status()
+    fixture["order_book"] = response.json()
+    fixture["symbol"] = symbol
+    fixture["description"] = (
+        f"{symbol} Binance Futures klines and depth recorded "
+        f"{datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC; sentiment/derivatives samples synthetic"
+    )
+    return fixture
+
+
+def load_fixture(path: Path = FIXTURE_PATH) -> Dict[str, Any]:
+    """读取夹具 JSON"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _bar_dicts(klines: List[List]) -> List[Dict[str, float]]:
+    """Binance K 线 → bars_data 字典"""
+    return [
+        {'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+         'close': float(k[4]), 'volume': float(k[5])}
+        for k in klines
+    ]
+
+
+class _Bar:
+    """最小 K 线对象 (TechnicalIndicatorManager.update 只读取这些字段)"""
+
+    def __init__(self, kline: List):
+        self.open = float(kline[1])
+        self.high = float(kline[2])
+        self.low = float(kline[3])
+        self.close = float(kline[4])
+        self.volume = float(kline[5])
+        self.ts_event = self.ts_init = int(kline[6]) * 1_000_000
+
+
+# =============================================================================
+# 用例
+# =============================================================================
+
+def build_cases(fixture: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """
+    构建基准用例 (名称 → 无参函数)
+
+    准备工作 (指标预热、处理器输出) 在这里完成一次，计时只覆盖被测调用。
+    get_technical_data / get_historical_context 按 K 线缓存，因此测量其未缓存的计算函数。
+    """
+    from indicators.technical_manager import TechnicalIndicatorManager
+    from utils.sr_zone_calculator import SRZoneCalculator
+    from utils.sr_volume_profile import calculate_volume_profile
+    from utils.sr_swing_detector import SwingDetector, detect_swing_points
+    from utils.sr_zone_calculator import SRLevel
+    from utils.sr_zone_service import SRZoneService
+    from utils.sr_zone_history import calculate_zone_history
+    from utils.orderbook_processor import OrderBookProcessor
+    from utils.order_flow_processor import OrderFlowProcessor
+    from agents.multi_agent_analyzer import MultiAgentAnalyzer
+
+    klines_15m = fixture["klines_15m"]
+    bars_15m = _bar_dicts(klines_15m)
+    bars_4h = _bar_dicts(fixture["klines_4h"])
+    bars_1d = _bar_dicts(fixture["klines_1d"])
+    price = bars_15m[-1]['close']
+
+    # 指标: 用全部 15M K 线预热 (update 用例循环重放同一批 K 线)
+    manager = TechnicalIndicatorManager(sma_periods=[5, 20, 50], lookback_requirements={'sr_zones': 200})
+    replay = [_Bar(k) for k in klines_15m]
+    for bar in replay:
+        manager.update(bar)
+    replay_index = [0]
+
+    def indicator_update():
+        bar = replay[replay_index[0]]
+        replay_index[0] = (replay_index[0] + 1) % len(replay)
+        manager.update(bar)
+
+    technical_data = dict(manager.get_technical_data(price))
+    technical_data['price'] = price
+    technical_data['historical_context'] = manager.get_historical_context(35)
+
+    # 订单簿 / 订单流 (处理器输出同时作为报告格式化的输入)
+    orderbook_processor = OrderBookProcessor(logger=logging.getLogger("benchmark"))
+    orderbook_data = orderbook_processor.process(fixture["order_book"], price, volatility=0.02)
+    order_flow_processor = OrderFlowProcessor(logger=logging.getLogger("benchmark"))
+    order_flow_data = order_flow_processor.process_klines(klines_15m[-50:])
+
+    anomalies = orderbook_data.get('anomalies') or {}
+    sr_calculator = SRZoneCalculator()
+    sr_kwargs = dict(
+        current_price=price,
+        bb_data={'upper': technical_data['bb_upper'], 'lower': technical_data['bb_lower'],
+                 'middle': technical_data['bb_middle']},
+        sma_data={'sma_50': technical_data.get('sma_50'), 'sma_200': None},
+        orderbook_anomalies={'bid_anomalies': anomalies.get('bid_anomalies', []),
+                             'ask_anomalies': anomalies.get('ask_anomalies', [])},
+        bars_data=bars_15m[-200:],
+        bars_data_4h=bars_4h[-50:],
+        bars_data_1d=bars_1d[-120:],
+        daily_bar=bars_1d[-1],
+        weekly_bar=None,
+    )
+
+    # 流式 swing: 每次调用窗口前移一根 K 线 (到末尾后回绕，触发一次重建)
+    swing_detector = SwingDetector()
+    stream_end = [200]
+
+    def swing_stream():
+        end = stream_end[0]
+        stream_end[0] = end + 1 if end < len(bars_15m) else 200
+        return swing_detector.detect(
+            bars_15m[end - 200:end], price, timeframe="15m", base_weight=0.8, level=SRLevel.MINOR)
+
+    # S/R 结果缓存命中路径 (输入不变: 键计算 + 查表)
+    sr_service = SRZoneService()
+    sr_service.get(sr_calculator, **sr_kwargs)
+
+    # S/R 历史批量模式: 需要 timestamp 对齐 4H / 1D (每次调用新建计算器，含状态预热)
+    def _stamped(klines):
+        return [dict(bar, timestamp=int(k[0])) for bar, k in zip(_bar_dicts(klines), klines)]
+
+    history_bars = (_stamped(klines_15m), _stamped(fixture["klines_4h"]), _stamped(fixture["klines_1d"]))
+
+    analyzer = MultiAgentAnalyzer(
+        api_key="benchmark",
+        memory_file=str(Path(tempfile.gettempdir()) / "benchmark_trading_memory.json"),
+    )
+    analyzer.logger.setLevel(logging.WARNING)
+
+    return {
+        'indicator.update': indicator_update,
+        'indicator.get_technical_data': lambda: manager._compute_technical_data(price),
+        'indicator.get_historical_context': lambda: manager._compute_historical_context(35),
+        'sr.calculate': lambda: sr_calculator.calculate(**sr_kwargs),
+        'sr.service_hit': lambda: sr_service.get(sr_calculator, **sr_kwargs),
+        'sr.volume_profile': lambda: calculate_volume_profile(bars_15m[-96:], price),
+        'sr.swing_points_15m': lambda: detect_swing_points(
+            bars_15m[-200:], price, timeframe="15m", base_weight=0.8, level=SRLevel.MINOR),
+        'sr.swing_stream_15m': swing_stream,
+        'sr.zone_history': lambda: calculate_zone_history(SRZoneCalculator(), *history_bars),
+        'sr.swing_points_4h': lambda: detect_swing_points(
+            bars_4h[-50:], price, timeframe="4h", base_weight=1.5, level=SRLevel.INTERMEDIATE),
+        'orderbook.process': lambda: orderbook_processor.process(fixture["order_book"], price, volatility=0.02),
+        'orderflow.process_klines': lambda: order_flow_processor.process_klines(klines_15m[-50:]),
+        'report.technical': lambda: analyzer._format_technical_report(technical_data),
+        'report.sentiment': lambda: analyzer._format_sentiment_report(fixture["sentiment"]),
+        'report.order_flow': lambda: analyzer._format_order_flow_report(order_flow_data),
+        'report.derivatives': lambda: analyzer._format_derivatives_report(fixture["derivatives"], price),
+        'report.orderbook': lambda: analyzer._format_orderbook_report(orderbook_data),
+    }
+
+
+# =============================================================================
+# 计时 / 基线
+# =============================================================================
+
+def time_case(fn: Callable[[], Any], repeats: int = DEFAULT_REPEATS,
+              min_time: float = DEFAULT_MIN_TIME) -> float:
+    """
+    单次调用耗时 (微秒): 自动确定每轮次数使一轮 >= min_time，取各轮最小值
+    (最小值受调度和其它进程干扰最少，与 timeit 一致)
+    """
+    fn()  # 预热
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return min(samples) * 1_000_000
+
+
+def calibrate(repeats: int = DEFAULT_REPEATS) -> float:
+    """固定的纯 Python 负载耗时 (微秒)，用于不同机器间换算"""
+    def workload():
+        total = 0.0
+        values = {}
+        for i in range(2000):
+            total += (i * 1.0001) ** 0.5
+            values[i % 64] = total
+        return sorted(values.values())
+    return time_case(workload, repeats=repeats)
+
+
+def run_suite(fixture: Dict[str, Any], name_filter: Optional[str] = None,
+              repeats: int = DEFAULT_REPEATS, min_time: float = DEFAULT_MIN_TIME) -> Dict[str, float]:
+    """运行所有 (匹配 name_filter 的) 用例，返回 {用例: 微秒}"""
+    cases = build_cases(fixture)
+    return {
+        name: time_case(fn, repeats=repeats, min_time=min_time)
+        for name, fn in cases.items()
+        if not name_filter or name_filter in name
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """读取基线 (不存在返回 None)"""
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, float], calibration_us: float, path: Path = BASELINE_PATH,
+                  previous: Optional[Dict[str, Any]] = None):
+    """写入基线 (--filter 时保留未运行用例的旧值)"""
+    cases = dict((previous or {}).get('cases', {}))
+    cases.update({name: round(us, 3) for name, us in results.items()})
+    baseline = {
+        'recorded': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration_us': round(calibration_us, 3),
+        'cases': dict(sorted(cases.items())),
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def compare(results: Dict[str, float], baseline: Optional[Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD, calibration_us: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    与基线对比
+
+    Returns
+    -------
+    List[Dict]
+        [{"name", "us", "baseline_us", "ratio", "status"}]; status 为
+        OK / REGRESSION / IMPROVED / NEW (基线中没有该用例)
+    """
+    baseline_cases = (baseline or {}).get('cases', {})
+    scale = 1.0
+    if baseline and calibration_us and baseline.get('calibration_us'):
+        scale = baseline['calibration_us'] / calibration_us
+
+    rows = []
+    for name, us in results.items():
+        reference = baseline_cases.get(name)
+        if not reference:
+            rows.append({'name': name, 'us': us, 'baseline_us': None, 'ratio': None, 'status': 'NEW'})
+            continue
+        ratio = us * scale / reference
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+        elif ratio < 1 / (1 + threshold):
+            status = 'IMPROVED'
+        else:
+            status = 'OK'
+        rows.append({'name': name, 'us': us, 'baseline_us': reference, 'ratio': ratio, 'status': status})
+    return rows
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='指标与 S/R 热路径性能基准套件')
+    parser.add_argument('--fixture', type=Path, default=FIXTURE_PATH, help='行情夹具 JSON')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='基线 JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'回归阈值 (默认 {DEFAULT_THRESHOLD:.2f} = 慢 30%% 即失败)')
+    parser.add_argument('--filter', default=None, help='只运行名称包含该字符串的用例')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help='每个用例的计时轮数')
+    parser.add_argument('--normalize', action='store_true',
+                        help='按校准负载耗时换算后再与基线比较 (基线来自其它机器时使用)')
+    parser.add_argument('--update-baseline', action='store_true', help='用本次结果重写基线')
+    parser.add_argument('--record', choices=['synthetic', 'live'], default=None,
+                        help='重新生成夹具 (synthetic) 或从 Binance 录制 (live) 后退出')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.record:
+        fixture = build_synthetic_fixture() if args.record == 'synthetic' else record_live_fixture()
+        with open(args.fixture, 'w') as f:
+            json.dump(fixture, f, separators=(',', ':'))
+            f.write('\n')
+        print(f"✅ 夹具已写入: {args.fixture}")
+        return 0
+
+    fixture = load_fixture(args.fixture)
+
+    print("=" * 72)
+    print("  指标与 S/R 热路径性能基准")
+    print("=" * 72)
+    print(f"  夹具: {fixture.get('description', args.fixture)}")
+    calibration_us = calibrate(args.repeats)
+    print(f"  校准负载: {calibration_us:.1f} μs")
+    print("-" * 72)
+
+    results = run_suite(fixture, name_filter=args.filter, repeats=args.repeats)
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold, calibration_us if args.normalize else None)
+
+    icons = {'OK': '✅', 'IMPROVED': '🚀', 'REGRESSION': '❌', 'NEW': '🆕'}
+    print(f"  {'用例':<36}{'μs/call':>12}{'基线':>12}{'比例':>8}")
+    for row in rows:
+        baseline_str = f"{row['baseline_us']:.1f}" if row['baseline_us'] else '-'
+        ratio_str = f"{row['ratio']:.2f}x" if row['ratio'] else '-'
+        print(f"  {row['name']:<36}{row['us']:>12.1f}{baseline_str:>12}{ratio_str:>8}  {icons[row['status']]}")
+    print()
+
+    if args.update_baseline:
+        save_baseline(results, calibration_us, args.baseline, previous=baseline)
+        print(f"✅ 基线已更新: {args.baseline}")
+        return 0
+
+    regressions = [row for row in rows if row['status'] == 'REGRESSION']
+    if regressions:
+        print(f"❌ {len(regressions)} 个用例超过基线 {args.threshold:.0%}:")
+        for row in regressions:
+            print(f"   - {row['name']}: {row['us']:.1f} μs (基线 {row['baseline_us']:.1f} μs, {row['ratio']:.2f}x)")
+        return 1
+    if baseline is None:
+        print("⚠️  无基线，使用 --update-baseline 记录")
+    else:
+        print(f"✅ 无性能回归 (阈值 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
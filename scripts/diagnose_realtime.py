@@ -117,6 +117,10 @@ from scripts.diagnostics.math_verification import (
 
 def main():
     """Main entry point for the diagnostic tool."""
+    # v6.0: Diagnostics yield Binance request weight to the live strategy on the same IP
+    from utils.binance_rate_governor import get_rate_governor, PRIORITY_LOW
+    get_rate_governor().set_process_priority(PRIORITY_LOW)
+
     # Parse command-line arguments
     parser = argparse.ArgumentParser(
         description='实盘信号诊断工具 v5.8 (TradingAgents + ADX-aware 动态权重)',
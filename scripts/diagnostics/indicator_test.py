@@ -71,6 +71,9 @@ class IndicatorInitializer(DiagnosticStep):
             else:
                 self.ctx.add_warning("指标未完全初始化，可能数据不足")
 
+            # v6.0: 批量向量化计算与逐根 update() 一致性
+            self._check_batch_parity()
+
             return True
 
         except Exception as e:
@@ -79,6 +82,29 @@ class IndicatorInitializer(DiagnosticStep):
             traceback.print_exc()
             return False
 
+    def _check_batch_parity(self) -> None:
+        """Compare compute_series() (batch) with the streaming indicator values."""
+        try:
+            from indicators.batch_indicators import ohlcv_from_klines
+
+            manager = self.ctx.indicator_manager
+            series = manager.compute_series(ohlcv_from_klines(self.ctx.klines_raw))
+            streaming = manager.get_technical_data(float(self.ctx.klines_raw[-1][4]))
+            mismatches = []
+            for key in ('rsi', 'macd', 'macd_signal', 'bb_upper', 'bb_lower', 'adx'):
+                batch_value = float(series[key][-1])
+                if batch_value != batch_value:  # NaN: not initialized
+                    continue
+                tolerance = 0.1 if key == 'adx' else 1e-6 * max(1.0, abs(streaming[key]))
+                if abs(batch_value - streaming[key]) > tolerance:
+                    mismatches.append(f"{key}: batch={batch_value:.4f} streaming={streaming[key]:.4f}")
+            if mismatches:
+                self.ctx.add_warning(f"批量指标与逐根计算不一致: {'; '.join(mismatches)}")
+            elif not self.ctx.summary_mode:
+                print("  ✅ 批量指标计算与逐根计算一致")
+        except Exception as e:
+            self.ctx.add_warning(f"批量指标一致性检查失败: {e}")
+
 
 class TechnicalDataFetcher(DiagnosticStep):
     """
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+S/R Zone 离线评估 / 参数网格 (v6.0)
+
+用 calculate_zone_history 在整段历史 K 线上逐根 15M 计算 zone，
+再用 zone_hit_rates 统计 K 根内 zone 被测试 / 守住 / 突破的比例，
+对 cluster_pct / atr_cluster_multiplier / touch_threshold_atr 做网格比较。
+
+K 线来源: 与 benchmark_suite 相同格式的 JSON (klines_15m / klines_4h / klines_1d，
+Binance 原始数组)。默认使用 tests/fixtures/benchmark_market_fixture.json；
+更长的历史可用 `benchmark_suite.py --record live` 录制或自行导出。
+
+Usage:
+    python3 scripts/evaluate_sr_zones.py
+    python3 scripts/evaluate_sr_zones.py --klines data/btc_90d.json --horizon 32
+    python3 scripts/evaluate_sr_zones.py --cluster-pct 0.3,0.5 --atr-multiplier 0.3,0.5,0.8 \\
+        --touch-threshold 0.2,0.3 --step 4
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import itertools
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.sr_zone_calculator import SRZoneCalculator
+from utils.sr_zone_history import calculate_zone_history, zone_hit_rates
+
+DEFAULT_KLINES_PATH = project_root / "tests" / "fixtures" / "benchmark_market_fixture.json"
+
+
+def _bars(klines: List[List]) -> List[Dict[str, float]]:
+    """Binance K 线 → 带 timestamp 的 bars_data 字典"""
+    return [
+        {'timestamp': int(k[0]), 'open': float(k[1]), 'high': float(k[2]),
+         'low': float(k[3]), 'close': float(k[4]), 'volume': float(k[5])}
+        for k in klines
+    ]
+
+
+def _floats(value: str) -> List[float]:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='S/R Zone 历史命中率评估与参数网格')
+    parser.add_argument('--klines', type=Path, default=DEFAULT_KLINES_PATH, help='K 线 JSON')
+    parser.add_argument('--horizon', type=int, default=16, help='向后观察的 15M K 线数 (默认 16 = 4 小时)')
+    parser.add_argument('--step', type=int, default=1, help='每隔 N 根 15M 评估一次')
+    parser.add_argument('--cluster-pct', type=_floats, default=[0.5], help='逗号分隔')
+    parser.add_argument('--atr-multiplier', type=_floats, default=[0.5], help='逗号分隔')
+    parser.add_argument('--touch-threshold', type=_floats, default=[0.3], help='逗号分隔')
+    parser.add_argument('--json', type=Path, default=None, help='将全部结果写入 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    with open(args.klines) as f:
+        data = json.load(f)
+    bars_15m = _bars(data['klines_15m'])
+    bars_4h = _bars(data.get('klines_4h', [])) or None
+    bars_1d = _bars(data.get('klines_1d', [])) or None
+
+    print("=" * 96)
+    print("  S/R Zone 历史评估")
+    print("=" * 96)
+    print(f"  K 线: {args.klines} (15M={len(bars_15m)}, 4H={len(bars_4h or [])}, 1D={len(bars_1d or [])})")
+    print(f"  观察窗口: {args.horizon} 根 15M, 步长 {args.step}")
+    print("-" * 96)
+    print(f"  {'cluster':>8}{'atr_mult':>10}{'touch':>8}{'evals':>8}"
+          f"{'S held':>9}{'R held':>9}{'nearS held':>12}{'nearR held':>12}{'HIGH held':>11}{'秒':>8}")
+
+    results = []
+    for cluster_pct, atr_mult, touch in itertools.product(
+            args.cluster_pct, args.atr_multiplier, args.touch_threshold):
+        calculator = SRZoneCalculator(
+            cluster_pct=cluster_pct,
+            atr_cluster_multiplier=atr_mult,
+            touch_threshold_atr=touch,
+        )
+        started = time.perf_counter()
+        history = calculate_zone_history(calculator, bars_15m, bars_4h, bars_1d, step=args.step)
+        stats = zone_hit_rates(history, bars_15m, horizon_bars=args.horizon)
+        elapsed = time.perf_counter() - started
+
+        groups = stats['groups']
+        print(f"  {cluster_pct:>8.2f}{atr_mult:>10.2f}{touch:>8.2f}{stats['evaluations']:>8}"
+              f"{groups['support']['hold_rate']:>9.1%}{groups['resistance']['hold_rate']:>9.1%}"
+              f"{groups['nearest_support']['hold_rate']:>12.1%}{groups['nearest_resistance']['hold_rate']:>12.1%}"
+              f"{groups['HIGH']['hold_rate']:>11.1%}{elapsed:>8.1f}")
+        results.append({
+            'cluster_pct': cluster_pct,
+            'atr_cluster_multiplier': atr_mult,
+            'touch_threshold_atr': touch,
+            'elapsed_sec': round(elapsed, 2),
+            **stats,
+        })
+
+    print("-" * 96)
+    print("  held = 被测试的 zone 中未被收盘突破的比例")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ 结果已写入: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ Reference: TradingAgents (UCLA/MIT) - https://github.com/TauricResearch/TradingA
 import os
 import asyncio
 import threading
+import time
 from typing import Dict, Any, Optional, Tuple
 
 from nautilus_trader.config import StrategyConfig
@@ -23,6 +24,7 @@ from nautilus_trader.model.data import Bar, BarType
 from nautilus_trader.model.enums import OrderSide, TimeInForce, PositionSide, PriceType, TriggerType, OrderType
 from nautilus_trader.model.identifiers import InstrumentId
 from nautilus_trader.model.instruments import Instrument
+from nautilus_trader.model.objects import Price
 from nautilus_trader.model.position import Position
 from datetime import datetime, timedelta, timezone
 
@@ -39,8 +41,18 @@ from utils.binance_kline_client import BinanceKlineClient
 from utils.order_flow_processor import OrderFlowProcessor
 from utils.coinalyze_client import CoinalyzeClient
 from utils.binance_orderbook_client import BinanceOrderBookClient
+from utils.local_orderbook import OrderBookStream
 from utils.orderbook_processor import OrderBookProcessor
 from utils.binance_derivatives_client import BinanceDerivativesClient
+from utils.parallel_fetcher import ParallelDataFetcher
+from utils.prefetch_scheduler import PrefetchScheduler
+from utils.sr_precompute_worker import SRPrecomputeWorker
+from utils.kline_store import KlineStore, INTERVAL_MS
+from utils.http_transport import get_http_transport
+from utils.binance_rate_governor import get_rate_governor
+from utils.data_cache import DataCache, get_data_cache
+from utils.sr_zone_service import candidate_walls_signature, report_inputs, zone_summary
+from utils.indicator_snapshot import IndicatorSnapshotStore
 from strategy.trading_logic import (
     calculate_position_size,
     validate_multiagent_sltp,
@@ -86,6 +98,10 @@ class DeepSeekAIStrategyConfig(StrategyConfig, frozen=True):
     bb_std: float = 2.0
     volume_ma_period: int = 20  # Volume MA period for analysis
     support_resistance_lookback: int = 20  # Support/resistance lookback period
+    sr_lookback_bars: int = 200  # v6.0: S/R 摆动点 + 成交量分布读取的 15M K 线数
+    indicator_snapshot_enabled: bool = True  # v6.0: 指标状态快照 (热重启)
+    indicator_snapshot_path: str = "data/indicator_snapshot.bin"  # v6.0: 快照文件
+    indicator_snapshot_interval_sec: float = 900.0  # v6.0: 定期写快照间隔 (秒)
 
     # v3.0: S/R Zone Calculator config (from configs/base.yaml sr_zones section)
     sr_zones_config: Dict = None  # type: ignore  # Passed as dict to MultiAgentAnalyzer
@@ -182,18 +198,34 @@ class DeepSeekAIStrategyConfig(StrategyConfig, frozen=True):
     network_telegram_polling_base_delay: float = 10.0
     network_binance_recv_window: int = 5000
     network_binance_balance_cache_ttl: float = 5.0
+    network_binance_freshness: Dict[str, float] = {}  # v6.0: 端点 → 缓存新鲜度 (秒)，覆盖默认值
     network_bar_persistence_max_limit: int = 1500
     network_bar_persistence_timeout: float = 10.0
     network_instrument_discovery_max_retries: int = 60  # Instrument 加载最大重试次数
     network_instrument_discovery_retry_interval: float = 1.0  # Instrument 加载重试间隔 (秒)
     network_binance_api_timeout: float = 10.0  # Binance API 超时 (秒)
     network_telegram_message_timeout: float = 30.0  # Telegram 消息发送超时 (秒)
+    network_data_fetch_deadline_sec: float = 20.0  # v6.0: on_timer 并行数据获取总时限 (秒)
+    network_data_fetch_max_workers: int = 8  # v6.0: 并行数据获取线程数
+    network_data_prefetch_enabled: bool = True  # v6.0: 边界前预热与 K 线无关的数据源
+    network_data_prefetch_lead_sec: float = 45.0  # v6.0: 预热提前量 (秒)
+    network_http_pool_maxsize: int = 10  # v6.0: 每个 host 的 keep-alive 连接数
+    network_http_max_retries: int = 2  # v6.0: 连接错误/5xx 重试次数
+    network_http_backoff_factor: float = 0.5  # v6.0: 重试退避因子 (秒)
+    network_binance_weight_limit: int = 2400  # v6.0: Binance IP 每分钟请求权重上限
+    network_binance_weight_low_reserve: float = 0.4  # v6.0: 低优先级请求需保留的余量比例
+    data_cache_enabled: bool = True  # v6.0: 外部数据 TTL 缓存
+    data_cache_persist_path: str = ""  # v6.0: 缓存持久化文件 (空 = 仅内存)
+    data_cache_max_stale_factor: float = 3.0  # v6.0: 展示路径 (心跳) 过期数据最长可用 ttl 倍数，决策路径过期即刷新
+    data_cache_ttls: Dict[str, float] = {}  # v6.0: 数据类型 → TTL (秒)，覆盖默认值
     sentiment_timeout: float = 10.0
 
     # Multi-Timeframe Configuration (v3.3)
     multi_timeframe_enabled: bool = False  # Default disabled for backward compatibility
     mtf_trend_sma_period: int = 200        # SMA period for trend layer (1D)
     mtf_decision_debate_rounds: int = 2    # Debate rounds for decision layer (4H)
+    mtf_local_aggregation: bool = True     # v6.0: 4H/1D 由 15M K 线本地聚合 (不再单独订阅)
+    mtf_extra_timeframes: Tuple[str, ...] = ()  # v6.0: 额外本地聚合周期 (如 ("1h",))
 
     # v3.12: Risk Circuit Breakers configuration (passed as dict from ConfigManager)
     risk_config: Dict = None  # type: ignore  # risk.circuit_breakers section from base.yaml
@@ -209,6 +241,12 @@ class DeepSeekAIStrategyConfig(StrategyConfig, frozen=True):
     order_book_weighted_decay: float = 0.8  # 加权 OBI 衰减因子
     order_book_adaptive_decay: bool = True  # 启用自适应衰减 (基于波动率)
     order_book_history_size: int = 10  # 历史缓存大小 (用于计算变化率)
+    order_book_stream_enabled: bool = False  # v6.0: WebSocket 本地订单簿
+    order_book_stream_update_speed_ms: int = 100  # v6.0: diff-depth 推送频率 (ms)
+    order_book_stream_snapshot_limit: int = 1000  # v6.0: 同步用 REST 快照档位数
+    order_book_stream_sample_interval_sec: float = 5.0  # v6.0: OBI 采样间隔 (秒)
+    order_book_stream_history_seconds: float = 600.0  # v6.0: 采样历史保留时长 (秒)
+    order_book_stream_stale_after_sec: float = 10.0  # v6.0: 超时未更新视为过期 (秒)
 
 
 class DeepSeekAIStrategy(Strategy):
@@ -232,6 +270,8 @@ class DeepSeekAIStrategy(Strategy):
 
         # Configuration
         self.instrument_id = InstrumentId.from_str(config.instrument_id)
+        # v6.0: Binance 交易对 ("BTCUSDT-PERP.BINANCE" → "BTCUSDT")，取代硬编码的 "BTCUSDT"
+        self.binance_symbol = self.instrument_id.symbol.value.split('-')[0]
         self.bar_type = BarType.from_str(config.bar_type)
 
         # Position sizing config
@@ -312,10 +352,36 @@ class DeepSeekAIStrategy(Strategy):
         # Rust indicators (RSI, MACD) that are not Send/Sync and will cause panic
         self._cached_current_price: float = 0.0
 
+        # v6.0: Binance request-weight governor (shared by every REST client via HttpTransport)
+        self.rate_governor = get_rate_governor(
+            weight_limit=getattr(config, 'network_binance_weight_limit', 2400),
+            low_reserve=getattr(config, 'network_binance_weight_low_reserve', 0.4),
+            logger=self.log,
+        )
+
+        # v6.0: Shared keep-alive HTTP transport (one pooled session per host).
+        # Must be created before any data client so they all pick up this config.
+        self.http_transport = get_http_transport(
+            pool_maxsize=getattr(config, 'network_http_pool_maxsize', 10),
+            max_retries=getattr(config, 'network_http_max_retries', 2),
+            backoff_factor=getattr(config, 'network_http_backoff_factor', 0.5),
+            logger=self.log,
+        )
+        # v6.0: TTL cache for slow-changing external data (funding history, Coinalyze, top-trader ratios).
+        # Also created before the data clients, which share the process-wide instance.
+        self.data_cache = get_data_cache(
+            ttls=getattr(config, 'data_cache_ttls', None) or None,
+            max_stale_factor=getattr(config, 'data_cache_max_stale_factor', 3.0),
+            persist_path=getattr(config, 'data_cache_persist_path', '') or None,
+            enabled=getattr(config, 'data_cache_enabled', True),
+            logger=self.log,
+        )
+
         # Real-time Binance account fetcher for accurate balance info
         self.binance_account = BinanceAccountFetcher(
             logger=self.log,
             cache_ttl=config.network_binance_balance_cache_ttl,
+            freshness=getattr(config, 'network_binance_freshness', None) or None,
             recv_window=config.network_binance_recv_window,
             api_timeout=config.network_binance_api_timeout,
         )
@@ -395,7 +461,13 @@ class DeepSeekAIStrategy(Strategy):
             bb_std=config.bb_std,
             volume_ma_period=config.volume_ma_period,
             support_resistance_lookback=config.support_resistance_lookback,
+            # v6.0: get_kline_data() 消费方声明所需深度，决定原始 K 线环形缓冲大小
+            lookback_requirements={
+                'sr_zones': getattr(config, 'sr_lookback_bars', 200),
+                'volume_profile': ((config.sr_zones_config or {}).get('volume_profile') or {}).get('lookback_bars', 96),
+            },
         )
+        self._sr_lookback_bars = getattr(config, 'sr_lookback_bars', 200)
 
         # Multi-Timeframe Manager (v3.2.8)
         self.mtf_enabled = getattr(config, 'multi_timeframe_enabled', False)
@@ -431,7 +503,9 @@ class DeepSeekAIStrategy(Strategy):
                     },
                     'execution_layer': {
                         'timeframe': '15m',
-                    }
+                    },
+                    'local_aggregation': getattr(config, 'mtf_local_aggregation', True),
+                    'extra_timeframes': list(getattr(config, 'mtf_extra_timeframes', None) or []),
                 }
 
                 self.mtf_manager = MultiTimeframeManager(
@@ -441,11 +515,25 @@ class DeepSeekAIStrategy(Strategy):
                     execution_bar_type=self.execution_bar_type,
                     logger=self.log,
                 )
+                # v6.0: on_timer 读取 4H 50 根 / 1D 120 根 K 线用于 S/R
+                self.mtf_manager.decision_manager.declare_lookback('sr_zones_4h', 50)
+                self.mtf_manager.trend_manager.declare_lookback('sr_zones_1d', 120)
+                # v6.0: 本地聚合 K 线不完整时从 REST 回补
+                self.mtf_manager.set_backfill(self._backfill_mtf_bar)
                 self.log.info(f"✅ MTF Manager initialized: trend={self.trend_bar_type}, decision={self.decision_bar_type}, exec={self.execution_bar_type}")
             except Exception as e:
                 self.log.error(f"❌ Failed to initialize MTF Manager: {e}")
                 self.mtf_enabled = False
 
+        # v6.0: Warm-restart snapshot of indicator state (restored in on_start, saved periodically/on stop)
+        self.indicator_snapshot = None
+        if getattr(config, 'indicator_snapshot_enabled', True) and getattr(config, 'indicator_snapshot_path', ''):
+            self.indicator_snapshot = IndicatorSnapshotStore(
+                path=config.indicator_snapshot_path,
+                logger=self.log,
+            )
+        self._restored_bar_ts: Dict[str, int] = {}
+
         # DeepSeek API key
         api_key = config.deepseek_api_key or os.getenv('DEEPSEEK_API_KEY')
         if not api_key:
@@ -463,6 +551,17 @@ class DeepSeekAIStrategy(Strategy):
         )
         self.log.info(f"✅ Multi-Agent analyzer initialized (debate_rounds={config.debate_rounds})")
 
+        # v6.0: K 线收盘后后台预计算 S/R 快照 (与 analyze() 共用 SRZoneService / 计算器)
+        precompute_cfg = (config.sr_zones_config or {}).get('precompute') or {}
+        self.sr_precompute_worker: Optional[SRPrecomputeWorker] = None
+        if precompute_cfg.get('enabled', True):
+            self.sr_precompute_worker = SRPrecomputeWorker(
+                service=self.multi_agent.sr_zone_service,
+                calculator=self.multi_agent.sr_calculator,
+                logger=self.log,
+            )
+        self._sr_precompute_wait_sec = float(precompute_cfg.get('wait_sec', 2.0))
+
         # Telegram Bot
         self.telegram_bot = None
         self.enable_telegram = config.enable_telegram
@@ -666,6 +765,19 @@ class DeepSeekAIStrategy(Strategy):
                     logger=self.log,
                 )
 
+                # v6.0: WebSocket 本地订单簿 (on_start 启动，未同步时回退 REST)
+                self.orderbook_stream = None
+                if getattr(config, 'order_book_stream_enabled', False):
+                    self.orderbook_stream = OrderBookStream(
+                        symbol=self.binance_symbol,
+                        update_speed_ms=getattr(config, 'order_book_stream_update_speed_ms', 100),
+                        snapshot_limit=getattr(config, 'order_book_stream_snapshot_limit', 1000),
+                        sample_interval_sec=getattr(config, 'order_book_stream_sample_interval_sec', 5.0),
+                        history_seconds=getattr(config, 'order_book_stream_history_seconds', 600.0),
+                        stale_after_sec=getattr(config, 'order_book_stream_stale_after_sec', 10.0),
+                        logger=self.log,
+                    )
+
                 # 订单簿处理器 (计算 OBI、滑点、异常等)
                 self.orderbook_processor = OrderBookProcessor(
                     price_band_pct=config.order_book_price_band_pct if hasattr(config, 'order_book_price_band_pct') else 0.5,
@@ -680,11 +792,13 @@ class DeepSeekAIStrategy(Strategy):
                     },
                     history_size=config.order_book_history_size if hasattr(config, 'order_book_history_size') else 10,
                     logger=self.log,
+                    local_book=self.orderbook_stream,
                 )
                 self.log.info("✅ Order Book clients initialized")
             else:
                 self.binance_orderbook_client = None
                 self.orderbook_processor = None
+                self.orderbook_stream = None
                 self.log.info("Order Book disabled by config")
 
             # ========== Binance Derivatives (v3.21: Top Traders, Taker Ratio) ==========
@@ -701,10 +815,34 @@ class DeepSeekAIStrategy(Strategy):
             self.coinalyze_client = None
             self.binance_orderbook_client = None
             self.orderbook_processor = None
+            self.orderbook_stream = None
             self.binance_derivatives_client = None
             self.order_book_enabled = False
             self.log.info("Order Flow disabled by config")
 
+        # ========== v6.0: 增量 K 线存储 (启动预取 / 订单流 / S/R 共用) ==========
+        self.kline_store = KlineStore(
+            client=self.binance_kline_client or BinanceKlineClient(logger=self.log),
+            logger=self.log,
+        )
+
+        # ========== v6.0: 并行数据获取 (on_timer 外部数据扇出) ==========
+        self.data_fetcher = ParallelDataFetcher(
+            max_workers=getattr(config, 'network_data_fetch_max_workers', 8),
+            deadline_sec=getattr(config, 'network_data_fetch_deadline_sec', 20.0),
+            logger=self.log,
+        )
+        self.latest_fetch_stage: Optional[Dict[str, Any]] = None  # 最近一轮获取摘要 (心跳/诊断)
+        # v6.0: 边界前预热慢数据源 (衍生品/情绪/资金费率/Coinalyze)，边界时只取 K 线和订单簿
+        self.prefetch_scheduler: Optional[PrefetchScheduler] = None
+        if getattr(config, 'network_data_prefetch_enabled', True):
+            self.prefetch_scheduler = PrefetchScheduler(
+                fetcher=self.data_fetcher,
+                lead_time_sec=getattr(config, 'network_data_prefetch_lead_sec', 45.0),
+                logger=self.log,
+            )
+        self._cycle_bar_close_ts: Optional[float] = None  # 当前周期对应的 K 线收盘时间 (epoch 秒)
+
         # State tracking
         self.instrument: Optional[Instrument] = None
         self.last_signal: Optional[Dict[str, Any]] = None
@@ -797,8 +935,12 @@ class DeepSeekAIStrategy(Strategy):
 
         self.log.info(f"Loaded instrument: {self.instrument.id}")
 
+        # v6.0: Restore indicator snapshot; the prefetches below then only fill the gap since it was taken
+        self._restore_indicator_snapshot()
+
         # Pre-fetch historical bars before subscribing to live data
-        self._prefetch_historical_bars(limit=200)
+        # v6.0: deep enough for the largest declared lookback requirement
+        self._prefetch_historical_bars(limit=max(200, self.indicator_manager.history_bars.capacity))
 
         # Subscribe to bars (live data)
         self.subscribe_bars(self.bar_type)
@@ -817,10 +959,15 @@ class DeepSeekAIStrategy(Strategy):
         if self.mtf_enabled and self.mtf_manager:
             try:
                 # Subscribe to all three timeframes
-                self.subscribe_bars(self.trend_bar_type)
-                self.subscribe_bars(self.decision_bar_type)
-                self.subscribe_bars(self.execution_bar_type)
-                self.log.info(f"MTF: Subscribed to 1D, 4H, 15M bars")
+                # v6.0: 本地聚合时只订阅 15M，4H / 1D 由 MultiTimeframeManager 聚合生成
+                if self.mtf_manager.local_aggregation:
+                    self.subscribe_bars(self.execution_bar_type)
+                    self.log.info(f"MTF: Subscribed to 15M bars (4H/1D aggregated locally)")
+                else:
+                    self.subscribe_bars(self.trend_bar_type)
+                    self.subscribe_bars(self.decision_bar_type)
+                    self.subscribe_bars(self.execution_bar_type)
+                    self.log.info(f"MTF: Subscribed to 1D, 4H, 15M bars")
 
                 # Prefetch historical data for each layer (async)
                 self._prefetch_multi_timeframe_bars()
@@ -828,6 +975,16 @@ class DeepSeekAIStrategy(Strategy):
                 self.log.error(f"MTF: Failed to subscribe/prefetch: {e}")
                 # Continue without MTF - graceful degradation
 
+        # v6.0: Report the bar depth each consumer actually gets after prefetch/restore
+        self._log_lookback_depth()
+
+        # v6.0: Start WebSocket local order book (syncs in background before first on_timer)
+        if getattr(self, 'orderbook_stream', None):
+            try:
+                self.orderbook_stream.start()
+            except Exception as e:
+                self.log.warning(f"⚠️ Order book stream failed to start, using REST snapshots: {e}")
+
         # Set up timer for periodic analysis (clock-aligned to 00/15/30/45 minutes)
         interval_minutes = self.config.timer_interval_sec // 60  # 默认 15 分钟
         next_aligned_time = self._calculate_next_aligned_time(interval_minutes)
@@ -840,6 +997,32 @@ class DeepSeekAIStrategy(Strategy):
             callback=self.on_timer,
         )
 
+        # v6.0: Prefetch timer fires lead_time_sec before each aligned boundary
+        lead_sec = self.prefetch_scheduler.lead_time_sec if self.prefetch_scheduler else 0
+        if 0 < lead_sec < self.config.timer_interval_sec:
+            prefetch_start = next_aligned_time - timedelta(seconds=lead_sec)
+            if prefetch_start <= datetime.now(timezone.utc):
+                prefetch_start += timedelta(seconds=self.config.timer_interval_sec)
+            self.clock.set_timer(
+                name="prefetch_timer",
+                interval=timedelta(seconds=self.config.timer_interval_sec),
+                start_time=prefetch_start,
+                callback=self._on_prefetch_timer,
+            )
+            self.log.info(
+                f"Prefetch timer: {lead_sec:.0f}s before boundary, "
+                f"first at {prefetch_start.strftime('%H:%M:%S')} UTC"
+            )
+
+        # v6.0: Periodic indicator snapshot (a crash loses at most one interval)
+        snapshot_interval = getattr(self.config, 'indicator_snapshot_interval_sec', 0)
+        if self.indicator_snapshot and snapshot_interval > 0:
+            self.clock.set_timer(
+                name="indicator_snapshot_timer",
+                interval=timedelta(seconds=snapshot_interval),
+                callback=self._on_indicator_snapshot_timer,
+            )
+
         self.log.info("Strategy started successfully")
 
         # Fetch real account balance from Binance
@@ -1031,8 +1214,117 @@ class DeepSeekAIStrategy(Strategy):
         except Exception:
             pass  # Ignore if not subscribed
 
+        # v6.0: Final indicator snapshot for the next warm restart
+        if getattr(self, 'indicator_snapshot', None):
+            self._save_indicator_snapshot()
+
+        # v6.0: Release data fetch worker threads
+        if getattr(self, 'data_fetcher', None):
+            self.data_fetcher.shutdown()
+        if getattr(self, 'orderbook_stream', None):
+            self.orderbook_stream.stop()
+        if getattr(self, 'data_cache', None):
+            self.data_cache.close()
+        if getattr(self, 'http_transport', None):
+            self.http_transport.close()
+
         self.log.info("Strategy stopped")
 
+    def _bar_independent_fetch_tasks(self) -> Dict[str, Any]:
+        """
+        v6.0: 与 K 线收盘无关的慢数据源 (可在边界前预热)
+
+        情绪、Coinalyze、资金费率 (含历史)、Binance 衍生品的更新周期
+        均为分钟到小时级，提前几十秒获取不影响数据含义。
+        """
+        tasks = {}
+        if self.sentiment_enabled and self.sentiment_fetcher:
+            tasks['sentiment'] = self.sentiment_fetcher.fetch
+        if self.coinalyze_client and self.coinalyze_client.is_enabled():
+            tasks['coinalyze'] = self.coinalyze_client.fetch_all
+        if self.binance_kline_client:
+            tasks['funding_rate'] = self.binance_kline_client.get_funding_rate
+            tasks['funding_rate_history'] = lambda: self.binance_kline_client.get_funding_rate_history(limit=10)
+        if self.binance_derivatives_client:
+            tasks['binance_derivatives'] = self.binance_derivatives_client.fetch_all
+        return tasks
+
+    def _bar_dependent_fetch_tasks(self) -> Dict[str, Any]:
+        """v6.0: 依赖最新 K 线的数据源 (必须在边界之后获取)"""
+        tasks = {}
+        if self.binance_kline_client and self.order_flow_processor:
+            # v6.0: 增量同步，只下载上次之后的新 K 线 (返回已收盘 K 线视图)
+            tasks['klines'] = lambda: self.kline_store.get_klines(self.binance_symbol, "15m", 50)
+        if self.binance_orderbook_client and self.orderbook_processor:
+            tasks['orderbook'] = self._get_raw_order_book
+        return tasks
+
+    def _on_prefetch_timer(self, event):
+        """
+        v6.0: 边界前预热 (在事件循环线程中调用，只启动后台线程，立即返回)
+        """
+        if not self.prefetch_scheduler:
+            return
+        interval_minutes = self.config.timer_interval_sec // 60
+        target = self._calculate_next_aligned_time(interval_minutes)
+        tasks = self._bar_independent_fetch_tasks()
+        if self.prefetch_scheduler.start(target.timestamp(), tasks):
+            self.log.debug(f"Prefetch started for {target.strftime('%H:%M')} UTC: {', '.join(tasks)}")
+
+    def _fetch_external_data(self):
+        """
+        v6.0: 并行获取 on_timer 所需的外部数据
+
+        只做网络 I/O，不调用有状态处理器 (OrderFlowProcessor / OrderBookProcessor)，
+        处理仍在 on_timer 线程中按原顺序执行。
+
+        预热结果可用时，边界时只获取依赖 K 线的数据源和预热失败的数据源。
+
+        Returns
+        -------
+        FetchStageResult
+            数据源名称 → FetchOutcome，未启用的数据源不出现在结果中
+        """
+        prewarmed = None
+        if self.prefetch_scheduler and self._cycle_bar_close_ts is not None:
+            prewarmed = self.prefetch_scheduler.collect(
+                self._cycle_bar_close_ts,
+                wait_sec=min(5.0, self.data_fetcher.deadline_sec),
+            )
+
+        independent = self._bar_independent_fetch_tasks()
+        tasks = self._bar_dependent_fetch_tasks()
+        if prewarmed is None:
+            tasks.update(independent)
+        else:
+            # 预热失败 / 超时的数据源在边界时重试
+            tasks.update({
+                name: fn for name, fn in independent.items()
+                if name not in prewarmed.outcomes or not prewarmed.outcomes[name].ok
+            })
+            self.log.info(f"📦 Using prefetched data: {', '.join(n for n, o in prewarmed.outcomes.items() if o.ok)}")
+
+        result = self.data_fetcher.run(tasks)
+        if prewarmed is not None:
+            result = prewarmed.merge(result)
+            # 保持原数据源顺序 (日志 / 心跳)
+            order = list(independent) + [n for n in result.outcomes if n not in independent]
+            result.outcomes = {n: result.outcomes[n] for n in order if n in result.outcomes}
+        return result
+
+    def _get_raw_order_book(self) -> Optional[Dict[str, Any]]:
+        """
+        v6.0: 订单簿深度 — 优先读取 WebSocket 本地订单簿 (零网络开销)，
+        未同步或过期时回退到 REST 快照
+        """
+        stream = getattr(self, 'orderbook_stream', None)
+        if stream is not None:
+            book = stream.get_order_book(limit=100)
+            if book is not None:
+                return book
+            self.log.debug(f"Local order book not ready ({stream.get_status()}), using REST snapshot")
+        return self.binance_orderbook_client.get_order_book(symbol=self.binance_symbol, limit=100)
+
     def _calculate_next_aligned_time(self, interval_minutes: int = 15) -> datetime:
         """
         Calculate the next clock-aligned time point.
@@ -1154,6 +1446,98 @@ class DeepSeekAIStrategy(Strategy):
             # Keep existing config value on error
             self.leverage = self.config.leverage
 
+    @staticmethod
+    def _binance_interval(bar_type) -> str:
+        """Map a BarType to the Binance kline interval."""
+        # NOTE: Must check longer strings first (15-MINUTE before 5-MINUTE)
+        bar_type_str = str(bar_type)
+        if '15-MINUTE' in bar_type_str:
+            return '15m'
+        elif '5-MINUTE' in bar_type_str:
+            return '5m'
+        elif '1-MINUTE' in bar_type_str:
+            return '1m'
+        elif '4-HOUR' in bar_type_str:
+            return '4h'
+        elif '1-HOUR' in bar_type_str:
+            return '1h'
+        elif '1-DAY' in bar_type_str:
+            return '1d'
+        return '15m'  # Default fallback
+
+    @staticmethod
+    def _gap_bars(after_ns: int, interval: str, limit: int) -> int:
+        """v6.0: Number of closed bars opened after after_ns (capped at limit)."""
+        interval_ns = INTERVAL_MS.get(interval, INTERVAL_MS['15m']) * 1_000_000
+        return max(1, min(limit, (time.time_ns() - after_ns) // interval_ns + 1))
+
+    def _snapshot_layers(self) -> Dict[str, Tuple[Any, str, int]]:
+        """v6.0: layer → (indicator manager, Binance interval, full prefetch limit)"""
+        main_limit = max(200, self.indicator_manager.history_bars.capacity)
+        layers = {'main': (self.indicator_manager, self._binance_interval(self.bar_type), main_limit)}
+        if self.mtf_enabled and self.mtf_manager:
+            managers = self.mtf_manager.layer_managers()
+            for layer, interval, limit in (('trend', '1d', 220), ('decision', '4h', 60), ('execution', '15m', 40)):
+                if layer in managers:
+                    layers[layer] = (managers[layer], interval, limit)
+        return layers
+
+    def _log_lookback_depth(self):
+        """v6.0: Log required vs available bar depth per consumer for every layer."""
+        for layer, (mgr, _, _) in self._snapshot_layers().items():
+            try:
+                report = mgr.get_lookback_report()
+            except Exception as e:
+                self.log.debug(f"Lookback report failed for {layer}: {e}")
+                continue
+            parts = [
+                f"{consumer}={r['available']}/{r['required']}{'' if r['ok'] else ' ⚠️'}"
+                for consumer, r in report.items()
+            ]
+            short = [consumer for consumer, r in report.items() if not r['ok']]
+            message = f"📏 Lookback depth [{layer}]: {', '.join(parts)}"
+            if short:
+                self.log.warning(f"{message} — insufficient: {', '.join(short)}")
+            else:
+                self.log.info(message)
+
+    def _restore_indicator_snapshot(self):
+        """
+        v6.0: Restore indicator state saved by the previous process.
+
+        Layers whose last bar is older than their full prefetch window are skipped
+        (a gap fill would download as much as a cold start).
+        """
+        self._restored_bar_ts = {}
+        if not self.indicator_snapshot:
+            return
+        start = time.monotonic()
+        layers = self._snapshot_layers()
+        self._restored_bar_ts = self.indicator_snapshot.restore(
+            {layer: mgr for layer, (mgr, _, _) in layers.items()},
+            max_gap_ns={
+                layer: (limit - 1) * INTERVAL_MS.get(interval, INTERVAL_MS['15m']) * 1_000_000
+                for layer, (_, interval, limit) in layers.items()
+            },
+        )
+        if self._restored_bar_ts:
+            self.log.info(
+                f"♻️ Indicator snapshot restored in {(time.monotonic() - start) * 1000:.0f}ms: "
+                f"{', '.join(f'{layer}={len(layers[layer][0].recent_bars)} bars' for layer in self._restored_bar_ts)}"
+            )
+
+    def _save_indicator_snapshot(self):
+        """v6.0: Write all indicator layers to the snapshot file."""
+        size = self.indicator_snapshot.save(
+            {layer: mgr for layer, (mgr, _, _) in self._snapshot_layers().items()}
+        )
+        if size:
+            self.log.debug(f"Indicator snapshot saved ({size / 1024:.1f} KB)")
+
+    def _on_indicator_snapshot_timer(self, event):
+        """v6.0: Periodic indicator snapshot (runs on the event loop thread, same as on_bar)."""
+        self._save_indicator_snapshot()
+
     def _prefetch_historical_bars(self, limit: int = 200):
         """
         Pre-fetch historical bars from Binance API on startup.
@@ -1167,7 +1551,6 @@ class DeepSeekAIStrategy(Strategy):
             Number of historical bars to fetch (default: 200)
         """
         try:
-            import requests
             from nautilus_trader.core.datetime import millis_to_nanos
 
             # Extract symbol from instrument_id
@@ -1175,40 +1558,26 @@ class DeepSeekAIStrategy(Strategy):
             symbol_str = str(self.instrument_id)
             symbol = symbol_str.split('-')[0]
 
-            # Convert bar type to Binance interval
-            # NOTE: Must check longer strings first (15-MINUTE before 5-MINUTE)
-            bar_type_str = str(self.bar_type)
-            if '15-MINUTE' in bar_type_str:
-                interval = '15m'
-            elif '5-MINUTE' in bar_type_str:
-                interval = '5m'
-            elif '1-MINUTE' in bar_type_str:
-                interval = '1m'
-            elif '4-HOUR' in bar_type_str:
-                interval = '4h'
-            elif '1-HOUR' in bar_type_str:
-                interval = '1h'
-            elif '1-DAY' in bar_type_str:
-                interval = '1d'
-            else:
-                interval = '15m'  # Default fallback
+            interval = self._binance_interval(self.bar_type)
 
-            self.log.info(
-                f"📡 Pre-fetching {limit} historical bars from Binance "
-                f"(symbol={symbol}, interval={interval})..."
-            )
-
-            # Binance Futures API endpoint
-            url = "https://fapi.binance.com/fapi/v1/klines"
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': min(limit, 1500),  # Binance max
-            }
+            # v6.0: After a snapshot restore only the bars since the snapshot are needed
+            after_ns = self._restored_bar_ts.get('main')
+            if after_ns is not None:
+                limit = self._gap_bars(after_ns, interval, limit)
+                self.log.info(
+                    f"📡 Snapshot restored, fetching {limit} gap bars from Binance "
+                    f"(symbol={symbol}, interval={interval})..."
+                )
+            else:
+                self.log.info(
+                    f"📡 Pre-fetching {limit} historical bars from Binance "
+                    f"(symbol={symbol}, interval={interval})..."
+                )
 
-            response = requests.get(url, params=params, timeout=self.config.network_bar_persistence_timeout)
-            response.raise_for_status()
-            klines = response.json()
+            # v6.0: Read through the incremental kline store (closed bars only;
+            # the still-forming candle is kept separate and arrives later as a live bar)
+            self.kline_store.sync(symbol, interval, min_bars=min(limit, 1500))
+            klines = self.kline_store.closed(symbol, interval, limit)
 
             if not klines:
                 self.log.warning("⚠️ No bars received from Binance API")
@@ -1219,6 +1588,8 @@ class DeepSeekAIStrategy(Strategy):
             # Convert to NautilusTrader bars and feed to indicators
             bars_fed = 0
             for kline in klines:
+                if after_ns is not None and millis_to_nanos(kline[0]) <= after_ns:
+                    continue  # already in the restored snapshot
                 try:
                     # Create Bar object
                     bar = Bar(
@@ -1266,10 +1637,12 @@ class DeepSeekAIStrategy(Strategy):
             if layer == "trend":
                 # 趋势层 (1D) 只更新指标，RISK 状态在 on_timer 中评估
                 self.log.debug(f"MTF: trend (1D) bar routed")
+                self._submit_sr_precompute("1d")
                 return
             elif layer == "decision":
                 # 决策层 (4H) 数据由 AI 在 on_timer 中使用，这里只记录
                 self.log.debug(f"[MTF] 4H bar 收盘，数据已更新 (AI 将在 on_timer 中使用)")
+                self._submit_sr_precompute("4h")
                 return
             elif layer == "execution":
                 # Update cached price for execution layer
@@ -1288,6 +1661,9 @@ class DeepSeekAIStrategy(Strategy):
         with self._state_lock:
             self._cached_current_price = float(bar.close)
 
+        # v6.0: 收盘后立即后台预计算 S/R 快照
+        self._submit_sr_precompute("15m")
+
         # Log bar data
         if self.bars_received % 10 == 0:
             self.log.info(
@@ -1295,6 +1671,140 @@ class DeepSeekAIStrategy(Strategy):
                 f"O:{bar.open} H:{bar.high} L:{bar.low} C:{bar.close} V:{bar.volume}"
             )
 
+    # =========================================================================
+    # v6.0: S/R 输入 K 线 + 后台预计算
+    # =========================================================================
+
+    def _layer_sr_bars(self) -> Dict[str, Any]:
+        """
+        S/R 输入 K 线的指标管理器版本 (K 线存储不可用时的回退)
+
+        只能在事件循环线程调用 (读取 indicator_manager / MTF 各层管理器)。
+        """
+        layer_bars = {
+            'bars_data': self.indicator_manager.get_kline_data(count=self._sr_lookback_bars),
+            'bars_data_4h': None,
+            'bars_data_1d': None,
+            'weekly_bar': None,
+        }
+        if self.mtf_enabled and self.mtf_manager:
+            try:
+                # 4H bars from decision layer
+                decision_mgr = getattr(self.mtf_manager, 'decision_manager', None)
+                if decision_mgr and hasattr(decision_mgr, 'recent_bars') and decision_mgr.recent_bars:
+                    layer_bars['bars_data_4h'] = decision_mgr.get_kline_data(count=50)
+                # 1D bars from trend layer
+                trend_mgr = getattr(self.mtf_manager, 'trend_manager', None)
+                if trend_mgr and hasattr(trend_mgr, 'recent_bars') and trend_mgr.recent_bars:
+                    layer_bars['bars_data_1d'] = trend_mgr.get_kline_data(count=120)
+            except Exception as e:
+                self.log.debug(f"[MTF] Failed to extract MTF bars for S/R: {e}")
+            # v6.0: 按自然周 (周一 00:00 UTC) 聚合的上一根周线
+            layer_bars['weekly_bar'] = self.mtf_manager.get_weekly_bar()
+        return layer_bars
+
+    def _collect_sr_bars(self, layer_bars: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        S/R 计算的 K 线输入: 优先增量 K 线存储，回退到 layer_bars
+
+        不访问指标管理器，可在后台线程调用。
+
+        Parameters
+        ----------
+        layer_bars : Dict
+            _layer_sr_bars() 的结果
+
+        Returns
+        -------
+        Dict
+            bars_data / bars_data_4h / bars_data_1d / daily_bar / weekly_bar
+        """
+        # v6.0: 完整 200 根已收盘 15M K 线，不受 indicator_manager max_bars 限制
+        bars_data = None
+        try:
+            if self.kline_store.sync(self.binance_symbol, "15m", min_bars=self._sr_lookback_bars):
+                bars_data = self.kline_store.get_ohlcv(self.binance_symbol, "15m", self._sr_lookback_bars)
+        except Exception as e:
+            self.log.debug(f"Kline store read failed, using indicator bars: {e}")
+        sr_bars = {
+            'bars_data': bars_data or layer_bars['bars_data'],
+            'bars_data_4h': None,
+            'bars_data_1d': None,
+            'daily_bar': None,
+            'weekly_bar': None,
+        }
+        if not (self.mtf_enabled and self.mtf_manager):
+            return sr_bars
+
+        try:
+            # v6.0: 4H / 1D 已收盘 K 线优先读取增量 K 线存储
+            # (本地聚合时各层 K 线已是最新，无需 REST)
+            if not self.mtf_manager.local_aggregation:
+                if self.kline_store.sync(self.binance_symbol, "4h", min_bars=50):
+                    sr_bars['bars_data_4h'] = self.kline_store.get_ohlcv(self.binance_symbol, "4h", 50) or None
+                if self.kline_store.sync(self.binance_symbol, "1d", min_bars=120):
+                    sr_bars['bars_data_1d'] = self.kline_store.get_ohlcv(self.binance_symbol, "1d", 120) or None
+        except Exception as e:
+            self.log.debug(f"[MTF] Kline store read failed, using layer bars: {e}")
+        if sr_bars['bars_data_4h'] is None:
+            sr_bars['bars_data_4h'] = layer_bars['bars_data_4h']
+        if sr_bars['bars_data_1d'] is None:
+            sr_bars['bars_data_1d'] = layer_bars['bars_data_1d']
+
+        # Extract daily bar (last completed) and weekly bar (last 5 days)
+        bars_1d = sr_bars['bars_data_1d']
+        if bars_1d:
+            from utils.sr_pivot_calculator import aggregate_weekly_bar
+            sr_bars['daily_bar'] = bars_1d[-1]
+            sr_bars['weekly_bar'] = aggregate_weekly_bar(bars_1d)
+        # v6.0: 优先使用按自然周聚合的上一根周线
+        if layer_bars['weekly_bar']:
+            sr_bars['weekly_bar'] = layer_bars['weekly_bar']
+        return sr_bars
+
+    def _submit_sr_precompute(self, trigger: str) -> None:
+        """
+        v6.0: 在后台预计算 S/R 快照 (K 线收盘 / 周期开始时，事件循环线程调用)
+
+        依赖指标管理器的输入 (回退 K 线、BB/SMA) 在此处取好，
+        K 线存储同步和 S/R 计算在后台线程执行。订单墙沿用上一周期的订单簿，
+        本周期候选墙变化时 analyze() 会重新计算 (不再等待预计算，见 on_timer)。
+        """
+        if not self.sr_precompute_worker or not self.indicator_manager.is_initialized():
+            return
+        if self.mtf_enabled and self.mtf_manager and not self.mtf_manager.is_all_layers_initialized():
+            return
+        if not self.indicator_manager.recent_bars:
+            return
+        current_price = float(self.indicator_manager.recent_bars[-1].close)
+        try:
+            layer_bars = self._layer_sr_bars()
+            # 与 on_timer 相同价格 → 指标结果按 K 线缓存，周期内不重复计算
+            technical_data = self.indicator_manager.get_technical_data(current_price)
+        except Exception as e:
+            self.log.debug(f"S/R precompute skipped ({trigger}): {e}")
+            return
+        report = report_inputs(technical_data, self.latest_orderbook_data)
+        walls_key = candidate_walls_signature(
+            report['orderbook_anomalies'], self.sr_precompute_worker.calculator, current_price,
+        )
+        cached_atr = self._cached_atr_value
+
+        def _inputs() -> Dict[str, Any]:
+            inputs = self._collect_sr_bars(layer_bars)
+            # 与 on_timer 相同的 ATR 更新规则 (计算失败时沿用缓存值)
+            atr_value = cached_atr
+            bars_data = inputs['bars_data']
+            if bars_data and len(bars_data) >= 14:
+                from utils.sr_zone_calculator import SRZoneCalculator
+                atr_val = SRZoneCalculator._calculate_atr_from_bars(bars_data)
+                if atr_val and atr_val > 0:
+                    atr_value = atr_val
+            inputs.update(report, current_price=current_price, atr_value=atr_value)
+            return inputs
+
+        self.sr_precompute_worker.submit(trigger, _inputs, walls_key=walls_key)
+
     def on_historical_data(self, data):
         """
         Handle historical data from request_bars() (v3.2.8).
@@ -1401,44 +1911,40 @@ class DeepSeekAIStrategy(Strategy):
         self.log.info("MTF: 开始预取历史数据 (直接 Binance API)...")
 
         try:
-            import requests
-            from nautilus_trader.core.datetime import millis_to_nanos
-
             # Extract symbol from instrument_id (BTCUSDT-PERP.BINANCE -> BTCUSDT)
             symbol_str = str(self.instrument_id)
             symbol = symbol_str.split('-')[0]
 
-            # Binance Futures API endpoint
-            url = "https://fapi.binance.com/fapi/v1/klines"
-            timeout = self.config.network_bar_persistence_timeout
-
             # === Trend Layer (1D) - SMA_200 needs 220 bars ===
             self.log.info(f"MTF: 预取趋势层 (1D, 220 bars)...")
             trend_bars = self._fetch_binance_klines(
-                url, symbol, '1d', 220, timeout,
-                self.trend_bar_type, self.mtf_manager.trend_manager
+                symbol, '1d', 220,
+                self.trend_bar_type, self.mtf_manager.trend_manager,
+                after_ns=self._restored_bar_ts.get('trend'),
             )
-            if trend_bars > 0:
+            if trend_bars > 0 or 'trend' in self._restored_bar_ts:
                 self._mtf_trend_initialized = True
                 self.log.info(f"✅ MTF 趋势层预取完成: {trend_bars} bars")
 
             # === Decision Layer (4H) - SMA_50, MACD need 60 bars ===
             self.log.info(f"MTF: 预取决策层 (4H, 60 bars)...")
             decision_bars = self._fetch_binance_klines(
-                url, symbol, '4h', 60, timeout,
-                self.decision_bar_type, self.mtf_manager.decision_manager
+                symbol, '4h', 60,
+                self.decision_bar_type, self.mtf_manager.decision_manager,
+                after_ns=self._restored_bar_ts.get('decision'),
             )
-            if decision_bars > 0:
+            if decision_bars > 0 or 'decision' in self._restored_bar_ts:
                 self._mtf_decision_initialized = True
                 self.log.info(f"✅ MTF 决策层预取完成: {decision_bars} bars")
 
             # === Execution Layer (15M) - RSI, EMA need 40 bars ===
             self.log.info(f"MTF: 预取执行层 (15M, 40 bars)...")
             execution_bars = self._fetch_binance_klines(
-                url, symbol, '15m', 40, timeout,
-                self.execution_bar_type, self.mtf_manager.execution_manager
+                symbol, '15m', 40,
+                self.execution_bar_type, self.mtf_manager.execution_manager,
+                after_ns=self._restored_bar_ts.get('execution'),
             )
-            if execution_bars > 0:
+            if execution_bars > 0 or 'execution' in self._restored_bar_ts:
                 self._mtf_execution_initialized = True
                 self.log.info(f"✅ MTF 执行层预取完成: {execution_bars} bars")
 
@@ -1448,29 +1954,67 @@ class DeepSeekAIStrategy(Strategy):
                 f"趋势={trend_bars}, 决策={decision_bars}, 执行={execution_bars}"
             )
 
+            # v6.0: 周线由日线聚合；本地聚合器用当日已收盘 15M K 线预热
+            self.mtf_manager.rebuild_weekly()
+            if self.mtf_manager.local_aggregation:
+                self._seed_mtf_aggregation(symbol)
+
         except Exception as e:
             self.log.error(f"❌ MTF 预取历史数据失败: {e}")
             self.log.warning("MTF 将使用实时数据初始化 (需要等待更长时间)")
 
-    def _fetch_binance_klines(self, url, symbol, interval, limit, timeout, bar_type, indicator_manager):
+    def _seed_mtf_aggregation(self, symbol: str):
+        """
+        v6.0: Feed the closed 15M bars of the current UTC day to the MTF aggregator,
+        so the forming 4H / 1D bars are complete when they close.
+        """
+        try:
+            bars_per_day = INTERVAL_MS['1d'] // INTERVAL_MS['15m']
+            self.kline_store.sync(symbol, '15m', min_bars=bars_per_day)
+            klines = self.kline_store.closed(symbol, '15m', bars_per_day)
+            day_start_ms = (int(time.time() * 1000) // INTERVAL_MS['1d']) * INTERVAL_MS['1d']
+            klines = [k for k in klines if int(k[0]) >= day_start_ms]
+            self.mtf_manager.seed_aggregator(
+                klines, self.instrument.price_precision, self.instrument.size_precision,
+            )
+            self.log.info(f"MTF: 本地聚合器预热 {len(klines)} 根 15M K 线")
+        except Exception as e:
+            self.log.warning(f"⚠️ MTF 聚合器预热失败 (4H/1D 首根 K 线将从 REST 回补): {e}")
+
+    def _backfill_mtf_bar(self, timeframe: str, open_ns: int) -> Optional[Tuple[float, float, float, float, float]]:
+        """
+        v6.0: Read one closed 4H / 1D (or extra timeframe) kline from REST.
+
+        Called by MultiTimeframeManager only when a locally aggregated bar is
+        incomplete or missing (gap in the 15M stream). After a long gap this
+        runs once per missing period, oldest first; the store syncs the whole
+        gap on the first call and later calls are local reads.
+        """
+        symbol = self.binance_symbol
+        depth = self._gap_bars(open_ns, timeframe, 1000) + 2
+        self.kline_store.sync(symbol, timeframe, min_bars=depth)
+        open_ms = open_ns // 1_000_000
+        for kline in reversed(self.kline_store.closed(symbol, timeframe, depth)):
+            if int(kline[0]) == open_ms:
+                return float(kline[1]), float(kline[2]), float(kline[3]), float(kline[4]), float(kline[5])
+        return None
+
+    def _fetch_binance_klines(self, symbol, interval, limit, bar_type, indicator_manager, after_ns=None):
         """
         Fetch klines from Binance API and feed to indicator manager.
 
+        v6.0: Reads closed bars from the incremental kline store.
+        v6.0: after_ns (restored snapshot) → only bars opened after it are fetched and fed.
+
         Returns number of bars successfully fed.
         """
-        import requests
         from nautilus_trader.core.datetime import millis_to_nanos
 
         try:
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': min(limit, 1500),  # Binance max
-            }
-
-            response = requests.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-            klines = response.json()
+            if after_ns is not None:
+                limit = self._gap_bars(after_ns, interval, limit)
+            self.kline_store.sync(symbol, interval, min_bars=min(limit, 1500))
+            klines = self.kline_store.closed(symbol, interval, limit)
 
             if not klines:
                 self.log.warning(f"⚠️ Binance API 返回空数据 (interval={interval})")
@@ -1478,6 +2022,8 @@ class DeepSeekAIStrategy(Strategy):
 
             bars_fed = 0
             for kline in klines:
+                if after_ns is not None and millis_to_nanos(kline[0]) <= after_ns:
+                    continue  # 已在快照中
                 try:
                     bar = Bar(
                         bar_type=bar_type,
@@ -1520,6 +2066,10 @@ class DeepSeekAIStrategy(Strategy):
             # v2.1: Increment timer counter for heartbeat tracking
             self._timer_count = getattr(self, '_timer_count', 0) + 1
 
+            # v6.0: 本周期对应的 K 线收盘时间 (对齐边界)，用于预热匹配和收盘→决策延迟
+            interval_sec = self.config.timer_interval_sec
+            self._cycle_bar_close_ts = (time.time() // interval_sec) * interval_sec
+
             # v2.1: 发送心跳 - 移到 on_timer 开始位置，确保每次都发送
             # 即使后续分析失败，用户也能知道服务器在运行
             self._send_heartbeat_notification()
@@ -1585,15 +2135,44 @@ class DeepSeekAIStrategy(Strategy):
             kline_data = self.indicator_manager.get_kline_data(count=10)
             self.log.debug(f"Retrieved {len(kline_data)} K-lines for analysis")
 
+            # v6.0: S/R 快照与外部数据扇出并行计算 (on_bar 已提交相同输入时为缓存命中)
+            self._submit_sr_precompute("timer")
+
+            # ========== v6.0: 并行获取外部数据 ==========
+            # 各数据源互不依赖，扇出到线程池，总耗时 ≈ 最慢数据源 (受 deadline 约束)
+            # 缺失数据源在 fetch_stage 中显式标记为 EMPTY/ERROR/TIMEOUT
+            fetch_stage = self._fetch_external_data()
+            self.latest_fetch_stage = fetch_stage.to_dict()
+            # v6.0: 连接复用统计 (累计)
+            http_stats = self.http_transport.get_stats()
+            self.latest_fetch_stage['http'] = http_stats
+            # v6.0: TTL 缓存命中统计 (不含逐键明细，避免 heartbeat 过大)
+            cache_stats = self.data_cache.get_stats()
+            cache_stats.pop('entries', None)
+            self.latest_fetch_stage['data_cache'] = cache_stats
+            # v6.0: 指标结果按 K 线缓存的命中统计
+            self.latest_fetch_stage['indicator_memo'] = self.indicator_manager.get_memo_stats()
+            if self.prefetch_scheduler:
+                self.latest_fetch_stage['prefetch'] = self.prefetch_scheduler.get_stats()
+            # v6.0: Binance 请求权重余量
+            weight = self.rate_governor.get_headroom()
+            self.latest_fetch_stage['binance_weight'] = weight
+            self.log.debug(
+                f"Binance weight headroom: {weight['headroom_pct']:.0f}% "
+                f"(server used 1m: {weight['server_used_weight_1m']}, deferred: {weight['deferred']})"
+            )
+            self.log.debug(
+                f"HTTP pool: {http_stats['requests']} requests, "
+                f"{http_stats['new_connections']} new / {http_stats['reused_connections']} reused connections"
+            )
+
             # Get sentiment data (with default neutral values as fallback)
-            sentiment_data = None
-            if self.sentiment_enabled and self.sentiment_fetcher:
+            sentiment_data = fetch_stage.get('sentiment')
+            if sentiment_data:
                 try:
-                    sentiment_data = self.sentiment_fetcher.fetch()
-                    if sentiment_data:
-                        self.log.info(self.sentiment_fetcher.format_for_display(sentiment_data))
+                    self.log.info(self.sentiment_fetcher.format_for_display(sentiment_data))
                 except Exception as e:
-                    self.log.warning(f"Failed to fetch sentiment data: {e}")
+                    self.log.warning(f"Failed to format sentiment data: {e}")
 
             # Provide default neutral sentiment if unavailable (prevents None being passed to AI)
             if sentiment_data is None:
@@ -1749,12 +2328,8 @@ class DeepSeekAIStrategy(Strategy):
                 order_flow_data = None
                 if self.binance_kline_client and self.order_flow_processor:
                     try:
-                        # 获取 Binance 完整 K线 (12 列，包含订单流字段)
-                        raw_klines = self.binance_kline_client.get_klines(
-                            symbol="BTCUSDT",
-                            interval="15m",
-                            limit=50,
-                        )
+                        # Binance 完整 K线 (12 列，包含订单流字段)，v6.0: 并行阶段已获取
+                        raw_klines = fetch_stage.get('klines')
                         if raw_klines:
                             order_flow_data = self.order_flow_processor.process_klines(raw_klines)
                             self.latest_order_flow_data = order_flow_data  # v3.6: Store for heartbeat
@@ -1769,18 +2344,20 @@ class DeepSeekAIStrategy(Strategy):
 
                 # ========== 获取衍生品数据 (MTF v2.1) ==========
                 derivatives_data = None
-                if self.coinalyze_client and self.coinalyze_client.is_enabled():
+                if 'coinalyze' in fetch_stage.outcomes:
                     try:
-                        derivatives_data = self.coinalyze_client.fetch_all()
-                        self.latest_derivatives_data = derivatives_data  # v3.6: Store for heartbeat
-                        if derivatives_data.get('enabled'):
+                        # v6.0: 缺失时为 None (已在 fetch_stage 中标记)，不覆盖上一轮心跳数据
+                        derivatives_data = fetch_stage.get('coinalyze')
+                        if derivatives_data is not None:
+                            self.latest_derivatives_data = derivatives_data  # v3.6: Store for heartbeat
+                        if derivatives_data and derivatives_data.get('enabled'):
                             oi = derivatives_data.get('open_interest')
                             funding = derivatives_data.get('funding_rate')
                             self.log.info(
                                 f"📊 Derivatives: OI={oi.get('value', 0):.2f} BTC, "
                                 f"Funding={funding.get('value', 0)*100:.5f}%" if oi and funding else "Derivatives: partial data"
                             )
-                        else:
+                        elif derivatives_data is not None:
                             self.log.debug("Coinalyze client disabled, no derivatives data")
                     except Exception as e:
                         self.log.warning(f"⚠️ Derivatives fetch failed: {e}")
@@ -1790,7 +2367,7 @@ class DeepSeekAIStrategy(Strategy):
                 # Binance FR 需要单独获取并注入，否则 AI 看到 "Funding Rate: N/A"
                 if self.binance_kline_client:
                     try:
-                        binance_fr = self.binance_kline_client.get_funding_rate()
+                        binance_fr = fetch_stage.get('funding_rate')
                         if binance_fr:
                             if derivatives_data is None:
                                 derivatives_data = {'enabled': True}
@@ -1807,7 +2384,7 @@ class DeepSeekAIStrategy(Strategy):
                             }
                             # Also fetch history for trend analysis
                             try:
-                                fr_history = self.binance_kline_client.get_funding_rate_history(limit=10)
+                                fr_history = fetch_stage.get('funding_rate_history')
                                 if fr_history and len(fr_history) >= 2:
                                     history_list = []
                                     for h in fr_history:
@@ -1817,6 +2394,8 @@ class DeepSeekAIStrategy(Strategy):
                                             'time': h.get('fundingTime'),
                                         })
                                     fr_dict['history'] = history_list
+                                    # v6.0: 缓存数据年龄 (AI 报告显示)
+                                    fr_dict['history_age_sec'] = self.binance_kline_client.get_funding_rate_history_age(limit=10)
                                     # Calculate trend
                                     rates = [entry['rate_pct'] for entry in history_list]
                                     if rates[-1] > rates[0] * 1.1:
@@ -1839,11 +2418,8 @@ class DeepSeekAIStrategy(Strategy):
                 orderbook_data = None
                 if self.binance_orderbook_client and self.orderbook_processor:
                     try:
-                        # 获取订单簿数据
-                        raw_orderbook = self.binance_orderbook_client.get_order_book(
-                            symbol="BTCUSDT",
-                            limit=100,
-                        )
+                        # 订单簿数据 (v6.0: 并行阶段已获取)
+                        raw_orderbook = fetch_stage.get('orderbook')
                         if raw_orderbook:
                             # 处理订单簿数据 (计算 OBI、滑点、异常等)
                             orderbook_data = self.orderbook_processor.process(
@@ -1874,7 +2450,7 @@ class DeepSeekAIStrategy(Strategy):
                 binance_derivatives_data = None
                 if self.binance_derivatives_client:
                     try:
-                        binance_derivatives_data = self.binance_derivatives_client.fetch_all()
+                        binance_derivatives_data = fetch_stage.get('binance_derivatives')
                         if binance_derivatives_data:
                             top_pos = binance_derivatives_data.get('top_long_short_position', {})
                             latest = top_pos.get('latest')
@@ -1888,7 +2464,10 @@ class DeepSeekAIStrategy(Strategy):
 
                 # v3.0: Get extended bars for S/R Swing Point detection
                 # v4.0: Increased from 120 (30h) to 200 (50h) for robust swing detection + VP
-                sr_bars_data = self.indicator_manager.get_kline_data(count=200)
+                # v6.0: 优先读取增量 K 线存储 (完整 200 根已收盘 K 线，不受 indicator_manager max_bars 限制)
+                # v6.0: 与后台预计算共用同一取数逻辑，输入一致时 analyze() 直接命中预计算快照
+                sr_inputs = self._collect_sr_bars(self._layer_sr_bars())
+                sr_bars_data = sr_inputs['bars_data']
 
                 # v4.0 (E1): Update cached ATR value from 15M bars
                 if sr_bars_data and len(sr_bars_data) >= 14:
@@ -1915,42 +2494,23 @@ class DeepSeekAIStrategy(Strategy):
                 except Exception as e:
                     self.log.warning(f"Risk controller update failed: {e}")
 
-                # v4.0 (E1): Extract MTF bars from trend/decision managers (if available)
-                bars_data_4h = None
-                bars_data_1d = None
-                daily_bar = None
-                weekly_bar = None
-                if self.mtf_enabled and self.mtf_manager:
-                    try:
-                        # 4H bars from decision layer
-                        decision_mgr = getattr(self.mtf_manager, 'decision_manager', None)
-                        if decision_mgr and hasattr(decision_mgr, 'recent_bars') and decision_mgr.recent_bars:
-                            bars_data_4h = [
-                                {'high': float(b.high), 'low': float(b.low),
-                                 'close': float(b.close), 'open': float(b.open),
-                                 'volume': float(b.volume)}
-                                for b in decision_mgr.recent_bars[-50:]
-                            ]
-                        # 1D bars from trend layer
-                        trend_mgr = getattr(self.mtf_manager, 'trend_manager', None)
-                        if trend_mgr and hasattr(trend_mgr, 'recent_bars') and trend_mgr.recent_bars:
-                            bars_1d_raw = [
-                                {'high': float(b.high), 'low': float(b.low),
-                                 'close': float(b.close), 'open': float(b.open),
-                                 'volume': float(b.volume)}
-                                for b in trend_mgr.recent_bars[-120:]
-                            ]
-                            bars_data_1d = bars_1d_raw
-                            # Extract daily bar (last completed) and weekly bar (last 5 days)
-                            if bars_1d_raw:
-                                daily_bar = bars_1d_raw[-1]
-                                from utils.sr_pivot_calculator import aggregate_weekly_bar
-                                weekly_bar = aggregate_weekly_bar(bars_1d_raw)
-                    except Exception as e:
-                        self.log.debug(f"[MTF] Failed to extract MTF bars for S/R: {e}")
+                if self.mtf_enabled and self.mtf_manager and self.mtf_manager.local_aggregation:
+                    self.latest_fetch_stage['mtf_aggregation'] = self.mtf_manager.get_aggregation_stats()
+
+                # v6.0: 预计算仍在进行时短暂等待，避免 analyze() 重复计算同一快照；
+                # 本周期候选墙与预计算输入不同时快照不会命中，不等待
+                sr_precompute_waited = None
+                if self.sr_precompute_worker:
+                    walls_key = candidate_walls_signature(
+                        report_inputs(None, orderbook_data)['orderbook_anomalies'],
+                        self.sr_precompute_worker.calculator, current_price,
+                    )
+                    sr_precompute_waited = self.sr_precompute_worker.wait_for(
+                        walls_key, self._sr_precompute_wait_sec,
+                    )
 
                 signal_data = self.multi_agent.analyze(
-                    symbol="BTCUSDT",
+                    symbol=self.binance_symbol,
                     technical_report=ai_technical_data,
                     sentiment_report=sentiment_data,
                     current_position=current_position,
@@ -1967,13 +2527,27 @@ class DeepSeekAIStrategy(Strategy):
                     # ========== v3.0: OHLC bars for S/R Swing Detection ==========
                     bars_data=sr_bars_data,
                     # ========== v4.0: MTF bars for S/R pivot + volume profile ==========
-                    bars_data_4h=bars_data_4h,
-                    bars_data_1d=bars_data_1d,
-                    daily_bar=daily_bar,
-                    weekly_bar=weekly_bar,
+                    bars_data_4h=sr_inputs['bars_data_4h'],
+                    bars_data_1d=sr_inputs['bars_data_1d'],
+                    daily_bar=sr_inputs['daily_bar'],
+                    weekly_bar=sr_inputs['weekly_bar'],
                     atr_value=self._cached_atr_value,
                 )
 
+                # v6.0: 本周期 S/R 快照来源 (precompute / analysis)、年龄和计算耗时
+                sr_snapshot = getattr(self.multi_agent, 'sr_zone_snapshot', None)
+                if sr_snapshot is not None and self.latest_fetch_stage is not None:
+                    sr_stage = {
+                        'origin': sr_snapshot.origin,
+                        'age_sec': round(sr_snapshot.age_sec, 1),
+                        'compute_ms': round(sr_snapshot.compute_ms, 1),
+                    }
+                    if self.sr_precompute_worker:
+                        sr_stage['precompute_hit'] = self.sr_precompute_worker.record_use(sr_snapshot)
+                        sr_stage['precompute_waited'] = sr_precompute_waited
+                        sr_stage['precompute'] = self.sr_precompute_worker.get_stats()
+                    self.latest_fetch_stage['sr_zones'] = sr_stage
+
                 # v3.8: Store S/R Zone data for heartbeat (from MultiAgentAnalyzer cache)
                 if hasattr(self.multi_agent, '_sr_zones_cache') and self.multi_agent._sr_zones_cache:
                     self.latest_sr_zones_data = self.multi_agent._sr_zones_cache
@@ -1993,6 +2567,13 @@ class DeepSeekAIStrategy(Strategy):
                 )
                 self.log.info(f"📋 Reason: {signal_data.get('reason', 'N/A')}")
 
+                # v6.0: K 线收盘 → 决策延迟
+                if self._cycle_bar_close_ts is not None:
+                    decision_latency = time.time() - self._cycle_bar_close_ts
+                    if self.latest_fetch_stage is not None:
+                        self.latest_fetch_stage['bar_close_to_decision_sec'] = round(decision_latency, 1)
+                    self.log.info(f"⏱️ Bar close → decision: {decision_latency:.1f}s")
+
                 if signal_data.get('debate_summary'):
                     self.log.info(f"🗣️ Debate Summary: {signal_data['debate_summary'][:200]}...")
 
@@ -2167,7 +2748,7 @@ class DeepSeekAIStrategy(Strategy):
                 'signal': signal_data.get('signal', 'HOLD'),
                 'confidence': signal_data.get('confidence', 'MEDIUM'),
                 'reason': signal_data.get('reason', ''),
-                'symbol': 'BTCUSDT',
+                'symbol': self.binance_symbol,
                 'timestamp': datetime.now().isoformat(),
                 'risk_level': signal_data.get('risk_level', 'MEDIUM'),
                 'stop_loss': signal_data.get('stop_loss'),
@@ -2404,7 +2985,9 @@ class DeepSeekAIStrategy(Strategy):
                         # Also fetch history for trend calculation
                         funding_history = None
                         try:
-                            funding_history = self.binance_kline_client.get_funding_rate_history(limit=5)
+                            # v6.0: 心跳仅展示，允许缓存旧值 (后台刷新)
+                            with DataCache.serve_stale():
+                                funding_history = self.binance_kline_client.get_funding_rate_history(limit=5)
                         except Exception:
                             pass
                         # Calculate funding trend from history
@@ -2455,28 +3038,13 @@ class DeepSeekAIStrategy(Strategy):
             sr_zone_heartbeat = None
             if self.latest_sr_zones_data:
                 # v5.0: Pass full S/R zone data with strength/level for Telegram display
-                support_zones = self.latest_sr_zones_data.get('support_zones', [])
-                resistance_zones = self.latest_sr_zones_data.get('resistance_zones', [])
                 hard_control = self.latest_sr_zones_data.get('hard_control', {})
-
-                def _zone_to_dict(zone):
-                    """Convert SRZone object to dict for heartbeat."""
-                    return {
-                        'price': zone.price_center,
-                        'price_low': zone.price_low,
-                        'price_high': zone.price_high,
-                        'strength': getattr(zone, 'strength', 'LOW'),
-                        'level': getattr(zone, 'level', 'MINOR'),
-                        'sources': getattr(zone, 'sources', []),
-                        'touch_count': getattr(zone, 'touch_count', 0),
-                        'has_swing_point': getattr(zone, 'has_swing_point', False),
-                        'has_order_wall': getattr(zone, 'has_order_wall', False),
-                        'distance_pct': getattr(zone, 'distance_pct', 0),
-                    }
+                # v6.0: SRZoneService 快照已预生成 zone 摘要 (空结果时现场生成)
+                summary = self.latest_sr_zones_data.get('zone_summary') or zone_summary(self.latest_sr_zones_data)
 
                 sr_zone_heartbeat = {
-                    'support_zones': [_zone_to_dict(z) for z in support_zones[:3]],
-                    'resistance_zones': [_zone_to_dict(z) for z in resistance_zones[:3]],
+                    'support_zones': summary['support_zones'],
+                    'resistance_zones': summary['resistance_zones'],
                     'block_long': hard_control.get('block_long', False),
                     'block_short': hard_control.get('block_short', False),
                 }
@@ -2578,8 +3146,8 @@ class DeepSeekAIStrategy(Strategy):
         period_start_price = float(bars[0].open)
 
         # Calculate high/low from all available bars
-        period_high = max(float(bar.high) for bar in bars)
-        period_low = min(float(bar.low) for bar in bars)
+        period_high = float(self.indicator_manager.bars.highs().max())
+        period_low = float(self.indicator_manager.bars.lows().min())
 
         # Calculate price change from period start
         period_change_pct = ((current_price - period_start_price) / period_start_price) * 100 if period_start_price > 0 else 0
@@ -3045,7 +3613,13 @@ class DeepSeekAIStrategy(Strategy):
             side = 'long' if position.side == PositionSide.LONG else 'short'
             quantity = float(position.quantity)
             avg_px = float(position.avg_px_open)
-            unrealized_pnl = float(position.unrealized_pnl(current_price)) if current_price else 0.0
+            unrealized_pnl = 0.0
+            if current_price:
+                # v6.0: recent_bars 的 close 为 float，Position.unrealized_pnl() 只接受 Price
+                pnl_price = current_price
+                if not isinstance(pnl_price, Price):
+                    pnl_price = self.instrument.make_price(float(pnl_price))
+                unrealized_pnl = float(position.unrealized_pnl(pnl_price))
 
             # === Tier 1: Must have ===
             # PnL percentage
@@ -3852,7 +4426,7 @@ class DeepSeekAIStrategy(Strategy):
 
         if self.binance_account:
             try:
-                realtime_price = self.binance_account.get_realtime_price('BTCUSDT')
+                realtime_price = self.binance_account.get_realtime_price(self.binance_symbol)
                 if realtime_price and realtime_price > 0:
                     entry_price = realtime_price
             except Exception:
@@ -4845,7 +5419,7 @@ class DeepSeekAIStrategy(Strategy):
             current_price = None
             if self.binance_account:
                 try:
-                    current_price = self.binance_account.get_realtime_price('BTCUSDT')
+                    current_price = self.binance_account.get_realtime_price(self.binance_symbol)
                 except Exception:
                     pass
 
@@ -5675,6 +6249,8 @@ class DeepSeekAIStrategy(Strategy):
         automatic OCO linkage. When SL fills → cancel TP, when TP fills → cancel SL.
         This applies to ALL scenarios: bracket, add, reduce, trailing stop.
         """
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_order_event()
         filled_order_id = str(event.client_order_id)
 
         self.log.info(
@@ -5759,6 +6335,8 @@ class DeepSeekAIStrategy(Strategy):
         NT 1.222.0 rejects bracket orders with linked_order_ids, so we use
         a two-phase approach: entry first → SL/TP after position opens.
         """
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_position_event()
         self.log.info(
             f"🟢 Position opened: {event.side.name} "
             f"{event.quantity} @ {event.avg_px_open}"
@@ -5953,20 +6531,12 @@ class DeepSeekAIStrategy(Strategy):
                     nearest_sup_price = nearest_sup.price_center if nearest_sup else None
                     nearest_res_price = nearest_res.price_center if nearest_res else None
 
-                    def _zone_to_dict(zone):
-                        return {
-                            'price': zone.price_center,
-                            'strength': getattr(zone, 'strength', 'LOW'),
-                            'level': getattr(zone, 'level', 'MINOR'),
-                        }
-
-                    support_zones = self.latest_sr_zones_data.get('support_zones', [])
-                    resistance_zones = self.latest_sr_zones_data.get('resistance_zones', [])
+                    summary = self.latest_sr_zones_data.get('zone_summary') or zone_summary(self.latest_sr_zones_data)
                     sr_zone_data = {
                         'nearest_support': nearest_sup_price,
                         'nearest_resistance': nearest_res_price,
-                        'support_zones': [_zone_to_dict(z) for z in support_zones[:3]],
-                        'resistance_zones': [_zone_to_dict(z) for z in resistance_zones[:3]],
+                        'support_zones': summary['support_zones'],
+                        'resistance_zones': summary['resistance_zones'],
                     }
 
                 # v3.17: Calculate entry quality based on distance from S/R Zone
@@ -6038,6 +6608,8 @@ class DeepSeekAIStrategy(Strategy):
 
     def on_position_closed(self, event):
         """Handle position closed events."""
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_position_event()
         # PositionOpened event contains position data directly
         self.log.info(
             f"🔴 Position closed: {event.side.name} "
@@ -6397,6 +6969,8 @@ class DeepSeekAIStrategy(Strategy):
         v3.10: Track order cancellations for better order lifecycle management.
         v4.0 (A1): Call _handle_orphan_order to detect unprotected positions.
         """
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_order_event()
         client_order_id = str(event.client_order_id) if hasattr(event, 'client_order_id') else 'N/A'
         short_id = client_order_id[:8]
 
@@ -6441,6 +7015,8 @@ class DeepSeekAIStrategy(Strategy):
         v3.10: Track GTC order expirations.
         v4.0 (A1): Call _handle_orphan_order to detect unprotected positions.
         """
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_order_event()
         client_order_id = str(event.client_order_id) if hasattr(event, 'client_order_id') else 'N/A'
         short_id = client_order_id[:8]
 
@@ -6530,6 +7106,8 @@ class DeepSeekAIStrategy(Strategy):
         v3.10: Track position size changes.
         v4.0 (A3): Consume _pending_reduce_sltp to rebuild SL/TP after reduce fill.
         """
+        # v6.0: Account REST cache is stale after this event
+        self.binance_account.on_position_event()
         self.log.info(
             f"📊 Position changed: {event.side.name} "
             f"qty {event.quantity} (signed: {getattr(event, 'signed_qty', 'N/A')})"
@@ -6946,7 +7524,7 @@ class DeepSeekAIStrategy(Strategy):
                 try:
                     if self.binance_account:
                         sltp = self.binance_account.get_sl_tp_from_orders(
-                            symbol='BTCUSDT',
+                            symbol=self.binance_symbol,
                             position_side=side.lower(),
                         )
                         position_info['sl_price'] = sltp.get('sl_price')
@@ -0,0 +1,192 @@
+# tests/test_async_clients.py
+
+import asyncio
+import time
+
+import httpx
+
+from utils.async_http_transport import AsyncHttpTransport
+from utils.async_market_clients import (
+    AsyncBinanceDerivativesClient,
+    AsyncBinanceKlineClient,
+    AsyncBinanceOrderBookClient,
+    AsyncCoinalyzeClient,
+    AsyncSentimentDataFetcher,
+)
+from utils.binance_derivatives_client import BinanceDerivativesClient
+from utils.binance_kline_client import BinanceKlineClient
+from utils.binance_rate_governor import BinanceRateGovernor
+from utils.coinalyze_client import CoinalyzeClient
+from utils.data_cache import DataCache
+from utils.sentiment_client import SentimentDataFetcher
+
+
+NOW_MS = 1_700_000_000_000
+
+RATIO = [
+    {"symbol": "BTCUSDT", "longShortRatio": str(1.0 + i / 10), "longAccount": "0.55",
+     "shortAccount": "0.45", "buySellRatio": str(1.1 - i / 20), "sumOpenInterestValue": str(1e9 + i * 1e7),
+     "timestamp": NOW_MS - i * 900_000}
+    for i in range(10)
+]
+
+RESPONSES = {
+    "/fapi/v1/klines": [[NOW_MS, "100", "101", "99", "100.5", "10", NOW_MS + 899_999, "1000", 50, "6", "600", "0"]],
+    "/fapi/v1/premiumIndex": {"symbol": "BTCUSDT", "lastFundingRate": "0.0001", "markPrice": "100.5",
+                              "indexPrice": "100.4", "interestRate": "0.0001", "nextFundingTime": NOW_MS + 3_600_000},
+    "/fapi/v1/fundingRate": [{"symbol": "BTCUSDT", "fundingTime": NOW_MS, "fundingRate": "-0.0002", "markPrice": "100"}],
+    "/fapi/v1/ticker/24hr": {"symbol": "BTCUSDT", "priceChangePercent": "1.5", "quoteVolume": "1e9",
+                             "highPrice": "105", "lowPrice": "95"},
+    "/futures/data/topLongShortAccountRatio": RATIO,
+    "/futures/data/topLongShortPositionRatio": RATIO,
+    "/futures/data/takerlongshortRatio": RATIO,
+    "/futures/data/openInterestHist": RATIO,
+    "/futures/data/globalLongShortAccountRatio": RATIO[::-1],
+    "/v1/open-interest": [{"symbol": "BTCUSDT_PERP.A", "value": 102199.5, "update": NOW_MS}],
+    "/v1/liquidation-history": [{"symbol": "BTCUSDT_PERP.A", "history": [{"t": 1, "l": 0.1, "s": 0.2}]}],
+    "/v1/open-interest-history": [{"symbol": "BTCUSDT_PERP.A", "history": [{"t": 1, "c": 100.0}, {"t": 2, "c": 110.0}]}],
+    "/v1/long-short-ratio-history": [{"symbol": "BTCUSDT_PERP.A", "history": [{"t": 1, "r": 2.0}, {"t": 2, "r": 2.01}]}],
+}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=RESPONSES[request.url.path])
+
+
+class _SyncHttp:
+    """同步 HttpTransport 替身 (httpx.Client + MockTransport，返回同一份数据)"""
+
+    def __init__(self, handler=_handler):
+        self._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def get(self, url, params=None, headers=None, timeout=10, priority=None):
+        return self._client.get(url, params=params, headers=headers, timeout=timeout)
+
+
+def _async_http(handler=_handler):
+    return AsyncHttpTransport(governor=BinanceRateGovernor(), transport=httpx.MockTransport(handler))
+
+
+def _no_cache():
+    return DataCache(enabled=False)
+
+
+class TestParity:
+    """测试异步客户端与同步客户端返回相同的数据结构"""
+
+    def test_kline_client(self):
+        sync = BinanceKlineClient(http=_SyncHttp(), cache=_no_cache())
+
+        async def run():
+            async with _async_http() as http:
+                client = AsyncBinanceKlineClient(http=http, cache=_no_cache())
+                return (
+                    await client.get_klines("BTCUSDT", "15m", 1),
+                    await client.get_funding_rate("BTCUSDT"),
+                    await client.get_funding_rate_history("BTCUSDT", 1),
+                )
+
+        klines, funding, history = asyncio.run(run())
+        assert klines == sync.get_klines("BTCUSDT", "15m", 1)
+        assert funding == sync.get_funding_rate("BTCUSDT")
+        assert funding["funding_rate"] == -0.0002
+        assert funding["predicted_rate"] == 0.0001
+        assert history == sync.get_funding_rate_history("BTCUSDT", 1)
+
+    def test_derivatives_fetch_all(self):
+        sync = BinanceDerivativesClient(http=_SyncHttp(), cache=_no_cache())
+
+        async def run():
+            async with _async_http() as http:
+                client = AsyncBinanceDerivativesClient(http=http, cache=_no_cache())
+                ratio = await client.get_top_long_short_position_ratio("BTCUSDT", "15m", 10)
+                return ratio, await client.fetch_all("BTCUSDT", "15m", 10)
+
+        ratio, data = asyncio.run(run())
+        assert ratio == RATIO
+        assert data == sync.fetch_all("BTCUSDT", "15m", 10)
+        assert data["top_long_short_position"]["trend"] == "FALLING"
+
+    def test_coinalyze_fetch_all_with_history(self):
+        sync = CoinalyzeClient(api_key="k", http=_SyncHttp(), cache=_no_cache())
+
+        async def run():
+            async with _async_http() as http:
+                client = AsyncCoinalyzeClient(api_key="k", http=http, cache=_no_cache())
+                return await client.fetch_all_with_history(), await client.fetch_all()
+
+        with_history, current = asyncio.run(run())
+        assert with_history == sync.fetch_all_with_history()
+        assert with_history["trends"] == {"oi_trend": "RISING", "long_short_trend": "STABLE"}
+        assert current == sync.fetch_all()
+        assert current["_data_quality"] == "COMPLETE"
+
+    def test_sentiment(self):
+        sync = SentimentDataFetcher(http=_SyncHttp())
+
+        async def run():
+            async with _async_http() as http:
+                return await AsyncSentimentDataFetcher(http=http).fetch("BTC")
+
+        result = asyncio.run(run())
+        expected = sync.fetch("BTC")
+        assert result["history"] == expected["history"]
+        assert result["net_sentiment"] == expected["net_sentiment"]
+        assert len(result["history"]) == 10
+
+
+class TestAsyncBehaviour:
+    """测试并发请求 / 重试 / 缓存共享"""
+
+    def test_fetch_all_is_concurrent(self):
+        async def slow_handler(request):
+            await asyncio.sleep(0.2)
+            return _handler(request)
+
+        async def run():
+            async with _async_http(slow_handler) as http:
+                client = AsyncBinanceDerivativesClient(http=http, cache=_no_cache())
+                start = time.monotonic()
+                await client.fetch_all()
+                return time.monotonic() - start, http.get_stats()
+
+        elapsed, stats = asyncio.run(run())
+        # 6 个端点并发: ~0.2s (串行需要 1.2s)
+        assert elapsed < 0.8
+        assert stats["requests"] == 6
+
+    def test_orderbook_retries_then_validates(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.params["limit"])
+            if len(calls) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"lastUpdateId": 1, "bids": [["100", "1"], ["99", "2"]],
+                                             "asks": [["101", "1"], ["102", "2"]]})
+
+        async def run():
+            async with _async_http(handler) as http:
+                client = AsyncBinanceOrderBookClient(http=http, retry_delay=0)
+                return await client.get_order_book("BTCUSDT", 100)
+
+        book = asyncio.run(run())
+        assert calls == ["100", "100"]
+        assert book["bids"][0] == ["100", "1"]
+
+    def test_cache_shared_with_sync_client(self):
+        cache = DataCache()
+
+        async def run():
+            async with _async_http() as http:
+                client = AsyncBinanceKlineClient(http=http, cache=cache)
+                return await client.get_funding_rate_history("BTCUSDT", 10)
+
+        history = asyncio.run(run())
+
+        def fail(*args, **kwargs):
+            raise AssertionError("sync client should hit the cache")
+
+        sync = BinanceKlineClient(http=_SyncHttp(fail), cache=cache)
+        assert sync.get_funding_rate_history("BTCUSDT", 10) == history
+        assert cache.get_stats()["hits"] == 1
@@ -0,0 +1,205 @@
+# tests/test_bar_aggregator.py
+
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.bar_aggregator import HigherTimeframeAggregator, TIMEFRAME_NS, bucket_start
+from indicators.multi_timeframe_manager import MultiTimeframeManager
+
+
+M15 = TIMEFRAME_NS["15m"]
+H4 = TIMEFRAME_NS["4h"]
+DAY = TIMEFRAME_NS["1d"]
+# 2024-01-01 00:00 UTC (周一)
+MONDAY = 1_704_067_200 * 1_000_000_000
+
+EXEC_TYPE = BarType.from_str("BTCUSDT-PERP.BINANCE-15-MINUTE-LAST-EXTERNAL")
+DECISION_TYPE = BarType.from_str("BTCUSDT-PERP.BINANCE-4-HOUR-LAST-EXTERNAL")
+TREND_TYPE = BarType.from_str("BTCUSDT-PERP.BINANCE-1-DAY-LAST-EXTERNAL")
+
+
+def _ohlcv(i):
+    close = 42000.0 + (i % 13) * 25 - (i % 5) * 40
+    return close - 10, close + 50, close - 60, close, 10.0 + i % 7
+
+
+def _exec_bar(i, start=MONDAY):
+    """实盘约定: ts_event = 收盘时间 (open + 15m - 1ms)"""
+    o, h, l, c, v = _ohlcv(i)
+    ts = start + i * M15 + M15 - 1_000_000
+    return Bar(
+        bar_type=EXEC_TYPE,
+        open=Price(o, 1), high=Price(h, 1), low=Price(l, 1), close=Price(c, 1),
+        volume=Quantity(v, 3), ts_event=ts, ts_init=ts,
+    )
+
+
+def _mtf(**config):
+    return MultiTimeframeManager(
+        config={"enabled": True, "local_aggregation": True, **config},
+        trend_bar_type=TREND_TYPE,
+        decision_bar_type=DECISION_TYPE,
+        execution_bar_type=EXEC_TYPE,
+    )
+
+
+class TestBucketAlignment:
+    """测试 UTC / 周一对齐"""
+
+    def test_open_and_close_timestamps_map_to_same_bucket(self):
+        open_ts = MONDAY + 5 * H4
+        assert bucket_start(open_ts, "4h") == open_ts
+        assert bucket_start(open_ts + H4 - 1_000_000, "4h") == open_ts
+        assert bucket_start(MONDAY + 13 * DAY // 2, "1d") == MONDAY + 6 * DAY
+
+    def test_week_starts_monday(self):
+        assert bucket_start(MONDAY, "1w") == MONDAY
+        assert bucket_start(MONDAY + 6 * DAY + DAY - 1, "1w") == MONDAY
+        assert bucket_start(MONDAY - 1, "1w") == MONDAY - 7 * DAY
+
+
+class TestHigherTimeframeAggregator:
+    """测试 15M → 4H / 1D 聚合"""
+
+    def test_emits_on_last_source_bar(self):
+        agg = HigherTimeframeAggregator("15m", ("4h", "1d"))
+        emitted = []
+        for i in range(16):
+            out = agg.add(MONDAY + i * M15, *_ohlcv(i))
+            if i < 15:
+                assert out == []
+            emitted.extend(out)
+
+        assert len(emitted) == 1
+        bar = emitted[0]
+        rows = [_ohlcv(i) for i in range(16)]
+        assert bar.timeframe == "4h" and bar.open_ns == MONDAY and bar.complete
+        assert bar.open == rows[0][0]
+        assert bar.high == max(r[1] for r in rows)
+        assert bar.low == min(r[2] for r in rows)
+        assert bar.close == rows[-1][3]
+        assert bar.volume == sum(r[4] for r in rows)
+
+        for i in range(16, 96):
+            emitted.extend(agg.add(MONDAY + i * M15, *_ohlcv(i)))
+        assert [b.timeframe for b in emitted].count("4h") == 6
+        assert emitted[-1].timeframe == "1d" and emitted[-1].bar_count == 96
+
+    def test_gap_emits_incomplete_and_ignores_duplicates(self):
+        agg = HigherTimeframeAggregator("15m", ("4h",))
+        for i in range(10):
+            agg.add(MONDAY + i * M15, *_ohlcv(i))
+        assert agg.add(MONDAY + 9 * M15, *_ohlcv(9)) == []
+
+        out = agg.add(MONDAY + H4, *_ohlcv(16))
+        assert len(out) == 1
+        assert not out[0].complete and out[0].bar_count == 10
+        stats = agg.get_stats()
+        assert stats["ignored"] == 1 and stats["incomplete"] == {"4h": 1}
+
+    def test_gap_longer_than_period_emits_every_missing_period(self):
+        agg = HigherTimeframeAggregator("15m", ("4h", "1d"))
+        for i in range(10):
+            agg.add(MONDAY + i * M15, *_ohlcv(i))
+        # 15M 流中断 10:00 → 第二天 04:15: 4H 缺 4 个完整周期，1D 缺 0 个
+        resume = 112
+        out = agg.add(MONDAY + (resume + 1) * M15, *_ohlcv(resume))
+        h4 = [b for b in out if b.timeframe == "4h"]
+        assert [b.open_ns for b in h4] == [MONDAY + k * H4 for k in range(7)]
+        assert h4[0].bar_count == 10
+        assert all(b.bar_count == 0 and b.volume == 0.0 for b in h4[1:])
+        assert all(b.close == _ohlcv(9)[3] for b in h4[1:])
+        assert [b.open_ns for b in out if b.timeframe == "1d"] == [MONDAY]
+        stats = agg.get_stats()
+        assert stats["missing"] == {"4h": 6, "1d": 0}
+        assert stats["incomplete"] == {"4h": 7, "1d": 1}
+
+    def test_rejects_non_multiple_timeframe(self):
+        try:
+            HigherTimeframeAggregator("4h", ("15m",))
+        except ValueError:
+            return
+        raise AssertionError("expected ValueError")
+
+
+class TestMultiTimeframeLocalAggregation:
+    """测试 MTF 管理器由 15M 生成 4H / 1D / 周线"""
+
+    def test_routes_aggregated_bars_into_layers(self):
+        mtf = _mtf()
+        for i in range(96 * 7):
+            mtf.route_bar(_exec_bar(i))
+
+        assert len(mtf.decision_manager.recent_bars) == 6 * 7
+        assert len(mtf.trend_manager.recent_bars) == 7
+        last_4h = mtf.decision_manager.recent_bars[-1]
+        assert last_4h.ts_event == MONDAY + 7 * DAY - 1_000_000
+        assert last_4h.close == _ohlcv(96 * 7 - 1)[3]
+
+        weekly = mtf.get_weekly_bar()
+        assert weekly["timestamp"] == MONDAY
+        assert weekly["close"] == _ohlcv(96 * 7 - 1)[3]
+        assert mtf.get_aggregation_stats()["emitted"] == {"4h": 42, "1d": 7}
+
+    def test_skips_periods_already_prefetched(self):
+        mtf = _mtf()
+        # REST 预取已提供前两个 4H 周期 (最后一根 ts 落在第二个周期内)
+        mtf.decision_manager.update(_exec_bar(31))
+        before = len(mtf.decision_manager.recent_bars)
+        for i in range(32):
+            mtf.route_bar(_exec_bar(i))
+        assert len(mtf.decision_manager.recent_bars) == before
+
+    def test_incomplete_bar_is_backfilled(self):
+        mtf = _mtf()
+        calls = []
+
+        def backfill(timeframe, open_ns):
+            calls.append((timeframe, open_ns))
+            return (1.0, 2.0, 0.5, 1.5, 99.0)
+
+        mtf.set_backfill(backfill)
+        for i in range(8, 17):  # 启动于 4H 周期中途
+            mtf.route_bar(_exec_bar(i))
+        assert calls == [("4h", MONDAY)]
+        bar = mtf.decision_manager.recent_bars[-1]
+        assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (1.0, 2.0, 0.5, 1.5, 99.0)
+        assert mtf.get_aggregation_stats()["backfilled"] == 1
+
+    def test_extra_timeframe(self):
+        mtf = _mtf(extra_timeframes=["1h"])
+        for i in range(16):
+            mtf.route_bar(_exec_bar(i))
+        bars = mtf.get_aggregated_bars("1h")
+        assert len(bars) == 4
+        assert bars[0]["timestamp"] == MONDAY
+
+    def test_missing_periods_backfilled_in_order(self):
+        mtf = _mtf()
+        calls = []
+
+        def backfill(timeframe, open_ns):
+            calls.append((timeframe, open_ns))
+            return (1.0, 2.0, 0.5, 1.5, float((open_ns - MONDAY) // H4)) if timeframe == "4h" else None
+
+        mtf.set_backfill(backfill)
+        for i in range(16):
+            mtf.route_bar(_exec_bar(i))
+        # 缺口: 第 2~4 个 4H 周期 (04:00-15:59) 没有任何 15M K 线
+        for i in range(64, 80):
+            mtf.route_bar(_exec_bar(i))
+
+        assert calls == [("4h", MONDAY + k * H4) for k in (1, 2, 3)]
+        bars = mtf.decision_manager.recent_bars
+        assert [b.ts_event for b in bars] == [MONDAY + k * H4 + H4 - 1_000_000 for k in range(5)]
+        assert [b.volume for b in bars[1:4]] == [1.0, 2.0, 3.0]
+        assert mtf.get_aggregation_stats()["backfilled"] == 3
+
+    def test_missing_period_without_backfill_is_skipped(self):
+        mtf = _mtf()
+        mtf.set_backfill(lambda timeframe, open_ns: None)
+        for i in list(range(16)) + list(range(48, 64)):
+            mtf.route_bar(_exec_bar(i))
+        bars = mtf.decision_manager.recent_bars
+        assert [b.ts_event for b in bars] == [MONDAY + k * H4 + H4 - 1_000_000 for k in (0, 3)]
+        assert mtf.get_aggregation_stats()["unfilled"] == 2
@@ -0,0 +1,53 @@
+# tests/test_bar_buffer.py
+
+import numpy as np
+import pytest
+
+from indicators.bar_buffer import BarRow, OHLCVRingBuffer
+
+
+def _fill(buf, n, start=0):
+    for i in range(start, start + n):
+        buf.append(100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0 + i, i * 1000, i * 1000 + 1)
+
+
+class TestOHLCVRingBuffer:
+    """测试 OHLCV 列式环形缓冲"""
+
+    def test_keeps_newest_capacity_bars(self):
+        buf = OHLCVRingBuffer(5, headroom=2)
+        _fill(buf, 13)  # 多次压缩
+        assert len(buf) == 5
+        assert buf.closes().tolist() == [108.5, 109.5, 110.5, 111.5, 112.5]
+        assert buf.closes(2).tolist() == [111.5, 112.5]
+        assert buf.closes(50).tolist() == buf.closes().tolist()
+        assert buf[-1] == BarRow(112.0, 113.0, 111.0, 112.5, 22.0, 12000, 12001)
+        assert buf[0].ts_event == 8000
+        assert [r.close for r in buf[-3:]] == [110.5, 111.5, 112.5]
+        assert buf[::2] == [buf[0], buf[2], buf[4]]
+        with pytest.raises(IndexError):
+            buf[5]
+
+    def test_views_are_zero_copy_and_stable(self):
+        buf = OHLCVRingBuffer(4, headroom=2)
+        _fill(buf, 4)
+        view = buf.closes()
+        assert np.shares_memory(view, buf.ohlcv())
+        assert not view.flags.writeable
+        before = view.tolist()
+        _fill(buf, 6, start=4)  # 追加 + 压缩后旧视图不变
+        assert view.tolist() == before
+        assert buf.highs(1)[0] == 110.0
+
+    def test_adapters_and_arrays_roundtrip(self):
+        buf = OHLCVRingBuffer(10)
+        assert buf == [] and not buf
+        _fill(buf, 3)
+        assert buf.to_dicts(1) == [
+            {'timestamp': 2001, 'open': 102.0, 'high': 103.0, 'low': 101.0, 'close': 102.5, 'volume': 12.0}
+        ]
+        other = OHLCVRingBuffer(2)
+        other.load_arrays(buf.to_arrays())
+        assert list(other) == buf[-2:]
+        # 每根 K 线 ~84 字节 (Bar 对象 ~300 字节)
+        assert OHLCVRingBuffer(200).nbytes / 200 <= 90
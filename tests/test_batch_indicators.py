@@ -0,0 +1,160 @@
+# tests/test_batch_indicators.py
+
+import math
+import random
+import time
+
+import numpy as np
+import pytest
+
+from indicators.batch_indicators import (
+    compute_indicator_series,
+    linear_recurrence,
+    ohlcv_from_klines,
+)
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+class _Bar:
+    def __init__(self, i, o, h, l, c, v):
+        self.open = o
+        self.high = h
+        self.low = l
+        self.close = c
+        self.volume = v
+        self.ts_event = self.ts_init = i * 900_000_000_000
+
+
+def _ohlcv(n, seed=11):
+    rnd = random.Random(seed)
+    price = 60000.0
+    rows = []
+    for i in range(n):
+        o = price
+        price = round(price * (1 + rnd.gauss(0, 0.004)), 1)
+        h = round(max(o, price) * (1 + abs(rnd.gauss(0, 0.002))), 1)
+        l = round(min(o, price) * (1 - abs(rnd.gauss(0, 0.002))), 1)
+        # 偶尔出现横盘 (涨跌为 0) 和零成交量
+        if i % 37 == 0:
+            price = o
+        rows.append((o, h, l, price, 0.0 if i % 53 == 0 else 50 + rnd.random() * 100))
+    return np.array(rows).T
+
+
+MANAGER_PARAMS = [
+    dict(),
+    dict(sma_periods=[20, 50], rsi_period=7, macd_fast=10, macd_slow=20, bb_period=10),
+    dict(sma_periods=[200], ema_periods=[12, 26], macd_signal=5),
+]
+
+
+class TestLinearRecurrence:
+    """测试分块闭式递推与逐点递推一致"""
+
+    @pytest.mark.parametrize("decay", [0.0, 1 / 3, 12 / 13, 0.999])
+    def test_matches_loop(self, decay):
+        rnd = random.Random(3)
+        u = [rnd.uniform(-5, 5) for _ in range(3000)]
+        expected = []
+        y = 42.0
+        for x in u:
+            y = decay * y + x
+            expected.append(y)
+        assert np.allclose(linear_recurrence(np.array(u), decay, 42.0), expected, rtol=1e-10, atol=1e-9)
+
+
+class TestStreamingParity:
+    """测试批量计算与 update() 逐根计算一致"""
+
+    @pytest.mark.parametrize("params", MANAGER_PARAMS)
+    def test_snapshot_values_match(self, params):
+        ohlcv = _ohlcv(600)
+        manager = TechnicalIndicatorManager(**params)
+        series = manager.compute_series(ohlcv)
+        o, h, l, c, v = ohlcv
+
+        checked = 0
+        for i in range(ohlcv.shape[1]):
+            manager.update(_Bar(i, o[i], h[i], l[i], c[i], v[i]))
+            data = manager.get_technical_data(c[i])
+            for key in [f'sma_{p}' for p in manager.sma_periods] + [f'ema_{p}' for p in manager.ema_periods]:
+                if not math.isnan(series[key][i]):
+                    assert series[key][i] == pytest.approx(data[key], rel=1e-10)
+            if not math.isnan(series['rsi'][i]):
+                assert series['rsi'][i] == pytest.approx(data['rsi'], rel=1e-9, abs=1e-9)
+            if not math.isnan(series['macd_signal'][i]) and not math.isnan(series['macd'][i]):
+                for key in ('macd', 'macd_signal', 'macd_histogram'):
+                    assert series[key][i] == pytest.approx(data[key], rel=1e-7, abs=1e-7)
+            if not math.isnan(series['bb_upper'][i]):
+                for key in ('bb_upper', 'bb_middle', 'bb_lower', 'bb_position'):
+                    assert series[key][i] == pytest.approx(data[key], rel=1e-9, abs=1e-9)
+            if not math.isnan(series['volume_ratio'][i]):
+                assert series['volume_ratio'][i] == pytest.approx(data['volume_ratio'], rel=1e-9)
+            if not math.isnan(series['support'][i]):
+                assert series['support'][i] == data['support']
+                assert series['resistance'][i] == data['resistance']
+            if math.isnan(series['adx'][i]):
+                assert data['adx_regime'] == 'INSUFFICIENT_DATA'
+            else:
+                for key in ('adx', 'di_plus', 'di_minus'):
+                    assert round(series[key][i], 1) == pytest.approx(data[key], abs=0.1 + 1e-9)
+                    assert series[key][i] == pytest.approx(getattr(manager.adx, {'adx': 'value'}.get(key, key)), rel=1e-9)
+                checked += 1
+        assert checked > 0
+
+    @pytest.mark.parametrize("params", MANAGER_PARAMS[:2])
+    def test_history_series_match(self, params):
+        ohlcv = _ohlcv(400, seed=5)
+        manager = TechnicalIndicatorManager(**params)
+        for i in range(ohlcv.shape[1]):
+            manager.update(_Bar(i, *ohlcv[:, i]))
+        series = manager.compute_series(ohlcv)
+        count = 35
+
+        def tail(name, decimals):
+            values = series[name][~np.isnan(series[name])][-count:]
+            return np.round(values, decimals)
+
+        # 舍入边界上允许 1 个末位单位的差异
+        assert np.allclose(tail('rsi', 2), manager._rsi_history[-count:], atol=0.01 + 1e-9)
+        assert np.allclose(tail('macd', 4), manager._macd_history[-count:], atol=1e-4 + 1e-9)
+        assert np.allclose(tail('macd_signal', 4), manager._macd_signal_history[-count:], atol=1e-4 + 1e-9)
+        assert np.allclose(tail('adx', 1), manager._adx_history[-count:], atol=0.1 + 1e-9)
+        assert np.allclose(tail('bb_width', 2), manager._bb_width_history[-count:], atol=0.01 + 1e-9)
+        for period in manager.sma_periods:
+            assert np.allclose(tail(f'sma_{period}', 2), manager._sma_history[period][-count:], atol=0.01 + 1e-9)
+
+    def test_compute_series_does_not_change_state(self):
+        manager = TechnicalIndicatorManager()
+        manager.compute_series(_ohlcv(100))
+        assert len(manager.recent_bars) == 0
+        assert manager.version == 0
+
+
+class TestBatchApi:
+    """测试输入格式和边界情况"""
+
+    def test_short_history_is_nan(self):
+        series = compute_indicator_series(_ohlcv(4))
+        assert all(np.isnan(values).all() for values in series.values())
+        assert len(series['adx']) == 4
+
+    def test_empty_history(self):
+        series = compute_indicator_series(np.empty((5, 0)))
+        assert all(len(values) == 0 for values in series.values())
+
+    def test_rejects_row_major_array(self):
+        with pytest.raises(ValueError):
+            compute_indicator_series(np.zeros((100, 5)))
+
+    def test_klines_conversion(self):
+        klines = [[i * 900_000, '1', '2', '0.5', '1.5', '10', i * 900_000 + 899_999] for i in range(3)]
+        ohlcv = ohlcv_from_klines(klines)
+        assert ohlcv.shape == (5, 3)
+        assert ohlcv[3].tolist() == [1.5, 1.5, 1.5]
+
+    def test_months_of_15m_bars_in_milliseconds(self):
+        ohlcv = _ohlcv(17_280)  # 180 天 15M
+        start = time.perf_counter()
+        compute_indicator_series(ohlcv, sma_periods=[5, 20, 50, 200])
+        assert time.perf_counter() - start < 0.5
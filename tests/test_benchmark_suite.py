@@ -0,0 +1,61 @@
+# tests/test_benchmark_suite.py
+
+import pytest
+
+from scripts.benchmark_suite import (
+    BASELINE_PATH,
+    build_cases,
+    compare,
+    load_baseline,
+    load_fixture,
+    time_case,
+)
+
+
+@pytest.fixture(scope="module")
+def cases():
+    return build_cases(load_fixture())
+
+
+class TestBenchmarkCases:
+    """测试基准用例在夹具上可运行"""
+
+    def test_every_case_runs(self, cases):
+        for name, fn in cases.items():
+            result = fn()
+            if not name.startswith('indicator.update'):
+                assert result, name
+
+    def test_baseline_covers_all_cases(self, cases):
+        baseline = load_baseline(BASELINE_PATH)
+        assert baseline is not None
+        assert set(baseline['cases']) == set(cases)
+
+    def test_sr_calculate_finds_zones(self, cases):
+        result = cases['sr.calculate']()
+        assert result['support_zones'] and result['resistance_zones']
+
+    def test_time_case(self):
+        assert time_case(lambda: sum(range(100)), repeats=2, min_time=0.001) > 0
+
+
+class TestRegressionGate:
+    """测试基线对比"""
+
+    BASELINE = {'calibration_us': 100.0, 'cases': {'a': 10.0, 'b': 10.0, 'c': 10.0}}
+
+    def test_statuses(self):
+        rows = compare({'a': 12.0, 'b': 14.0, 'c': 7.0, 'd': 1.0}, self.BASELINE, threshold=0.3)
+        assert {row['name']: row['status'] for row in rows} == {
+            'a': 'OK', 'b': 'REGRESSION', 'c': 'IMPROVED', 'd': 'NEW',
+        }
+
+    def test_calibration_scaling(self):
+        # 当前机器慢一倍: 校准 200μs，用例 20μs 换算后与基线持平
+        rows = compare({'a': 20.0}, self.BASELINE, threshold=0.3, calibration_us=200.0)
+        assert rows[0]['status'] == 'OK'
+        assert rows[0]['ratio'] == pytest.approx(1.0)
+
+    def test_no_baseline(self):
+        rows = compare({'a': 1.0}, None)
+        assert rows[0]['status'] == 'NEW'
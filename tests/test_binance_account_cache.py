@@ -0,0 +1,80 @@
+# tests/test_binance_account_cache.py
+
+import threading
+import time
+
+from utils.binance_account import BinanceAccountFetcher
+
+
+class _SlowAccountFetcher(BinanceAccountFetcher):
+    """替换签名请求，记录调用次数"""
+
+    def __init__(self, delay=0.1, **kwargs):
+        super().__init__(api_key="k", api_secret="s", **kwargs)
+        self.delay = delay
+        self.calls = []
+        self.counter = 0
+
+    def _make_request(self, endpoint, params=None):
+        self.calls.append(endpoint)
+        time.sleep(self.delay)
+        self.counter += 1
+        if endpoint == "/fapi/v1/openOrders":
+            return [{"orderId": self.counter}]
+        return {"totalWalletBalance": str(self.counter), "positions": []}
+
+
+class TestBinanceAccountCoalescing:
+    """测试并发请求合并 / 新鲜度 / 事件失效"""
+
+    def test_concurrent_requests_share_one_call(self):
+        fetcher = _SlowAccountFetcher(delay=0.2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(fetcher.get_account_info()))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert fetcher.calls == ["/fapi/v2/account"]
+        assert len(results) == 5 and all(r is results[0] for r in results)
+        stats = fetcher.get_cache_stats()
+        assert stats["requests"] == 1
+        assert stats["coalesced"] + stats["cache_hits"] == 4
+
+    def test_per_endpoint_freshness(self):
+        fetcher = _SlowAccountFetcher(delay=0, cache_ttl=60, freshness={"open_orders": 0.05})
+        fetcher.get_account_info()
+        fetcher.get_open_orders("BTCUSDT")
+        time.sleep(0.1)
+        fetcher.get_account_info()
+        fetcher.get_open_orders("BTCUSDT")
+        assert fetcher.calls.count("/fapi/v2/account") == 1
+        assert fetcher.calls.count("/fapi/v1/openOrders") == 2
+
+    def test_order_event_invalidates(self):
+        fetcher = _SlowAccountFetcher(delay=0, cache_ttl=60)
+        assert fetcher.get_balance()["total_balance"] == 1.0
+        assert fetcher.get_balance()["total_balance"] == 1.0
+        fetcher.on_order_event()
+        assert fetcher.get_balance()["total_balance"] == 2.0
+
+    def test_result_in_flight_during_invalidation_not_cached(self):
+        fetcher = _SlowAccountFetcher(delay=0.2, cache_ttl=60)
+        t = threading.Thread(target=fetcher.get_account_info)
+        t.start()
+        time.sleep(0.05)
+        fetcher.on_position_event()
+        t.join()
+        fetcher.get_account_info()
+        assert fetcher.calls.count("/fapi/v2/account") == 2
+
+    def test_failures_not_cached(self):
+        fetcher = _SlowAccountFetcher(delay=0, cache_ttl=60)
+        fetcher._make_request = lambda endpoint, params=None: fetcher.calls.append(endpoint)
+        assert fetcher.get_account_info() is None
+        assert fetcher.get_account_info() is None
+        assert len(fetcher.calls) == 2
@@ -0,0 +1,82 @@
+# tests/test_binance_rate_governor.py
+
+import asyncio
+import time
+
+import pytest
+
+from utils.binance_rate_governor import (
+    BinanceRateGovernor,
+    RateLimitDeferred,
+    endpoint_weight,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+)
+
+FAPI = "https://fapi.binance.com"
+
+
+class TestEndpointWeight:
+    """测试端点权重表"""
+
+    def test_weights(self):
+        assert endpoint_weight("/fapi/v1/klines", {"limit": 50}) == 1
+        assert endpoint_weight("/fapi/v1/klines", {"limit": 200}) == 2
+        assert endpoint_weight("/fapi/v1/klines", {"limit": 1500}) == 10
+        assert endpoint_weight("/fapi/v1/depth", {"limit": 100}) == 5
+        assert endpoint_weight("/fapi/v2/account") == 5
+        assert endpoint_weight("/fapi/v1/openOrders", {"symbol": "BTCUSDT"}) == 1
+        assert endpoint_weight("/fapi/v1/openOrders") == 40
+        assert endpoint_weight("/fapi/v1/unknown") == 1
+
+
+class TestBinanceRateGovernor:
+    """测试令牌桶 / 优先级余量 / 服务端用量同步"""
+
+    def test_priority_reserves(self):
+        gov = BinanceRateGovernor(weight_limit=100, normal_reserve=0.1, low_reserve=0.5,
+                                  max_wait_sec={PRIORITY_LOW: 0, PRIORITY_NORMAL: 0, PRIORITY_HIGH: 0})
+        # 服务端报告已用 55: 剩余 45 < 低优先级余量 50
+        gov.observe({"X-MBX-USED-WEIGHT-1M": "55"}, 200)
+        with pytest.raises(RateLimitDeferred):
+            gov.acquire(f"{FAPI}/fapi/v1/income", priority=PRIORITY_LOW)
+        # 普通优先级仍可用 (剩余 45 - 1 >= 10)
+        gov.acquire(f"{FAPI}/fapi/v1/klines", {"limit": 50})
+        # 高优先级可用到 0
+        for _ in range(8):
+            gov.acquire(f"{FAPI}/fapi/v2/account")
+        headroom = gov.get_headroom()
+        assert headroom["deferred"]["low"] == 1
+        assert headroom["server_used_weight_1m"] == 55
+        assert headroom["headroom_pct"] < 10
+
+    def test_low_priority_waits_for_refill(self):
+        gov = BinanceRateGovernor(weight_limit=600, low_reserve=0.5)  # 10 weight/s
+        gov.observe({"X-MBX-USED-WEIGHT-1M": "301"}, 200)
+        start = time.monotonic()
+        waited = gov.acquire(f"{FAPI}/fapi/v1/ticker/24hr", {"symbol": "BTCUSDT"}, priority=PRIORITY_LOW)
+        assert 0.1 <= time.monotonic() - start < 1.5
+        assert waited > 0
+
+    def test_retry_after_blocks(self):
+        gov = BinanceRateGovernor(max_wait_sec={PRIORITY_HIGH: 0.2})
+        gov.observe({"Retry-After": "5"}, 429)
+        with pytest.raises(RateLimitDeferred):
+            gov.acquire(f"{FAPI}/fapi/v2/account")
+        headroom = gov.get_headroom()
+        assert headroom["rate_limited"] == 1
+        assert headroom["blocked_for_sec"] > 4
+
+    def test_process_priority_cap(self):
+        gov = BinanceRateGovernor()
+        assert gov.priority_for("/fapi/v2/account") == PRIORITY_HIGH
+        gov.set_process_priority(PRIORITY_LOW)
+        assert gov.priority_for("/fapi/v2/account") == PRIORITY_LOW
+        assert not gov.applies_to("https://api.coinalyze.net/v1/open-interest")
+
+    def test_async_acquire(self):
+        gov = BinanceRateGovernor()
+        waited = asyncio.run(gov.acquire_async(f"{FAPI}/fapi/v1/klines?symbol=BTCUSDT&limit=1500"))
+        assert waited == 0
+        assert gov.get_headroom()["weight"] == 10
@@ -0,0 +1,198 @@
+# tests/test_data_cache.py
+
+import time
+from types import SimpleNamespace
+
+import utils.data_cache as data_cache_module
+from utils.data_cache import FUNDING_PENDING_RETRY_SEC, DataCache
+
+
+class _Counter:
+    def __init__(self, values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.values.pop(0) if self.values else None
+
+
+class _Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _fake_clock(monkeypatch, clock):
+    monkeypatch.setattr(data_cache_module, "time", SimpleNamespace(time=clock, sleep=time.sleep))
+
+
+class TestDataCache:
+    """测试 TTL 缓存命中 / 过期刷新 / 失败回退"""
+
+    def test_hit_within_ttl(self):
+        cache = DataCache(ttls={"t": 60})
+        fetch = _Counter([{"v": 1}, {"v": 2}])
+        assert cache.get("t", "/a", {"x": 1}, fetch) == {"v": 1}
+        assert cache.get("t", "/a", {"x": 1}, fetch) == {"v": 1}
+        assert fetch.calls == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_params_are_part_of_key(self):
+        cache = DataCache(ttls={"t": 60})
+        fetch = _Counter([1, 2])
+        assert cache.get("t", "/a", {"x": 1}, fetch) == 1
+        assert cache.get("t", "/a", {"x": 2}, fetch) == 2
+        assert fetch.calls == 2
+
+    def test_stale_while_revalidate(self):
+        cache = DataCache(ttls={"t": 0.05}, max_stale_factor=100)
+        fetch = _Counter(["old", "new"])
+        cache.get("t", "/a", None, fetch)
+        time.sleep(0.08)
+
+        # 过期: serve_stale 上下文中立即返回旧值，后台刷新
+        with DataCache.serve_stale():
+            assert cache.get("t", "/a", None, fetch) == "old"
+        assert cache.wait_for_refreshes(timeout=2)
+        assert cache.get("t", "/a", None, fetch) == "new"
+        assert fetch.calls == 2
+        assert cache.get_stats()["stale_hits"] == 1
+
+    def test_expired_fetches_sync_outside_serve_stale(self):
+        cache = DataCache(ttls={"t": 0.05}, max_stale_factor=100)
+        fetch = _Counter(["old", "new"])
+        cache.get("t", "/a", None, fetch)
+        time.sleep(0.08)
+        assert cache.get("t", "/a", None, fetch) == "new"
+        assert cache.get_stats()["stale_hits"] == 0
+
+    def test_decision_cycle_never_gets_previous_cycle_data(self, monkeypatch):
+        # 900s 分析周期, 300s TTL, 45s 预热提前量: 每个周期都应拿到本周期数据
+        clock = _Clock()
+        _fake_clock(monkeypatch, clock)
+        cache = DataCache(ttls={"binance_ratio": 300}, max_stale_factor=3.0)
+        fetch = _Counter(range(10))
+        start = clock.now
+        for cycle in range(5):
+            clock.now = start + cycle * 900 - 45   # 预热
+            cache.get("binance_ratio", "/r", None, fetch)
+            clock.now = start + cycle * 900        # 周期
+            assert cache.get("binance_ratio", "/r", None, fetch) == cycle
+            assert cache.age("/r") == 45.0
+        assert fetch.calls == 5
+        assert cache.get_stats()["stale_hits"] == 0
+
+    def test_funding_history_expires_at_next_settlement(self, monkeypatch):
+        clock = _Clock(now=1_700_000_000.0)
+        _fake_clock(monkeypatch, clock)
+        cache = DataCache(ttls={"funding_rate_history": 1800})
+        settled = clock.now - 600   # 10 分钟前结算
+        rows = [
+            {"fundingRate": "0.0001", "fundingTime": int((settled - 8 * 3600) * 1000)},
+            {"fundingRate": "0.0002", "fundingTime": int(settled * 1000)},
+        ]
+        new_rows = rows[1:] + [{"fundingRate": "0.0003", "fundingTime": int((settled + 8 * 3600) * 1000)}]
+        fetch = _Counter([rows, new_rows])
+
+        cache.get("funding_rate_history", "/f", None, fetch)
+        clock.now = settled + 8 * 3600 - 1   # 超过固定 TTL，但尚未结算
+        assert cache.get("funding_rate_history", "/f", None, fetch) == rows
+        clock.now = settled + 8 * 3600 + 1   # 结算后立即刷新
+        assert cache.get("funding_rate_history", "/f", None, fetch) == new_rows
+        assert fetch.calls == 2
+
+    def test_funding_history_retries_while_settlement_pending(self, monkeypatch):
+        clock = _Clock()
+        _fake_clock(monkeypatch, clock)
+        cache = DataCache(ttls={"funding_rate_history": 1800})
+        # 最后结算 8h 前: 新费率尚未发布
+        rows = [{"fundingRate": "0.0001", "fundingTime": int((clock.now - 8 * 3600) * 1000)}]
+        fetch = _Counter([rows, rows])
+        cache.get("funding_rate_history", "/f", None, fetch)
+        clock.now += FUNDING_PENDING_RETRY_SEC - 1
+        cache.get("funding_rate_history", "/f", None, fetch)
+        assert fetch.calls == 1
+        clock.now += 2
+        cache.get("funding_rate_history", "/f", None, fetch)
+        assert fetch.calls == 2
+
+    def test_expired_beyond_stale_window_fetches_sync(self):
+        cache = DataCache(ttls={"t": 0.02}, max_stale_factor=1.0)
+        fetch = _Counter(["old", "new"])
+        cache.get("t", "/a", None, fetch)
+        time.sleep(0.05)
+        assert cache.get("t", "/a", None, fetch) == "new"
+
+    def test_failure_keeps_old_value_and_none_not_cached(self):
+        cache = DataCache(ttls={"t": 0.02}, max_stale_factor=1.0)
+        fetch = _Counter(["old"])
+        cache.get("t", "/a", None, fetch)
+        time.sleep(0.05)
+        assert cache.get("t", "/a", None, fetch) == "old"  # 刷新失败 → 旧值
+        assert cache.get_stats()["errors"] == 1
+
+        empty = _Counter([])
+        assert cache.get("t", "/b", None, empty) is None
+        assert cache.get("t", "/b", None, empty) is None
+        assert empty.calls == 2
+        assert cache.age("/b") is None
+
+    def test_disabled_passthrough(self):
+        cache = DataCache(enabled=False)
+        fetch = _Counter([1, 2])
+        assert cache.get("t", "/a", None, fetch) == 1
+        assert cache.get("t", "/a", None, fetch) == 2
+
+    def test_persist_and_warm_start(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        cache = DataCache(ttls={"t": 60}, persist_path=path)
+        cache.get("t", "/a", {"s": "BTC"}, _Counter([[1, 2, 3]]))
+        cache.save()
+
+        restored = DataCache(ttls={"t": 60}, persist_path=path)
+        fetch = _Counter(["fresh"])
+        assert restored.get("t", "/a", {"s": "BTC"}, fetch) == [1, 2, 3]
+        assert fetch.calls == 0
+        assert restored.age("/a", {"s": "BTC"}) is not None
+
+
+class TestClientCaching:
+    """测试客户端通过缓存去重请求"""
+
+    def test_funding_history_shared_between_clients(self):
+        from utils.binance_derivatives_client import BinanceDerivativesClient
+        from utils.binance_kline_client import BinanceKlineClient
+
+        cache = DataCache()
+        kline = BinanceKlineClient(cache=cache)
+        derivs = BinanceDerivativesClient(cache=cache)
+        calls = []
+        rows = [{"fundingRate": "0.0001", "fundingTime": 1}]
+        kline._fetch_funding_rate_history = lambda params: calls.append(params) or rows
+        derivs._fetch = lambda endpoint, params: calls.append(endpoint) or rows
+
+        assert kline.get_funding_rate_history(limit=10) == rows
+        assert derivs.get_funding_rate_history("BTCUSDT", 10) == rows
+        assert len(calls) == 1
+        assert kline.get_funding_rate_history_age(limit=10) is not None
+
+    def test_coinalyze_history_key_ignores_time_window(self):
+        from utils.coinalyze_client import CoinalyzeClient
+
+        cache = DataCache()
+        client = CoinalyzeClient(api_key="test", cache=cache)
+        calls = []
+        client._request_with_retry = lambda endpoint, params: calls.append(params) or {"history": []}
+
+        client.get_open_interest_history(hours=4)
+        time.sleep(1.1)  # from/to 时间戳变化
+        client.get_open_interest_history(hours=4)
+        assert len(calls) == 1
+
+        result = client.fetch_all()
+        assert result["_cache"]["max_age_sec"] is not None
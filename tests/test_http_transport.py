@@ -0,0 +1,83 @@
+# tests/test_http_transport.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.http_transport import HttpTransport
+from utils.binance_kline_client import BinanceKlineClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        if self.path.startswith("/fail"):
+            self.server.fail_count += 1
+            body = b"{}"
+            self.send_response(503)
+        else:
+            body = json.dumps([[1, "1", "2", "0.5", "1.5", "10", 2, "15", 3, "6", "9", "0"]]).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.fail_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpTransport:
+    """测试共享 HTTP 连接池"""
+
+    def test_connections_reused(self, local_server):
+        """同一 host 的顺序请求复用同一个连接"""
+        transport = HttpTransport(pool_maxsize=2, max_retries=0)
+        url = f"http://127.0.0.1:{local_server.server_port}/fapi/v1/klines"
+
+        for _ in range(5):
+            resp = transport.get(url, params={"limit": 1}, timeout=5)
+            assert resp.status_code == 200
+
+        stats = transport.get_stats()
+        host_stats = stats["hosts"][f"127.0.0.1:{local_server.server_port}"]
+        assert host_stats["requests"] == 5
+        assert host_stats["new_connections"] == 1
+        assert host_stats["reused_connections"] == 4
+        assert stats["reuse_ratio"] == pytest.approx(0.8)
+        transport.close()
+
+    def test_retries_on_5xx(self, local_server):
+        """5xx 按重试策略重发，最终返回最后一次响应"""
+        transport = HttpTransport(max_retries=2, backoff_factor=0)
+        url = f"http://127.0.0.1:{local_server.server_port}/fail"
+
+        resp = transport.get(url, timeout=5)
+        assert resp.status_code == 503
+        assert local_server.fail_count == 3
+        transport.close()
+
+    def test_client_injection(self, local_server):
+        """客户端使用注入的 transport"""
+        transport = HttpTransport(max_retries=0)
+        client = BinanceKlineClient(timeout=5, http=transport)
+        client.BASE_URL = f"http://127.0.0.1:{local_server.server_port}"
+
+        klines = client.get_klines(limit=1)
+        assert klines and float(klines[0][4]) == 1.5
+        assert transport.get_stats()["requests"] == 1
+        transport.close()
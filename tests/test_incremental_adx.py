@@ -0,0 +1,90 @@
+# tests/test_incremental_adx.py
+
+import json
+import os
+
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "adx_wilder_fixture.json")
+BAR_TYPE = BarType.from_str("BTCUSDT-PERP.BINANCE-15-MINUTE-LAST-EXTERNAL")
+
+
+def _load():
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+def _bar(row):
+    ts_ms, o, h, l, c, v = row
+    ts = ts_ms * 1_000_000
+    return Bar(BAR_TYPE, Price.from_str(o), Price.from_str(h), Price.from_str(l),
+               Price.from_str(c), Quantity.from_str(v), ts, ts)
+
+
+# 原实现在 recent_bars 滚动后于窗口起点重新播种 Wilder 平滑，与完整递推的偏差上限
+# (fixture 300 根 K 线实测: ADX 0.6, DI 0.1)
+MAX_TRIMMED_ADX_DIFF = 0.6
+MAX_TRIMMED_DI_DIFF = 0.1
+
+
+class TestIncrementalADX:
+    """测试增量 ADX/DI 与原全量重算实现 (fixture 中记录的输出) 一致"""
+
+    def test_snapshot_matches_recorded_values(self):
+        """recent_bars 未滚动前与原实现逐位一致"""
+        fixture = _load()
+        mgr = TechnicalIndicatorManager()
+        assert mgr.max_bars == fixture["max_bars"]
+        for row, expected in zip(fixture["bars"][:mgr.max_bars], fixture["adx_after_each_bar"]):
+            mgr.update(_bar(row))
+            assert mgr._calculate_adx() == expected
+
+    def test_trimmed_window_keeps_wilder_recursion(self):
+        """滚动后保持从第一根 K 线开始的 Wilder 递推 (= 原实现不截断时的输出)，
+        与原实现的截断窗口重算只差重新播种造成的小偏差"""
+        fixture = _load()
+        mgr = TechnicalIndicatorManager()
+        assert len(fixture["bars"]) >= 3 * mgr.max_bars
+        diverged = 0
+        rows = zip(fixture["bars"], fixture["adx_untrimmed_after_each_bar"], fixture["adx_after_each_bar"])
+        for i, (row, untrimmed, trimmed) in enumerate(rows, 1):
+            mgr.update(_bar(row))
+            actual = mgr._calculate_adx()
+            assert actual == untrimmed
+            if i <= mgr.max_bars:
+                continue
+            assert len(mgr.recent_bars) == mgr.max_bars
+            assert abs(actual['adx'] - trimmed['adx']) <= MAX_TRIMMED_ADX_DIFF + 1e-9
+            assert abs(actual['di_plus'] - trimmed['di_plus']) <= MAX_TRIMMED_DI_DIFF + 1e-9
+            assert abs(actual['di_minus'] - trimmed['di_minus']) <= MAX_TRIMMED_DI_DIFF + 1e-9
+            diverged += actual != trimmed
+        assert diverged > 0  # 确实覆盖了与原截断重算不同的区间
+
+    def test_history_matches_recorded_values(self):
+        fixture = _load()
+        mgr = TechnicalIndicatorManager()
+        checked = 0
+        for processed, row in enumerate(fixture["bars"], 1):
+            mgr.update(_bar(row))
+            expected = fixture["adx_history_35"].get(str(processed))
+            if expected is not None:
+                assert mgr._calculate_adx_history(count=35) == expected
+                checked += 1
+        assert checked == len(fixture["adx_history_35"])
+
+        context = mgr.get_historical_context(35)
+        assert context["adx_trend"][-1] == mgr.get_technical_data(float(mgr.recent_bars[-1].close))["adx"]
+
+    def test_insufficient_data(self):
+        fixture = _load()
+        mgr = TechnicalIndicatorManager()
+        for row in fixture["bars"][:28]:
+            mgr.update(_bar(row))
+        assert mgr._calculate_adx() == {
+            'adx': 0.0, 'di_plus': 0.0, 'di_minus': 0.0, 'adx_regime': 'INSUFFICIENT_DATA',
+        }
+        assert mgr._calculate_adx_history(count=35) == {"adx": [], "di_plus": [], "di_minus": []}
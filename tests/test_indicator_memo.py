@@ -0,0 +1,80 @@
+# tests/test_indicator_memo.py
+
+from indicators.multi_timeframe_manager import MultiTimeframeManager
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+class _Bar:
+    def __init__(self, i):
+        close = 50000.0 + (i % 11) * 35 - (i % 7) * 20
+        self.open = close - 10
+        self.high = close + 60
+        self.low = close - 70
+        self.close = close
+        self.volume = 100.0 + i
+        self.ts_event = self.ts_init = i * 900_000_000_000
+
+
+def _manager(bars=80):
+    mgr = TechnicalIndicatorManager()
+    for i in range(bars):
+        mgr.update(_Bar(i))
+    return mgr
+
+
+class TestIndicatorMemo:
+    """测试指标结果按 K 线缓存"""
+
+    def test_same_result_until_next_update(self):
+        mgr = _manager()
+        first = mgr.get_technical_data(50100.0)
+        assert mgr.get_technical_data(50100.0) == first
+        assert mgr.get_technical_data(50200.0) != first  # current_price 不同
+        context = mgr.get_historical_context(35)
+        assert mgr.get_historical_context(35) == context
+        klines = mgr.get_kline_data(10)
+        assert mgr.get_kline_data(10) == klines
+        assert len(mgr.get_kline_data(20)) == 20
+
+        stats = mgr.get_memo_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 5
+        assert stats["entries"] == 5
+
+        version = mgr.version
+        mgr.update(_Bar(80))
+        assert mgr.version == version + 1
+        assert mgr.get_memo_stats()["entries"] == 0
+        fresh = mgr.get_technical_data(50100.0)
+        assert fresh == mgr._compute_technical_data(50100.0)
+
+    def test_caller_mutation_does_not_leak(self):
+        mgr = _manager()
+        data = mgr.get_technical_data(50100.0)
+        expected = mgr._compute_technical_data(50100.0)
+        data["rsi"] = -1
+        data.clear()
+        context = mgr.get_historical_context(35)
+        context["price_trend"].append(0.0)
+        context["price_trend"][0] = 0.0
+        klines = mgr.get_kline_data(10)
+        klines[-1]["close"] = 0.0
+        klines.pop()
+
+        assert mgr.get_technical_data(50100.0) == expected
+        assert mgr.get_historical_context(35) == mgr._compute_historical_context(35)
+        assert mgr.get_kline_data(10) == mgr.history_bars.to_dicts(10)
+        assert mgr.get_memo_stats()["hits"] == 3
+
+    def test_entries_bounded(self):
+        mgr = _manager()
+        for i in range(TechnicalIndicatorManager.MEMO_MAX_ENTRIES + 10):
+            mgr.get_technical_data(50000.0 + i)
+        assert mgr.get_memo_stats()["entries"] == TechnicalIndicatorManager.MEMO_MAX_ENTRIES
+
+    def test_mtf_layer_does_not_modify_cached_result(self):
+        mtf = MultiTimeframeManager(config={"enabled": True})
+        mtf.decision_manager = _manager(120)
+        layer_data = mtf.get_technical_data_for_layer("decision", 50100.0)
+        assert layer_data["_layer"] == "decision"
+        assert "_layer" not in mtf.decision_manager.get_technical_data(50100.0)
@@ -0,0 +1,101 @@
+# tests/test_indicator_snapshot.py
+
+import math
+import time
+
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.technical_manager import TechnicalIndicatorManager
+from utils.indicator_snapshot import SNAPSHOT_MAGIC, SNAPSHOT_VERSION, IndicatorSnapshotStore
+
+
+BAR_TYPE = BarType.from_str("BTCUSDT-PERP.BINANCE-1-DAY-LAST-EXTERNAL")
+DAY_NS = 86_400 * 1_000_000_000
+
+
+def _bar(i, start_ns):
+    close = 50000 + 3000 * math.sin(i / 9) + 17 * (i % 7)
+    return Bar(
+        bar_type=BAR_TYPE,
+        open=Price(close - 40, 1),
+        high=Price(close + 120, 1),
+        low=Price(close - 150, 1),
+        close=Price(close, 1),
+        volume=Quantity(1000 + (i % 13) * 37, 3),
+        ts_event=start_ns + i * DAY_NS,
+        ts_init=start_ns + i * DAY_NS,
+    )
+
+
+def _manager():
+    return TechnicalIndicatorManager(sma_periods=[200], ema_periods=[12, 26])
+
+
+class TestIndicatorSnapshot:
+    """测试指标状态快照的保存 / 恢复"""
+
+    def test_restore_continues_identically(self, tmp_path):
+        start_ns = time.time_ns() - 300 * DAY_NS
+        original = _manager()
+        for i in range(260):
+            original.update(_bar(i, start_ns))
+
+        store = IndicatorSnapshotStore(str(tmp_path / "snap.bin"))
+        assert store.save({"trend": original}) > 0
+
+        restored_mgr = _manager()
+        restored = store.restore({"trend": restored_mgr})
+        assert restored == {"trend": original.last_bar_ts}
+        assert len(restored_mgr.recent_bars) == len(original.recent_bars)
+        assert restored_mgr.recent_bars[-1] == original.recent_bars[-1]
+
+        # 恢复后继续喂入新 K 线，结果与从未中断的实例完全一致
+        for i in range(260, 280):
+            original.update(_bar(i, start_ns))
+            restored_mgr.update(_bar(i, start_ns))
+        price = float(original.recent_bars[-1].close)
+        assert restored_mgr.get_technical_data(price) == original.get_technical_data(price)
+        assert restored_mgr.get_historical_context(20) == original.get_historical_context(20)
+        assert restored_mgr.smas[200].initialized
+
+    def test_config_mismatch_and_gap_are_skipped(self, tmp_path):
+        start_ns = time.time_ns() - 100 * DAY_NS
+        mgr = _manager()
+        for i in range(60):
+            mgr.update(_bar(i, start_ns))
+        store = IndicatorSnapshotStore(str(tmp_path / "snap.bin"))
+        store.save({"trend": mgr, "decision": mgr})
+
+        other = TechnicalIndicatorManager(sma_periods=[50])
+        fresh = _manager()
+        # decision: 参数不同; trend: 最后一根 K 线距今 ~40 天 > 允许缺口 10 天
+        restored = store.restore({"trend": fresh, "decision": other}, max_gap_ns={"trend": 10 * DAY_NS})
+        assert restored == {}
+        assert fresh.recent_bars == [] and other.recent_bars == []
+
+    def test_invalid_file_ignored(self, tmp_path):
+        path = tmp_path / "snap.bin"
+        path.write_bytes(b"garbage")
+        store = IndicatorSnapshotStore(str(path))
+        assert store.load() is None
+        assert store.restore({"trend": _manager()}) == {}
+        assert IndicatorSnapshotStore(str(tmp_path / "missing.bin")).load() is None
+
+    def test_older_version_rejected(self, tmp_path):
+        start_ns = time.time_ns() - 100 * DAY_NS
+        mgr = _manager()
+        for i in range(60):
+            mgr.update(_bar(i, start_ns))
+        path = tmp_path / "snap.bin"
+        store = IndicatorSnapshotStore(str(path))
+        store.save({"trend": mgr})
+
+        # 旧版本快照 (缺少新增状态键) 整体拒绝，而不是逐层恢复失败
+        blob = bytearray(path.read_bytes())
+        blob[len(SNAPSHOT_MAGIC)] = SNAPSHOT_VERSION - 1
+        path.write_bytes(bytes(blob))
+        fresh = _manager()
+        assert store.load() is None
+        assert store.restore({"trend": fresh}) == {}
+        assert len(fresh.history_bars) == 0
@@ -0,0 +1,99 @@
+# tests/test_kline_store.py
+
+import time
+
+from utils.kline_store import KlineStore, KlineWindow, INTERVAL_MS
+from utils.order_flow_processor import OrderFlowProcessor
+
+
+INTERVAL = INTERVAL_MS["15m"]
+
+
+def _row(open_time, close=100.0):
+    return [
+        open_time, str(close), str(close + 1), str(close - 1), str(close),
+        "10.0", open_time + INTERVAL - 1, "1000.0", 50, "6.0", "600.0", "0",
+    ]
+
+
+class _FakeExchange:
+    """模拟 Binance /fapi/v1/klines (limit / startTime)"""
+
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.requests = []
+
+    def get_klines(self, symbol="BTCUSDT", interval="15m", limit=50, start_time=None):
+        self.requests.append((limit, start_time))
+        forming_open = (self.now_ms // INTERVAL) * INTERVAL
+        if start_time is None:
+            opens = [forming_open - i * INTERVAL for i in range(limit)][::-1]
+        else:
+            opens = list(range(start_time, forming_open + 1, INTERVAL))[:limit]
+        return [_row(t, close=t / INTERVAL % 1000) for t in opens]
+
+
+class TestKlineStore:
+    """测试增量同步和未收盘 K 线分离"""
+
+    def _store(self, exchange, monkeypatch):
+        monkeypatch.setattr(time, "time", lambda: exchange.now_ms / 1000)
+        return KlineStore(client=exchange)
+
+    def test_initial_then_incremental(self, monkeypatch):
+        base = 1_700_000_000_000 // INTERVAL * INTERVAL
+        exchange = _FakeExchange(now_ms=base + 5_000)
+        store = self._store(exchange, monkeypatch)
+
+        window = store.get_klines("BTCUSDT", "15m", 50)
+        assert len(window) == 50
+        assert window[-1][0] == base - INTERVAL  # 最后一根已收盘
+        assert store.forming("BTCUSDT", "15m")[0] == base
+        assert exchange.requests == [(51, None)]
+
+        # 同一根 K 线内再次读取: 不请求
+        store.get_klines("BTCUSDT", "15m", 50)
+        assert len(exchange.requests) == 1
+
+        # 前进两根: 只请求 startTime 之后的数据
+        exchange.now_ms = base + 2 * INTERVAL + 1_000
+        window2 = store.get_klines("BTCUSDT", "15m", 50)
+        assert exchange.requests[-1] == (3, base)
+        assert window2[-1][0] == base + INTERVAL
+        assert [r[0] for r in window2] == [base - 48 * INTERVAL + i * INTERVAL for i in range(50)]
+
+        # 旧视图不受影响
+        assert window[-1][0] == base - INTERVAL
+        assert store.get_status()["BTCUSDT:15m"]["fetched_rows"] == 51 + 3
+
+    def test_include_forming(self, monkeypatch):
+        base = 1_700_000_000_000 // INTERVAL * INTERVAL
+        exchange = _FakeExchange(now_ms=base + 5_000)
+        store = self._store(exchange, monkeypatch)
+
+        window = store.get_klines("BTCUSDT", "15m", 10, include_forming=True)
+        assert len(window) == 11
+        assert window[-1][0] == base
+        assert [r[0] for r in window][-2] == base - INTERVAL
+
+    def test_deeper_request_refetches(self, monkeypatch):
+        base = 1_700_000_000_000 // INTERVAL * INTERVAL
+        exchange = _FakeExchange(now_ms=base + 5_000)
+        store = self._store(exchange, monkeypatch)
+
+        store.sync("BTCUSDT", "15m", min_bars=40)
+        store.sync("BTCUSDT", "15m", min_bars=200)
+        assert exchange.requests == [(41, None), (201, None)]
+        assert len(store.closed("BTCUSDT", "15m", 500)) == 200
+
+        ohlcv = store.get_ohlcv("BTCUSDT", "15m", 3)
+        assert len(ohlcv) == 3
+        assert ohlcv[-1]["timestamp"] == (base - INTERVAL) * 1_000_000
+
+    def test_window_feeds_order_flow(self):
+        rows = [_row(i * INTERVAL) for i in range(20)]
+        window = KlineWindow(rows, 5, 20)
+        result = OrderFlowProcessor().process_klines(window)
+        assert result["data_source"] == "binance_raw"
+        assert result["bars_count"] == 15
+        assert result["buy_ratio"] == 0.6
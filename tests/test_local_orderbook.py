@@ -0,0 +1,138 @@
+# tests/test_local_orderbook.py
+
+import time
+
+import pytest
+
+from utils.local_orderbook import (
+    LocalOrderBook,
+    OrderBookStream,
+    DIFF_APPLIED,
+    DIFF_STALE,
+    DIFF_GAP,
+)
+from utils.orderbook_processor import OrderBookProcessor
+
+
+SNAPSHOT = {
+    "lastUpdateId": 100,
+    "E": 1, "T": 1,
+    "bids": [["100.0", "1.0"], ["99.5", "2.0"], ["99.0", "3.0"]],
+    "asks": [["100.5", "1.5"], ["101.0", "2.5"], ["101.5", "3.5"]],
+}
+
+
+def _diff(first_id, final_id, prev_id, bids=(), asks=()):
+    return {
+        "e": "depthUpdate", "E": final_id, "T": final_id, "s": "BTCUSDT",
+        "U": first_id, "u": final_id, "pu": prev_id,
+        "b": [list(b) for b in bids], "a": [list(a) for a in asks],
+    }
+
+
+class TestLocalOrderBook:
+    """测试本地订单簿序列校验和价位数组"""
+
+    def test_snapshot_and_diffs(self):
+        book = LocalOrderBook()
+        book.apply_snapshot(SNAPSHOT)
+
+        # u < lastUpdateId: 丢弃
+        assert book.apply_diff(_diff(90, 95, 89, bids=[("100.0", "9")])) == DIFF_STALE
+        # 第一个事件覆盖 lastUpdateId
+        assert book.apply_diff(_diff(98, 105, 97, bids=[("100.2", "0.5")], asks=[("100.5", "0")])) == DIFF_APPLIED
+        # 后续事件 pu 必须等于上一个 u
+        assert book.apply_diff(_diff(106, 110, 105, bids=[("99.5", "0")], asks=[("102.0", "1")])) == DIFF_APPLIED
+
+        depth = book.to_depth_dict(limit=10)
+        assert depth["lastUpdateId"] == 110
+        assert [float(p) for p, _ in depth["bids"]] == [100.2, 100.0, 99.0]
+        assert [float(p) for p, _ in depth["asks"]] == [101.0, 101.5, 102.0]
+        assert book.best_bid() == 100.2
+        assert book.best_ask() == 101.0
+
+    def test_first_event_must_bridge_snapshot(self):
+        book = LocalOrderBook()
+        book.apply_snapshot(SNAPSHOT)
+        assert book.apply_diff(_diff(102, 105, 101)) == DIFF_GAP
+
+    def test_sequence_gap_detected(self):
+        book = LocalOrderBook()
+        book.apply_snapshot(SNAPSHOT)
+        assert book.apply_diff(_diff(100, 105, 99)) == DIFF_APPLIED
+        assert book.apply_diff(_diff(107, 110, 106)) == DIFF_GAP
+
+    def test_trim_far_levels(self):
+        book = LocalOrderBook(max_levels=3)
+        book.apply_snapshot(SNAPSHOT)
+        book.apply_diff(_diff(100, 101, 99, bids=[("98.0", "1")], asks=[("105.0", "1")]))
+        assert book.bids.prices == [99.0, 99.5, 100.0]
+        assert book.asks.prices == [100.5, 101.0, 101.5]
+
+    def test_processor_reads_depth_dict(self):
+        book = LocalOrderBook()
+        book.apply_snapshot(SNAPSHOT)
+        processor = OrderBookProcessor()
+        result = processor.process(book.to_depth_dict(100), current_price=100.25)
+        assert result["_status"]["code"] == "OK"
+        assert result["obi"]["simple"] == pytest.approx((6.0 - 7.5) / 13.5, abs=1e-4)
+
+
+class TestOrderBookStreamReplay:
+    """通过本地回放服务器测试 WebSocket 同步 (含断档重新同步)"""
+
+    def _run_replay(self, diffs, snapshot_delay_sec=0.05):
+        pytest.importorskip("aiohttp")
+        from utils.orderbook_replay import OrderBookReplayServer
+
+        server = OrderBookReplayServer(
+            snapshot=SNAPSHOT, diffs=diffs, interval_sec=0.005,
+            snapshot_delay_sec=snapshot_delay_sec,
+        )
+        server.start()
+        stream = OrderBookStream(
+            ws_base_url=server.ws_base_url,
+            rest_base_url=server.rest_base_url,
+            sample_interval_sec=0.01,
+            stale_after_sec=60,
+            reconnect_delay_sec=0.05,
+        )
+        stream.start()
+        try:
+            assert server.wait_finished(timeout=10)
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and stream.book.last_update_id < diffs[-1]["u"]:
+                time.sleep(0.02)
+            return server, stream
+        finally:
+            stream.stop()
+            server.stop()
+
+    def test_sync_and_history(self):
+        diffs = [_diff(90, 99, 89)]  # 快照之前，应被丢弃
+        diffs.append(_diff(99, 101, 99, bids=[("100.1", "4")]))
+        prev = 101
+        for i in range(30):
+            diffs.append(_diff(prev + 1, prev + 2, prev, asks=[("100.5", str(1 + i * 0.1))]))
+            prev += 2
+
+        server, stream = self._run_replay(diffs)
+        status = stream.get_status()
+        assert status["synced"]
+        assert status["last_update_id"] == prev
+        assert status["resync_count"] == 0
+        assert server.snapshot_requests == 1
+
+        depth = stream.book.to_depth_dict(5)
+        assert float(depth["bids"][0][0]) == 100.1
+        assert float(depth["asks"][0][1]) == pytest.approx(1 + 29 * 0.1)
+        assert stream.get_history()
+
+    def test_gap_triggers_resync(self):
+        diffs = [_diff(99, 101, 99)]
+        diffs.append(_diff(110, 112, 108))  # pu != 101 → 断档
+        diffs += [_diff(113, 115, 112), _diff(116, 118, 115)]
+
+        server, stream = self._run_replay(diffs, snapshot_delay_sec=0.0)
+        assert stream.resync_count >= 1
+        assert server.snapshot_requests >= 2
@@ -0,0 +1,54 @@
+# tests/test_lookback_requirements.py
+
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+class _Bar:
+    def __init__(self, i):
+        close = 50000.0 + (i % 13) * 25
+        self.open = close - 10
+        self.high = close + 40
+        self.low = close - 45
+        self.close = close
+        self.volume = 100.0 + i
+        self.ts_event = self.ts_init = i * 900_000_000_000
+
+
+class TestLookbackRequirements:
+    """测试按消费方声明的 K 线深度"""
+
+    def test_history_ring_sized_from_declarations(self):
+        mgr = TechnicalIndicatorManager(lookback_requirements={"sr_zones": 200, "volume_profile": 96})
+        assert mgr.max_bars == 95
+        assert mgr.history_bars.capacity == 200
+        for i in range(250):
+            mgr.update(_Bar(i))
+
+        assert len(mgr.recent_bars) == 95  # 指标状态缓冲不变
+        klines = mgr.get_kline_data(count=200)
+        assert len(klines) == 200
+        assert klines[-1]["timestamp"] == 249 * 900_000_000_000
+
+        report = mgr.get_lookback_report()
+        assert report["sr_zones"] == {
+            "required": 200, "available": 200, "capacity": 200, "buffer": "history", "ok": True,
+        }
+        assert report["adx_history"]["buffer"] == "indicator"
+        assert all(r["ok"] for r in report.values())
+
+    def test_declare_grows_ring_and_reports_shortfall(self):
+        mgr = TechnicalIndicatorManager()
+        for i in range(120):
+            mgr.update(_Bar(i))
+        assert len(mgr.get_kline_data(count=200)) == 95
+
+        mgr.declare_lookback("sr_zones", 200)
+        assert mgr.history_bars.capacity == 200
+        assert len(mgr.history_bars) == 95  # 已有 K 线保留
+        report = mgr.get_lookback_report()
+        assert report["sr_zones"]["available"] == 95
+        assert report["sr_zones"]["ok"] is False
+
+        for i in range(120, 230):
+            mgr.update(_Bar(i))
+        assert mgr.get_lookback_report()["sr_zones"]["ok"] is True
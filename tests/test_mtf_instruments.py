@@ -0,0 +1,96 @@
+# tests/test_mtf_instruments.py
+
+import pytest
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from indicators.multi_timeframe_manager import MultiTimeframeManager
+
+
+M15_NS = 15 * 60 * 1_000_000_000
+# 2024-01-01 00:00 UTC
+START_NS = 1_704_067_200 * 1_000_000_000
+
+
+def _bar_types(symbol):
+    return {
+        f"{layer}_bar_type": BarType.from_str(f"{symbol}-PERP.BINANCE-{spec}-LAST-EXTERNAL")
+        for layer, spec in (("trend", "1-DAY"), ("decision", "4-HOUR"), ("execution", "15-MINUTE"))
+    }
+
+
+def _exec_bar(bar_type, i, base):
+    close = base + (i % 9) * 3 - (i % 4) * 2
+    ts = START_NS + i * M15_NS + M15_NS - 1_000_000
+    return Bar(
+        bar_type=bar_type,
+        open=Price(close - 1, 2), high=Price(close + 4, 2), low=Price(close - 5, 2),
+        close=Price(close, 2), volume=Quantity(5 + i % 3, 3), ts_event=ts, ts_init=ts,
+    )
+
+
+def _mtf(local_aggregation=True):
+    return MultiTimeframeManager(
+        config={"enabled": True, "local_aggregation": local_aggregation},
+        **_bar_types("BTCUSDT"),
+    )
+
+
+class TestInstrumentRegistry:
+    """测试多品种注册表与路由"""
+
+    def test_primary_instrument_is_registered(self):
+        mtf = _mtf()
+        assert list(mtf.instruments) == ["BTCUSDT-PERP.BINANCE"]
+        assert mtf.get_instrument() is mtf.primary
+        assert mtf.trend_manager is mtf.primary.managers["trend"]
+
+    def test_instruments_are_isolated(self):
+        mtf = _mtf()
+        eth = _bar_types("ETHUSDT")
+        mtf.register_instrument("ETHUSDT-PERP.BINANCE", **eth)
+
+        btc_exec = mtf.execution_bar_type
+        bars = []
+        for i in range(32):
+            bars.append(_exec_bar(btc_exec, i, 42000.0))
+            bars.append(_exec_bar(eth["execution_bar_type"], i, 2300.0))
+        assert mtf.route_bars(bars) == {"execution": 64}
+
+        eth_state = mtf.get_instrument("ETHUSDT-PERP.BINANCE")
+        assert len(eth_state.managers["execution"].recent_bars) == 32
+        assert len(eth_state.managers["decision"].recent_bars) == 2
+        assert eth_state.managers["decision"].recent_bars[-1].close < 3000
+        assert mtf.decision_manager.recent_bars[-1].close > 40000
+        assert mtf.get_aggregation_stats("ETHUSDT-PERP.BINANCE")["emitted"]["4h"] == 2
+
+        data = mtf.get_technical_data_for_layer("execution", 2300.0, instrument="ETHUSDT-PERP.BINANCE")
+        assert data["_layer"] == "execution"
+
+    def test_duplicate_bar_type_rejected(self):
+        mtf = _mtf()
+        assert mtf.register_instrument("BTCUSDT-PERP.BINANCE") is mtf.primary
+        with pytest.raises(ValueError):
+            mtf.register_instrument("OTHER", execution_bar_type=mtf.execution_bar_type)
+
+    def test_unknown_bar_type(self):
+        mtf = _mtf()
+        bar = _exec_bar(_bar_types("SOLUSDT")["execution_bar_type"], 0, 100.0)
+        assert mtf.route_bar(bar) == "unknown"
+        assert mtf.route_bars([bar]) == {"unknown": 1}
+
+    def test_memory_grows_linearly(self):
+        mtf = _mtf(local_aggregation=False)
+        per_instrument = mtf.get_registry_stats()["nbytes"]
+        for n in range(9):
+            mtf.register_instrument(f"SYM{n}", **_bar_types(f"SYM{n}USDT"))
+        stats = mtf.get_registry_stats()
+        assert stats["instruments"] == 10 and stats["routes"] == 30
+        assert stats["nbytes"] == 10 * per_instrument
+
+    def test_disabled_manager(self):
+        mtf = MultiTimeframeManager(config={"enabled": False})
+        assert mtf.trend_manager is None
+        assert mtf.route_bars([]) == {}
+        with pytest.raises(RuntimeError):
+            mtf.register_instrument("ETHUSDT-PERP.BINANCE")
@@ -0,0 +1,113 @@
+# tests/test_parallel_fetcher.py
+
+import threading
+import time
+
+from utils.parallel_fetcher import (
+    ParallelDataFetcher,
+    FETCH_BUSY,
+    FETCH_OK,
+    FETCH_EMPTY,
+    FETCH_ERROR,
+    FETCH_TIMEOUT,
+)
+
+
+class TestParallelDataFetcher:
+    """测试并行数据获取阶段"""
+
+    def test_runs_concurrently(self):
+        """多个慢数据源并行执行，总耗时约等于最慢数据源"""
+        fetcher = ParallelDataFetcher(max_workers=4, deadline_sec=5.0)
+
+        def slow(value):
+            def _fn():
+                time.sleep(0.2)
+                return value
+            return _fn
+
+        start = time.monotonic()
+        result = fetcher.run({'a': slow(1), 'b': slow(2), 'c': slow(3), 'd': slow(4)})
+        elapsed = time.monotonic() - start
+        fetcher.shutdown()
+
+        assert elapsed < 0.6
+        assert [result.get(k) for k in 'abcd'] == [1, 2, 3, 4]
+        assert result.missing == []
+        assert all(o.latency_ms >= 150 for o in result.outcomes.values())
+
+    def test_missing_sources_marked(self):
+        """失败/空/超时数据源显式标记"""
+        fetcher = ParallelDataFetcher(max_workers=4, deadline_sec=0.3)
+
+        def boom():
+            raise RuntimeError("network down")
+
+        result = fetcher.run({
+            'ok': lambda: {'x': 1},
+            'empty': lambda: None,
+            'error': boom,
+            'slow': lambda: time.sleep(1.0) or 'late',
+        })
+        fetcher.shutdown()
+
+        assert result.outcomes['ok'].status == FETCH_OK
+        assert result.outcomes['empty'].status == FETCH_EMPTY
+        assert result.outcomes['error'].status == FETCH_ERROR
+        assert "network down" in result.outcomes['error'].error
+        assert result.outcomes['slow'].status == FETCH_TIMEOUT
+        assert result.get('slow') is None
+        assert result.get('error', 'default') == 'default'
+        assert sorted(result.missing) == ['empty', 'error', 'slow']
+        assert result.total_ms < 900
+
+    def test_preserves_task_order_and_summary(self):
+        """结果保持任务顺序，摘要不含原始数据"""
+        fetcher = ParallelDataFetcher(max_workers=2, deadline_sec=5.0)
+        result = fetcher.run({'z': lambda: 1, 'a': lambda: 2})
+        fetcher.shutdown()
+
+        assert list(result.outcomes) == ['z', 'a']
+        summary = result.to_dict()
+        assert set(summary['sources']) == {'z', 'a'}
+        assert summary['missing'] == []
+        assert 'value' not in summary['sources']['z']
+
+    def test_empty_tasks(self):
+        fetcher = ParallelDataFetcher()
+        result = fetcher.run({})
+        fetcher.shutdown()
+        assert result.outcomes == {}
+        assert result.missing == []
+
+    def test_hung_source_not_resubmitted_while_running(self):
+        """超时后仍在运行的数据源占用 worker: 报告为 in_flight，完成前不重复提交"""
+        fetcher = ParallelDataFetcher(max_workers=2, deadline_sec=0.2)
+        release = threading.Event()
+        calls = []
+
+        def hang():
+            calls.append(1)
+            release.wait(5)
+            return 'late'
+
+        first = fetcher.run({'hang': hang, 'ok': lambda: 1})
+        assert first.outcomes['hang'].status == FETCH_TIMEOUT
+        assert first.in_flight == ['hang']
+        assert first.to_dict()['in_flight'] == ['hang']
+
+        second = fetcher.run({'hang': hang, 'ok': lambda: 2})
+        assert second.outcomes['hang'].status == FETCH_BUSY
+        assert second.get('ok') == 2  # 另一个 worker 仍可用
+        assert second.in_flight == ['hang']
+        assert len(calls) == 1
+
+        release.set()
+        deadline = time.monotonic() + 2
+        while fetcher.in_flight() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        third = fetcher.run({'hang': hang})
+        fetcher.shutdown()
+        assert third.outcomes['hang'].status == FETCH_OK
+        assert third.in_flight == []
+        assert len(calls) == 2
@@ -0,0 +1,64 @@
+# tests/test_position_data_price.py
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.identifiers import PositionId
+from nautilus_trader.model.objects import Price, Quantity
+from nautilus_trader.model.position import Position
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+from nautilus_trader.test_kit.stubs.events import TestEventStubs
+from nautilus_trader.test_kit.stubs.execution import TestExecStubs
+
+from indicators.technical_manager import TechnicalIndicatorManager
+from strategy.deepseek_strategy import DeepSeekAIStrategy
+
+
+class _Strategy(DeepSeekAIStrategy):
+    # Actor 的 cache / clock / config 为只读属性，子类遮蔽后可注入 Mock
+    cache = None
+    clock = None
+    config = None
+
+
+@pytest.fixture
+def strategy():
+    instrument = TestInstrumentProvider.btcusdt_perp_binance()
+    order = TestExecStubs.market_order(
+        instrument=instrument, order_side=OrderSide.BUY, quantity=Quantity.from_str("0.010"),
+    )
+    fill = TestEventStubs.order_filled(
+        order, instrument, last_px=Price.from_str("60000.0"), position_id=PositionId("P-1"),
+    )
+
+    s = _Strategy.__new__(_Strategy)
+    s.instrument = instrument
+    s.instrument_id = instrument.id
+    s.binance_account = Mock(get_positions=Mock(return_value=[]))  # → NautilusTrader cache 回退
+    s.cache = Mock(positions_open=Mock(return_value=[Position(instrument=instrument, fill=fill)]))
+    s.clock = Mock(timestamp_ns=Mock(return_value=0))
+    s.config = Mock(leverage=5)
+    s.sltp_state = {}
+    s.indicator_manager = TechnicalIndicatorManager()
+    s.indicator_manager.update(SimpleNamespace(
+        open=60900.0, high=61100.0, low=60800.0, close=61000.0, volume=1.0, ts_init=1, ts_event=1,
+    ))
+    return s
+
+
+class TestPositionDataPrice:
+    """测试持仓数据在无 current_price 时回退到环形缓冲区收盘价"""
+
+    @pytest.mark.parametrize("current_price", [None, 0])
+    def test_falls_back_to_last_bar_close(self, strategy, current_price):
+        assert isinstance(strategy.indicator_manager.recent_bars[-1].close, float)
+        data = strategy._get_current_position_data(current_price=current_price)
+        assert data['current_price'] == 61000.0
+        assert data['unrealized_pnl'] == pytest.approx(10.0)
+        assert data['pnl_percentage'] == pytest.approx(1.67)
+
+    def test_accepts_float_price(self, strategy):
+        data = strategy._get_current_position_data(current_price=59000.0)
+        assert data['unrealized_pnl'] == pytest.approx(-10.0)
@@ -0,0 +1,64 @@
+# tests/test_prefetch_scheduler.py
+
+import time
+
+from utils.parallel_fetcher import ParallelDataFetcher, FETCH_OK, FETCH_ERROR
+from utils.prefetch_scheduler import PrefetchScheduler
+
+
+def _boom():
+    raise RuntimeError("down")
+
+
+class TestPrefetchScheduler:
+    """测试边界前预热和结果消费"""
+
+    def setup_method(self):
+        self.fetcher = ParallelDataFetcher(max_workers=4, deadline_sec=2.0)
+
+    def teardown_method(self):
+        self.fetcher.shutdown()
+
+    def test_collect_matching_target(self):
+        scheduler = PrefetchScheduler(self.fetcher, lead_time_sec=30)
+        assert scheduler.start(1000.0, {'sentiment': lambda: {'x': 1}, 'coinalyze': _boom})
+
+        result = scheduler.collect(1000.0, wait_sec=2.0)
+        assert result.get('sentiment') == {'x': 1}
+        assert result.outcomes['coinalyze'].status == FETCH_ERROR
+        # 只能消费一次
+        assert scheduler.collect(1000.0) is None
+        assert scheduler.get_stats()['used'] == 1
+
+    def test_wrong_target_ignored(self):
+        scheduler = PrefetchScheduler(self.fetcher)
+        scheduler.start(1000.0, {'a': lambda: 1})
+        assert scheduler.collect(1900.0, wait_sec=1.0) is None
+
+    def test_stale_result_discarded(self):
+        scheduler = PrefetchScheduler(self.fetcher, max_age_sec=0.05)
+        scheduler.start(1000.0, {'a': lambda: 1})
+        time.sleep(0.2)
+        assert scheduler.collect(1000.0) is None
+        assert scheduler.get_stats()['discarded'] == 1
+
+    def test_still_running_not_blocking(self):
+        scheduler = PrefetchScheduler(self.fetcher)
+        scheduler.start(1000.0, {'slow': lambda: time.sleep(0.5) or 1})
+        start = time.monotonic()
+        assert scheduler.collect(1000.0, wait_sec=0.05) is None
+        assert time.monotonic() - start < 0.3
+        # 上一次仍在运行时不重复启动
+        assert not scheduler.start(1900.0, {'a': lambda: 1})
+
+    def test_merge_with_boundary_fetch(self):
+        scheduler = PrefetchScheduler(self.fetcher)
+        scheduler.start(1000.0, {'sentiment': lambda: 's', 'coinalyze': _boom})
+        prewarmed = scheduler.collect(1000.0, wait_sec=2.0)
+
+        boundary = self.fetcher.run({'klines': lambda: [1], 'coinalyze': lambda: 'retry'})
+        merged = prewarmed.merge(boundary)
+        assert merged.get('sentiment') == 's'
+        assert merged.get('klines') == [1]
+        assert merged.outcomes['coinalyze'].status == FETCH_OK
+        assert merged.missing == []
@@ -0,0 +1,91 @@
+# tests/test_rolling_stats.py
+
+import math
+import random
+
+import pytest
+
+from indicators.rolling_stats import RollingWindowStats
+from indicators.technical_manager import TechnicalIndicatorManager
+
+
+class _Bar:
+    def __init__(self, i, close):
+        self.open = close - 5
+        self.high = close + 20
+        self.low = close - 25
+        self.close = close
+        self.volume = 100 + i % 17
+        self.ts_event = self.ts_init = i * 900_000_000_000
+
+
+def _bars(n, seed=7):
+    rnd = random.Random(seed)
+    price = 60000.0
+    out = []
+    for i in range(n):
+        price = round(price * (1 + rnd.gauss(0, 0.004)), 1)
+        out.append(_Bar(i, price))
+    return out
+
+
+def _legacy_window_stats(closes, period):
+    """原实现: 每个点重建窗口并求和"""
+    mean = sum(closes[-period:]) / period
+    variance = sum((x - mean) ** 2 for x in closes[-period:]) / period
+    return mean, variance ** 0.5
+
+
+class TestRollingWindowStats:
+    """测试滑动窗口均值 / 方差"""
+
+    def test_matches_full_recompute(self):
+        stats = RollingWindowStats(20)
+        values = [100 + 10 * math.sin(i / 3) for i in range(500)]
+        for i, x in enumerate(values):
+            leaving = values[i - 20] if stats.initialized else None
+            stats.push(x, leaving)
+            if stats.needs_resync():
+                stats.resync(values[i - 19:i + 1])
+            if i >= 19:
+                mean, std = _legacy_window_stats(values[:i + 1], 20)
+                assert stats.mean == pytest.approx(mean, rel=1e-12)
+                assert stats.std == pytest.approx(std, rel=1e-9, abs=1e-9)
+
+
+class TestRollingHistories:
+    """测试 SMA / BB 宽度历史与原逐点重算一致"""
+
+    @pytest.mark.parametrize("n", [60, 400])
+    def test_histories_match_legacy(self, n):
+        mgr = TechnicalIndicatorManager()
+        closes = []
+        for bar in _bars(n):
+            mgr.update(bar)
+            closes.append(bar.close)
+        window = closes[-mgr.max_bars:]
+
+        count = 35 if n > 100 else 10
+        expected_sma = {}
+        for period in mgr.sma_periods:
+            expected_sma[f"sma_{period}"] = [
+                round(sum(window[e - period + 1:e + 1]) / period, 2)
+                for e in range(len(window) - count, len(window))
+            ]
+        sma_history = mgr._calculate_sma_history(count)
+        assert sma_history.keys() == expected_sma.keys()
+        for key, values in expected_sma.items():
+            # 1 位小数价格的均值常落在 .xx5 上，舍入方向可能差 0.01
+            assert sma_history[key] == pytest.approx(values, abs=0.0100001)
+
+        expected_width = []
+        for e in range(len(window) - count, len(window)):
+            mean, std = _legacy_window_stats(window[:e + 1], mgr.bb_period)
+            expected_width.append(round((2 * mgr.bb_std * std) / mean * 100, 2))
+        assert mgr._calculate_bb_width_history(count) == pytest.approx(expected_width, abs=0.0100001)
+
+        _, std = _legacy_window_stats(window, mgr.bb_period)
+        assert mgr._calculate_std_dev(mgr.bb_period) == pytest.approx(std, rel=1e-9)
+        context = mgr.get_historical_context(count)
+        assert context["bb_width_trend"] == mgr._bb_width_history[-count:]
+        assert context["sma_history"] == sma_history
@@ -0,0 +1,159 @@
+# tests/test_sr_precompute_worker.py
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from utils.sr_precompute_worker import SRPrecomputeWorker
+from utils.sr_zone_calculator import SRZoneCalculator
+from utils.sr_zone_service import SRZoneService, candidate_walls_signature, report_inputs
+
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_market_fixture.json'
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    data = json.loads(FIXTURE_PATH.read_text())
+
+    def _bars(key):
+        return [
+            {'timestamp': int(k[0]), 'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+             'close': float(k[4]), 'volume': float(k[5])}
+            for k in data[key]
+        ]
+
+    bars_15m = _bars('klines_15m')[-200:]
+    bars_1d = _bars('klines_1d')[-120:]
+    return dict(
+        current_price=bars_15m[-1]['close'],
+        bars_data=bars_15m,
+        bars_data_4h=_bars('klines_4h')[-50:],
+        bars_data_1d=bars_1d,
+        daily_bar=bars_1d[-1],
+        atr_value=SRZoneCalculator._calculate_atr_from_bars(bars_15m),
+    )
+
+
+class TestPrecompute:
+    """测试后台预计算与 analyze() 命中"""
+
+    def setup_method(self):
+        self.service = SRZoneService()
+        self.calculator = SRZoneCalculator()
+        self.worker = SRPrecomputeWorker(self.service, self.calculator)
+
+    def test_analysis_hits_precomputed_snapshot(self, inputs):
+        self.worker.submit("15m", lambda: dict(inputs))
+        assert self.worker.wait(5.0)
+
+        technical = {'bb_upper': 1.01 * inputs['current_price'], 'bb_lower': 0.99 * inputs['current_price'],
+                     'bb_middle': inputs['current_price'], 'sma_50': inputs['current_price']}
+        snapshot = self.service.get(self.calculator, **inputs, **report_inputs(technical, None))
+        assert snapshot.origin == "precompute"
+        assert self.service.get_stats()['misses'] == 1
+        # BB/SMA 只影响报告文本: zones 复用，报告按本周期数据重新生成
+        assert snapshot.result['raw_data']['bb_data']['upper'] == technical['bb_upper']
+
+        stats = self.worker.get_stats()
+        assert stats['computed'] == 1 and not stats['running']
+        assert stats['last']['trigger'] == "15m"
+        assert stats['last']['precomputed'] is True
+
+    def test_requests_coalesce_latest_wins(self, inputs):
+        started, release = threading.Event(), threading.Event()
+        seen = []
+
+        def _blocking():
+            started.set()
+            release.wait(5.0)
+            seen.append("first")
+            return None
+
+        self.worker.submit("15m", _blocking)
+        assert started.wait(5.0)
+        self.worker.submit("4h", lambda: seen.append("4h"))
+        self.worker.submit("1d", lambda: dict(inputs))
+        release.set()
+        assert self.worker.wait(5.0)
+
+        stats = self.worker.get_stats()
+        assert seen == ["first"]
+        assert stats['coalesced'] == 1
+        assert stats['skipped'] == 1
+        assert stats['last']['trigger'] == "1d"
+
+    def test_failure_is_counted(self):
+        def _boom():
+            raise RuntimeError("kline store down")
+
+        self.worker.submit("timer", _boom)
+        assert self.worker.wait(5.0)
+        assert self.worker.get_stats()['failed'] == 1
+        assert self.service.latest is None
+
+    def test_restarts_after_idle(self, inputs):
+        for trigger in ("15m", "timer"):
+            self.worker.submit(trigger, lambda: dict(inputs))
+            assert self.worker.wait(5.0)
+        stats = self.worker.get_stats()
+        assert stats['computed'] == 2
+        # 第二次输入相同 → 缓存命中，不重复计算
+        assert self.service.get_stats()['hits'] == 1
+
+    def test_changed_walls_skip_wait_and_count_miss(self, inputs):
+        price = inputs['current_price']
+        wall = {'price': round(price * 0.97, 1), 'volume_btc': 80.0, 'multiplier': 5.0}
+        walls = {'bid_anomalies': [wall], 'ask_anomalies': []}
+        walls_key = candidate_walls_signature(walls, self.calculator, price)
+        assert walls_key is not None
+
+        started, release = threading.Event(), threading.Event()
+
+        def _blocking():
+            started.set()
+            release.wait(5.0)
+            return dict(inputs)
+
+        self.worker.submit("15m", _blocking, walls_key=None)  # 上一周期: 无候选墙
+        assert started.wait(5.0)
+        self.worker.submit("timer", lambda: dict(inputs), walls_key=None)
+        # 本周期出现候选墙 → 不等待，并丢弃尚未开始的请求
+        assert self.worker.wait_for(walls_key, 5.0) is False
+        release.set()
+        assert self.worker.wait(5.0)
+
+        snapshot = self.service.get(self.calculator, **inputs, orderbook_anomalies=walls)
+        assert snapshot.origin == "analysis"
+        assert self.worker.record_use(snapshot) is False
+        stats = self.worker.get_stats()
+        assert stats['wait_skipped'] == 1 and stats['discarded'] == 1
+        assert stats['computed'] == 1 and stats['misses'] == 1
+
+    def test_same_walls_wait_and_hit(self, inputs):
+        self.worker.submit("15m", lambda: dict(inputs), walls_key=None)
+        assert self.worker.wait_for(None, 5.0) is True
+        snapshot = self.service.get(self.calculator, **inputs)
+        assert self.worker.record_use(snapshot) is True
+        assert self.worker.get_stats()['hits'] == 1
+
+
+class TestReportInputs:
+    """测试 BB / SMA / 订单墙输入提取"""
+
+    def test_extracts_all(self):
+        walls = {'bid_anomalies': [{'price': 1.0}], 'ask_anomalies': []}
+        result = report_inputs(
+            {'bb_upper': 3.0, 'bb_lower': 1.0, 'bb_middle': 2.0, 'sma_200': 5.0},
+            {'anomalies': walls},
+        )
+        assert result['bb_data'] == {'upper': 3.0, 'lower': 1.0, 'middle': 2.0}
+        assert result['sma_data'] == {'sma_50': None, 'sma_200': 5.0}
+        assert result['orderbook_anomalies'] == walls
+
+    def test_missing_reports(self):
+        assert report_inputs(None, {'anomalies': {}}) == {
+            'bb_data': None, 'sma_data': None, 'orderbook_anomalies': None,
+        }
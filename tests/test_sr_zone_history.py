@@ -0,0 +1,169 @@
+# tests/test_sr_zone_history.py
+
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.sr_pivot_calculator import aggregate_weekly_bar
+from utils.sr_zone_calculator import SRZone, SRZoneCalculator
+from utils.sr_zone_history import HistoricalZoneSet, calculate_zone_history, zone_hit_rates
+
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_market_fixture.json'
+
+MS_15M = 900_000
+
+
+@pytest.fixture(scope="module")
+def market():
+    data = json.loads(FIXTURE_PATH.read_text())
+
+    def _bars(key):
+        return [
+            {'timestamp': int(k[0]), 'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+             'close': float(k[4]), 'volume': float(k[5])}
+            for k in data[key]
+        ]
+
+    return _bars('klines_15m'), _bars('klines_4h'), _bars('klines_1d')
+
+
+def _synthetic(n, interval_ms, start_ms, seed, price=60000.0):
+    rnd = random.Random(seed)
+    bars = []
+    for i in range(n):
+        o = price
+        price = round(price * (1 + rnd.gauss(0, 0.004)), 1)
+        bars.append({
+            'timestamp': start_ms + i * interval_ms,
+            'open': o,
+            'high': round(max(o, price) * (1 + abs(rnd.gauss(0, 0.002))), 1),
+            'low': round(min(o, price) * (1 - abs(rnd.gauss(0, 0.002))), 1),
+            'close': price,
+            'volume': 50 + rnd.random() * 100,
+        })
+    return bars
+
+
+def _signature(zones):
+    return [
+        (round(z.price_low, 6), round(z.price_high, 6), z.strength, z.level,
+         z.touch_count, round(z.total_weight, 6), tuple(z.sources))
+        for z in zones
+    ]
+
+
+def _zone(low, high, side, strength='LOW'):
+    return SRZone(price_low=low, price_high=high, price_center=(low + high) / 2, side=side,
+                  strength=strength, sources=[], total_weight=1.0, distance_pct=0.0,
+                  has_order_wall=False, wall_size_btc=0.0)
+
+
+class TestHistoryParity:
+    """测试批量结果与逐点 calculate() 一致"""
+
+    def test_matches_calculate_at_every_bar(self, market):
+        bars_15m, bars_4h, bars_1d = market
+        history = calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h, bars_1d)
+        assert len(history) == len(bars_15m) - 199
+
+        for entry in history[::7]:
+            close_time = bars_15m[entry.index]['timestamp'] + MS_15M
+            window = bars_15m[entry.index - 199:entry.index + 1]
+            window_4h = [b for b in bars_4h if b['timestamp'] + 16 * MS_15M <= close_time][-50:]
+            window_1d = [b for b in bars_1d if b['timestamp'] + 96 * MS_15M <= close_time][-120:]
+            atr = SRZoneCalculator._calculate_atr_from_bars(window)
+            expected = SRZoneCalculator().calculate(
+                current_price=window[-1]['close'],
+                bars_data=window,
+                bars_data_4h=window_4h,
+                bars_data_1d=window_1d,
+                daily_bar=window_1d[-1],
+                weekly_bar=aggregate_weekly_bar(window_1d),
+                atr_value=atr,
+            )
+            assert entry.atr == pytest.approx(atr, rel=1e-12)
+            assert _signature(entry.support_zones) == _signature(expected['support_zones'])
+            assert _signature(entry.resistance_zones) == _signature(expected['resistance_zones'])
+            assert entry.nearest_support is entry.support_zones[0]
+
+    def test_step_and_start(self, market):
+        bars_15m, bars_4h, bars_1d = market
+        full = calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h, bars_1d, start=220)
+        sampled = calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h, bars_1d, start=220, step=10)
+        assert [e.index for e in sampled] == list(range(220, len(bars_15m), 10))
+        by_index = {e.index: e for e in full}
+        for entry in sampled:
+            assert _signature(entry.support_zones) == _signature(by_index[entry.index].support_zones)
+
+    def test_15m_only_without_timestamps(self, market):
+        bars_15m = [{k: v for k, v in b.items() if k != 'timestamp'} for b in market[0]]
+        history = calculate_zone_history(SRZoneCalculator(), bars_15m, lookback=100)
+        assert len(history) == len(bars_15m) - 99
+        assert history[0].timestamp is None
+        with pytest.raises(ValueError):
+            calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h=market[1])
+
+    def test_thousands_of_bars_in_seconds(self):
+        bars_15m = _synthetic(1400, MS_15M, 130 * 96 * MS_15M, seed=3)
+        bars_4h = _synthetic(130 * 6 + 90, 16 * MS_15M, 0, seed=4)
+        bars_1d = _synthetic(145, 96 * MS_15M, 0, seed=5)
+        started = time.perf_counter()
+        history = calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h, bars_1d)
+        assert len(history) == 1201
+        assert time.perf_counter() - started < 15.0
+        assert all(e.support_zones or e.resistance_zones for e in history)
+
+
+class TestHitRates:
+    """测试 zone 守住 / 突破统计"""
+
+    BARS = [
+        {'high': 101.0, 'low': 99.0, 'close': 100.0},   # 0: 评估点
+        {'high': 100.5, 'low': 95.5, 'close': 96.5},    # 1: 触及支撑 95-96
+        {'high': 98.0, 'low': 94.2, 'close': 94.8},     # 2: 收盘跌破 95-96，触及 93.5-94.5
+        {'high': 97.5, 'low': 93.8, 'close': 94.0},     # 3: 93.5-94.5 守住
+        {'high': 95.0, 'low': 92.0, 'close': 93.0},     # 4: 收盘跌破 93.5-94.5
+    ]
+
+    def test_held_broken_untested(self):
+        entry = HistoricalZoneSet(
+            index=0, timestamp=None, price=100.0, atr=1.0,
+            support_zones=[_zone(95.0, 96.0, 'support', 'HIGH'), _zone(93.5, 94.5, 'support'),
+                           _zone(80.0, 81.0, 'support')],
+            resistance_zones=[_zone(102.0, 103.0, 'resistance')],
+        )
+        stats = zone_hit_rates([entry], self.BARS, horizon_bars=3)
+        groups = stats['groups']
+        assert stats['evaluations'] == 1
+        assert groups['support'] == {
+            'zones': 3, 'tested': 2, 'held': 1, 'broken': 1, 'test_rate': 0.6667, 'hold_rate': 0.5,
+        }
+        assert groups['nearest_support']['broken'] == 1
+        assert groups['HIGH']['broken'] == 1
+        assert groups['LOW']['held'] == 1
+        assert groups['resistance']['tested'] == 0
+        assert groups['resistance']['hold_rate'] == 0.0
+
+    def test_horizon_limits_window(self):
+        entry = HistoricalZoneSet(
+            index=0, timestamp=None, price=100.0, atr=1.0,
+            support_zones=[_zone(93.5, 94.5, 'support')],
+        )
+        assert zone_hit_rates([entry], self.BARS, horizon_bars=1)['groups']['support']['tested'] == 0
+        assert zone_hit_rates([entry], self.BARS, horizon_bars=3)['groups']['support']['held'] == 1
+        assert zone_hit_rates([entry], self.BARS, horizon_bars=4)['groups']['support']['broken'] == 1
+        # 评估点之后不足 K 根 → 跳过
+        assert zone_hit_rates([entry], self.BARS, horizon_bars=5)['evaluations'] == 0
+
+    def test_fixture_history(self, market):
+        bars_15m, bars_4h, bars_1d = market
+        history = calculate_zone_history(SRZoneCalculator(), bars_15m, bars_4h, bars_1d)
+        stats = zone_hit_rates(history, bars_15m, horizon_bars=16)
+        assert stats['evaluations'] == len(bars_15m) - 200 - 16 + 1
+        nearest = stats['groups']['nearest_support']
+        assert nearest['zones'] == stats['evaluations']
+        assert nearest['held'] + nearest['broken'] == nearest['tested']
@@ -0,0 +1,179 @@
+# tests/test_sr_zone_service.py
+
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.sr_zone_calculator import SRZoneCalculator
+from utils.sr_zone_service import SRZoneService, get_sr_zone_service, zone_summary
+
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_market_fixture.json'
+
+
+def _bars(key):
+    return [
+        {'timestamp': int(k[0]), 'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+         'close': float(k[4]), 'volume': float(k[5])}
+        for k in json.loads(FIXTURE_PATH.read_text())[key]
+    ]
+
+
+@pytest.fixture(scope="module")
+def market():
+    bars_15m = _bars('klines_15m')
+    return {
+        'bars_15m': bars_15m,
+        'bars_4h': _bars('klines_4h'),
+        'bars_1d': _bars('klines_1d'),
+        'price': bars_15m[-1]['close'],
+    }
+
+
+def _inputs(market, end=None, walls=None):
+    bars_15m = market['bars_15m'][:end] if end else market['bars_15m']
+    return dict(
+        bars_data=bars_15m[-200:],
+        bars_data_4h=market['bars_4h'][-50:],
+        bars_data_1d=market['bars_1d'][-120:],
+        daily_bar=market['bars_1d'][-1],
+        atr_value=SRZoneCalculator._calculate_atr_from_bars(bars_15m[-200:]),
+        orderbook_anomalies=walls,
+    )
+
+
+class TestSnapshotReuse:
+    """测试快照复用与失效条件"""
+
+    def test_same_inputs_hit(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        first = service.get(calculator, market['price'], **_inputs(market))
+        second = service.get(calculator, market['price'], **_inputs(market))
+        assert second is first
+        assert service.get_stats()['hits'] == 1
+        assert service.latest is first
+
+    def test_matches_direct_calculation(self, market):
+        snapshot = SRZoneService().get(SRZoneCalculator(), market['price'], **_inputs(market))
+        direct = SRZoneCalculator().calculate_with_detailed_report(current_price=market['price'], **_inputs(market))
+        assert list(snapshot.result['support_zones']) == direct['support_zones']
+        assert list(snapshot.result['resistance_zones']) == direct['resistance_zones']
+        assert snapshot.result['ai_detailed_report'] == direct['ai_detailed_report']
+        assert snapshot.compute_ms > 0
+
+    def test_new_bar_misses(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        service.get(calculator, market['price'], **_inputs(market, end=-1))
+        service.get(calculator, market['price'], **_inputs(market))
+        assert service.get_stats()['misses'] == 2
+
+    def test_price_bucket_and_boundary(self, market):
+        service = SRZoneService(price_bucket_pct=20.0)
+        calculator = SRZoneCalculator()
+        price = market['price']
+        snapshot = service.get(calculator, price, **_inputs(market))
+        zone = snapshot.result['nearest_support']
+        assert service.price_bucket(zone.price_center) == service.price_bucket(price)
+        # 同一分桶且未跨越边界 → 复用
+        nudged = (price + zone.price_high) / 2 if zone.price_high < price else price
+        assert service.get(calculator, nudged, **_inputs(market)) is snapshot
+        # 跨越最近 zone 边界 → 重新计算
+        assert snapshot.crosses_boundary(zone.price_center)
+        assert service.get(calculator, zone.price_center, **_inputs(market)) is not snapshot
+        assert service.get_stats()['boundary_misses'] == 1
+        # 不同分桶 → 不同键
+        assert service.price_bucket(price * 1.5) != service.price_bucket(price)
+
+    def test_config_change_misses(self, market):
+        service = SRZoneService()
+        service.get(SRZoneCalculator(), market['price'], **_inputs(market))
+        service.get(SRZoneCalculator(touch_threshold_atr=0.5), market['price'], **_inputs(market))
+        assert service.get_stats()['misses'] == 2
+
+    def test_report_only_wall_change_reuses_zones(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        price = market['price']
+        small = {'bid_anomalies': [{'price': price * 0.99, 'volume_btc': 5.0, 'multiplier': 3.0}],
+                 'ask_anomalies': []}
+        smaller = {'bid_anomalies': [{'price': price * 0.99, 'volume_btc': 6.0, 'multiplier': 3.2}],
+                   'ask_anomalies': []}
+        first = service.get(calculator, price, **_inputs(market, walls=small))
+        second = service.get(calculator, price, **_inputs(market, walls=smaller))
+        assert second.result['support_zones'] == first.result['support_zones']
+        assert '6.00 BTC' in second.result['ai_detailed_report']
+        assert service.get_stats()['misses'] == 1
+
+    def test_report_only_bb_sma_change_reuses_zones(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        price = market['price']
+        first = service.get(calculator, price, **_inputs(market))
+        bb = {'upper': price * 1.01, 'lower': price * 0.99, 'middle': price}
+        second = service.get(calculator, price, bb_data=bb, sma_data={'sma_50': price * 0.98}, **_inputs(market))
+        assert second.result['support_zones'] == first.result['support_zones']
+        assert second.result['raw_data']['bb_data'] == bb
+        assert second.result['ai_detailed_report'] != first.result['ai_detailed_report']
+        assert service.get_stats()['misses'] == 1
+
+    def test_no_candidate_walls_same_as_no_orderbook(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        price = market['price']
+        small = {'bid_anomalies': [{'price': price * 0.99, 'volume_btc': 5.0}], 'ask_anomalies': []}
+        service.get(calculator, price, **_inputs(market))
+        service.get(calculator, price, **_inputs(market, walls=small))
+        assert service.get_stats()['misses'] == 1
+
+    def test_candidate_wall_change_misses(self, market):
+        service = SRZoneService()
+        calculator = SRZoneCalculator()
+        price = market['price']
+        wall = {'bid_anomalies': [{'price': price * 0.98, 'volume_btc': 80.0}], 'ask_anomalies': []}
+        service.get(calculator, price, **_inputs(market))
+        snapshot = service.get(calculator, price, **_inputs(market, walls=wall))
+        assert service.get_stats()['misses'] == 2
+        assert any(z.has_order_wall for z in snapshot.result['support_zones'])
+
+    def test_disabled_always_recomputes(self, market):
+        service = SRZoneService(enabled=False)
+        calculator = SRZoneCalculator()
+        service.get(calculator, market['price'], **_inputs(market))
+        service.get(calculator, market['price'], **_inputs(market))
+        assert service.get_stats()['hits'] == 0
+
+    def test_lru_eviction(self, market):
+        service = SRZoneService(max_entries=2)
+        calculator = SRZoneCalculator()
+        for end in (-3, -2, -1):
+            service.get(calculator, market['price'], **_inputs(market, end=end))
+        assert service.get_stats()['entries'] == 2
+        service.invalidate()
+        assert service.get_stats()['entries'] == 0
+
+
+class TestImmutability:
+    """测试快照只读"""
+
+    def test_result_is_read_only(self, market):
+        snapshot = SRZoneService().get(SRZoneCalculator(), market['price'], **_inputs(market))
+        with pytest.raises(TypeError):
+            snapshot.result['support_zones'] = []
+        with pytest.raises(TypeError):
+            snapshot.result['hard_control']['block_long'] = True
+        assert isinstance(snapshot.result['support_zones'], tuple)
+        with pytest.raises(AttributeError):
+            snapshot.price = 1.0
+
+    def test_zone_summary(self, market):
+        snapshot = SRZoneService().get(SRZoneCalculator(), market['price'], **_inputs(market))
+        summary = snapshot.result['zone_summary']
+        assert summary == zone_summary(snapshot.result)
+        assert len(summary['support_zones']) <= 3
+        assert summary['support_zones'][0]['price'] == snapshot.result['support_zones'][0].price_center
+
+    def test_singleton(self):
+        assert get_sr_zone_service() is get_sr_zone_service()
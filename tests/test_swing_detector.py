@@ -0,0 +1,133 @@
+# tests/test_swing_detector.py
+
+import random
+
+import pytest
+
+from utils.sr_swing_detector import (
+    SwingDetector,
+    _sorted_volume_weight_factor,
+    _volume_weight_factor,
+    detect_swing_points,
+)
+from utils.sr_zone_calculator import SRLevel, SRZoneCalculator
+
+
+def _bars(n, seed=1, timestamps=True):
+    rnd = random.Random(seed)
+    price = 60000.0
+    bars = []
+    for i in range(n):
+        o = price
+        price = round(price * (1 + rnd.gauss(0, 0.004)), 1)
+        bar = {
+            'open': o,
+            'high': round(max(o, price) * (1 + abs(rnd.gauss(0, 0.002))), 1),
+            'low': round(min(o, price) * (1 - abs(rnd.gauss(0, 0.002))), 1),
+            'close': price,
+            # 重复成交量检验百分位的并列处理
+            'volume': 0.0 if i % 29 == 3 else float(rnd.choice([50, 100, 150, 200]) + rnd.randint(0, 3)),
+        }
+        if timestamps:
+            bar['timestamp'] = i * 900_000_000_000
+        bars.append(bar)
+    return bars
+
+
+def _as_tuples(candidates):
+    return [(c.price, c.source, c.weight, c.side, c.extra, c.level, c.timeframe) for c in candidates]
+
+
+PARAMS = [
+    dict(left_bars=5, right_bars=5, max_age=100),
+    dict(left_bars=3, right_bars=2, max_age=40),
+    dict(left_bars=2, right_bars=4, max_age=15),
+]
+
+
+class TestVolumeIndex:
+    """测试有序索引百分位与全量扫描一致"""
+
+    def test_rank_matches_scan(self):
+        rnd = random.Random(2)
+        volumes = [float(rnd.randint(1, 20)) for _ in range(200)]
+        ordered = sorted(volumes)
+        for probe in [0.0, 0.5, 1.0, 7.0, 10.5, 20.0, 25.0]:
+            assert _sorted_volume_weight_factor(probe, ordered) == _volume_weight_factor(probe, volumes)
+
+
+class TestStreamingParity:
+    """测试流式检测与整窗扫描一致"""
+
+    @pytest.mark.parametrize("params", PARAMS)
+    @pytest.mark.parametrize("timestamps", [True, False])
+    def test_growing_history(self, params, timestamps):
+        bars = _bars(300, seed=3, timestamps=timestamps)
+        detector = SwingDetector(**params)
+        for end in range(1, len(bars) + 1):
+            history = bars[:end]
+            price = history[-1]['close']
+            expected = detect_swing_points(history, price, timeframe="4h", base_weight=1.5,
+                                           level=SRLevel.INTERMEDIATE, **params)
+            actual = detector.detect(history, price, timeframe="4h", base_weight=1.5,
+                                     level=SRLevel.INTERMEDIATE)
+            assert _as_tuples(actual) == _as_tuples(expected)
+
+    @pytest.mark.parametrize("params", PARAMS)
+    def test_sliding_fixed_length_window(self, params):
+        bars = _bars(400, seed=4)
+        detector = SwingDetector(**params)
+        for end in range(200, len(bars) + 1, 3):
+            window = bars[end - 200:end]
+            expected = detect_swing_points(window, 60000.0, **params)
+            assert _as_tuples(detector.detect(window, 60000.0)) == _as_tuples(expected)
+
+    def test_incremental_sync_feeds_only_new_bars(self):
+        bars = _bars(150)
+        detector = SwingDetector()
+        assert detector.sync(bars[:120]) == 100
+        assert detector.sync(bars[:122]) == 2
+        assert detector.sync(bars[:122]) == 0
+
+    def test_revised_history_rebuilds(self):
+        bars = _bars(150, timestamps=False)
+        detector = SwingDetector()
+        detector.sync(bars[:120])
+        revised = [dict(b) for b in bars[:121]]
+        revised[-2]['high'] += 500.0  # 已喂入的 K 线被修改
+        assert detector.sync(revised) == 100
+        expected = detect_swing_points(revised, 60000.0)
+        assert _as_tuples(detector.candidates(60000.0)) == _as_tuples(expected)
+
+    def test_shorter_history_rebuilds(self):
+        bars = _bars(150)
+        detector = SwingDetector()
+        detector.sync(bars[:90])
+        assert detector.sync(bars[40:91]) == 51
+        expected = detect_swing_points(bars[40:91], 60000.0)
+        assert _as_tuples(detector.candidates(60000.0)) == _as_tuples(expected)
+
+    def test_old_swings_age_out(self):
+        detector = SwingDetector(left_bars=2, right_bars=2, max_age=10)
+        detector.sync(_bars(200))
+        assert len(detector) == 10
+        assert all(c.extra['bar_index'] >= 2 for c in detector.candidates(60000.0))
+        assert detector.sync([]) == 0
+        assert detector.swing_count == 0
+
+
+class TestZoneCalculatorIntegration:
+    """测试 SRZoneCalculator 跨周期复用检测器后结果不变"""
+
+    def test_reused_calculator_matches_fresh(self):
+        bars_15m = _bars(400, seed=8)
+        bars_4h = _bars(120, seed=9)
+        reused = SRZoneCalculator()
+        for end in range(200, 260, 7):
+            kwargs = dict(current_price=bars_15m[end - 1]['close'], bars_data=bars_15m[end - 200:end],
+                          bars_data_4h=bars_4h[:end // 4], bars_data_1d=bars_4h[:60])
+            first = reused.calculate(**kwargs)
+            fresh = SRZoneCalculator().calculate(**kwargs)
+            assert first['support_zones'] == fresh['support_zones']
+            assert first['resistance_zones'] == fresh['resistance_zones']
+        assert set(reused._swing_detectors) == {'15m', '4h', '1d'}
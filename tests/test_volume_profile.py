@@ -0,0 +1,177 @@
+# tests/test_volume_profile.py
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from utils.sr_volume_profile import (
+    RollingVolumeProfile,
+    calculate_volume_profile,
+    calculate_volume_profiles,
+)
+
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_market_fixture.json'
+
+
+def _reference_profile(bars, current_price, value_area_pct=70, min_bins=30, max_bins=80):
+    """原 O(bars × bins) 实现，返回 (VPOC, VAH, VAL, VPOC 成交量占比)"""
+    highs = [float(b['high']) for b in bars if float(b['high']) > 0]
+    lows = [float(b['low']) for b in bars if float(b['low']) > 0]
+    price_low, price_high = min(lows), max(highs)
+    price_range = price_high - price_low
+    num_bins = max(min_bins, min(max_bins, int(price_range / (current_price * 0.001))))
+    bin_size = price_range / num_bins
+    bin_edges = [price_low + i * bin_size for i in range(num_bins + 1)]
+    vol_bins = [0.0] * num_bins
+    for bar in bars:
+        high, low, volume = float(bar['high']), float(bar['low']), float(bar['volume'])
+        if high <= 0 or low <= 0 or volume <= 0:
+            continue
+        bar_range = high - low
+        for j in range(num_bins):
+            if low <= bin_edges[j + 1] and high >= bin_edges[j]:
+                if bar_range > 0:
+                    overlap = (min(high, bin_edges[j + 1]) - max(low, bin_edges[j])) / bar_range
+                else:
+                    overlap = 1.0
+                vol_bins[j] += volume * max(0, overlap)
+    total_volume = sum(vol_bins)
+    vpoc_idx = vol_bins.index(max(vol_bins))
+    va_volume, va_bins = 0.0, set()
+    for idx in sorted(range(num_bins), key=lambda i: vol_bins[i], reverse=True):
+        va_bins.add(idx)
+        va_volume += vol_bins[idx]
+        if va_volume >= total_volume * value_area_pct / 100.0:
+            break
+    return (
+        round((bin_edges[vpoc_idx] + bin_edges[vpoc_idx + 1]) / 2, 2),
+        round(bin_edges[max(va_bins) + 1], 2),
+        round(bin_edges[min(va_bins)], 2),
+        vol_bins[vpoc_idx] / total_volume * 100,
+    )
+
+
+def _levels(candidates):
+    return {c.source: c for c in candidates}
+
+
+def _random_bars(n, seed, doji_every=0):
+    rnd = random.Random(seed)
+    price = 60000.0
+    bars = []
+    for i in range(n):
+        o = price
+        price = round(price * (1 + rnd.gauss(0, 0.003)), 1)
+        high = round(max(o, price) * (1 + abs(rnd.gauss(0, 0.001))), 1)
+        low = round(min(o, price) * (1 - abs(rnd.gauss(0, 0.001))), 1)
+        if doji_every and i % doji_every == 0:
+            high = low = price
+        volume = 0.0 if i % 41 == 7 else rnd.uniform(10, 500)
+        bars.append({'open': o, 'high': high, 'low': low, 'close': price, 'volume': volume})
+    return bars
+
+
+def _fixture_bars():
+    klines = json.loads(FIXTURE_PATH.read_text())['klines_15m']
+    return [
+        {'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+         'close': float(k[4]), 'volume': float(k[5])}
+        for k in klines
+    ]
+
+
+def _assert_matches_reference(candidates, bars, current_price):
+    vpoc, vah, val, vpoc_pct = _reference_profile(bars, current_price)
+    levels = _levels(candidates)
+    assert levels['VP_VPOC'].price == vpoc
+    assert levels['VP_VPOC'].side == ('support' if vpoc < current_price else 'resistance')
+    assert levels['VP_VPOC'].extra['vpoc_volume_pct'] == pytest.approx(vpoc_pct, rel=1e-9)
+    assert ('VP_VAH' in levels) == (vah > current_price)
+    assert ('VP_VAL' in levels) == (val < current_price)
+    if 'VP_VAH' in levels:
+        assert levels['VP_VAH'].price == vah
+    if 'VP_VAL' in levels:
+        assert levels['VP_VAL'].price == val
+
+
+class TestReferenceParity:
+    """测试向量化实现与原逐 bin 循环一致"""
+
+    def test_fixture_windows(self):
+        bars = _fixture_bars()
+        for end in range(96, len(bars) + 1, 13):
+            window = bars[end - 96:end]
+            price = window[-1]['close']
+            _assert_matches_reference(calculate_volume_profile(window, price), window, price)
+
+    @pytest.mark.parametrize("seed", range(8))
+    @pytest.mark.parametrize("doji_every", [0, 5])
+    def test_random_bars(self, seed, doji_every):
+        bars = _random_bars(200, seed, doji_every)
+        price = bars[-1]['close'] * (1 + (seed - 4) * 0.002)
+        _assert_matches_reference(calculate_volume_profile(bars, price), bars, price)
+
+    def test_doji_on_bin_edge_counts_in_both_bins(self):
+        # 区间 [100, 130] 分 30 个 bin (bin_size=1)，十字星恰好落在边界 110
+        bars = [{'high': 130.0, 'low': 100.0, 'volume': 1.0}] * 10
+        bars += [{'high': 110.0, 'low': 110.0, 'volume': 1000.0}]
+        _assert_matches_reference(calculate_volume_profile(bars, 200.0), bars, 200.0)
+
+    def test_too_few_bars(self):
+        assert calculate_volume_profile(_random_bars(9, 1), 60000.0) == []
+
+    def test_bad_price_returns_empty(self):
+        assert calculate_volume_profile(_random_bars(50, 1), 0.0) == []
+
+
+class TestMultiLookback:
+    """测试多窗口一次计算"""
+
+    def test_matches_single_window(self):
+        bars = _random_bars(800, 3)
+        price = bars[-1]['close']
+        profiles = calculate_volume_profiles(bars, price)
+        assert set(profiles) == {96, 288, 672}
+        for lookback, candidates in profiles.items():
+            assert candidates == calculate_volume_profile(bars[-lookback:], price)
+
+    def test_short_history(self):
+        profiles = calculate_volume_profiles(_random_bars(50, 3), 60000.0, lookbacks=(5, 96))
+        assert profiles[5] == []
+        assert profiles[96]
+
+
+class TestRollingVolumeProfile:
+    """测试滚动窗口增量更新"""
+
+    def test_rolling_matches_batch(self):
+        bars = _random_bars(400, 9, doji_every=7)
+        rolling = RollingVolumeProfile(window=96)
+        for i, bar in enumerate(bars):
+            rolling.push(bar)
+            if i >= 9 and i % 11 == 0:
+                window = bars[max(0, i - 95):i + 1]
+                price = bar['close']
+                expected = _levels(calculate_volume_profile(window, price))
+                actual = _levels(rolling.profile(price))
+                assert set(actual) == set(expected)
+                for source, candidate in expected.items():
+                    assert actual[source].price == pytest.approx(candidate.price, abs=0.01)
+        assert len(rolling) == 96
+
+    def test_extend_keeps_last_window(self):
+        bars = _random_bars(150, 4)
+        rolling = RollingVolumeProfile(window=96)
+        rolling.extend(bars)
+        assert len(rolling) == 96
+        assert rolling._by_low.shape == rolling._by_high.shape
+        rolling.clear()
+        assert len(rolling) == 0
+        assert rolling.profile(60000.0) == []
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            RollingVolumeProfile(window=0)
@@ -0,0 +1,81 @@
+# tests/test_zone_touches.py
+
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.sr_zone_calculator import SRZone, SRZoneCalculator, count_zone_touches
+
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_market_fixture.json'
+
+
+def _fixture_bars(key):
+    return [
+        {'open': float(k[1]), 'high': float(k[2]), 'low': float(k[3]),
+         'close': float(k[4]), 'volume': float(k[5])}
+        for k in json.loads(FIXTURE_PATH.read_text())[key]
+    ]
+
+
+def _zone(low, high):
+    return SRZone(price_low=low, price_high=high, price_center=(low + high) / 2, side='support',
+                  strength='LOW', sources=[], total_weight=1.0, distance_pct=0.0,
+                  has_order_wall=False, wall_size_btc=0.0)
+
+
+def _per_zone(calculator, zones, bars, atr):
+    return [calculator._count_zone_touches(z.price_center, z.price_low, z.price_high, bars, atr)
+            for z in zones]
+
+
+class TestBatchTouchCount:
+    """测试批量触及计数与逐 zone 计数一致"""
+
+    @pytest.mark.parametrize("key,window", [('klines_15m', 200), ('klines_4h', 50), ('klines_1d', 120)])
+    def test_fixture_grid_of_zones(self, key, window):
+        bars = _fixture_bars(key)[-window:]
+        calculator = SRZoneCalculator()
+        atr = SRZoneCalculator._calculate_atr_from_bars(bars)
+        lows = [b['low'] for b in bars]
+        highs = [b['high'] for b in bars]
+        step = (max(highs) - min(lows)) / 60
+        zones = [_zone(min(lows) + i * step, min(lows) + i * step + step * (i % 4) * 0.5) for i in range(61)]
+        zones += [_zone(b['low'], b['low']) for b in bars[::17]]  # 零宽度且恰好落在 K 线边界
+        expected = _per_zone(calculator, zones, bars, atr)
+        assert calculator._count_zone_touches_batch(zones, bars, atr) == expected
+        assert sum(expected) > 0
+
+    def test_invalid_bars_do_not_break_runs(self):
+        rnd = random.Random(6)
+        bars = []
+        for i in range(300):
+            low = rnd.uniform(90, 110)
+            bars.append({'high': low + rnd.uniform(0, 5), 'low': low})
+            if i % 9 == 0:
+                bars.append({'high': 0, 'low': 0})
+            if i % 23 == 0:
+                bars.append({'high': 105.0})
+        zones = [_zone(v, v + w) for v in range(85, 120) for w in (0, 0.5, 2)]
+        calculator = SRZoneCalculator(touch_threshold_atr=0.2)
+        assert calculator._count_zone_touches_batch(zones, bars, 1.5) == _per_zone(calculator, zones, bars, 1.5)
+
+    def test_calculate_uses_batch_counts(self):
+        bars = _fixture_bars('klines_15m')[-200:]
+        calculator = SRZoneCalculator()
+        result = calculator.calculate(current_price=bars[-1]['close'], bars_data=bars)
+        atr = SRZoneCalculator._calculate_atr_from_bars(bars)
+        zones = result['support_zones'] + result['resistance_zones']
+        assert [z.touch_count for z in zones] == _per_zone(calculator, zones, bars, atr)
+
+    def test_edge_cases(self):
+        calculator = SRZoneCalculator()
+        zones = [_zone(100, 101)]
+        assert calculator._count_zone_touches_batch([], [{'high': 1, 'low': 1}], 1.0) == []
+        assert calculator._count_zone_touches_batch(zones, [], 1.0) == [0]
+        assert calculator._count_zone_touches_batch(zones, [{'high': 100.5, 'low': 99}], 0.0) == [0]
+        counts = count_zone_touches(np.array([1.0]), np.array([2.0]), np.array([0.0]), np.array([0.0]))
+        assert counts.tolist() == [0]
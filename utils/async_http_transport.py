@@ -0,0 +1,185 @@
+# utils/async_http_transport.py
+
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.binance_rate_governor import BinanceRateGovernor, get_rate_governor
+
+
+class AsyncHttpTransport:
+    """
+    共享异步 HTTP 传输层 (v6.0)
+
+    HttpTransport 的 asyncio 版本，供 utils/async_market_clients.py 中的异步数据客户端
+    和 Web 后端使用。接口与 HttpTransport.get() 一致，返回 httpx.Response
+    (status_code / json() / headers 与 requests.Response 用法相同)。
+
+    特性:
+    - 每个 host 一个 httpx.AsyncClient (keep-alive 连接池)
+    - 连接错误自动重试 (httpx transport retries)，429 / 5xx 交给各客户端处理
+    - fapi.binance.com 请求经 BinanceRateGovernor.acquire_async 排队，并回传已用权重
+    - 统计每个 host 的请求数 / 错误数
+
+    注意: httpx.AsyncClient 绑定创建它的事件循环，因此这里不提供进程级单例；
+    每个事件循环 (策略 fetch 阶段 / FastAPI 应用) 各自持有一个实例，用完调用 aclose()。
+    """
+
+    DEFAULT_USER_AGENT = "AItrader/1.0"
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        user_agent: str = DEFAULT_USER_AGENT,
+        logger: logging.Logger = None,
+        governor: BinanceRateGovernor = None,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        """
+        初始化异步传输层
+
+        Parameters
+        ----------
+        pool_maxsize : int
+            每个 host 的最大连接数
+        max_retries : int
+            连接错误的重试次数
+        user_agent : str
+            默认 User-Agent
+        logger : logging.Logger, optional
+            日志记录器
+        governor : BinanceRateGovernor, optional
+            Binance 权重调度器 (默认进程级单例，与同步客户端共享额度)
+        transport : httpx.AsyncBaseTransport, optional
+            自定义底层 transport (测试用 httpx.MockTransport)
+        """
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.max_retries = max(0, int(max_retries))
+        self.user_agent = user_agent
+        self.logger = logger or logging.getLogger(__name__)
+        self.governor = governor or get_rate_governor()
+        self._transport = transport
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._request_count: Dict[str, int] = {}
+        self._error_count: Dict[str, int] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """创建带连接池的 AsyncClient"""
+        transport = self._transport or httpx.AsyncHTTPTransport(
+            retries=self.max_retries,
+            limits=httpx.Limits(
+                max_connections=self.pool_maxsize,
+                max_keepalive_connections=self.pool_maxsize,
+            ),
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            headers={"User-Agent": self.user_agent},
+        )
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """
+        获取 URL 对应 host 的 AsyncClient (不存在则创建)
+
+        单个事件循环内无并发修改，无需加锁。
+        """
+        host = urlsplit(url).netloc
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[host] = client
+            self._request_count.setdefault(host, 0)
+            self._error_count.setdefault(host, 0)
+        return client
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        priority: Optional[int] = None,
+    ) -> httpx.Response:
+        """
+        发送 GET 请求
+
+        Parameters
+        ----------
+        url : str
+            完整 URL
+        params : Dict, optional
+            查询参数
+        headers : Dict, optional
+            额外请求头
+        timeout : float
+            请求超时 (秒)
+        priority : int, optional
+            Binance 权重优先级 (PRIORITY_HIGH / NORMAL / LOW)，默认按端点判定
+
+        Returns
+        -------
+        httpx.Response
+
+        Raises
+        ------
+        RateLimitDeferred
+            权重余量不足且超过排队时间
+        httpx.TimeoutException / httpx.HTTPError
+            网络错误
+        """
+        client = self.client_for(url)
+        host = urlsplit(url).netloc
+        governed = self.governor.applies_to(url)
+        if governed:
+            await self.governor.acquire_async(url, params, priority)
+        self._request_count[host] = self._request_count.get(host, 0) + 1
+        try:
+            response = await client.get(url, params=params, headers=headers, timeout=timeout)
+            if governed:
+                self.governor.observe(response.headers, response.status_code)
+            return response
+        except Exception:
+            self._error_count[host] = self._error_count.get(host, 0) + 1
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        请求统计
+
+        Returns
+        -------
+        Dict
+            {"hosts": {host: {"requests", "errors"}}, "requests": int, "errors": int}
+        """
+        hosts = {
+            host: {
+                "requests": self._request_count.get(host, 0),
+                "errors": self._error_count.get(host, 0),
+            }
+            for host in self._request_count
+        }
+        return {
+            "hosts": hosts,
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "errors": sum(h["errors"] for h in hosts.values()),
+        }
+
+    async def aclose(self):
+        """关闭所有 AsyncClient 和连接池"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
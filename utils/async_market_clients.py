@@ -0,0 +1,518 @@
+# utils/async_market_clients.py
+
+"""
+异步市场数据客户端 (v6.0)
+
+utils/*_client.py 的 asyncio 版本:
+- AsyncBinanceKlineClient       ← BinanceKlineClient
+- AsyncBinanceDerivativesClient ← BinanceDerivativesClient
+- AsyncBinanceOrderBookClient   ← BinanceOrderBookClient
+- AsyncCoinalyzeClient          ← CoinalyzeClient
+- AsyncSentimentDataFetcher     ← SentimentDataFetcher
+
+每个异步类继承对应的同步类，只覆盖发请求的方法；请求参数构建、响应解析、
+结果组装、趋势计算和 format_for_ai 等全部复用同步版本的实现，
+保证两种客户端返回完全相同的数据结构。
+
+与同步版本的区别:
+- 传输层为 AsyncHttpTransport (httpx.AsyncClient)，同样经 BinanceRateGovernor 排队
+- 重试等待使用 asyncio.sleep，不阻塞事件循环
+- fetch_all / get_funding_rate 等多端点方法用 asyncio.gather 并发请求
+- TTL 缓存经 DataCache.get_async，与同步客户端共享同一份缓存条目
+
+用法:
+    async with AsyncHttpTransport() as http:
+        klines = AsyncBinanceKlineClient(http=http)
+        derivatives = AsyncBinanceDerivativesClient(http=http)
+        bars, data = await asyncio.gather(
+            klines.get_klines("BTCUSDT", "15m", 50),
+            derivatives.fetch_all("BTCUSDT"),
+        )
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from utils.async_http_transport import AsyncHttpTransport
+from utils.binance_derivatives_client import BinanceDerivativesClient
+from utils.binance_kline_client import BinanceKlineClient
+from utils.binance_orderbook_client import BinanceOrderBookClient
+from utils.binance_rate_governor import RateLimitDeferred
+from utils.coinalyze_client import CoinalyzeClient
+from utils.data_cache import DataCache
+from utils.sentiment_client import SentimentDataFetcher
+
+
+class _AsyncTransportMixin:
+    """
+    异步传输层所有权管理
+
+    未传入 http 时客户端自建 AsyncHttpTransport，并在 aclose() 时关闭；
+    传入的共享实例由调用方负责关闭。
+    """
+
+    def _own_transport(
+        self,
+        http: Optional[AsyncHttpTransport],
+        logger: Optional[logging.Logger],
+    ) -> AsyncHttpTransport:
+        self._owns_http = http is None
+        return http or AsyncHttpTransport(logger=logger)
+
+    async def aclose(self):
+        """关闭自建的传输层"""
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+
+class AsyncBinanceKlineClient(_AsyncTransportMixin, BinanceKlineClient):
+    """BinanceKlineClient 的 asyncio 版本"""
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        logger: logging.Logger = None,
+        http: AsyncHttpTransport = None,
+        cache: DataCache = None,
+    ):
+        http = self._own_transport(http, logger)
+        super().__init__(timeout=timeout, logger=logger, http=http, cache=cache)
+
+    async def get_klines(
+        self,
+        symbol: str = "BTCUSDT",
+        interval: str = "15m",
+        limit: int = 50,
+        start_time: Optional[int] = None,
+    ) -> Optional[List[List]]:
+        """获取 K线数据 (完整 12 列)，见 BinanceKlineClient.get_klines()"""
+        try:
+            url = f"{self.BASE_URL}/fapi/v1/klines"
+            params = self._klines_params(symbol, interval, limit, start_time)
+
+            response = await self._http.get(url, params=params, timeout=self.timeout)
+
+            if response.status_code == 200:
+                return response.json()
+            self.logger.warning(
+                f"⚠️ Binance klines API error: {response.status_code}"
+            )
+            return None
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ Binance klines fetch error: {e}")
+            return None
+
+    async def get_current_price(self, symbol: str = "BTCUSDT") -> Optional[float]:
+        """获取当前价格"""
+        klines = await self.get_klines(symbol=symbol, interval="1m", limit=1)
+        if klines and len(klines) > 0:
+            return float(klines[-1][4])  # close price
+        return None
+
+    async def get_funding_rate(self, symbol: str = "BTCUSDT") -> Optional[Dict[str, Any]]:
+        """
+        获取资金费率数据 (已结算 + 预期)，见 BinanceKlineClient.get_funding_rate()
+
+        premiumIndex 与已结算费率两个请求并发发出。
+        """
+        premium, settled = await asyncio.gather(
+            self._http.get(
+                f"{self.BASE_URL}/fapi/v1/premiumIndex",
+                params={"symbol": symbol},
+                timeout=self.timeout,
+            ),
+            self._http.get(
+                f"{self.BASE_URL}/fapi/v1/fundingRate",
+                params={"symbol": symbol, "limit": 1},
+                timeout=self.timeout,
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(premium, Exception):
+            self.logger.warning(f"⚠️ Binance funding rate fetch error: {premium}")
+            return None
+        if premium.status_code != 200:
+            self.logger.warning(
+                f"⚠️ Binance premiumIndex API error: {premium.status_code}"
+            )
+            return None
+
+        settled_data = None
+        if isinstance(settled, Exception):
+            self.logger.debug(f"⚠️ Settled funding rate fetch error: {settled}")
+        elif settled.status_code == 200:
+            settled_data = settled.json()
+
+        try:
+            return self._parse_funding_rate(premium.json(), settled_data)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Binance funding rate fetch error: {e}")
+            return None
+
+    async def get_funding_rate_history(
+        self,
+        symbol: str = "BTCUSDT",
+        limit: int = 10,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """获取资金费率结算历史 (经 TTL 缓存)"""
+        params = {"symbol": symbol, "limit": limit}
+        return await self._cache.get_async(
+            "funding_rate_history", "/fapi/v1/fundingRate", params,
+            lambda: self._fetch_funding_rate_history(params),
+        )
+
+    async def _fetch_funding_rate_history(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """直接请求资金费率历史 (不经缓存)"""
+        try:
+            url = f"{self.BASE_URL}/fapi/v1/fundingRate"
+
+            response = await self._http.get(url, params=params, timeout=self.timeout)
+
+            if response.status_code == 200:
+                return response.json()
+            self.logger.warning(
+                f"⚠️ Binance funding rate history API error: {response.status_code}"
+            )
+            return None
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ Binance funding rate history fetch error: {e}")
+            return None
+
+
+class AsyncBinanceDerivativesClient(_AsyncTransportMixin, BinanceDerivativesClient):
+    """
+    BinanceDerivativesClient 的 asyncio 版本
+
+    同步版本的 get_top_long_short_account_ratio / get_ticker_24hr / get_depth 等方法
+    只是构建 (endpoint, params) 后 return self._request(...)；这里把 _request 覆盖为协程，
+    因此继承下来的这些方法直接返回 awaitable，无需逐个重写:
+
+        ratio = await client.get_top_long_short_position_ratio("BTCUSDT", "15m", 10)
+    """
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        logger: logging.Logger = None,
+        config: dict = None,
+        http: AsyncHttpTransport = None,
+        cache: DataCache = None,
+    ):
+        http = self._own_transport(http, logger)
+        super().__init__(timeout=timeout, logger=logger, config=config, http=http, cache=cache)
+
+    async def _request(self, endpoint: str, params: dict) -> Optional[Any]:
+        """通用请求方法 (可缓存端点经 TTL 缓存)"""
+        data_type = self.CACHE_TYPES.get(endpoint)
+        if data_type is None:
+            return await self._fetch(endpoint, params)
+        return await self._cache.get_async(data_type, endpoint, params, lambda: self._fetch(endpoint, params))
+
+    async def _fetch(self, endpoint: str, params: dict) -> Optional[Any]:
+        """直接请求 (不经缓存)"""
+        try:
+            url = f"{self.BASE_URL}{endpoint}"
+            response = await self._http.get(url, params=params, timeout=self.timeout)
+            return self._parse_response(endpoint, response)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Binance API request error: {e}")
+            return None
+
+    async def fetch_all(
+        self,
+        symbol: str = "BTCUSDT",
+        period: str = "15m",
+        history_limit: int = 10,
+    ) -> Dict[str, Any]:
+        """一次性并发获取所有 Binance 衍生品数据，见 BinanceDerivativesClient.fetch_all()"""
+        results = await asyncio.gather(
+            self.get_top_long_short_account_ratio(symbol, period, history_limit),
+            self.get_top_long_short_position_ratio(symbol, period, history_limit),
+            self.get_taker_long_short_ratio(symbol, period, history_limit),
+            self.get_open_interest_hist(symbol, period, history_limit),
+            self.get_funding_rate_history(symbol, history_limit),
+            self.get_ticker_24hr(symbol),
+        )
+        return self._assemble_fetch_all(symbol, period, history_limit, *results)
+
+
+class AsyncBinanceOrderBookClient(_AsyncTransportMixin, BinanceOrderBookClient):
+    """BinanceOrderBookClient 的 asyncio 版本"""
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+        logger: logging.Logger = None,
+        http: AsyncHttpTransport = None,
+        base_url: str = None,
+    ):
+        http = self._own_transport(http, logger)
+        super().__init__(
+            timeout=timeout,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            logger=logger,
+            http=http,
+            base_url=base_url,
+        )
+
+    async def get_order_book(
+        self,
+        symbol: str = "BTCUSDT",
+        limit: int = 100,
+    ) -> Optional[Dict]:
+        """获取订单簿深度，见 BinanceOrderBookClient.get_order_book()"""
+        url = f"{self.BASE_URL}/fapi/v1/depth"
+        params = {
+            "symbol": symbol,
+            "limit": limit,
+        }
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._http.get(url, params=params, timeout=self.timeout)
+
+                data, retry = self._handle_response(response, attempt)
+                if not retry:
+                    return data
+
+            except httpx.TimeoutException:
+                self.logger.warning(
+                    f"⚠️ Request timeout after {self.timeout}s, "
+                    f"attempt {attempt+1}/{self.max_retries+1}"
+                )
+
+            except Exception as e:
+                self.logger.error(f"❌ Order book fetch error: {e}")
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay)
+
+        return None
+
+
+class AsyncCoinalyzeClient(_AsyncTransportMixin, CoinalyzeClient):
+    """CoinalyzeClient 的 asyncio 版本"""
+
+    def __init__(
+        self,
+        api_key: str = None,
+        timeout: int = 10,
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+        logger: logging.Logger = None,
+        http: AsyncHttpTransport = None,
+        cache: DataCache = None,
+    ):
+        http = self._own_transport(http, logger)
+        super().__init__(
+            api_key=api_key,
+            timeout=timeout,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            logger=logger,
+            http=http,
+            cache=cache,
+        )
+
+    async def _request_with_retry(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+    ) -> Optional[Dict]:
+        """带重试的 HTTP 请求，见 CoinalyzeClient._request_with_retry()"""
+        url = f"{self.BASE_URL}{endpoint}"
+        headers = self._get_headers()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._http.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=self.timeout,
+                )
+
+                data, delay = self._handle_response(response, attempt)
+                if delay is None:
+                    return data
+                await asyncio.sleep(delay)
+                continue
+
+            except httpx.TimeoutException:
+                self.logger.warning(
+                    f"⚠️ Coinalyze timeout (attempt {attempt + 1}/{self.max_retries + 1})"
+                )
+            except (httpx.HTTPError, RateLimitDeferred) as e:
+                self.logger.warning(
+                    f"⚠️ Coinalyze request error (attempt {attempt + 1}): {e}"
+                )
+
+            # 指数退避
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay * (2 ** attempt))
+
+        return None
+
+    async def _cached_request(
+        self,
+        data_type: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_params: Dict[str, Any] = None,
+    ) -> Optional[Dict]:
+        """经 TTL 缓存的请求"""
+        key_params = cache_params if cache_params is not None else params
+        result = await self._cache.get_async(
+            data_type, endpoint, key_params,
+            lambda: self._request_with_retry(endpoint=endpoint, params=params),
+        )
+        self._last_ages[endpoint] = self._cache.age(endpoint, key_params) if result is not None else None
+        return result
+
+    async def get_open_interest(self, symbol: str = None) -> Optional[Dict]:
+        """获取当前 Open Interest (value 为 BTC 数量)"""
+        if not self._enabled:
+            return None
+
+        symbol = symbol or self.DEFAULT_SYMBOL
+        return await self._cached_request(
+            "coinalyze_current",
+            endpoint="/open-interest",
+            params={"symbols": symbol},
+        )
+
+    async def _get_history(self, endpoint: str, symbol: str, interval: str, hours: int) -> Optional[Dict]:
+        if not self._enabled:
+            return None
+
+        symbol = symbol or self.DEFAULT_SYMBOL
+        params, cache_params = self._history_params(symbol, interval, hours)
+        return await self._cached_request(
+            "coinalyze_history",
+            endpoint=endpoint,
+            params=params,
+            cache_params=cache_params,
+        )
+
+    async def get_liquidations(
+        self,
+        symbol: str = None,
+        interval: str = "1hour",
+        hours: int = 24,
+    ) -> Optional[Dict]:
+        """获取清算历史 (l/s 为 BTC 单位)"""
+        return await self._get_history("/liquidation-history", symbol, interval, hours)
+
+    async def get_open_interest_history(
+        self,
+        symbol: str = None,
+        interval: str = "1hour",
+        hours: int = 4,
+    ) -> Optional[Dict]:
+        """获取 OI 历史数据 (OHLC 格式)"""
+        return await self._get_history("/open-interest-history", symbol, interval, hours)
+
+    async def get_long_short_ratio_history(
+        self,
+        symbol: str = None,
+        interval: str = "1hour",
+        hours: int = 4,
+    ) -> Optional[Dict]:
+        """获取多空比历史数据"""
+        return await self._get_history("/long-short-ratio-history", symbol, interval, hours)
+
+    async def fetch_all(self, symbol: str = None) -> Dict[str, Any]:
+        """并发获取 OI + 清算，见 CoinalyzeClient.fetch_all()"""
+        if not self._enabled:
+            return {
+                "open_interest": None,
+                "liquidations": None,
+                "enabled": False,
+            }
+
+        oi, liq = await asyncio.gather(
+            self.get_open_interest(symbol),
+            self.get_liquidations(symbol),
+        )
+        return self._assemble_fetch_all(oi, liq)
+
+    async def fetch_all_with_history(
+        self,
+        symbol: str = None,
+        history_hours: int = 4,
+    ) -> Dict[str, Any]:
+        """并发获取当前值 + 历史数据，见 CoinalyzeClient.fetch_all_with_history()"""
+        if not self._enabled:
+            return {
+                "open_interest": None,
+                "liquidations": None,
+                "open_interest_history": None,
+                "long_short_ratio_history": None,
+                "trends": {},
+                "enabled": False,
+            }
+
+        oi, liq, oi_hist, ls_hist = await asyncio.gather(
+            self.get_open_interest(symbol),
+            self.get_liquidations(symbol),
+            self.get_open_interest_history(symbol, hours=history_hours),
+            self.get_long_short_ratio_history(symbol, hours=history_hours),
+        )
+        return self._assemble_fetch_all_with_history(oi, liq, oi_hist, ls_hist)
+
+
+class AsyncSentimentDataFetcher(_AsyncTransportMixin, SentimentDataFetcher):
+    """SentimentDataFetcher 的 asyncio 版本"""
+
+    def __init__(
+        self,
+        lookback_hours: int = 4,
+        timeframe: str = "15m",
+        timeout: float = 10.0,
+        http: Optional[AsyncHttpTransport] = None,
+    ):
+        http = self._own_transport(http, None)
+        super().__init__(
+            lookback_hours=lookback_hours,
+            timeframe=timeframe,
+            timeout=timeout,
+            http=http,
+        )
+
+    async def fetch(self, token: str = "BTC") -> Optional[Dict[str, Any]]:
+        """获取情绪数据 (含历史序列)，见 SentimentDataFetcher.fetch()"""
+        try:
+            params = self._build_params(token)
+            if params is None:
+                return None
+
+            response = await self._http.get(
+                self.BINANCE_URL,
+                params=params,
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                return self._parse_response(response.json())
+
+            print(f"⚠️ Binance API returned unexpected response: {response.status_code}")
+            return None
+
+        except Exception as e:
+            print(f"❌ Sentiment data fetch failed: {e}")
+            return None
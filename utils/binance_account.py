@@ -9,10 +9,29 @@ import time
 import hmac
 import hashlib
 import logging
-import urllib.request
-import urllib.error
-import json
-from typing import Dict, Any, Optional
+import threading
+from typing import Callable, Dict, Any, Optional
+
+from utils.http_transport import HttpTransport, get_http_transport
+
+
+# v6.0: Per-endpoint freshness policy (seconds a cached response may be reused).
+# 'account' defaults to the legacy cache_ttl; order/position events invalidate explicitly.
+DEFAULT_FRESHNESS: Dict[str, float] = {
+    'account': 5.0,       # /fapi/v2/account (balance + positions + leverage)
+    'open_orders': 3.0,   # /fapi/v1/openOrders
+    'price': 1.0,         # /fapi/v1/ticker/price
+    'trades': 10.0,       # /fapi/v1/userTrades
+    'income': 30.0,       # /fapi/v1/income
+}
+
+
+class _InFlight:
+    """A single in-progress request that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
 
 
 class BinanceAccountFetcher:
@@ -35,6 +54,8 @@ class BinanceAccountFetcher:
         cache_ttl: float = 5.0,
         recv_window: int = 5000,
         api_timeout: float = 10.0,
+        http: Optional[HttpTransport] = None,
+        freshness: Optional[Dict[str, float]] = None,
     ):
         """
         Initialize Binance account fetcher.
@@ -48,25 +69,40 @@ class BinanceAccountFetcher:
         logger : logging.Logger, optional
             Logger instance
         cache_ttl : float, optional
-            Cache time-to-live (seconds), default: 5.0
+            Account info cache time-to-live (seconds), default: 5.0
         recv_window : int, optional
             Binance API receive window (ms), default: 5000
         api_timeout : float, optional
             API request timeout (seconds), default: 10.0
+        http : HttpTransport, optional
+            Shared keep-alive connection pool (defaults to process-wide instance)
+        freshness : dict, optional
+            v6.0: Per-endpoint freshness overrides (seconds), see DEFAULT_FRESHNESS.
+            'account' falls back to cache_ttl.
         """
         self.api_key = api_key or os.getenv('BINANCE_API_KEY', '')
         self.api_secret = api_secret or os.getenv('BINANCE_API_SECRET', '')
         self.logger = logger or logging.getLogger(__name__)
 
-        # Cache for rate limiting
-        self._cache: Dict[str, Any] = {}
-        self._cache_time: float = 0
-        self._cache_ttl: float = cache_ttl
+        # v6.0: Response cache + single-flight coalescing.
+        # The strategy thread, Telegram command thread and heartbeat all read account
+        # state; concurrent identical requests share one in-flight signed REST call.
+        self._freshness: Dict[str, float] = dict(DEFAULT_FRESHNESS, account=cache_ttl)
+        if freshness:
+            self._freshness.update({k: float(v) for k, v in freshness.items()})
+        self._cache: Dict[tuple, tuple] = {}  # (kind, *args) -> (fetched_at, data)
+        self._inflight: Dict[tuple, _InFlight] = {}
+        self._cache_lock = threading.Lock()
+        self._generation: int = 0  # bumped by invalidate(); stale in-flight results are not cached
+        self._stats: Dict[str, int] = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'invalidations': 0}
 
         # Binance API configuration
         self._recv_window: int = recv_window
         self._api_timeout: float = api_timeout
 
+        # v6.0: Shared keep-alive connection pool (replaces per-call urllib connections)
+        self._http: HttpTransport = http or get_http_transport()
+
         # Binance server time offset (local_time + offset = binance_time)
         self._time_offset_ms: int = 0
         self._time_offset_synced: bool = False
@@ -85,14 +121,12 @@ class BinanceAccountFetcher:
         """
         try:
             url = f"{self.BASE_URL}/fapi/v1/time"
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "AItrader/1.0"
-            })
 
             t_before = int(time.time() * 1000)
-            response = urllib.request.urlopen(req, timeout=self._api_timeout)
+            response = self._http.get(url, timeout=self._api_timeout)
             t_after = int(time.time() * 1000)
-            data = json.loads(response.read())
+            response.raise_for_status()
+            data = response.json()
 
             server_time = data.get('serverTime', 0)
             if server_time <= 0:
@@ -162,20 +196,19 @@ class BinanceAccountFetcher:
                 url = f"{self.BASE_URL}{endpoint}?{query_string}"
 
                 # Make request
-                req = urllib.request.Request(url, headers={
-                    "X-MBX-APIKEY": self.api_key,
-                    "User-Agent": "AItrader/1.0"
-                })
+                response = self._http.get(
+                    url,
+                    headers={"X-MBX-APIKEY": self.api_key},
+                    timeout=self._api_timeout,
+                )
 
-                response = urllib.request.urlopen(req, timeout=self._api_timeout)
-                data = json.loads(response.read())
-                return data
+                if response.status_code == 200:
+                    return response.json()
 
-            except urllib.error.HTTPError as e:
-                error_body = e.read().decode()[:200]
+                error_body = response.text[:200]
 
                 # Handle -1021: Timestamp outside recvWindow
-                if e.code == 400 and '-1021' in error_body:
+                if response.status_code == 400 and '-1021' in error_body:
                     if attempt < max_retries - 1:
                         self.logger.warning(
                             f"Binance -1021 timestamp error, re-syncing server time (attempt {attempt + 1})"
@@ -192,7 +225,7 @@ class BinanceAccountFetcher:
                             f"Offset: {self._time_offset_ms}ms"
                         )
 
-                self.logger.error(f"Binance API HTTP error {e.code}: {error_body}")
+                self.logger.error(f"Binance API HTTP error {response.status_code}: {error_body}")
                 return None
             except Exception as e:
                 self.logger.error(f"Binance API request failed: {e}")
@@ -200,6 +233,96 @@ class BinanceAccountFetcher:
 
         return None
 
+    # =========================================================================
+    # v6.0: Freshness policy + single-flight coalescing
+    # =========================================================================
+
+    def _fetch_shared(
+        self,
+        key: tuple,
+        fetch_fn: Callable[[], Any],
+        use_cache: bool = True,
+    ) -> Any:
+        """
+        Return a cached response if fresh, otherwise fetch once for all concurrent callers.
+
+        Parameters
+        ----------
+        key : tuple
+            (kind, *args); kind selects the freshness window
+        fetch_fn : callable
+            Performs the REST call, returns None on failure (failures are not cached)
+        use_cache : bool
+            False skips the cache but still joins an in-flight request
+        """
+        max_age = self._freshness.get(key[0], 0.0)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if use_cache and cached is not None and (time.time() - cached[0]) < max_age:
+                self._stats['cache_hits'] += 1
+                return cached[1]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                flight = _InFlight()
+                self._inflight[key] = flight
+                generation = self._generation
+                self._stats['requests'] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait(timeout=self._api_timeout * 2 + 5)
+            return flight.result
+
+        data = None
+        try:
+            data = fetch_fn()
+        finally:
+            with self._cache_lock:
+                # An order/position event during the request means the response may predate it
+                if data is not None and generation == self._generation:
+                    self._cache[key] = (time.time(), data)
+                self._inflight.pop(key, None)
+            flight.result = data
+            flight.done.set()
+        return data
+
+    def invalidate(self, *kinds: str):
+        """
+        Drop cached responses.
+
+        Parameters
+        ----------
+        *kinds : str
+            Endpoint kinds to drop (e.g. 'account', 'open_orders'); none = everything
+        """
+        with self._cache_lock:
+            if kinds:
+                for key in [k for k in self._cache if k[0] in kinds]:
+                    del self._cache[key]
+            else:
+                self._cache.clear()
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    def on_order_event(self):
+        """Order filled / canceled / expired: open orders, balance and positions may have changed."""
+        self.invalidate('open_orders', 'account', 'trades', 'income')
+
+    def on_position_event(self):
+        """Position opened / changed / closed: positions and margin changed."""
+        self.invalidate('account', 'open_orders')
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """REST requests sent vs. served from cache or coalesced onto an in-flight call."""
+        with self._cache_lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._inflight)
+        return stats
+
     def get_account_info(self, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Get full account information from Binance Futures.
@@ -209,17 +332,11 @@ class BinanceAccountFetcher:
         dict or None
             Account info including balances, positions, etc.
         """
-        # Check cache
-        if use_cache and self._cache and (time.time() - self._cache_time) < self._cache_ttl:
-            return self._cache
-
-        data = self._make_request("/fapi/v2/account")
-
-        if data:
-            self._cache = data
-            self._cache_time = time.time()
-
-        return data
+        return self._fetch_shared(
+            ('account',),
+            lambda: self._make_request("/fapi/v2/account"),
+            use_cache=use_cache,
+        )
 
     def get_balance(self) -> Dict[str, float]:
         """
@@ -363,7 +480,10 @@ class BinanceAccountFetcher:
             clean_symbol = symbol.replace('-PERP', '').replace('.BINANCE', '').upper()
             params['symbol'] = clean_symbol
 
-        data = self._make_request("/fapi/v1/openOrders", params)
+        data = self._fetch_shared(
+            ('open_orders', params.get('symbol')),
+            lambda: self._make_request("/fapi/v1/openOrders", dict(params)),
+        )
 
         if data is None:
             return []
@@ -463,7 +583,10 @@ class BinanceAccountFetcher:
             'limit': limit,
         }
 
-        data = self._make_request("/fapi/v1/userTrades", params)
+        data = self._fetch_shared(
+            ('trades', clean_symbol, limit),
+            lambda: self._make_request("/fapi/v1/userTrades", dict(params)),
+        )
 
         if data is None:
             return []
@@ -487,13 +610,18 @@ class BinanceAccountFetcher:
             Current mark price
         """
         clean_symbol = symbol.replace('-PERP', '').replace('.BINANCE', '').upper()
+        return self._fetch_shared(
+            ('price', clean_symbol),
+            lambda: self._fetch_realtime_price(clean_symbol),
+        )
+
+    def _fetch_realtime_price(self, clean_symbol: str) -> Optional[float]:
+        """Uncached mark price request."""
         try:
             url = f"{self.BASE_URL}/fapi/v1/ticker/price?symbol={clean_symbol}"
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "AItrader/1.0"
-            })
-            response = urllib.request.urlopen(req, timeout=self._api_timeout)
-            data = json.loads(response.read())
+            response = self._http.get(url, timeout=self._api_timeout)
+            response.raise_for_status()
+            data = response.json()
             price = float(data.get('price', 0))
             return price if price > 0 else None
         except Exception as e:
@@ -521,7 +649,10 @@ class BinanceAccountFetcher:
         if income_type:
             params['incomeType'] = income_type
 
-        data = self._make_request("/fapi/v1/income", params)
+        data = self._fetch_shared(
+            ('income', income_type, limit),
+            lambda: self._make_request("/fapi/v1/income", dict(params)),
+        )
 
         if data is None:
             return []
@@ -540,6 +671,7 @@ def get_binance_fetcher(
     cache_ttl: float = 5.0,
     recv_window: int = 5000,
     api_timeout: float = 10.0,
+    freshness: Optional[Dict[str, float]] = None,
 ) -> BinanceAccountFetcher:
     """Get or create a BinanceAccountFetcher instance."""
     global _fetcher_instance
@@ -552,6 +684,7 @@ def get_binance_fetcher(
             cache_ttl=cache_ttl,
             recv_window=recv_window,
             api_timeout=api_timeout,
+            freshness=freshness,
         )
 
     return _fetcher_instance
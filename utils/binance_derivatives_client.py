@@ -14,10 +14,12 @@ Binance 衍生品数据客户端
 这些数据是 Coinalyze 没有的，可提供额外的市场洞察。
 """
 
-import requests
 import logging
 from typing import Optional, Dict, Any, List
 
+from utils.data_cache import DataCache, get_data_cache
+from utils.http_transport import HttpTransport, get_http_transport
+
 
 class BinanceDerivativesClient:
     """
@@ -29,36 +31,61 @@ class BinanceDerivativesClient:
 
     BASE_URL = "https://fapi.binance.com"
 
+    # v6.0: 端点 → 缓存数据类型 (未列出的端点如 depth 不缓存)
+    CACHE_TYPES = {
+        "/futures/data/topLongShortAccountRatio": "binance_ratio",
+        "/futures/data/topLongShortPositionRatio": "binance_ratio",
+        "/futures/data/takerlongshortRatio": "binance_ratio",
+        "/futures/data/openInterestHist": "binance_ratio",
+        "/fapi/v1/fundingRate": "funding_rate_history",
+        "/fapi/v1/ticker/24hr": "ticker_24hr",
+    }
+
     def __init__(
         self,
         timeout: int = 10,
         logger: logging.Logger = None,
         config: dict = None,
+        http: HttpTransport = None,
+        cache: DataCache = None,
     ):
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
         self.config = config or {}
+        # v6.0: 共享 keep-alive 连接池 (默认进程级单例)
+        self._http = http or get_http_transport()
+        # v6.0: TTL 缓存 (默认进程级单例)
+        self._cache = cache or get_data_cache()
         # v3.7: 读取趋势计算阈值配置
         trend_config = self.config.get('binance_derivatives', {}).get('trend_calculation', {})
         self.trend_threshold_pct = trend_config.get('threshold_pct', 5.0)
 
     def _request(self, endpoint: str, params: dict) -> Optional[Any]:
-        """通用请求方法"""
+        """通用请求方法 (v6.0: 可缓存端点经 TTL 缓存)"""
+        data_type = self.CACHE_TYPES.get(endpoint)
+        if data_type is None:
+            return self._fetch(endpoint, params)
+        return self._cache.get(data_type, endpoint, params, lambda: self._fetch(endpoint, params))
+
+    def _fetch(self, endpoint: str, params: dict) -> Optional[Any]:
+        """直接请求 (不经缓存)"""
         try:
             url = f"{self.BASE_URL}{endpoint}"
-            response = requests.get(url, params=params, timeout=self.timeout)
-
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.warning(
-                    f"⚠️ Binance API error: {endpoint} returned {response.status_code}"
-                )
-                return None
+            response = self._http.get(url, params=params, timeout=self.timeout)
+            return self._parse_response(endpoint, response)
         except Exception as e:
             self.logger.warning(f"⚠️ Binance API request error: {e}")
             return None
 
+    def _parse_response(self, endpoint: str, response) -> Optional[Any]:
+        """v6.0: 解析响应 (同步 requests / 异步 httpx 响应共用)"""
+        if response.status_code == 200:
+            return response.json()
+        self.logger.warning(
+            f"⚠️ Binance API error: {endpoint} returned {response.status_code}"
+        )
+        return None
+
     # =========================================================================
     # 大户数据 (Top Trader Data) - Binance 独有
     # =========================================================================
@@ -320,7 +347,7 @@ class BinanceDerivativesClient:
         Dict
             完整的衍生品数据字典
         """
-        # 并行请求会更快，但为了简单起见这里串行
+        # 串行请求; v6.0 起大部分端点命中 TTL 缓存
         top_account = self.get_top_long_short_account_ratio(symbol, period, history_limit)
         top_position = self.get_top_long_short_position_ratio(symbol, period, history_limit)
         taker_ratio = self.get_taker_long_short_ratio(symbol, period, history_limit)
@@ -328,6 +355,24 @@ class BinanceDerivativesClient:
         funding_hist = self.get_funding_rate_history(symbol, history_limit)
         ticker = self.get_ticker_24hr(symbol)
 
+        return self._assemble_fetch_all(
+            symbol, period, history_limit,
+            top_account, top_position, taker_ratio, oi_hist, funding_hist, ticker,
+        )
+
+    def _assemble_fetch_all(
+        self,
+        symbol: str,
+        period: str,
+        history_limit: int,
+        top_account: Optional[List[Dict]],
+        top_position: Optional[List[Dict]],
+        taker_ratio: Optional[List[Dict]],
+        oi_hist: Optional[List[Dict]],
+        funding_hist: Optional[List[Dict]],
+        ticker: Optional[Dict],
+    ) -> Dict[str, Any]:
+        """v6.0: 组装 fetch_all 结果 (同步与异步客户端共用)"""
         # 计算趋势
         top_position_trend = self._calc_trend(top_position, "longShortRatio")
         taker_trend = self._calc_trend(taker_ratio, "buySellRatio")
@@ -362,9 +407,27 @@ class BinanceDerivativesClient:
                 "symbol": symbol,
                 "period": period,
                 "history_limit": history_limit,
+                **self._data_ages(symbol, period, history_limit),
             },
         }
 
+    def _data_ages(self, symbol: str, period: str, history_limit: int) -> Dict[str, Any]:
+        """v6.0: fetch_all 各端点的缓存数据年龄 (秒)"""
+        ratio_params = {"symbol": symbol, "period": period, "limit": history_limit}
+        ages = {
+            "top_long_short_account": self._cache.age("/futures/data/topLongShortAccountRatio", ratio_params),
+            "top_long_short_position": self._cache.age("/futures/data/topLongShortPositionRatio", ratio_params),
+            "taker_long_short": self._cache.age("/futures/data/takerlongshortRatio", ratio_params),
+            "open_interest_hist": self._cache.age("/futures/data/openInterestHist", ratio_params),
+            "funding_rate_hist": self._cache.age("/fapi/v1/fundingRate", {"symbol": symbol, "limit": history_limit}),
+            "ticker_24hr": self._cache.age("/fapi/v1/ticker/24hr", {"symbol": symbol}),
+        }
+        known = [a for a in ages.values() if a is not None]
+        return {
+            "data_age_sec": ages,
+            "max_data_age_sec": max(known) if known else None,
+        }
+
     def _calc_trend(
         self,
         data: Optional[List[Dict]],
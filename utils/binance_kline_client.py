@@ -1,10 +1,12 @@
 # utils/binance_kline_client.py
 
 import time
-import requests
 import logging
 from typing import List, Optional, Dict, Any
 
+from utils.data_cache import DataCache, get_data_cache
+from utils.http_transport import HttpTransport, get_http_transport
+
 
 class BinanceKlineClient:
     """
@@ -25,15 +27,22 @@ class BinanceKlineClient:
         self,
         timeout: int = 10,
         logger: logging.Logger = None,
+        http: HttpTransport = None,
+        cache: DataCache = None,
     ):
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
+        # v6.0: 共享 keep-alive 连接池 (默认进程级单例)
+        self._http = http or get_http_transport()
+        # v6.0: TTL 缓存 (资金费率历史每 8h 才变化一次)
+        self._cache = cache or get_data_cache()
 
     def get_klines(
         self,
         symbol: str = "BTCUSDT",
         interval: str = "15m",
         limit: int = 50,
+        start_time: Optional[int] = None,
     ) -> Optional[List[List]]:
         """
         获取 K线数据 (完整 12 列)
@@ -46,6 +55,8 @@ class BinanceKlineClient:
             时间周期 (1m/5m/15m/1h/4h/1d)
         limit : int
             获取数量 (最大 1500)
+        start_time : int, optional
+            v6.0: 起始开盘时间 (毫秒)，用于增量同步 (KlineStore)
 
         Returns
         -------
@@ -73,13 +84,9 @@ class BinanceKlineClient:
         """
         try:
             url = f"{self.BASE_URL}/fapi/v1/klines"
-            params = {
-                "symbol": symbol,
-                "interval": interval,
-                "limit": limit,
-            }
+            params = self._klines_params(symbol, interval, limit, start_time)
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._http.get(url, params=params, timeout=self.timeout)
 
             if response.status_code == 200:
                 return response.json()
@@ -134,7 +141,7 @@ class BinanceKlineClient:
             url = f"{self.BASE_URL}/fapi/v1/premiumIndex"
             params = {"symbol": symbol}
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._http.get(url, params=params, timeout=self.timeout)
 
             if response.status_code != 200:
                 self.logger.warning(
@@ -144,56 +151,21 @@ class BinanceKlineClient:
 
             data = response.json()
 
-            # lastFundingRate = 当前周期实时预期费率 (NOT last settled!)
-            predicted_rate = float(data.get('lastFundingRate', 0))
-            mark_price = float(data.get('markPrice', 0))
-            index_price = float(data.get('indexPrice', 0))
-            interest_rate = float(data.get('interestRate', 0))
-            next_funding_time = data.get('nextFundingTime', 0)
-
-            # 瞬时溢价指数 (仅供参考)
-            premium_index = 0.0
-            if index_price > 0:
-                premium_index = (mark_price - index_price) / index_price
-
-            # 计算距下次结算的分钟数
-            countdown_min = None
-            if next_funding_time and next_funding_time > 0:
-                now_ms = int(time.time() * 1000)
-                remaining_ms = next_funding_time - now_ms
-                if remaining_ms > 0:
-                    countdown_min = round(remaining_ms / 60000)
-
             # 2. 获取已结算费率 (from /fapi/v1/fundingRate)
-            settled_rate = 0.0
+            settled_data = None
             try:
-                settled_resp = requests.get(
+                settled_resp = self._http.get(
                     f"{self.BASE_URL}/fapi/v1/fundingRate",
                     params={"symbol": symbol, "limit": 1},
                     timeout=self.timeout,
                 )
                 if settled_resp.status_code == 200:
                     settled_data = settled_resp.json()
-                    if settled_data and len(settled_data) > 0:
-                        settled_rate = float(settled_data[0].get('fundingRate', 0))
             except Exception as e:
                 self.logger.debug(f"⚠️ Settled funding rate fetch error: {e}")
                 # 降级: 如果获取失败，settled_rate 保持 0
 
-            return {
-                "symbol": data.get('symbol'),
-                "funding_rate": settled_rate,                          # 已结算费率
-                "funding_rate_pct": round(settled_rate * 100, 6),      # 已结算费率 (%, 6位匹配币安精度)
-                "predicted_rate": predicted_rate,                      # 预期费率 (from lastFundingRate)
-                "predicted_rate_pct": round(predicted_rate * 100, 6),  # 预期费率 (%, 6位匹配币安精度)
-                "next_funding_time": next_funding_time,
-                "next_funding_countdown_min": countdown_min,
-                "mark_price": mark_price,
-                "index_price": index_price,
-                "interest_rate": interest_rate,
-                "premium_index": premium_index,
-                "source": "binance_direct",
-            }
+            return self._parse_funding_rate(data, settled_data)
 
         except Exception as e:
             self.logger.warning(f"⚠️ Binance funding rate fetch error: {e}")
@@ -223,11 +195,22 @@ class BinanceKlineClient:
                 ...
             ]
         """
+        params = {"symbol": symbol, "limit": limit}
+        return self._cache.get(
+            "funding_rate_history", "/fapi/v1/fundingRate", params,
+            lambda: self._fetch_funding_rate_history(params),
+        )
+
+    def get_funding_rate_history_age(self, symbol: str = "BTCUSDT", limit: int = 10) -> Optional[float]:
+        """v6.0: 资金费率历史缓存年龄 (秒)，无缓存返回 None"""
+        return self._cache.age("/fapi/v1/fundingRate", {"symbol": symbol, "limit": limit})
+
+    def _fetch_funding_rate_history(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """直接请求资金费率历史 (不经缓存)"""
         try:
             url = f"{self.BASE_URL}/fapi/v1/fundingRate"
-            params = {"symbol": symbol, "limit": limit}
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._http.get(url, params=params, timeout=self.timeout)
 
             if response.status_code == 200:
                 return response.json()
@@ -240,3 +223,86 @@ class BinanceKlineClient:
         except Exception as e:
             self.logger.warning(f"⚠️ Binance funding rate history fetch error: {e}")
             return None
+
+    # =========================================================================
+    # v6.0: 请求构建 / 响应解析 (同步与异步客户端共用)
+    # =========================================================================
+
+    @staticmethod
+    def _klines_params(
+        symbol: str,
+        interval: str,
+        limit: int,
+        start_time: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """/fapi/v1/klines 查询参数"""
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit,
+        }
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        return params
+
+    @staticmethod
+    def _parse_funding_rate(
+        data: Dict[str, Any],
+        settled_data: Optional[List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        合并 premiumIndex 与最近一次结算记录
+
+        Parameters
+        ----------
+        data : Dict
+            /fapi/v1/premiumIndex 响应
+        settled_data : List[Dict], optional
+            /fapi/v1/fundingRate?limit=1 响应 (获取失败为 None，已结算费率按 0 处理)
+
+        Returns
+        -------
+        Dict
+            见 get_funding_rate()
+        """
+        # lastFundingRate = 当前周期实时预期费率 (NOT last settled!)
+        predicted_rate = float(data.get('lastFundingRate', 0))
+        mark_price = float(data.get('markPrice', 0))
+        index_price = float(data.get('indexPrice', 0))
+        interest_rate = float(data.get('interestRate', 0))
+        next_funding_time = data.get('nextFundingTime', 0)
+
+        # 瞬时溢价指数 (仅供参考)
+        premium_index = 0.0
+        if index_price > 0:
+            premium_index = (mark_price - index_price) / index_price
+
+        # 计算距下次结算的分钟数
+        countdown_min = None
+        if next_funding_time and next_funding_time > 0:
+            now_ms = int(time.time() * 1000)
+            remaining_ms = next_funding_time - now_ms
+            if remaining_ms > 0:
+                countdown_min = round(remaining_ms / 60000)
+
+        settled_rate = 0.0
+        try:
+            if settled_data and len(settled_data) > 0:
+                settled_rate = float(settled_data[0].get('fundingRate', 0))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass  # 降级: 结算记录格式异常时 settled_rate 保持 0
+
+        return {
+            "symbol": data.get('symbol'),
+            "funding_rate": settled_rate,                          # 已结算费率
+            "funding_rate_pct": round(settled_rate * 100, 6),      # 已结算费率 (%, 6位匹配币安精度)
+            "predicted_rate": predicted_rate,                      # 预期费率 (from lastFundingRate)
+            "predicted_rate_pct": round(predicted_rate * 100, 6),  # 预期费率 (%, 6位匹配币安精度)
+            "next_funding_time": next_funding_time,
+            "next_funding_countdown_min": countdown_min,
+            "mark_price": mark_price,
+            "index_price": index_price,
+            "interest_rate": interest_rate,
+            "premium_index": premium_index,
+            "source": "binance_direct",
+        }
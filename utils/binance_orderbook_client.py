@@ -3,7 +3,9 @@
 import requests
 import logging
 import time
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+
+from utils.http_transport import HttpTransport, get_http_transport
 
 
 class BinanceOrderBookClient:
@@ -29,6 +31,8 @@ class BinanceOrderBookClient:
         max_retries: int = 2,
         retry_delay: float = 1.0,
         logger: logging.Logger = None,
+        http: HttpTransport = None,
+        base_url: str = None,
     ):
         """
         初始化订单簿客户端
@@ -43,11 +47,18 @@ class BinanceOrderBookClient:
             重试延迟 (秒)
         logger : logging.Logger, optional
             日志记录器
+        http : HttpTransport, optional
+            共享 HTTP 连接池 (默认进程级单例)
+        base_url : str, optional
+            覆盖 BASE_URL (用于本地回放服务器)
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.logger = logger or logging.getLogger(__name__)
+        self._http = http or get_http_transport()
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
 
     def get_order_book(
         self,
@@ -94,48 +105,17 @@ class BinanceOrderBookClient:
         # 重试逻辑
         for attempt in range(self.max_retries + 1):
             try:
-                response = requests.get(
+                response = self._http.get(
                     url,
                     params=params,
                     timeout=self.timeout,
                 )
 
-                # 处理限流 (429)
-                if response.status_code == 429:
-                    if attempt < self.max_retries:
-                        wait_time = self.retry_delay * (2 ** attempt)
-                        self.logger.warning(
-                            f"⚠️ Rate limited (429), waiting {wait_time}s before retry {attempt+1}/{self.max_retries}"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        self.logger.error("❌ Rate limited, max retries exceeded")
-                        return None
-
-                # 处理成功响应
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # 验证数据完整性
-                    if not self._validate_orderbook(data):
-                        self.logger.error("❌ Invalid order book data received")
-                        return None
-
-                    return data
-
-                # 处理其他错误
-                else:
-                    self.logger.warning(
-                        f"⚠️ Binance order book API error: {response.status_code}, "
-                        f"attempt {attempt+1}/{self.max_retries+1}"
-                    )
-
-                    if attempt < self.max_retries:
-                        time.sleep(self.retry_delay)
-                        continue
-                    else:
-                        return None
+                data, retry = self._handle_response(response, attempt)
+                if retry:
+                    time.sleep(self.retry_delay)
+                    continue
+                return data
 
             except requests.exceptions.Timeout:
                 self.logger.warning(
@@ -158,6 +138,43 @@ class BinanceOrderBookClient:
 
         return None
 
+    def _handle_response(self, response, attempt: int) -> Tuple[Optional[Dict], bool]:
+        """
+        v6.0: 处理单次响应 (同步 requests / 异步 httpx 响应共用)
+
+        Returns
+        -------
+        Tuple[Optional[Dict], bool]
+            (订单簿数据或 None, 是否应重试)
+        """
+        # 处理限流 (429)
+        # v6.0: 不再盲目 sleep 重试 (封禁期内重试会升级为 418 IP 封禁)；
+        # 共享权重调度器已记录 Retry-After，在此之前的请求会排队或推迟
+        if response.status_code == 429:
+            self.logger.warning(
+                f"⚠️ Rate limited (429), Retry-After={response.headers.get('Retry-After', 'N/A')}s, "
+                f"skipping this snapshot"
+            )
+            return None, False
+
+        # 处理成功响应
+        if response.status_code == 200:
+            data = response.json()
+
+            # 验证数据完整性
+            if not self._validate_orderbook(data):
+                self.logger.error("❌ Invalid order book data received")
+                return None, False
+
+            return data, False
+
+        # 处理其他错误
+        self.logger.warning(
+            f"⚠️ Binance order book API error: {response.status_code}, "
+            f"attempt {attempt+1}/{self.max_retries+1}"
+        )
+        return None, attempt < self.max_retries
+
     def _validate_orderbook(self, data: Dict) -> bool:
         """
         验证订单簿数据合法性
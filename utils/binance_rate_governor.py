@@ -0,0 +1,425 @@
+# utils/binance_rate_governor.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+
+# 优先级 (数值越大优先级越低)
+PRIORITY_HIGH = 0     # 交易关键: 账户 / 持仓 / 挂单 / 实时价格
+PRIORITY_NORMAL = 1   # 策略数据: K 线 / 订单簿 / 衍生品
+PRIORITY_LOW = 2      # 诊断脚本 / Web 面板
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+# 受 IP 权重限制的 host (USDⓈ-M Futures)
+GOVERNED_HOSTS = ("fapi.binance.com",)
+
+# 固定权重端点 (Binance Futures 文档)
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    "/fapi/v1/ping": 1,
+    "/fapi/v1/time": 1,
+    "/fapi/v1/premiumIndex": 1,
+    "/fapi/v1/fundingRate": 1,
+    "/fapi/v1/ticker/price": 1,       # 带 symbol; 不带为 2
+    "/fapi/v1/ticker/24hr": 1,        # 带 symbol; 不带为 40
+    "/fapi/v1/openOrders": 1,         # 带 symbol; 不带为 40
+    "/fapi/v1/userTrades": 5,
+    "/fapi/v1/income": 30,
+    "/fapi/v1/order": 1,
+    "/fapi/v1/allOrders": 5,
+    "/fapi/v2/account": 5,
+    "/fapi/v2/balance": 5,
+    "/fapi/v2/positionRisk": 5,
+    "/fapi/v1/exchangeInfo": 1,
+    "/futures/data/topLongShortAccountRatio": 1,
+    "/futures/data/topLongShortPositionRatio": 1,
+    "/futures/data/globalLongShortAccountRatio": 1,
+    "/futures/data/takerlongshortRatio": 1,
+    "/futures/data/openInterestHist": 1,
+}
+
+# 不带 symbol 时权重放大的端点
+NO_SYMBOL_WEIGHTS: Dict[str, int] = {
+    "/fapi/v1/ticker/price": 2,
+    "/fapi/v1/ticker/24hr": 40,
+    "/fapi/v1/openOrders": 40,
+}
+
+# 交易关键端点 (默认高优先级)
+HIGH_PRIORITY_ENDPOINTS = frozenset({
+    "/fapi/v2/account",
+    "/fapi/v2/balance",
+    "/fapi/v2/positionRisk",
+    "/fapi/v1/openOrders",
+    "/fapi/v1/order",
+    "/fapi/v1/ticker/price",
+    "/fapi/v1/time",
+})
+
+
+def endpoint_weight(path: str, params: Optional[Mapping[str, Any]] = None) -> int:
+    """
+    计算一次请求的权重
+
+    Parameters
+    ----------
+    path : str
+        API 路径 (如 /fapi/v1/klines)
+    params : Mapping, optional
+        查询参数 (klines / depth 权重取决于 limit)
+
+    Returns
+    -------
+    int
+        请求权重 (未知端点按 1 计)
+    """
+    params = params or {}
+    if path in ("/fapi/v1/klines", "/fapi/v1/continuousKlines", "/fapi/v1/markPriceKlines"):
+        limit = int(params.get("limit", 500))
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        if limit <= 1000:
+            return 5
+        return 10
+    if path == "/fapi/v1/depth":
+        limit = int(params.get("limit", 500))
+        if limit <= 50:
+            return 2
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 10
+        return 20
+    if path in NO_SYMBOL_WEIGHTS and not params.get("symbol"):
+        return NO_SYMBOL_WEIGHTS[path]
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+class RateLimitDeferred(requests.exceptions.RequestException):
+    """请求因权重余量不足被推迟 (调用方按普通网络错误处理)"""
+
+
+class BinanceRateGovernor:
+    """
+    Binance 请求权重调度器 (v6.0)
+
+    策略、Web 后端 (TradingService / PerformanceService) 和诊断脚本从同一 IP
+    访问 fapi.binance.com，共享每分钟 2400 的请求权重。超限返回 429，
+    持续超限升级为 418 (IP 封禁)。
+
+    令牌桶 (容量 = 每分钟权重上限，按秒匀速回填):
+    - 每个请求按端点权重扣减令牌
+    - 低优先级请求必须保留一定余量 (low_reserve / normal_reserve)，
+      余量不足时排队等待，超过最长等待时间则推迟 (抛出 RateLimitDeferred)
+    - 高优先级 (账户 / 持仓 / 挂单) 可以用到 0
+    - 每次响应读取 X-MBX-USED-WEIGHT-1M 同步服务端实际用量 (含其他进程)
+    - 429 / 418 读取 Retry-After，在此之前所有请求暂停
+
+    各进程有各自的实例，通过服务端返回的已用权重感知其他进程的消耗。
+    """
+
+    def __init__(
+        self,
+        weight_limit: int = 2400,
+        normal_reserve: float = 0.1,
+        low_reserve: float = 0.4,
+        max_wait_sec: Optional[Dict[int, float]] = None,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化调度器
+
+        Parameters
+        ----------
+        weight_limit : int
+            每分钟权重上限 (Binance Futures 默认 2400)
+        normal_reserve : float
+            普通优先级请求需保留的余量比例
+        low_reserve : float
+            低优先级请求需保留的余量比例
+        max_wait_sec : Dict[int, float], optional
+            各优先级最长排队时间 (秒)
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.capacity = float(weight_limit)
+        self.refill_per_sec = self.capacity / 60.0
+        self.floors = {
+            PRIORITY_HIGH: 0.0,
+            PRIORITY_NORMAL: self.capacity * normal_reserve,
+            PRIORITY_LOW: self.capacity * low_reserve,
+        }
+        self.max_wait_sec = {PRIORITY_HIGH: 5.0, PRIORITY_NORMAL: 10.0, PRIORITY_LOW: 30.0}
+        if max_wait_sec:
+            self.max_wait_sec.update(max_wait_sec)
+        self.logger = logger or logging.getLogger(__name__)
+
+        # 进程级优先级上限: 诊断 / Web 进程设为 PRIORITY_LOW，所有请求至多为低优先级
+        self.process_priority = PRIORITY_HIGH
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._server_used: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0, "weight": 0, "waited": 0, "wait_sec": 0.0,
+            "deferred": {name: 0 for name in PRIORITY_NAMES.values()},
+            "rate_limited": 0,
+        }
+
+    # =========================================================================
+    # 判定
+    # =========================================================================
+
+    @staticmethod
+    def applies_to(url: str) -> bool:
+        """URL 是否受 IP 权重限制"""
+        return urlsplit(url).netloc in GOVERNED_HOSTS
+
+    def priority_for(self, path: str, priority: Optional[int] = None) -> int:
+        """端点默认优先级，受进程级上限约束"""
+        if priority is None:
+            priority = PRIORITY_HIGH if path in HIGH_PRIORITY_ENDPOINTS else PRIORITY_NORMAL
+        return max(priority, self.process_priority)
+
+    def set_process_priority(self, priority: int):
+        """设置进程级优先级上限 (诊断脚本 / Web 后端调用 PRIORITY_LOW)"""
+        self.process_priority = priority
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_sec)
+            self._updated = now
+
+    def _try_acquire(self, weight: int, priority: int) -> float:
+        """
+        尝试扣减令牌
+
+        Returns
+        -------
+        float
+            0 = 成功；> 0 = 需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            floor = self.floors[priority]
+            if self._tokens - weight >= floor:
+                self._tokens -= weight
+                self._stats["requests"] += 1
+                self._stats["weight"] += weight
+                return 0.0
+            return (floor + weight - self._tokens) / self.refill_per_sec
+
+    def _defer(self, path: str, priority: int, wait: float):
+        name = PRIORITY_NAMES[priority]
+        with self._lock:
+            self._stats["deferred"][name] += 1
+        raise RateLimitDeferred(
+            f"Binance weight headroom low, deferred {name}-priority {path} (needs {wait:.1f}s)"
+        )
+
+    def _record_wait(self, waited: float):
+        if waited > 0:
+            with self._lock:
+                self._stats["waited"] += 1
+                self._stats["wait_sec"] += waited
+
+    # =========================================================================
+    # 获取令牌
+    # =========================================================================
+
+    def acquire(self, url: str, params: Optional[Mapping[str, Any]] = None, priority: Optional[int] = None) -> float:
+        """
+        请求前获取令牌 (阻塞排队)
+
+        Parameters
+        ----------
+        url : str
+            完整 URL (查询串中的参数也参与权重计算)
+        params : Mapping, optional
+            查询参数
+        priority : int, optional
+            覆盖端点默认优先级
+
+        Returns
+        -------
+        float
+            排队等待的秒数
+
+        Raises
+        ------
+        RateLimitDeferred
+            超过该优先级最长等待时间
+        """
+        path, merged = self._split(url, params)
+        weight = endpoint_weight(path, merged)
+        priority = self.priority_for(path, priority)
+        max_wait = self.max_wait_sec[priority]
+
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(weight, priority)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            if waited + wait > max_wait:
+                self._record_wait(waited)
+                self._defer(path, priority, wait)
+            step = min(wait, 0.5)
+            time.sleep(step)
+            waited += step
+
+    async def acquire_async(self, url: str, params: Optional[Mapping[str, Any]] = None, priority: Optional[int] = None) -> float:
+        """acquire() 的 asyncio 版本 (Web 后端 httpx 客户端使用)"""
+        path, merged = self._split(url, params)
+        weight = endpoint_weight(path, merged)
+        priority = self.priority_for(path, priority)
+        max_wait = self.max_wait_sec[priority]
+
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(weight, priority)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            if waited + wait > max_wait:
+                self._record_wait(waited)
+                self._defer(path, priority, wait)
+            step = min(wait, 0.5)
+            await asyncio.sleep(step)
+            waited += step
+
+    @staticmethod
+    def _split(url: str, params: Optional[Mapping[str, Any]]):
+        parts = urlsplit(url)
+        merged = dict(parse_qsl(parts.query))
+        if params:
+            merged.update(params)
+        return parts.path, merged
+
+    # =========================================================================
+    # 响应反馈
+    # =========================================================================
+
+    def observe(self, headers: Mapping[str, str], status_code: int):
+        """
+        根据响应头同步服务端用量
+
+        Parameters
+        ----------
+        headers : Mapping
+            响应头 (大小写不敏感的 requests / httpx headers)
+        status_code : int
+            HTTP 状态码
+        """
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("x-mbx-used-weight-1m")
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if used is not None:
+                try:
+                    self._server_used = int(used)
+                    self._tokens = min(self._tokens, max(0.0, self.capacity - self._server_used))
+                except ValueError:
+                    pass
+
+            if status_code in (418, 429):
+                retry_after = headers.get("Retry-After") or headers.get("retry-after")
+                try:
+                    delay = float(retry_after) if retry_after is not None else 60.0
+                except ValueError:
+                    delay = 60.0
+                self._blocked_until = max(self._blocked_until, now + delay)
+                self._tokens = 0.0
+                self._stats["rate_limited"] += 1
+                banned = status_code == 418
+        if status_code in (418, 429):
+            self.logger.warning(
+                f"⚠️ Binance {'IP ban (418)' if banned else 'rate limit (429)'}: "
+                f"pausing requests for {delay:.0f}s"
+            )
+
+    def get_headroom(self) -> Dict[str, Any]:
+        """
+        当前权重余量 (指标)
+
+        Returns
+        -------
+        Dict
+            {"tokens", "capacity", "headroom_pct", "server_used_weight_1m", "blocked_for_sec",
+             "requests", "weight", "waited", "wait_sec", "deferred", "rate_limited"}
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            stats = dict(self._stats)
+            stats["deferred"] = dict(self._stats["deferred"])
+            stats["wait_sec"] = round(stats["wait_sec"], 2)
+            stats.update({
+                "tokens": round(self._tokens, 1),
+                "capacity": int(self.capacity),
+                "headroom_pct": round(self._tokens / self.capacity * 100, 1),
+                "server_used_weight_1m": self._server_used,
+                "blocked_for_sec": round(max(0.0, self._blocked_until - now), 1),
+            })
+        return stats
+
+    def httpx_event_hooks(self, priority: Optional[int] = None) -> Dict[str, list]:
+        """
+        httpx.AsyncClient 的 event_hooks (请求前排队，响应后同步用量)
+
+        Parameters
+        ----------
+        priority : int, optional
+            该客户端所有请求的优先级
+        """
+        async def _on_request(request):
+            url = str(request.url)
+            if self.applies_to(url):
+                await self.acquire_async(url, priority=priority)
+
+        async def _on_response(response):
+            if self.applies_to(str(response.request.url)):
+                self.observe(response.headers, response.status_code)
+
+        return {"request": [_on_request], "response": [_on_response]}
+
+
+# Singleton instance shared by all clients in the process
+_governor_instance: Optional[BinanceRateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor(
+    weight_limit: int = 2400,
+    normal_reserve: float = 0.1,
+    low_reserve: float = 0.4,
+    logger: Optional[logging.Logger] = None,
+) -> BinanceRateGovernor:
+    """Get or create the process-wide BinanceRateGovernor instance."""
+    global _governor_instance
+
+    if _governor_instance is None:
+        with _governor_lock:
+            if _governor_instance is None:
+                _governor_instance = BinanceRateGovernor(
+                    weight_limit=weight_limit,
+                    normal_reserve=normal_reserve,
+                    low_reserve=low_reserve,
+                    logger=logger,
+                )
+
+    return _governor_instance
@@ -3,9 +3,12 @@
 import requests
 import time
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import os
 
+from utils.data_cache import DataCache, get_data_cache
+from utils.http_transport import HttpTransport, get_http_transport
+
 
 class CoinalyzeClient:
     """
@@ -29,6 +32,8 @@ class CoinalyzeClient:
         max_retries: int = 2,
         retry_delay: float = 1.0,
         logger: logging.Logger = None,
+        http: HttpTransport = None,
+        cache: DataCache = None,
     ):
         """
         初始化 Coinalyze 客户端
@@ -45,12 +50,20 @@ class CoinalyzeClient:
             重试基础延迟 (秒)，使用指数退避
         logger : Logger
             日志记录器
+        http : HttpTransport, optional
+            共享 HTTP 连接池 (默认进程级单例)
+        cache : DataCache, optional
+            v6.0: TTL 缓存 (默认进程级单例)
         """
         self.api_key = api_key or os.getenv("COINALYZE_API_KEY")
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.logger = logger or logging.getLogger(__name__)
+        self._http = http or get_http_transport()
+        self._cache = cache or get_data_cache()
+        # v6.0: 最近一次返回数据的年龄 (endpoint → 秒)
+        self._last_ages: Dict[str, Optional[float]] = {}
         self._enabled = bool(self.api_key)
 
         if not self._enabled:
@@ -85,30 +98,18 @@ class CoinalyzeClient:
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = requests.get(
+                response = self._http.get(
                     url,
                     params=params,
                     headers=headers,
                     timeout=self.timeout,
                 )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data[0] if data else None
-
-                elif response.status_code == 429:
-                    self.logger.warning("⚠️ Coinalyze rate limit reached (429)")
-                    # 速率限制时等待更长时间
-                    if attempt < self.max_retries:
-                        time.sleep(self.retry_delay * (2 ** attempt) * 2)
-                        continue
-                    return None
-
-                else:
-                    self.logger.warning(
-                        f"⚠️ Coinalyze API error: {response.status_code}"
-                    )
-                    return None
+                data, delay = self._handle_response(response, attempt)
+                if delay is None:
+                    return data
+                time.sleep(delay)
+                continue
 
             except requests.exceptions.Timeout:
                 self.logger.warning(
@@ -125,6 +126,85 @@ class CoinalyzeClient:
 
         return None
 
+    def _handle_response(self, response, attempt: int) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        v6.0: 处理单次响应 (同步 requests / 异步 httpx 响应共用)
+
+        Returns
+        -------
+        Tuple[Optional[Dict], Optional[float]]
+            (结果, None) 表示结束；(None, delay) 表示等待 delay 秒后重试
+        """
+        if response.status_code == 200:
+            data = response.json()
+            return (data[0] if data else None), None
+
+        if response.status_code == 429:
+            self.logger.warning("⚠️ Coinalyze rate limit reached (429)")
+            # 速率限制时等待更长时间
+            if attempt < self.max_retries:
+                return None, self.retry_delay * (2 ** attempt) * 2
+            return None, None
+
+        self.logger.warning(
+            f"⚠️ Coinalyze API error: {response.status_code}"
+        )
+        return None, None
+
+    @staticmethod
+    def _history_params(symbol: str, interval: str, hours: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        v6.0: 历史端点的 (查询参数, 缓存键参数)
+
+        缓存键省略 from/to 时间窗口，用 hours 代替
+        """
+        now = int(time.time())
+        params = {
+            "symbols": symbol,
+            "interval": interval,
+            "from": now - (hours * 3600),
+            "to": now,
+        }
+        return params, {"symbols": symbol, "interval": interval, "hours": hours}
+
+    def _cached_request(
+        self,
+        data_type: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_params: Dict[str, Any] = None,
+    ) -> Optional[Dict]:
+        """
+        v6.0: 经 TTL 缓存的请求
+
+        Parameters
+        ----------
+        data_type : str
+            缓存数据类型 (决定 TTL)
+        endpoint : str
+            API 端点
+        params : Dict
+            实际查询参数
+        cache_params : Dict, optional
+            缓存键参数 (省略 from/to 时间窗口)，默认同 params
+        """
+        key_params = cache_params if cache_params is not None else params
+        result = self._cache.get(
+            data_type, endpoint, key_params,
+            lambda: self._request_with_retry(endpoint=endpoint, params=params),
+        )
+        self._last_ages[endpoint] = self._cache.age(endpoint, key_params) if result is not None else None
+        return result
+
+    def _cache_summary(self, endpoints) -> Dict[str, Any]:
+        """v6.0: 各端点数据年龄 (用于 AI 报告显示数据新鲜度)"""
+        ages = {ep: self._last_ages.get(ep) for ep in endpoints}
+        known = [a for a in ages.values() if a is not None]
+        return {
+            "ages_sec": ages,
+            "max_age_sec": max(known) if known else None,
+        }
+
     def get_open_interest(self, symbol: str = None) -> Optional[Dict]:
         """
         获取当前 Open Interest
@@ -142,7 +222,8 @@ class CoinalyzeClient:
             return None
 
         symbol = symbol or self.DEFAULT_SYMBOL
-        return self._request_with_retry(
+        return self._cached_request(
+            "coinalyze_current",
             endpoint="/open-interest",
             params={"symbols": symbol},
         )
@@ -181,14 +262,12 @@ class CoinalyzeClient:
             return None
 
         symbol = symbol or self.DEFAULT_SYMBOL
-        return self._request_with_retry(
+        params, cache_params = self._history_params(symbol, interval, hours)
+        return self._cached_request(
+            "coinalyze_history",
             endpoint="/liquidation-history",
-            params={
-                "symbols": symbol,
-                "interval": interval,
-                "from": int(time.time()) - (hours * 3600),
-                "to": int(time.time()),
-            },
+            params=params,
+            cache_params=cache_params,
         )
 
     def fetch_all(self, symbol: str = None) -> Dict[str, Any]:
@@ -211,7 +290,10 @@ class CoinalyzeClient:
 
         oi = self.get_open_interest(symbol)
         liq = self.get_liquidations(symbol)
+        return self._assemble_fetch_all(oi, liq)
 
+    def _assemble_fetch_all(self, oi: Optional[Dict], liq: Optional[Dict]) -> Dict[str, Any]:
+        """v6.0: 组装 fetch_all 结果 (同步与异步客户端共用)"""
         # 🔍 Fix B8: Add data quality marker if any data is missing
         missing_count = sum([oi is None, liq is None])
         data_quality = "COMPLETE" if missing_count == 0 else "PARTIAL" if missing_count < 2 else "MISSING"
@@ -225,6 +307,7 @@ class CoinalyzeClient:
                 field for field, value in [("OI", oi), ("Liq", liq)]
                 if value is None
             ],
+            "_cache": self._cache_summary(["/open-interest", "/liquidation-history"]),
         }
 
     def is_enabled(self) -> bool:
@@ -272,16 +355,12 @@ class CoinalyzeClient:
             return None
 
         symbol = symbol or self.DEFAULT_SYMBOL
-        now = int(time.time())
-
-        return self._request_with_retry(
+        params, cache_params = self._history_params(symbol, interval, hours)
+        return self._cached_request(
+            "coinalyze_history",
             endpoint="/open-interest-history",
-            params={
-                "symbols": symbol,
-                "interval": interval,
-                "from": now - (hours * 3600),
-                "to": now,
-            },
+            params=params,
+            cache_params=cache_params,
         )
 
     def get_long_short_ratio_history(
@@ -323,16 +402,12 @@ class CoinalyzeClient:
             return None
 
         symbol = symbol or self.DEFAULT_SYMBOL
-        now = int(time.time())
-
-        return self._request_with_retry(
+        params, cache_params = self._history_params(symbol, interval, hours)
+        return self._cached_request(
+            "coinalyze_history",
             endpoint="/long-short-ratio-history",
-            params={
-                "symbols": symbol,
-                "interval": interval,
-                "from": now - (hours * 3600),
-                "to": now,
-            },
+            params=params,
+            cache_params=cache_params,
         )
 
     def fetch_all_with_history(
@@ -381,7 +456,16 @@ class CoinalyzeClient:
 
         oi_hist = self.get_open_interest_history(symbol, hours=history_hours)
         ls_hist = self.get_long_short_ratio_history(symbol, hours=history_hours)
+        return self._assemble_fetch_all_with_history(oi, liq, oi_hist, ls_hist)
 
+    def _assemble_fetch_all_with_history(
+        self,
+        oi: Optional[Dict],
+        liq: Optional[Dict],
+        oi_hist: Optional[Dict],
+        ls_hist: Optional[Dict],
+    ) -> Dict[str, Any]:
+        """v6.0: 组装 fetch_all_with_history 结果 (同步与异步客户端共用)"""
         trends = {
             "oi_trend": self._calc_trend_from_history(oi_hist, "c"),
             "long_short_trend": self._calc_trend_from_history(ls_hist, "r"),
@@ -394,6 +478,10 @@ class CoinalyzeClient:
             "long_short_ratio_history": ls_hist,
             "trends": trends,
             "enabled": True,
+            "_cache": self._cache_summary([
+                "/open-interest", "/liquidation-history",
+                "/open-interest-history", "/long-short-ratio-history",
+            ]),
         }
 
     def _calc_trend_from_history(
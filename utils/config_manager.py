@@ -223,6 +223,10 @@ class ConfigManager:
             # 定时器
             (('timing', 'timer_interval_sec'), int, 60, 86400, True),
 
+            # 指标
+            (('indicators', 'snapshot', 'interval_sec'), (int, float), 0, 86400, False),
+            (('indicators', 'sr_lookback_bars'), int, 50, 1500, False),
+
             # AI 配置
             (('ai', 'deepseek', 'temperature'), float, 0.0, 2.0, True),
             (('ai', 'multi_agent', 'debate_rounds'), int, 1, 5, True),
@@ -230,9 +234,17 @@ class ConfigManager:
             # 网络配置
             (('network', 'instrument_discovery', 'max_retries'), int, 1, 300, True),
             (('network', 'binance', 'recv_window'), int, 1000, 60000, True),
+            (('network', 'binance', 'weight_limit'), int, 100, 10000, False),
+            (('network', 'binance', 'weight_low_reserve'), float, 0.0, 0.9, False),
             (('network', 'bar_persistence', 'max_limit'), int, 100, 2000, True),
             (('network', 'bar_persistence', 'timeout'), int, 1, 60, True),
             (('network', 'oco_manager', 'socket_timeout'), int, 1, 30, True),
+            (('network', 'data_fetch', 'deadline_sec'), (int, float), 1, 120, False),
+            (('network', 'data_fetch', 'max_workers'), int, 1, 32, False),
+            (('network', 'data_fetch', 'prefetch_lead_sec'), (int, float), 0, 600, False),
+            (('network', 'http', 'pool_maxsize'), int, 1, 100, False),
+            (('network', 'http', 'max_retries'), int, 0, 10, False),
+            (('network', 'data_cache', 'max_stale_factor'), (int, float), 1, 20, False),
 
             # 交易逻辑
             (('trading_logic', 'quantity_adjustment_step'), float, 0.0001, 0.01, True),
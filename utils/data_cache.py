@@ -0,0 +1,502 @@
+# utils/data_cache.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+# 每种数据的 TTL (秒)，按上游更新周期设置
+DEFAULT_TTLS: Dict[str, float] = {
+    "funding_rate_history": 1800.0,   # 每 8h 结算一次
+    "coinalyze_current": 60.0,        # OI 快照 (~1 分钟更新)
+    "coinalyze_history": 300.0,       # OI / 清算 / 多空比 1hour 历史
+    "binance_ratio": 300.0,           # 大户/Taker 比、OI 历史 (5m-15m 周期)
+    "ticker_24hr": 30.0,              # 24h 统计 (滚动窗口)
+}
+
+# 资金费率结算间隔 (无法从历史行推断时使用)
+FUNDING_INTERVAL_SEC = 8 * 3600.0
+# 已过结算时刻但新费率尚未发布时的重试间隔 (秒)
+FUNDING_PENDING_RETRY_SEC = 60.0
+
+# 当前上下文是否接受过期旧值 (见 DataCache.serve_stale)
+_serve_stale: ContextVar[bool] = ContextVar("data_cache_serve_stale", default=False)
+
+
+def _next_funding_time(rows: Any) -> Optional[float]:
+    """fundingRate 历史行 → 下次结算时间 (epoch 秒)，无法判断时返回 None"""
+    try:
+        times = sorted(float(row["fundingTime"]) / 1000.0 for row in rows)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not times:
+        return None
+    interval = FUNDING_INTERVAL_SEC
+    if len(times) >= 2 and times[-1] > times[-2]:
+        interval = times[-1] - times[-2]
+    return times[-1] + interval
+
+
+class DataCache:
+    """
+    外部数据 TTL 缓存 (v6.0)
+
+    资金费率每 8h 结算，Coinalyze / Binance 大户数据按 5m-1h 粒度更新，
+    但 on_timer 与诊断 / Telegram 命令每次调用都会重新请求全部数据。
+
+    特性:
+    - 键 = (endpoint, params)，params 只含决定结果的参数 (不含 from/to 时间戳)
+    - 每种数据类型独立 TTL；funding_rate_history 在下次 fundingTime 结算时过期
+    - 过期即同步刷新 (决策路径永远拿不到过期数据)
+    - stale-while-revalidate 仅在 serve_stale() 上下文中生效 (Telegram 心跳等展示用途):
+      过期但未超过 ttl * (max_stale_factor - 1) 时立即返回旧值，后台线程刷新
+      (同一键同时只刷新一次)
+    - 可选磁盘持久化 (JSON)，重启后缓存仍可用
+    - 命中 / 未命中统计，记录每个键的数据年龄
+
+    不缓存 None (请求失败)；刷新失败时保留旧值。
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float] = None,
+        default_ttl: float = 60.0,
+        max_stale_factor: float = 3.0,
+        persist_path: str = None,
+        persist_interval_sec: float = 30.0,
+        enabled: bool = True,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化缓存
+
+        Parameters
+        ----------
+        ttls : Dict[str, float], optional
+            数据类型 → TTL (秒)，覆盖 DEFAULT_TTLS 中的同名项
+        default_ttl : float
+            未配置的数据类型使用的 TTL
+        max_stale_factor : float
+            serve_stale() 上下文中旧值最长可用时间 = 过期时刻 + ttl * (max_stale_factor - 1)，
+            超过则同步刷新
+        persist_path : str, optional
+            持久化文件路径 (None = 仅内存)
+        persist_interval_sec : float
+            两次写盘的最小间隔 (秒)
+        enabled : bool
+            False 时直接透传请求
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update({k: float(v) for k, v in ttls.items()})
+        self.default_ttl = float(default_ttl)
+        self.max_stale_factor = max(1.0, float(max_stale_factor))
+        self.persist_path = persist_path
+        self.persist_interval_sec = persist_interval_sec
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger(__name__)
+
+        # key → {"value", "fetched_at" / "expires_at" (epoch 秒), "data_type"}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._async_refreshes: set = set()
+        self._last_persist: float = 0.0
+        self._dirty = False
+
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+        if self.persist_path:
+            self._load()
+
+    # =========================================================================
+    # 核心接口
+    # =========================================================================
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """(endpoint, params) → 缓存键"""
+        return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def ttl_for(self, data_type: str) -> float:
+        return self.ttls.get(data_type, self.default_ttl)
+
+    def expires_at(self, data_type: str, value: Any, fetched_at: float) -> float:
+        """
+        条目过期时间 (epoch 秒)
+
+        funding_rate_history 在下次结算 (最后一行 fundingTime + 结算间隔) 时过期，
+        刚结算的费率不会被固定 TTL 挡住；结算时刻已过但新费率尚未发布时，
+        FUNDING_PENDING_RETRY_SEC 后重试。其余类型 = fetched_at + ttl。
+        """
+        ttl = self.ttl_for(data_type)
+        if data_type == "funding_rate_history":
+            next_time = _next_funding_time(value)
+            if next_time is not None:
+                if next_time > fetched_at:
+                    return next_time
+                return fetched_at + min(ttl, FUNDING_PENDING_RETRY_SEC)
+        return fetched_at + ttl
+
+    def _stale_until(self, entry: Dict[str, Any]) -> float:
+        """serve_stale() 上下文中旧值可用的截止时间"""
+        return entry["expires_at"] + self.ttl_for(entry["data_type"]) * (self.max_stale_factor - 1)
+
+    @staticmethod
+    @contextmanager
+    def serve_stale():
+        """
+        在此上下文中 (当前线程 / asyncio 任务) 允许返回过期旧值并后台刷新
+
+        仅用于展示类调用 (Telegram 心跳、诊断)；交易决策路径不要使用。
+
+        Usage:
+            with DataCache.serve_stale():
+                history = kline_client.get_funding_rate_history(limit=5)
+        """
+        token = _serve_stale.set(True)
+        try:
+            yield
+        finally:
+            _serve_stale.reset(token)
+
+    def get(
+        self,
+        data_type: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        fetch_fn: Callable[[], Any],
+    ) -> Any:
+        """
+        读取缓存，必要时调用 fetch_fn 获取
+
+        Parameters
+        ----------
+        data_type : str
+            数据类型 (决定 TTL)
+        endpoint : str
+            API 端点
+        params : Dict, optional
+            决定结果的参数 (不含时间戳)
+        fetch_fn : Callable
+            无参获取函数，返回 None 表示失败
+
+        Returns
+        -------
+        Any
+            数据 (fetch_fn 失败且无旧值时为 None)
+        """
+        if not self.enabled:
+            return fetch_fn()
+
+        key = self.make_key(endpoint, params)
+        state, entry = self._lookup(key, data_type)
+        if state == "hit":
+            return entry["value"]
+        if state == "miss":
+            return self._fetch_and_store(key, data_type, fetch_fn, fallback=entry)
+        if state == "refresh":
+            self._get_executor().submit(self._background_refresh, key, data_type, fetch_fn)
+        return entry["value"]
+
+    async def get_async(
+        self,
+        data_type: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        fetch_coro_fn: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        get() 的 asyncio 版本 (v6.0: 异步数据客户端使用)
+
+        与 get() 共享同一份缓存条目和统计；stale 刷新作为事件循环任务执行。
+
+        Parameters
+        ----------
+        fetch_coro_fn : Callable
+            无参函数，返回获取数据的协程
+        """
+        if not self.enabled:
+            return await fetch_coro_fn()
+
+        key = self.make_key(endpoint, params)
+        state, entry = self._lookup(key, data_type)
+        if state == "hit":
+            return entry["value"]
+        if state == "miss":
+            try:
+                value = await fetch_coro_fn()
+            except Exception as e:
+                value = None
+                self.logger.warning(f"⚠️ Cache fetch failed for {key}: {e}")
+            return self._store(key, data_type, value, fallback=entry)
+        if state == "refresh":
+            task = asyncio.get_running_loop().create_task(
+                self._background_refresh_async(key, data_type, fetch_coro_fn)
+            )
+            # 保留引用，避免任务在完成前被回收
+            self._async_refreshes.add(task)
+            task.add_done_callback(self._async_refreshes.discard)
+        return entry["value"]
+
+    def _lookup(self, key: str, data_type: str):
+        """
+        查找缓存条目并更新统计
+
+        过期条目只在 serve_stale() 上下文中作为旧值返回，否则按 "miss" 同步刷新。
+
+        Returns
+        -------
+        Tuple[str, Optional[Dict]]
+            ("hit" | "stale" | "refresh" | "miss", entry)；
+            "refresh" = 已过期且需由调用方调度后台刷新
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and now < entry["expires_at"]:
+                self._stats["hits"] += 1
+                return "hit", entry
+
+            if entry is not None and _serve_stale.get() and now < self._stale_until(entry):
+                self._stats["stale_hits"] += 1
+                if key in self._refreshing:
+                    return "stale", entry
+                self._refreshing.add(key)
+                return "refresh", entry
+
+            self._stats["misses"] += 1
+            return "miss", entry
+
+    def _fetch_and_store(
+        self,
+        key: str,
+        data_type: str,
+        fetch_fn: Callable[[], Any],
+        fallback: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        try:
+            value = fetch_fn()
+        except Exception as e:
+            value = None
+            self.logger.warning(f"⚠️ Cache fetch failed for {key}: {e}")
+        return self._store(key, data_type, value, fallback)
+
+    def _store(
+        self,
+        key: str,
+        data_type: str,
+        value: Any,
+        fallback: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        if value is None:
+            with self._lock:
+                self._stats["errors"] += 1
+            # 请求失败时返回旧值 (即使已超过 stale 上限，旧数据仍优于无数据)
+            return fallback["value"] if fallback else None
+
+        fetched_at = time.time()
+        entry = {
+            "value": value,
+            "fetched_at": fetched_at,
+            "expires_at": self.expires_at(data_type, value, fetched_at),
+            "data_type": data_type,
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+        self._maybe_persist()
+        return value
+
+    def _background_refresh(self, key: str, data_type: str, fetch_fn: Callable[[], Any]):
+        try:
+            with self._lock:
+                self._stats["refreshes"] += 1
+            self._fetch_and_store(key, data_type, fetch_fn)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _background_refresh_async(self, key: str, data_type: str, fetch_coro_fn):
+        try:
+            with self._lock:
+                self._stats["refreshes"] += 1
+            try:
+                value = await fetch_coro_fn()
+            except Exception as e:
+                value = None
+                self.logger.warning(f"⚠️ Cache fetch failed for {key}: {e}")
+            self._store(key, data_type, value)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        return self._executor
+
+    def age(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """
+        数据年龄 (秒)
+
+        Returns
+        -------
+        float or None
+            距离上次成功获取的秒数，无缓存时返回 None
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return round(time.time() - entry["fetched_at"], 1)
+
+    def invalidate(self, endpoint: str = None):
+        """清除缓存 (endpoint=None 清除全部，否则清除该端点的所有参数组合)"""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                prefix = f"{endpoint}?"
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+            self._dirty = True
+
+    def wait_for_refreshes(self, timeout: float = 5.0) -> bool:
+        """等待后台刷新完成 (测试 / 关闭前使用)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                if not self._refreshing:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        命中统计和各键的数据年龄
+
+        Returns
+        -------
+        Dict
+            {"hits", "stale_hits", "misses", "refreshes", "errors", "hit_ratio", "entries": {key: {"data_type", "age_sec"}}}
+        """
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+            entries = {
+                key: {"data_type": e["data_type"], "age_sec": round(now - e["fetched_at"], 1)}
+                for key, e in self._entries.items()
+            }
+        served = stats["hits"] + stats["stale_hits"]
+        total = served + stats["misses"]
+        stats["hit_ratio"] = round(served / total, 3) if total > 0 else 0.0
+        stats["entries"] = entries
+        return stats
+
+    # =========================================================================
+    # 持久化
+    # =========================================================================
+
+    def _load(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path) as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Data cache load failed ({self.persist_path}): {e}")
+            return
+
+        now = time.time()
+        loaded = 0
+        for key, entry in raw.items():
+            try:
+                entry["fetched_at"] = float(entry["fetched_at"])
+                if "expires_at" not in entry:
+                    entry["expires_at"] = self.expires_at(entry["data_type"], entry["value"], entry["fetched_at"])
+                if now < self._stale_until(entry):
+                    self._entries[key] = entry
+                    loaded += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        if loaded:
+            self.logger.info(f"✅ Data cache warm start: {loaded} entries from {self.persist_path}")
+
+    def _maybe_persist(self):
+        if not self.persist_path:
+            return
+        if time.time() - self._last_persist < self.persist_interval_sec:
+            return
+        self.save()
+
+    def save(self):
+        """写盘 (原子替换)"""
+        if not self.persist_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._entries)
+            self._dirty = False
+            self._last_persist = time.time()
+        try:
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.persist_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.persist_path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"⚠️ Data cache save failed: {e}")
+
+    def close(self):
+        """保存并停止后台刷新线程"""
+        self.save()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance shared by all data clients
+_cache_instance: Optional[DataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_data_cache(
+    ttls: Dict[str, float] = None,
+    max_stale_factor: float = 3.0,
+    persist_path: str = None,
+    enabled: bool = True,
+    logger: Optional[logging.Logger] = None,
+) -> DataCache:
+    """Get or create the process-wide DataCache instance."""
+    global _cache_instance
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = DataCache(
+                    ttls=ttls,
+                    max_stale_factor=max_stale_factor,
+                    persist_path=persist_path,
+                    enabled=enabled,
+                    logger=logger,
+                )
+
+    return _cache_instance
@@ -0,0 +1,272 @@
+# utils/http_transport.py
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.binance_rate_governor import BinanceRateGovernor, get_rate_governor
+
+
+class HttpTransport:
+    """
+    共享 HTTP 传输层 (v6.0)
+
+    各数据客户端原先直接调用 requests.get()，每次请求都新建 TCP + TLS 连接。
+    on_timer 每轮访问 fapi.binance.com 十余次，握手开销占了大部分延迟。
+
+    这里为每个 host 维护一个 requests.Session (keep-alive 连接池)，
+    所有客户端共享同一个实例，同一 host 的请求复用已建立的连接。
+
+    特性:
+    - 每个 host 一个 Session，连接池大小可配置 (应 >= 并行获取线程数)
+    - 连接错误 / 5xx 自动重试 (指数退避)，429 仍交给各客户端处理
+    - 统计新建连接与复用连接数量，供诊断使用
+    - v6.0: fapi.binance.com 请求经 BinanceRateGovernor 按权重排队，并回传已用权重
+
+    注意: requests/urllib3 不支持 HTTP/2，这里只做 HTTP/1.1 keep-alive 复用。
+    """
+
+    DEFAULT_USER_AGENT = "AItrader/1.0"
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        status_forcelist: tuple = (500, 502, 503, 504),
+        user_agent: str = DEFAULT_USER_AGENT,
+        logger: logging.Logger = None,
+        governor: BinanceRateGovernor = None,
+    ):
+        """
+        初始化传输层
+
+        Parameters
+        ----------
+        pool_maxsize : int
+            每个 host 的最大保持连接数
+        max_retries : int
+            连接错误 / 5xx 的最大重试次数 (仅幂等 GET)
+        backoff_factor : float
+            重试退避因子 (backoff_factor * 2^n 秒)
+        status_forcelist : tuple
+            触发重试的 HTTP 状态码 (不含 429，由调用方处理)
+        user_agent : str
+            默认 User-Agent
+        logger : logging.Logger, optional
+            日志记录器
+        governor : BinanceRateGovernor, optional
+            Binance 权重调度器 (默认进程级单例)
+        """
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_factor = float(backoff_factor)
+        self.status_forcelist = tuple(status_forcelist)
+        self.user_agent = user_agent
+        self.logger = logger or logging.getLogger(__name__)
+        self.governor = governor or get_rate_governor()
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._request_count: Dict[str, int] = {}
+        self._error_count: Dict[str, int] = {}
+
+    def _build_session(self) -> requests.Session:
+        """创建带连接池和重试策略的 Session"""
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": self.user_agent})
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        获取 URL 对应 host 的 Session (不存在则创建)
+
+        Parameters
+        ----------
+        url : str
+            完整 URL
+
+        Returns
+        -------
+        requests.Session
+        """
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._build_session()
+                self._sessions[host] = session
+                self._request_count.setdefault(host, 0)
+                self._error_count.setdefault(host, 0)
+        return session
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        priority: Optional[int] = None,
+    ) -> requests.Response:
+        """
+        发送 GET 请求 (与 requests.get 相同的返回值和异常语义)
+
+        Parameters
+        ----------
+        url : str
+            完整 URL
+        params : Dict, optional
+            查询参数
+        headers : Dict, optional
+            额外请求头
+        timeout : float
+            请求超时 (秒)
+        priority : int, optional
+            v6.0: Binance 权重优先级 (PRIORITY_HIGH / NORMAL / LOW)，默认按端点判定
+
+        Returns
+        -------
+        requests.Response
+
+        Raises
+        ------
+        RateLimitDeferred
+            权重余量不足且超过排队时间 (RequestException 子类)
+        """
+        session = self.session_for(url)
+        host = urlsplit(url).netloc
+        governed = self.governor.applies_to(url)
+        if governed:
+            self.governor.acquire(url, params, priority)
+        with self._lock:
+            self._request_count[host] = self._request_count.get(host, 0) + 1
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+            if governed:
+                self.governor.observe(response.headers, response.status_code)
+            return response
+        except Exception:
+            with self._lock:
+                self._error_count[host] = self._error_count.get(host, 0) + 1
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        连接复用统计
+
+        new_connections 来自 urllib3 连接池的 num_connections，
+        reused_connections = 实际发出的请求数 - 新建连接数 (含重试)。
+
+        Returns
+        -------
+        Dict
+            {
+                "hosts": {host: {"requests", "errors", "new_connections", "reused_connections"}},
+                "requests": int,
+                "new_connections": int,
+                "reused_connections": int,
+                "reuse_ratio": float,
+            }
+        """
+        hosts: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            sessions = dict(self._sessions)
+            request_count = dict(self._request_count)
+            error_count = dict(self._error_count)
+
+        for host, session in sessions.items():
+            new_conns = 0
+            wire_requests = 0
+            # http:// 与 https:// 挂载同一个 adapter，去重避免重复计数
+            adapters = {id(a): a for a in session.adapters.values()}.values()
+            for adapter in adapters:
+                pools = getattr(adapter, "poolmanager", None)
+                if pools is None:
+                    continue
+                for key in list(pools.pools.keys()):
+                    pool = pools.pools.get(key)
+                    if pool is None:
+                        continue
+                    new_conns += getattr(pool, "num_connections", 0)
+                    wire_requests += getattr(pool, "num_requests", 0)
+            hosts[host] = {
+                "requests": request_count.get(host, 0),
+                "errors": error_count.get(host, 0),
+                "new_connections": new_conns,
+                "reused_connections": max(0, wire_requests - new_conns),
+            }
+
+        total_new = sum(h["new_connections"] for h in hosts.values())
+        total_reused = sum(h["reused_connections"] for h in hosts.values())
+        total_wire = total_new + total_reused
+        return {
+            "hosts": hosts,
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "new_connections": total_new,
+            "reused_connections": total_reused,
+            "reuse_ratio": round(total_reused / total_wire, 3) if total_wire > 0 else 0.0,
+        }
+
+    def close(self):
+        """关闭所有 Session 和连接池"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+# Singleton instance shared by all data clients
+_transport_instance: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_http_transport(
+    pool_maxsize: int = 10,
+    max_retries: int = 2,
+    backoff_factor: float = 0.5,
+    logger: Optional[logging.Logger] = None,
+) -> HttpTransport:
+    """Get or create the process-wide HttpTransport instance."""
+    global _transport_instance
+
+    if _transport_instance is None:
+        with _transport_lock:
+            if _transport_instance is None:
+                _transport_instance = HttpTransport(
+                    pool_maxsize=pool_maxsize,
+                    max_retries=max_retries,
+                    backoff_factor=backoff_factor,
+                    logger=logger,
+                )
+
+    return _transport_instance
@@ -0,0 +1,182 @@
+# utils/indicator_snapshot.py
+
+import logging
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    from nautilus_trader import __version__ as NAUTILUS_VERSION
+except ImportError:  # pragma: no cover
+    NAUTILUS_VERSION = "unknown"
+
+
+SNAPSHOT_MAGIC = b"AITIS"
+# 2: OHLCV 数组缓冲; 3: + history_bars / rolling / sma_history / bb_history
+SNAPSHOT_VERSION = 3
+
+
+class IndicatorSnapshotStore:
+    """
+    指标状态快照 (v6.0)
+
+    每次重启 on_start 都要从 Binance 下载各层 200+ 根 K 线并逐根回放到
+    TechnicalIndicatorManager (1D 层需 200+ 根日线才能初始化 SMA_200)。
+
+    这里把各层 TechnicalIndicatorManager.get_state() (K 线缓冲、历史缓冲、
+    NautilusTrader 指标内部状态) 写入一个紧凑的二进制文件:
+
+        SNAPSHOT_MAGIC | version (1 byte) | zlib(pickle({"created_at", "nautilus_version", "layers"}))
+
+    启动时恢复快照，只需补齐快照之后缺失的 K 线。
+
+    - 写入为原子替换 (tmp + os.replace)，进程中途退出不会留下半个文件
+    - 文件损坏 / 版本不符 / NautilusTrader 版本变化时忽略快照 (回退到完整预取)
+    - 快照只从本地路径读取 (pickle)，不要指向不受信任的文件
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age_sec: float = 3 * 86400,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化快照存储
+
+        Parameters
+        ----------
+        path : str
+            快照文件路径
+        max_age_sec : float
+            快照最长有效期 (秒)，超过则忽略
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.path = path
+        self.max_age_sec = float(max_age_sec)
+        self.logger = logger or logging.getLogger(__name__)
+        self.last_saved_at: Optional[float] = None
+
+    def save(self, managers: Dict[str, Any]) -> int:
+        """
+        写入快照
+
+        Parameters
+        ----------
+        managers : Dict[str, TechnicalIndicatorManager]
+            层名 → 指标管理器
+
+        Returns
+        -------
+        int
+            写入字节数 (失败返回 0)
+        """
+        try:
+            payload = {
+                "created_at": time.time(),
+                "nautilus_version": NAUTILUS_VERSION,
+                "layers": {
+                    layer: mgr.get_state()
+                    for layer, mgr in managers.items()
+                    if mgr is not None and mgr.recent_bars
+                },
+            }
+            blob = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(
+                pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, self.path)
+            self.last_saved_at = payload["created_at"]
+            return len(blob)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Indicator snapshot save failed: {e}")
+            return 0
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取快照
+
+        Returns
+        -------
+        Dict or None
+            {"created_at": float, "layers": {layer: state}}；
+            文件不存在 / 无效 / 过期时返回 None
+        """
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                blob = f.read()
+            header_len = len(SNAPSHOT_MAGIC) + 1
+            if blob[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or blob[len(SNAPSHOT_MAGIC)] != SNAPSHOT_VERSION:
+                self.logger.warning(f"⚠️ Indicator snapshot format not recognized: {self.path}")
+                return None
+            payload = pickle.loads(zlib.decompress(blob[header_len:]))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Indicator snapshot load failed ({self.path}): {e}")
+            return None
+
+        if payload.get("nautilus_version") != NAUTILUS_VERSION:
+            self.logger.info(
+                f"Indicator snapshot ignored: NautilusTrader {payload.get('nautilus_version')} "
+                f"→ {NAUTILUS_VERSION}"
+            )
+            return None
+
+        age = time.time() - float(payload.get("created_at", 0))
+        if age > self.max_age_sec:
+            self.logger.info(f"Indicator snapshot ignored: {age / 3600:.1f}h old")
+            return None
+
+        return payload
+
+    def restore(
+        self,
+        managers: Dict[str, Any],
+        max_gap_ns: Dict[str, int] = None,
+    ) -> Dict[str, int]:
+        """
+        恢复快照到各层指标管理器
+
+        Parameters
+        ----------
+        managers : Dict[str, TechnicalIndicatorManager]
+            层名 → 指标管理器 (应为刚创建、尚未喂入 K 线的实例)
+        max_gap_ns : Dict[str, int], optional
+            层名 → 允许的最大缺口 (ns)。最后一根 K 线距今超过该值时不恢复该层，
+            因为补齐缺口需要的 K 线数已接近完整预取
+
+        Returns
+        -------
+        Dict[str, int]
+            成功恢复的层 → 最后一根 K 线的 ts_event (ns)，用于只补齐之后的 K 线
+        """
+        payload = self.load()
+        if not payload:
+            return {}
+
+        now_ns = time.time_ns()
+        restored: Dict[str, int] = {}
+        for layer, mgr in managers.items():
+            state = payload["layers"].get(layer)
+            if mgr is None or not state or state.get("last_ts_event") is None:
+                continue
+            gap_limit = (max_gap_ns or {}).get(layer)
+            if gap_limit is not None and now_ns - state["last_ts_event"] > gap_limit:
+                self.logger.info(f"Indicator snapshot: {layer} layer gap too large, full prefetch")
+                continue
+            try:
+                mgr.set_state(state)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Indicator snapshot: {layer} layer not restored: {e}")
+                continue
+            restored[layer] = state["last_ts_event"]
+        return restored
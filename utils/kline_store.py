@@ -0,0 +1,305 @@
+# utils/kline_store.py
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.binance_kline_client import BinanceKlineClient
+
+
+# Binance 周期 → 毫秒
+INTERVAL_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "1w": 604_800_000,
+}
+
+BINANCE_MAX_LIMIT = 1500
+
+
+class KlineWindow(Sequence):
+    """
+    K 线只读视图 (v6.0)
+
+    引用存储内部列表的 [start, end) 区间，可选附加未收盘 K 线，不复制数据。
+    存储追加新 K 线不影响已有视图；裁剪时存储换用新列表，旧视图仍指向旧列表。
+    支持 len / 索引 / 切片 / 迭代，可直接传给 OrderFlowProcessor.process_klines。
+    """
+
+    __slots__ = ("_rows", "_start", "_end", "_tail")
+
+    def __init__(self, rows: List[List], start: int, end: int, tail: Optional[List] = None):
+        self._rows = rows
+        self._start = start
+        self._end = end
+        self._tail = tail
+
+    def __len__(self) -> int:
+        return self._end - self._start + (1 if self._tail is not None else 0)
+
+    def __getitem__(self, index):
+        n = len(self)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("KlineWindow index out of range")
+        if self._tail is not None and index == n - 1:
+            return self._tail
+        return self._rows[self._start + index]
+
+    def __iter__(self) -> Iterator[List]:
+        for i in range(self._start, self._end):
+            yield self._rows[i]
+        if self._tail is not None:
+            yield self._tail
+
+    def __repr__(self) -> str:
+        return f"KlineWindow(len={len(self)}, forming={self._tail is not None})"
+
+
+class _KlineSeries:
+    """单个 (symbol, interval) 的已收盘 K 线 + 未收盘 K 线"""
+
+    def __init__(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        self.rows: List[List] = []         # 已收盘 K 线，按 open_time 升序，连续
+        self.forming: Optional[List] = None
+        self.last_sync: float = 0.0
+        self.fetched_rows: int = 0          # 累计下载的 K 线数
+        self.lock = threading.Lock()
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return int(self.rows[-1][0]) if self.rows else None
+
+
+class KlineStore:
+    """
+    增量 K 线存储 (v6.0)
+
+    原先 on_timer / 启动预取每次下载固定 N 根 K 线，其实只有最后 1-2 根变化。
+    这里按 (symbol, interval) 保存已收盘 K 线，每次只请求上次最后一根
+    已收盘 K 线之后的数据；未收盘 K 线单独保存，不混入已收盘序列。
+
+    数据格式为 Binance 原始 12 列 (见 BinanceKlineClient.get_klines)。
+    """
+
+    def __init__(
+        self,
+        client: BinanceKlineClient = None,
+        max_bars: int = 1500,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化 K 线存储
+
+        Parameters
+        ----------
+        client : BinanceKlineClient, optional
+            K 线客户端 (默认新建)
+        max_bars : int
+            每个序列保留的最大已收盘 K 线数
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.client = client or BinanceKlineClient(logger=self.logger)
+        self.max_bars = max(1, int(max_bars))
+        self._series: Dict[Tuple[str, str], _KlineSeries] = {}
+        self._lock = threading.Lock()
+
+    def _get_series(self, symbol: str, interval: str) -> _KlineSeries:
+        key = (symbol, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if interval not in INTERVAL_MS:
+                    raise ValueError(f"Unsupported kline interval: {interval}")
+                series = _KlineSeries(INTERVAL_MS[interval])
+                self._series[key] = series
+            return series
+
+    # =========================================================================
+    # 同步
+    # =========================================================================
+
+    def sync(self, symbol: str, interval: str, min_bars: int = 50, force: bool = False) -> bool:
+        """
+        增量同步一个序列
+
+        Parameters
+        ----------
+        symbol : str
+            交易对 (如 BTCUSDT)
+        interval : str
+            Binance 周期 (15m / 4h / 1d ...)
+        min_bars : int
+            至少需要的已收盘 K 线数 (不足时整段重新下载)
+        force : bool
+            True = 即使最新已收盘 K 线仍是最新的也请求 (刷新未收盘 K 线)
+
+        Returns
+        -------
+        bool
+            序列是否可用 (请求失败但已有数据时仍为 True)
+        """
+        series = self._get_series(symbol, interval)
+        min_bars = min(max(1, int(min_bars)), self.max_bars, BINANCE_MAX_LIMIT - 1)
+
+        with series.lock:
+            now_ms = int(time.time() * 1000)
+            last_open = series.last_open_time
+
+            if len(series.rows) < min_bars or last_open is None:
+                start_time = None
+                limit = min(min_bars + 1, BINANCE_MAX_LIMIT)  # +1: 未收盘 K 线
+            else:
+                missing = (now_ms - last_open) // series.interval_ms - 1  # 新的已收盘 K 线数
+                if missing <= 0 and not force:
+                    return True
+                if missing + 1 > BINANCE_MAX_LIMIT:
+                    # 断档过长: 整段重新下载
+                    start_time = None
+                    limit = min(max(min_bars, len(series.rows)) + 1, BINANCE_MAX_LIMIT)
+                else:
+                    start_time = last_open + series.interval_ms
+                    limit = int(missing) + 1  # +1: 未收盘 K 线
+
+            klines = self.client.get_klines(
+                symbol=symbol, interval=interval, limit=limit, start_time=start_time,
+            )
+            if not klines:
+                return bool(series.rows)
+
+            series.fetched_rows += len(klines)
+            series.last_sync = time.time()
+            self._merge(series, klines, now_ms, replace=start_time is None)
+            return bool(series.rows)
+
+    def _merge(self, series: _KlineSeries, klines: List[List], now_ms: int, replace: bool):
+        closed = [k for k in klines if int(k[6]) < now_ms]
+        forming = klines[-1] if int(klines[-1][6]) >= now_ms else None
+
+        if replace:
+            rows = closed
+        else:
+            rows = series.rows
+            last_open = series.last_open_time
+            for k in closed:
+                open_time = int(k[0])
+                if last_open is not None and open_time <= last_open:
+                    continue  # 重复
+                if last_open is not None and open_time != last_open + series.interval_ms:
+                    self.logger.warning(
+                        f"⚠️ Kline gap detected ({last_open} → {open_time}), resetting series"
+                    )
+                    rows = [r for r in closed if int(r[0]) >= open_time]
+                    break
+                rows.append(k)
+                last_open = open_time
+
+        # 裁剪时换用新列表，已发出的 KlineWindow 不受影响
+        if len(rows) > self.max_bars:
+            rows = rows[-self.max_bars:]
+        series.rows = rows
+        series.forming = forming
+
+    # =========================================================================
+    # 读取
+    # =========================================================================
+
+    def closed(self, symbol: str, interval: str, count: int) -> KlineWindow:
+        """最近 count 根已收盘 K 线 (不触发网络请求)"""
+        series = self._get_series(symbol, interval)
+        with series.lock:
+            rows = series.rows
+            end = len(rows)
+            return KlineWindow(rows, max(0, end - int(count)), end)
+
+    def forming(self, symbol: str, interval: str) -> Optional[List]:
+        """当前未收盘 K 线 (上次同步时的状态)"""
+        series = self._get_series(symbol, interval)
+        with series.lock:
+            return series.forming
+
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        count: int,
+        include_forming: bool = False,
+    ) -> Optional[KlineWindow]:
+        """
+        同步后返回最近 count 根 K 线
+
+        Parameters
+        ----------
+        symbol : str
+            交易对
+        interval : str
+            Binance 周期
+        count : int
+            已收盘 K 线数
+        include_forming : bool
+            是否在末尾附加未收盘 K 线 (会强制刷新)
+
+        Returns
+        -------
+        KlineWindow or None
+            无数据时返回 None
+        """
+        if not self.sync(symbol, interval, min_bars=count, force=include_forming):
+            return None
+        series = self._get_series(symbol, interval)
+        with series.lock:
+            rows = series.rows
+            end = len(rows)
+            tail = series.forming if include_forming else None
+            return KlineWindow(rows, max(0, end - int(count)), end, tail)
+
+    def get_ohlcv(self, symbol: str, interval: str, count: int) -> List[Dict[str, Any]]:
+        """
+        最近 count 根已收盘 K 线的 OHLCV Dict (S/R 计算格式，不触发网络请求)
+
+        timestamp 为开盘时间 (纳秒)，与启动预取生成的 Bar.ts_init 一致。
+        """
+        return [
+            {
+                'timestamp': int(k[0]) * 1_000_000,
+                'open': float(k[1]),
+                'high': float(k[2]),
+                'low': float(k[3]),
+                'close': float(k[4]),
+                'volume': float(k[5]),
+            }
+            for k in self.closed(symbol, interval, count)
+        ]
+
+    def get_status(self) -> Dict[str, Any]:
+        """各序列的深度和下载量 (诊断用)"""
+        with self._lock:
+            items = list(self._series.items())
+        status = {}
+        for (symbol, interval), series in items:
+            with series.lock:
+                status[f"{symbol}:{interval}"] = {
+                    'closed_bars': len(series.rows),
+                    'last_open_time': series.last_open_time,
+                    'has_forming': series.forming is not None,
+                    'fetched_rows': series.fetched_rows,
+                    'last_sync': series.last_sync,
+                }
+        return status
@@ -0,0 +1,631 @@
+# utils/local_orderbook.py
+
+"""
+本地订单簿 (v6.0)
+
+通过 Binance diff-depth WebSocket 维护本地订单簿，替代每轮 REST 全量快照。
+
+同步流程 (Binance Futures 官方文档 "How to manage a local order book correctly"):
+1. 订阅 <symbol>@depth@100ms，缓存收到的事件
+2. REST 获取快照 /fapi/v1/depth?limit=1000
+3. 丢弃 u < lastUpdateId 的事件
+4. 第一个处理的事件必须满足 U <= lastUpdateId <= u
+5. 之后每个事件的 pu 必须等于上一个事件的 u，否则从第 2 步重新同步
+6. 数量为绝对值，0 表示删除该价位
+
+参考:
+- https://binance-docs.github.io/apidocs/futures/en/#how-to-manage-a-local-order-book-correctly
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.binance_orderbook_client import BinanceOrderBookClient
+
+
+# apply_diff() 返回状态
+DIFF_APPLIED = "APPLIED"
+DIFF_STALE = "STALE"      # u < lastUpdateId，快照已包含，丢弃
+DIFF_GAP = "GAP"          # 序列断档，需要重新同步
+
+
+class _BookSide:
+    """
+    单边价位数组 (价格升序)
+
+    prices / qtys 为平行数组，通过二分查找定位价位。
+    买盘同样按升序存储，最优买价位于末尾。
+    """
+
+    __slots__ = ("prices", "qtys")
+
+    def __init__(self):
+        self.prices: List[float] = []
+        self.qtys: List[float] = []
+
+    def clear(self):
+        self.prices.clear()
+        self.qtys.clear()
+
+    def load(self, levels: List[List[str]]):
+        pairs = sorted((float(p), float(q)) for p, q in levels if float(q) > 0)
+        self.prices = [p for p, _ in pairs]
+        self.qtys = [q for _, q in pairs]
+
+    def update(self, price: float, qty: float):
+        i = bisect_left(self.prices, price)
+        exists = i < len(self.prices) and self.prices[i] == price
+        if qty <= 0:
+            if exists:
+                del self.prices[i]
+                del self.qtys[i]
+        elif exists:
+            self.qtys[i] = qty
+        else:
+            self.prices.insert(i, price)
+            self.qtys.insert(i, qty)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class LocalOrderBook:
+    """
+    本地订单簿数据结构 (不含网络 I/O)
+
+    负责快照加载、增量事件应用和序列校验，输出与
+    BinanceOrderBookClient.get_order_book() 相同格式的深度字典，
+    OrderBookProcessor 无需改动即可使用。
+    """
+
+    def __init__(self, symbol: str = "BTCUSDT", max_levels: int = 1000):
+        """
+        Parameters
+        ----------
+        symbol : str
+            交易对
+        max_levels : int
+            每边保留的最大价位数 (超出时裁剪远离盘口的价位)
+        """
+        self.symbol = symbol
+        self.max_levels = max_levels
+        self.bids = _BookSide()
+        self.asks = _BookSide()
+        self.last_update_id: int = 0
+        self._last_u: Optional[int] = None   # 上一个已应用事件的 u
+        self._synced = False
+        self.event_time: int = 0             # 最近事件时间 E (ms)
+        self.transaction_time: int = 0       # 最近撮合时间 T (ms)
+        self.updated_at: float = 0.0         # 本地 monotonic 时间
+
+    @property
+    def is_synced(self) -> bool:
+        return self._synced
+
+    @property
+    def awaiting_first_event(self) -> bool:
+        return self._synced and self._last_u is None
+
+    def reset(self):
+        """清空订单簿，等待重新同步"""
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+        self._last_u = None
+        self._synced = False
+
+    def apply_snapshot(self, snapshot: Dict[str, Any]):
+        """
+        加载 REST 快照
+
+        Parameters
+        ----------
+        snapshot : Dict
+            /fapi/v1/depth 返回值 (含 lastUpdateId, bids, asks)
+        """
+        self.bids.load(snapshot.get("bids", []))
+        self.asks.load(snapshot.get("asks", []))
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self.event_time = int(snapshot.get("E", 0) or 0)
+        self.transaction_time = int(snapshot.get("T", 0) or 0)
+        self._last_u = None
+        self._synced = True
+        self.updated_at = time.monotonic()
+
+    def apply_diff(self, event: Dict[str, Any]) -> str:
+        """
+        应用一个 depthUpdate 事件
+
+        Parameters
+        ----------
+        event : Dict
+            {"e": "depthUpdate", "E", "T", "U", "u", "pu", "b": [[p, q]], "a": [[p, q]]}
+
+        Returns
+        -------
+        str
+            DIFF_APPLIED / DIFF_STALE / DIFF_GAP
+        """
+        if not self._synced:
+            return DIFF_GAP
+
+        first_id = int(event["U"])
+        final_id = int(event["u"])
+
+        if final_id < self.last_update_id:
+            return DIFF_STALE
+
+        if self._last_u is None:
+            # 快照后的第一个事件必须覆盖 lastUpdateId
+            if not (first_id <= self.last_update_id <= final_id):
+                return DIFF_GAP
+        elif int(event.get("pu", -1)) != self._last_u:
+            return DIFF_GAP
+
+        for price, qty in event.get("b", []):
+            self.bids.update(float(price), float(qty))
+        for price, qty in event.get("a", []):
+            self.asks.update(float(price), float(qty))
+        self._trim()
+
+        self._last_u = final_id
+        self.last_update_id = final_id
+        self.event_time = int(event.get("E", 0) or 0)
+        self.transaction_time = int(event.get("T", 0) or 0)
+        self.updated_at = time.monotonic()
+        return DIFF_APPLIED
+
+    def _trim(self):
+        """裁剪远离盘口的价位，避免长时间运行后数组无限增长"""
+        excess = len(self.bids) - self.max_levels
+        if excess > 0:
+            del self.bids.prices[:excess]
+            del self.bids.qtys[:excess]
+        excess = len(self.asks) - self.max_levels
+        if excess > 0:
+            del self.asks.prices[-excess:]
+            del self.asks.qtys[-excess:]
+
+    def best_bid(self) -> Optional[float]:
+        return self.bids.prices[-1] if self.bids.prices else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.prices[0] if self.asks.prices else None
+
+    def top_levels(self, limit: int = 100):
+        """
+        返回前 limit 档 (bids 价格降序, asks 价格升序)
+
+        Returns
+        -------
+        Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]
+        """
+        n_b = min(limit, len(self.bids))
+        bids = list(zip(reversed(self.bids.prices[-n_b:]), reversed(self.bids.qtys[-n_b:]))) if n_b else []
+        asks = list(zip(self.asks.prices[:limit], self.asks.qtys[:limit]))
+        return bids, asks
+
+    def to_depth_dict(self, limit: int = 100) -> Dict[str, Any]:
+        """
+        导出为 REST /fapi/v1/depth 格式
+
+        Parameters
+        ----------
+        limit : int
+            每边档位数
+
+        Returns
+        -------
+        Dict
+            {"lastUpdateId", "E", "T", "bids": [[str, str]], "asks": [[str, str]]}
+        """
+        bids, asks = self.top_levels(limit)
+        return {
+            "lastUpdateId": self.last_update_id,
+            "E": self.event_time,
+            "T": self.transaction_time,
+            "bids": [[repr(p), repr(q)] for p, q in bids],
+            "asks": [[repr(p), repr(q)] for p, q in asks],
+        }
+
+
+class OrderBookStream:
+    """
+    diff-depth WebSocket 订单簿流
+
+    在后台线程运行 asyncio 事件循环:
+    - 订阅 <symbol>@depth@<speed>ms
+    - REST 快照 + 缓存事件完成初始同步
+    - 序列断档 (pu != 上一个 u) 时自动重新同步
+    - 按 sample_interval_sec 采样 OBI / 深度，提供分钟内历史
+
+    读取接口 (get_order_book / get_history) 线程安全，不发起网络请求。
+    """
+
+    DEFAULT_WS_BASE_URL = "wss://fstream.binance.com"
+
+    def __init__(
+        self,
+        symbol: str = "BTCUSDT",
+        ws_base_url: str = None,
+        rest_base_url: str = None,
+        update_speed_ms: int = 100,
+        snapshot_limit: int = 1000,
+        depth_levels: int = 100,
+        sample_interval_sec: float = 5.0,
+        history_seconds: float = 600.0,
+        stale_after_sec: float = 10.0,
+        reconnect_delay_sec: float = 5.0,
+        record_path: str = None,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化订单簿流
+
+        Parameters
+        ----------
+        symbol : str
+            交易对 (如 BTCUSDT)
+        ws_base_url : str, optional
+            WebSocket 基础地址 (默认 Binance Futures；测试时指向回放服务器)
+        rest_base_url : str, optional
+            REST 快照基础地址 (默认 BinanceOrderBookClient.BASE_URL)
+        update_speed_ms : int
+            推送频率 (100 / 250 / 500)
+        snapshot_limit : int
+            REST 快照档位数
+        depth_levels : int
+            采样 OBI / 深度时使用的档位数 (与 REST 模式的 limit 保持一致)
+        sample_interval_sec : float
+            OBI 采样间隔 (秒)
+        history_seconds : float
+            采样历史保留时长 (秒)
+        stale_after_sec : float
+            超过该时间未更新视为过期，get_order_book 返回 None
+        reconnect_delay_sec : float
+            断线重连等待 (秒)
+        record_path : str, optional
+            将原始快照和事件追加写入 JSONL (供 OrderBookReplayServer 回放)
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.symbol = symbol.upper()
+        self.ws_base_url = (ws_base_url or self.DEFAULT_WS_BASE_URL).rstrip("/")
+        self.update_speed_ms = update_speed_ms
+        self.snapshot_limit = snapshot_limit
+        self.depth_levels = depth_levels
+        self.sample_interval_sec = sample_interval_sec
+        self.stale_after_sec = stale_after_sec
+        self.reconnect_delay_sec = reconnect_delay_sec
+        self.record_path = record_path
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.book = LocalOrderBook(symbol=self.symbol, max_levels=snapshot_limit)
+        self._snapshot_client = BinanceOrderBookClient(logger=self.logger, base_url=rest_base_url)
+
+        self._lock = threading.Lock()
+        self._history: Deque[Dict[str, Any]] = deque(
+            maxlen=max(1, int(history_seconds / max(sample_interval_sec, 0.1)))
+        )
+        self._last_sample_at: float = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event = threading.Event()
+
+        # 统计
+        self.events_applied = 0
+        self.events_dropped = 0
+        self.resync_count = 0
+        self.reconnect_count = 0
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.ws_base_url}/ws/{self.symbol.lower()}@depth@{self.update_speed_ms}ms"
+
+    # =========================================================================
+    # 生命周期
+    # =========================================================================
+
+    def start(self):
+        """启动后台线程 (重复调用无副作用)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._thread_main, name=f"orderbook-stream-{self.symbol}", daemon=True,
+        )
+        self._thread.start()
+        self.logger.info(f"📖 Order book stream starting: {self.stream_url}")
+
+    def stop(self, timeout: float = 5.0):
+        """停止后台线程"""
+        self._stop_event.set()
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(lambda: None)  # 唤醒事件循环
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        except Exception as e:
+            self.logger.error(f"❌ Order book stream crashed: {e}")
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self):
+        import aiohttp  # 可选依赖: 仅在启用订单簿流时需要
+
+        while not self._stop_event.is_set():
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self.stream_url, heartbeat=30) as ws:
+                        self.logger.info(f"✅ Order book stream connected ({self.symbol})")
+                        await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ Order book stream error: {e}")
+
+            if self._stop_event.is_set():
+                break
+            with self._lock:
+                self.book.reset()
+            self.reconnect_count += 1
+            await asyncio.sleep(self.reconnect_delay_sec)
+
+    async def _consume(self, ws):
+        """消费 WebSocket 消息，维护同步状态"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        buffer: List[Dict[str, Any]] = []
+        snapshot_future = None
+
+        while not self._stop_event.is_set():
+            try:
+                msg = await ws.receive(timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                    return
+                continue
+
+            payload = json.loads(msg.data)
+            event = payload.get("data", payload)  # 兼容组合流格式
+            if event.get("e") != "depthUpdate":
+                continue
+            self._record(event)
+
+            if not self.book.is_synced:
+                buffer.append(event)
+                if snapshot_future is None:
+                    snapshot_future = loop.run_in_executor(None, self._fetch_snapshot)
+                if not snapshot_future.done():
+                    continue
+                snapshot = snapshot_future.result()
+                snapshot_future = None
+                if not snapshot:
+                    buffer.clear()
+                    await asyncio.sleep(self.reconnect_delay_sec)
+                    continue
+                self._sync_from_snapshot(snapshot, buffer)
+                buffer = []
+                continue
+
+            with self._lock:
+                status = self.book.apply_diff(event)
+            if status == DIFF_APPLIED:
+                self.events_applied += 1
+                self._maybe_sample()
+            elif status == DIFF_STALE:
+                self.events_dropped += 1
+            else:
+                self._handle_gap(event)
+                buffer = [event]
+
+    def _sync_from_snapshot(self, snapshot: Dict[str, Any], buffered: List[Dict[str, Any]]):
+        """加载快照并回放缓存事件"""
+        self._record(snapshot)
+        with self._lock:
+            self.book.apply_snapshot(snapshot)
+            for event in buffered:
+                status = self.book.apply_diff(event)
+                if status == DIFF_APPLIED:
+                    self.events_applied += 1
+                elif status == DIFF_STALE:
+                    self.events_dropped += 1
+                else:
+                    # 快照比缓存事件更新太多 / 太旧，重新获取
+                    self.book.reset()
+                    self.resync_count += 1
+                    self.logger.warning(
+                        f"⚠️ Order book snapshot {snapshot.get('lastUpdateId')} does not bridge "
+                        f"buffered events, resyncing"
+                    )
+                    return
+        self.logger.info(
+            f"📖 Order book synced: lastUpdateId={self.book.last_update_id}, "
+            f"{len(self.book.bids)} bids / {len(self.book.asks)} asks"
+        )
+        self._maybe_sample(force=True)
+
+    def _handle_gap(self, event: Dict[str, Any]):
+        """序列断档 → 重置并重新同步"""
+        self.resync_count += 1
+        self.logger.warning(
+            f"⚠️ Order book sequence gap (pu={event.get('pu')}, expected {self.book._last_u}), "
+            f"resync #{self.resync_count}"
+        )
+        with self._lock:
+            self.book.reset()
+
+    def _fetch_snapshot(self) -> Optional[Dict[str, Any]]:
+        return self._snapshot_client.get_order_book(symbol=self.symbol, limit=self.snapshot_limit)
+
+    def _record(self, item: Dict[str, Any]):
+        if not self.record_path:
+            return
+        try:
+            with open(self.record_path, "a") as f:
+                f.write(json.dumps(item) + "\n")
+        except OSError as e:
+            self.logger.debug(f"Order book record failed: {e}")
+
+    # =========================================================================
+    # 采样 (分钟内 OBI / 深度历史)
+    # =========================================================================
+
+    def _maybe_sample(self, force: bool = False):
+        now = time.time()
+        if not force and now - self._last_sample_at < self.sample_interval_sec:
+            return
+        with self._lock:
+            bids, asks = self.book.top_levels(self.depth_levels)
+        if not bids or not asks:
+            return
+        bid_vol = sum(q for _, q in bids)
+        ask_vol = sum(q for _, q in asks)
+        total = bid_vol + ask_vol
+        best_bid, best_ask = bids[0][0], asks[0][0]
+        mid = (best_bid + best_ask) / 2
+        sample = {
+            "timestamp": int(now * 1000),
+            "obi": round((bid_vol - ask_vol) / total, 4) if total > 0 else 0.0,
+            "bid_depth_btc": round(bid_vol, 3),
+            "ask_depth_btc": round(ask_vol, 3),
+            "spread_pct": round((best_ask - best_bid) / mid * 100, 5) if mid > 0 else 0.0,
+            "mid_price": round(mid, 2),
+        }
+        with self._lock:
+            self._history.append(sample)
+        self._last_sample_at = now
+
+    # =========================================================================
+    # 读取接口
+    # =========================================================================
+
+    @property
+    def is_ready(self) -> bool:
+        """已同步且数据未过期"""
+        with self._lock:
+            if not self.book.is_synced or self.book.awaiting_first_event:
+                return False
+            return (time.monotonic() - self.book.updated_at) <= self.stale_after_sec
+
+    def get_order_book(self, limit: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        读取本地订单簿 (零网络开销)
+
+        Parameters
+        ----------
+        limit : int
+            每边档位数
+
+        Returns
+        -------
+        Optional[Dict]
+            REST /fapi/v1/depth 格式，未同步或已过期返回 None
+        """
+        if not self.is_ready:
+            return None
+        with self._lock:
+            return self.book.to_depth_dict(limit)
+
+    def get_history(self, window_sec: float = None) -> List[Dict[str, Any]]:
+        """
+        返回 OBI / 深度采样历史 (时间升序)
+
+        Parameters
+        ----------
+        window_sec : float, optional
+            只返回最近 window_sec 秒的样本
+        """
+        with self._lock:
+            samples = list(self._history)
+        if window_sec is not None:
+            cutoff = int((time.time() - window_sec) * 1000)
+            samples = [s for s in samples if s["timestamp"] >= cutoff]
+        return samples
+
+    def get_history_summary(self, window_sec: float = 300.0) -> Dict[str, Any]:
+        """
+        分钟内 OBI 动态摘要 (供 OrderBookProcessor.dynamics 使用)
+
+        Returns
+        -------
+        Dict
+            {
+                "samples": int,
+                "window_sec": float,
+                "obi_series": [...],          # 采样 OBI (最多 60 个)
+                "obi_change_1m": float|None,
+                "obi_change_window": float|None,
+                "obi_min": float|None, "obi_max": float|None,
+                "bid_depth_change_pct": float|None,
+                "ask_depth_change_pct": float|None,
+            }
+        """
+        samples = self.get_history(window_sec)
+        summary = {
+            "samples": len(samples),
+            "window_sec": window_sec,
+            "sample_interval_sec": self.sample_interval_sec,
+            "obi_series": [s["obi"] for s in samples[-60:]],
+            "obi_change_1m": None,
+            "obi_change_window": None,
+            "obi_min": None,
+            "obi_max": None,
+            "bid_depth_change_pct": None,
+            "ask_depth_change_pct": None,
+        }
+        if len(samples) < 2:
+            return summary
+
+        last = samples[-1]
+        first = samples[0]
+        cutoff_1m = last["timestamp"] - 60_000
+        ref_1m = next((s for s in samples if s["timestamp"] >= cutoff_1m), first)
+        obis = [s["obi"] for s in samples]
+
+        def pct(curr, prev):
+            return round((curr - prev) / prev * 100, 2) if prev > 0 else None
+
+        summary.update({
+            "obi_change_1m": round(last["obi"] - ref_1m["obi"], 4),
+            "obi_change_window": round(last["obi"] - first["obi"], 4),
+            "obi_min": min(obis),
+            "obi_max": max(obis),
+            "bid_depth_change_pct": pct(last["bid_depth_btc"], first["bid_depth_btc"]),
+            "ask_depth_change_pct": pct(last["ask_depth_btc"], first["ask_depth_btc"]),
+        })
+        return summary
+
+    def get_status(self) -> Dict[str, Any]:
+        """同步状态 (心跳 / 诊断用)"""
+        with self._lock:
+            age = time.monotonic() - self.book.updated_at if self.book.updated_at else None
+            return {
+                "synced": self.book.is_synced,
+                "last_update_id": self.book.last_update_id,
+                "age_sec": round(age, 2) if age is not None else None,
+                "bid_levels": len(self.book.bids),
+                "ask_levels": len(self.book.asks),
+                "events_applied": self.events_applied,
+                "events_dropped": self.events_dropped,
+                "resync_count": self.resync_count,
+                "reconnect_count": self.reconnect_count,
+                "history_samples": len(self._history),
+            }
@@ -39,6 +39,7 @@ class OrderBookProcessor:
         weighted_obi_config: Dict = None,
         history_size: int = 10,
         logger: logging.Logger = None,
+        local_book=None,
     ):
         """
         初始化处理器
@@ -57,6 +58,8 @@ class OrderBookProcessor:
             历史缓存大小 (用于变化率计算)
         logger : logging.Logger, optional
             日志记录器
+        local_book : OrderBookStream, optional
+            v6.0: WebSocket 本地订单簿，提供零网络开销的深度数据和分钟内 OBI 历史
         """
         self.price_band_pct = price_band_pct
         self.base_anomaly_threshold = base_anomaly_threshold
@@ -76,9 +79,12 @@ class OrderBookProcessor:
         self._history: List[Dict] = []
         self._history_size = history_size
 
+        # v6.0: 本地订单簿 (utils.local_orderbook.OrderBookStream)
+        self.local_book = local_book
+
     def process(
         self,
-        order_book: Dict,
+        order_book: Optional[Dict],
         current_price: float,
         volatility: float = None,
     ) -> Dict[str, Any]:
@@ -87,8 +93,9 @@ class OrderBookProcessor:
 
         Parameters
         ----------
-        order_book : Dict
+        order_book : Dict, optional
             Binance 订单簿原始数据
+            v6.0: 为 None 时从 local_book 读取 (未同步则返回 NO_DATA)
         current_price : float
             当前价格
         volatility : float, optional
@@ -100,6 +107,11 @@ class OrderBookProcessor:
             包含所有订单簿指标的字典 (详见方案文档 lines/259-372)
         """
         try:
+            if order_book is None and self.local_book is not None:
+                order_book = self.local_book.get_order_book(limit=100)
+            if order_book is None:
+                return self._no_data_result("Local order book not synced")
+
             bids = order_book.get("bids", [])
             asks = order_book.get("asks", [])
 
@@ -170,6 +182,12 @@ class OrderBookProcessor:
 
             # ========== v2.0 Critical: 变化率指标 ==========
             dynamics = self._calculate_dynamics(current_data)
+            # v6.0: 分钟内 OBI/深度动态 (WebSocket 采样，分辨率远高于每轮快照)
+            if self.local_book is not None:
+                try:
+                    dynamics["intraminute"] = self.local_book.get_history_summary()
+                except Exception as e:
+                    self.logger.debug(f"Local order book history unavailable: {e}")
             current_data["dynamics"] = dynamics
 
             # ========== 更新历史缓存 ==========
@@ -0,0 +1,169 @@
+# utils/orderbook_replay.py
+
+"""
+订单簿回放服务器 (v6.0)
+
+在本地模拟 Binance Futures 的两个接口，回放录制的深度数据:
+- GET /fapi/v1/depth          → 返回录制的 REST 快照
+- WS  /ws/<symbol>@depth@...  → 依次推送录制的 depthUpdate 事件
+
+用于测试 OrderBookStream，无需访问 Binance:
+
+    server = OrderBookReplayServer.from_file("logs/depth_btcusdt.jsonl")
+    server.start()
+    stream = OrderBookStream(ws_base_url=server.ws_base_url, rest_base_url=server.rest_base_url)
+
+录制文件为 OrderBookStream(record_path=...) 生成的 JSONL:
+含 lastUpdateId 的行为快照，含 "e": "depthUpdate" 的行为增量事件。
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class OrderBookReplayServer:
+    """本地 REST + WebSocket 回放服务器 (后台线程运行 aiohttp)"""
+
+    def __init__(
+        self,
+        snapshot: Dict[str, Any],
+        diffs: List[Dict[str, Any]],
+        interval_sec: float = 0.01,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        snapshot_delay_sec: float = 0.0,
+        logger: logging.Logger = None,
+    ):
+        """
+        Parameters
+        ----------
+        snapshot : Dict
+            REST 快照 (lastUpdateId, bids, asks)
+        diffs : List[Dict]
+            按顺序推送的 depthUpdate 事件
+        interval_sec : float
+            事件推送间隔 (秒)
+        host : str
+            监听地址
+        port : int
+            监听端口 (0 = 随机)
+        snapshot_delay_sec : float
+            REST 快照响应延迟，模拟快照晚于 WS 事件到达
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.snapshot = snapshot
+        self.diffs = list(diffs)
+        self.interval_sec = interval_sec
+        self.host = host
+        self.port = port
+        self.snapshot_delay_sec = snapshot_delay_sec
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.snapshot_requests = 0
+        self.ws_connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._finished = threading.Event()  # 所有事件已推送
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "OrderBookReplayServer":
+        """从 OrderBookStream 录制的 JSONL 文件加载 (使用第一个快照)"""
+        snapshot = None
+        diffs = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if item.get("e") == "depthUpdate":
+                    diffs.append(item)
+                elif "lastUpdateId" in item and snapshot is None:
+                    snapshot = item
+        if snapshot is None:
+            raise ValueError(f"No depth snapshot found in {path}")
+        return cls(snapshot=snapshot, diffs=diffs, **kwargs)
+
+    @property
+    def rest_base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_base_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 5.0):
+        """启动服务器，阻塞直到端口就绪"""
+        self._thread = threading.Thread(target=self._thread_main, name="orderbook-replay", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Order book replay server failed to start")
+
+    def stop(self, timeout: float = 5.0):
+        if self._loop and self._runner:
+            fut = asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop)
+            try:
+                fut.result(timeout)
+            except Exception:
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wait_finished(self, timeout: float = 10.0) -> bool:
+        """等待所有事件推送完成"""
+        return self._finished.wait(timeout)
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start_app())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _start_app(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/fapi/v1/depth", self._handle_depth)
+        app.router.add_get("/ws/{stream}", self._handle_ws)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # 端口为 0 时读取实际端口
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _handle_depth(self, request):
+        from aiohttp import web
+
+        self.snapshot_requests += 1
+        if self.snapshot_delay_sec > 0:
+            await asyncio.sleep(self.snapshot_delay_sec)
+        return web.json_response(self.snapshot)
+
+    async def _handle_ws(self, request):
+        from aiohttp import web
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.ws_connections += 1
+        for event in self.diffs:
+            if ws.closed:
+                break
+            await ws.send_str(json.dumps(event))
+            await asyncio.sleep(self.interval_sec)
+        self._finished.set()
+        # 保持连接直到客户端关闭
+        async for _ in ws:
+            pass
+        return ws
@@ -0,0 +1,270 @@
+# utils/parallel_fetcher.py
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# 数据源状态
+FETCH_OK = "OK"            # 成功返回数据
+FETCH_EMPTY = "EMPTY"      # 调用成功但返回 None / 空数据
+FETCH_ERROR = "ERROR"      # 调用抛出异常
+FETCH_TIMEOUT = "TIMEOUT"  # 超过本轮 deadline 未返回
+FETCH_BUSY = "BUSY"        # 之前超时的调用仍在运行 (占用 worker)，本轮未重新提交
+
+
+@dataclass
+class FetchOutcome:
+    """单个数据源的获取结果"""
+    name: str
+    status: str
+    value: Any = None
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == FETCH_OK
+
+
+@dataclass
+class FetchStageResult:
+    """一轮并行获取的汇总结果"""
+    outcomes: Dict[str, FetchOutcome] = field(default_factory=dict)
+    total_ms: float = 0.0
+    deadline_sec: float = 0.0
+    # 本轮结束时仍占用 worker 的超时调用 (线程无法中断，结果已丢弃)
+    in_flight: List[str] = field(default_factory=list)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """返回数据源的值，缺失/失败时返回 default"""
+        outcome = self.outcomes.get(name)
+        if outcome is None or not outcome.ok:
+            return default
+        return outcome.value
+
+    @property
+    def missing(self) -> List[str]:
+        """未成功获取的数据源列表 (EMPTY/ERROR/TIMEOUT)"""
+        return [name for name, o in self.outcomes.items() if not o.ok]
+
+    def merge(self, other: 'FetchStageResult') -> 'FetchStageResult':
+        """
+        合并另一轮结果 (v6.0: 预热结果 + 边界时获取的结果)
+
+        同名数据源以 other 为准；total_ms / in_flight 取本轮 (关键路径)。
+        """
+        return FetchStageResult(
+            outcomes={**self.outcomes, **other.outcomes},
+            total_ms=other.total_ms,
+            deadline_sec=other.deadline_sec,
+            in_flight=list(other.in_flight),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """供心跳/诊断使用的摘要 (不含原始数据)"""
+        return {
+            'total_ms': round(self.total_ms, 1),
+            'deadline_sec': self.deadline_sec,
+            'missing': self.missing,
+            'in_flight': list(self.in_flight),
+            'sources': {
+                name: {
+                    'status': o.status,
+                    'latency_ms': round(o.latency_ms, 1),
+                    'error': o.error,
+                }
+                for name, o in self.outcomes.items()
+            },
+        }
+
+
+class ParallelDataFetcher:
+    """
+    并行数据获取阶段 (v6.0)
+
+    on_timer 原先串行调用 sentiment / klines / coinalyze / funding rate /
+    orderbook / binance derivatives，总耗时为各数据源延迟之和。
+    这里把互不依赖的 I/O 调用扇出到线程池，总耗时约等于最慢的数据源，
+    且受每轮 deadline 约束。
+
+    特性:
+    - 线程池复用 (跨周期)，避免每轮创建线程
+    - 每轮 deadline: 超时的数据源标记为 TIMEOUT，不阻塞后续分析
+    - 缺失数据源显式标记 (EMPTY / ERROR / TIMEOUT / BUSY)
+    - 记录每个数据源的延迟
+    - 超时后仍在运行的调用无法取消，会继续占用 worker: 按数据源记录，
+      完成前不重新提交 (标记 BUSY)，并在结果的 in_flight 中报告
+
+    注意: 线程中只做网络 I/O，数据处理 (OrderFlowProcessor 等有状态处理器)
+    仍在调用线程中执行，避免并发修改处理器内部历史。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        deadline_sec: float = 20.0,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化并行获取器
+
+        Parameters
+        ----------
+        max_workers : int
+            线程池大小 (应 >= 单轮数据源数量)
+        deadline_sec : float
+            单轮获取的总时间上限 (秒)
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.deadline_sec = float(deadline_sec)
+        self.logger = logger or logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="data-fetch",
+        )
+        # 数据源 → (超时后仍在运行的 future, 开始时间)
+        self._abandoned: Dict[str, Tuple[Future, float]] = {}
+        self._abandoned_lock = threading.Lock()
+
+    def in_flight(self) -> List[str]:
+        """之前超时、目前仍占用 worker 的数据源"""
+        with self._abandoned_lock:
+            return sorted(self._abandoned)
+
+    def _abandon(self, name: str, fut: Future, started_at: float):
+        """记录无法取消的超时调用，完成后自动移除"""
+        with self._abandoned_lock:
+            self._abandoned[name] = (fut, started_at)
+
+        def _release(done: Future):
+            with self._abandoned_lock:
+                if self._abandoned.get(name, (None,))[0] is done:
+                    del self._abandoned[name]
+
+        fut.add_done_callback(_release)
+
+    def run(
+        self,
+        tasks: Dict[str, Callable[[], Any]],
+        deadline_sec: Optional[float] = None,
+    ) -> FetchStageResult:
+        """
+        并行执行一组获取任务
+
+        Parameters
+        ----------
+        tasks : Dict[str, Callable]
+            数据源名称 → 无参调用 (返回数据或 None)
+        deadline_sec : float, optional
+            覆盖默认 deadline
+
+        Returns
+        -------
+        FetchStageResult
+            每个数据源的 FetchOutcome (任务全部有结果，缺失显式标记)
+        """
+        deadline = self.deadline_sec if deadline_sec is None else float(deadline_sec)
+        result = FetchStageResult(deadline_sec=deadline)
+        if not tasks:
+            return result
+
+        stage_start = time.monotonic()
+        stage_end = stage_start + deadline
+        started: Dict[str, float] = {}
+        finished: Dict[str, float] = {}
+
+        def _timed(name: str, fn: Callable[[], Any]) -> Any:
+            started[name] = time.monotonic()
+            try:
+                return fn()
+            finally:
+                finished[name] = time.monotonic()
+
+        # 上一轮超时的调用仍在运行: 不重复提交，避免同一数据源占满线程池
+        with self._abandoned_lock:
+            busy = {name: self._abandoned[name][1] for name in tasks if name in self._abandoned}
+        for name, busy_since in busy.items():
+            result.outcomes[name] = FetchOutcome(
+                name=name,
+                status=FETCH_BUSY,
+                error=f"previous call still running ({stage_start - busy_since:.0f}s)",
+            )
+
+        futures = {
+            self._executor.submit(_timed, name, fn): name
+            for name, fn in tasks.items()
+            if name not in busy
+        }
+
+        pending = set(futures)
+        while pending:
+            remaining = stage_end - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = futures[fut]
+                latency = (finished.get(name, time.monotonic()) - started.get(name, stage_start)) * 1000
+                try:
+                    value = fut.result()
+                except Exception as e:
+                    result.outcomes[name] = FetchOutcome(
+                        name=name, status=FETCH_ERROR, latency_ms=latency, error=str(e),
+                    )
+                    continue
+                status = FETCH_EMPTY if value is None or value == {} or value == [] else FETCH_OK
+                result.outcomes[name] = FetchOutcome(
+                    name=name, status=status, value=value, latency_ms=latency,
+                )
+
+        # 超时任务: 尚未开始的直接取消；已在运行的无法中断，结果丢弃并记录为 in-flight
+        now = time.monotonic()
+        for fut in pending:
+            name = futures[fut]
+            if not fut.cancel():
+                self._abandon(name, fut, started.get(name, stage_start))
+            result.outcomes[name] = FetchOutcome(
+                name=name,
+                status=FETCH_TIMEOUT,
+                latency_ms=(now - started.get(name, stage_start)) * 1000,
+                error=f"deadline {deadline:.1f}s exceeded",
+            )
+
+        # 保持调用方传入的顺序，便于日志阅读
+        result.outcomes = {name: result.outcomes[name] for name in tasks}
+        result.in_flight = self.in_flight()
+        result.total_ms = (time.monotonic() - stage_start) * 1000
+        self._log_summary(result)
+        return result
+
+    def _log_summary(self, result: FetchStageResult):
+        """记录每个数据源延迟和缺失情况"""
+        parts = [
+            f"{name}={o.latency_ms:.0f}ms" + ("" if o.ok else f"({o.status})")
+            for name, o in result.outcomes.items()
+        ]
+        self.logger.info(
+            f"📡 Data fetch: {result.total_ms:.0f}ms total "
+            f"(deadline {result.deadline_sec:.0f}s) | " + ", ".join(parts)
+        )
+        missing = result.missing
+        if missing:
+            self.logger.warning(f"⚠️ Data sources missing this cycle: {', '.join(missing)}")
+        if result.in_flight:
+            self.logger.warning(
+                f"⚠️ Timed-out fetches still holding workers "
+                f"({len(result.in_flight)}/{self.max_workers}): {', '.join(result.in_flight)}"
+            )
+        for o in result.outcomes.values():
+            if o.status == FETCH_ERROR:
+                self.logger.warning(f"⚠️ {o.name} fetch failed: {o.error}")
+
+    def shutdown(self):
+        """关闭线程池 (不等待挂起任务)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
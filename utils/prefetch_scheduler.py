@@ -0,0 +1,145 @@
+# utils/prefetch_scheduler.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.parallel_fetcher import FetchStageResult, ParallelDataFetcher
+
+
+class PrefetchScheduler:
+    """
+    周期数据预热 (v6.0)
+
+    on_timer 对齐到 15 分钟边界，但所有数据在定时器触发后才开始获取，
+    决策总是落后 K 线收盘 10-60 秒。与 K 线无关的慢数据源
+    (衍生品、情绪、资金费率、Coinalyze 历史) 在边界前 lead_time_sec 预先获取，
+    边界时只获取依赖 K 线的数据 (最新 K 线、订单簿)，再合并预热结果。
+
+    每个预热结果绑定一个目标边界 (epoch 秒)，只能被该边界的周期消费一次；
+    目标不符或数据过旧 (超过 max_age_sec) 的结果直接丢弃。
+    """
+
+    def __init__(
+        self,
+        fetcher: ParallelDataFetcher,
+        lead_time_sec: float = 45.0,
+        max_age_sec: float = 180.0,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化预热调度器
+
+        Parameters
+        ----------
+        fetcher : ParallelDataFetcher
+            并行获取器 (与 on_timer 共用线程池)
+        lead_time_sec : float
+            在边界前多少秒开始预热
+        max_age_sec : float
+            预热结果最长可用时间 (秒)，从预热完成起计算
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.fetcher = fetcher
+        self.lead_time_sec = float(lead_time_sec)
+        self.max_age_sec = float(max_age_sec)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._target_ts: Optional[float] = None
+        self._result: Optional[FetchStageResult] = None
+        self._completed_at: Optional[float] = None
+
+        self._stats = {"started": 0, "used": 0, "discarded": 0, "skipped": 0}
+
+    def start(self, target_ts: float, tasks: Dict[str, Callable[[], Any]]) -> bool:
+        """
+        在后台线程开始预热 (立即返回，不阻塞事件循环)
+
+        Parameters
+        ----------
+        target_ts : float
+            目标边界 (epoch 秒)
+        tasks : Dict[str, Callable]
+            与 K 线无关的数据源
+
+        Returns
+        -------
+        bool
+            True = 已开始；False = 上一次预热仍在进行或无任务
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._stats["skipped"] += 1
+                self.logger.warning("⚠️ Previous prefetch still running, skipping")
+                return False
+            if not tasks:
+                return False
+            self._target_ts = target_ts
+            self._result = None
+            self._completed_at = None
+            self._stats["started"] += 1
+            self._thread = threading.Thread(
+                target=self._run, args=(target_ts, tasks), name="data-prefetch", daemon=True,
+            )
+            self._thread.start()
+        return True
+
+    def _run(self, target_ts: float, tasks: Dict[str, Callable[[], Any]]):
+        try:
+            result = self.fetcher.run(tasks)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Prefetch failed: {e}")
+            return
+        with self._lock:
+            # 期间可能已开始下一次预热 (目标不同)，旧结果丢弃
+            if self._target_ts == target_ts:
+                self._result = result
+                self._completed_at = time.time()
+
+    def collect(self, target_ts: float, wait_sec: float = 0.0) -> Optional[FetchStageResult]:
+        """
+        取出目标边界的预热结果 (消费后清空)
+
+        Parameters
+        ----------
+        target_ts : float
+            当前周期对应的边界 (epoch 秒)
+        wait_sec : float
+            预热仍在进行时最多等待的秒数
+
+        Returns
+        -------
+        FetchStageResult or None
+            可用的预热结果，否则 None (调用方应同步获取全部数据源)
+        """
+        with self._lock:
+            thread = self._thread
+            matches = self._target_ts is not None and abs(self._target_ts - target_ts) < 1.0
+        if not matches:
+            return None
+
+        if thread is not None and thread.is_alive() and wait_sec > 0:
+            thread.join(timeout=wait_sec)
+
+        with self._lock:
+            result, completed_at = self._result, self._completed_at
+            if result is None:
+                # 仍未完成: 保留目标，后续结果自然被下一次 start 覆盖
+                self._stats["discarded"] += 1
+                return None
+            self._result = None
+            self._target_ts = None
+            if time.time() - completed_at > self.max_age_sec:
+                self._stats["discarded"] += 1
+                return None
+            self._stats["used"] += 1
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """预热统计 (started / used / discarded / skipped)"""
+        with self._lock:
+            return dict(self._stats, lead_time_sec=self.lead_time_sec)
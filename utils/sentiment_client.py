@@ -5,10 +5,11 @@ Fetches market sentiment indicators from Binance Long/Short Ratio API.
 (Replaced CryptoOracle with Binance due to invalid API key)
 """
 
-import requests
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+from utils.http_transport import HttpTransport, get_http_transport
+
 
 class SentimentDataFetcher:
     """
@@ -25,6 +26,7 @@ class SentimentDataFetcher:
         lookback_hours: int = 4,
         timeframe: str = "15m",
         timeout: float = 10.0,
+        http: Optional[HttpTransport] = None,
     ):
         """
         Initialize sentiment data fetcher.
@@ -37,11 +39,14 @@ class SentimentDataFetcher:
             Time interval for data: "5m", "15m", "30m", "1h", "4h", "1d"
         timeout : float, optional
             Request timeout (seconds), default: 10.0
+        http : HttpTransport, optional
+            Shared keep-alive connection pool (defaults to process-wide instance)
         """
         self.lookback_hours = lookback_hours
         # Map timeframe to Binance period format
         self.timeframe = self._map_timeframe(timeframe)
         self.timeout = timeout
+        self._http = http or get_http_transport()
 
     def _map_timeframe(self, timeframe: str) -> str:
         """Map common timeframe formats to Binance period format."""
@@ -84,46 +89,19 @@ class SentimentDataFetcher:
             }
         """
         try:
-            # Input validation: ensure token is a valid string
-            if not isinstance(token, str) or not token.isalnum() or len(token) > 10:
-                print(f"⚠️ Invalid token: {token}")
+            params = self._build_params(token)
+            if params is None:
                 return None
 
-            # v3.24: Fetch 10 data points for history series
-            params = {
-                "symbol": f"{token.upper()}USDT",  # Normalize to uppercase
-                "period": self.timeframe,
-                "limit": 10
-            }
-
             # Make request
-            response = requests.get(
+            response = self._http.get(
                 self.BINANCE_URL,
                 params=params,
                 timeout=self.timeout
             )
 
             if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    # Binance returns data in ascending order (oldest first, newest last)
-                    result = self._parse_binance_data(data[-1])
-                    if result:
-                        # v3.24: Build history series (oldest → newest)
-                        # Binance API already returns ascending order, no need to reverse
-                        history = []
-                        for item in data:
-                            try:
-                                history.append({
-                                    'long': float(item.get('longAccount', 0.5)),
-                                    'short': float(item.get('shortAccount', 0.5)),
-                                    'ratio': float(item.get('longShortRatio', 1.0)),
-                                    'timestamp': item.get('timestamp', 0),
-                                })
-                            except (ValueError, TypeError):
-                                continue
-                        result['history'] = history
-                    return result
+                return self._parse_response(response.json())
 
             print(f"⚠️ Binance API returned unexpected response: {response.status_code}")
             return None
@@ -132,6 +110,52 @@ class SentimentDataFetcher:
             print(f"❌ Sentiment data fetch failed: {e}")
             return None
 
+    def _build_params(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate token and build query parameters (shared by sync/async fetchers).
+
+        Returns None if the token is invalid.
+        """
+        # Input validation: ensure token is a valid string
+        if not isinstance(token, str) or not token.isalnum() or len(token) > 10:
+            print(f"⚠️ Invalid token: {token}")
+            return None
+
+        # v3.24: Fetch 10 data points for history series
+        return {
+            "symbol": f"{token.upper()}USDT",  # Normalize to uppercase
+            "period": self.timeframe,
+            "limit": 10
+        }
+
+    def _parse_response(self, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Parse a globalLongShortAccountRatio response into sentiment + history
+        (shared by sync/async fetchers).
+        """
+        if not data or len(data) == 0:
+            print("⚠️ Binance API returned empty sentiment data")
+            return None
+
+        # Binance returns data in ascending order (oldest first, newest last)
+        result = self._parse_binance_data(data[-1])
+        if result:
+            # v3.24: Build history series (oldest → newest)
+            # Binance API already returns ascending order, no need to reverse
+            history = []
+            for item in data:
+                try:
+                    history.append({
+                        'long': float(item.get('longAccount', 0.5)),
+                        'short': float(item.get('shortAccount', 0.5)),
+                        'ratio': float(item.get('longShortRatio', 1.0)),
+                        'timestamp': item.get('timestamp', 0),
+                    })
+                except (ValueError, TypeError):
+                    continue
+            result['history'] = history
+        return result
+
     def _parse_binance_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse sentiment data from Binance API response."""
         try:
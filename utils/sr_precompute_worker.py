@@ -0,0 +1,199 @@
+# utils/sr_precompute_worker.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.sr_zone_service import SRZoneService, SRZoneSnapshot
+
+
+class SRPrecomputeWorker:
+    """
+    S/R 快照后台预计算 (v6.0)
+
+    S/R 计算 (三周期摆动点、枢轴点、成交量分布、聚类、触碰计数、详细报告)
+    原本在数据获取之后、第一次 LLM 调用之前同步执行。输入只在 K 线收盘时变化，
+    因此在 15M/4H/1D K 线收盘后立即在后台线程计算，与外部数据扇出并行；
+    analyze() 经 SRZoneService 取到同一快照 (缓存命中)，不再在关键路径上计算。
+
+    请求按"最新优先"合并: 计算进行中到达的多个请求只保留最后一个。
+    inputs_fn 在后台线程执行，不得访问 indicator_manager (Rust 指标非线程安全)，
+    依赖指标的数据须在事件循环线程预先取好。
+
+    订单墙来自上一周期的订单簿: 本周期候选墙 (candidate_walls_signature) 不同时，
+    预计算快照不会命中，wait_for() 不再等待，并丢弃尚未开始的请求。
+    """
+
+    def __init__(
+        self,
+        service: SRZoneService,
+        calculator,
+        logger: logging.Logger = None,
+    ):
+        """
+        初始化预计算器
+
+        Parameters
+        ----------
+        service : SRZoneService
+            快照缓存 (与 MultiAgentAnalyzer 共用)
+        calculator : SRZoneCalculator
+            与 analyze() 相同的计算器 (配置一致才能命中)
+        logger : logging.Logger, optional
+            日志记录器
+        """
+        self.service = service
+        self.calculator = calculator
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[tuple] = None
+        self._last: Optional[Dict[str, Any]] = None
+        self._walls_key: Optional[Tuple] = None
+
+        self._stats = {
+            "submitted": 0, "computed": 0, "coalesced": 0, "skipped": 0, "failed": 0,
+            "hits": 0, "misses": 0, "wait_skipped": 0, "discarded": 0,
+        }
+
+    def submit(
+        self,
+        trigger: str,
+        inputs_fn: Callable[[], Optional[Dict[str, Any]]],
+        walls_key: Optional[Tuple] = None,
+    ) -> None:
+        """
+        请求一次预计算 (立即返回，不阻塞事件循环)
+
+        Parameters
+        ----------
+        trigger : str
+            触发来源 (如 "15m" / "4h" / "1d" / "timer")，记录在统计中
+        inputs_fn : Callable
+            在后台线程调用，返回 SRZoneService.get() 的参数
+            (current_price, bars_data, ...)；返回 None 表示数据不足，跳过
+        walls_key : Tuple, optional
+            本次输入的候选墙签名 (candidate_walls_signature)
+        """
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._walls_key = walls_key
+            if self._pending is not None:
+                self._stats["coalesced"] += 1
+            self._pending = (trigger, inputs_fn, time.time())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sr-precompute", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    # 在锁内清空，submit() 看到 None 时总会启动新线程
+                    self._thread = None
+                    return
+                trigger, inputs_fn, submitted_at = self._pending
+                self._pending = None
+            try:
+                inputs = inputs_fn()
+                if not inputs or not inputs.get('current_price'):
+                    with self._lock:
+                        self._stats["skipped"] += 1
+                    continue
+                snapshot = self.service.get(self.calculator, origin="precompute", **inputs)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed"] += 1
+                self.logger.warning(f"⚠️ S/R precompute failed ({trigger}): {e}")
+                continue
+            self._record(trigger, submitted_at, snapshot)
+
+    def _record(self, trigger: str, submitted_at: float, snapshot: SRZoneSnapshot):
+        with self._lock:
+            self._stats["computed"] += 1
+            self._last = {
+                "trigger": trigger,
+                "ready_sec": round(time.time() - submitted_at, 3),  # 提交 → 快照可用
+                "compute_ms": round(snapshot.compute_ms, 1),
+                "precomputed": snapshot.origin == "precompute",  # False: 已被 analyze() 抢先计算
+            }
+        self.logger.debug(
+            f"S/R snapshot ready ({trigger}) in {time.time() - submitted_at:.2f}s "
+            f"(compute {snapshot.compute_ms:.1f}ms)"
+        )
+
+    def wait(self, timeout: float) -> bool:
+        """
+        等待进行中的预计算完成
+
+        Parameters
+        ----------
+        timeout : float
+            最多等待的秒数
+
+        Returns
+        -------
+        bool
+            True = 无进行中的计算
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive() and timeout > 0:
+            thread.join(timeout=timeout)
+        return thread is None or not thread.is_alive()
+
+    def wait_for(self, walls_key: Optional[Tuple], timeout: float) -> bool:
+        """
+        候选墙与最近一次提交一致时等待预计算完成；不一致时立即返回
+
+        候选墙不同的快照不会被 analyze() 命中，等待只会增加延迟；
+        此时尚未开始的请求也一并丢弃 (减少与 analyze() 争用计算器)。
+
+        Parameters
+        ----------
+        walls_key : Tuple or None
+            本周期订单簿的候选墙签名
+        timeout : float
+            最多等待的秒数
+
+        Returns
+        -------
+        bool
+            True = 已等待 (预计算结果可用)
+        """
+        with self._lock:
+            current = walls_key == self._walls_key
+            if not current:
+                self._stats["wait_skipped"] += 1
+                if self._pending is not None:
+                    self._pending = None
+                    self._stats["discarded"] += 1
+        if not current:
+            return False
+        self.wait(timeout)
+        return True
+
+    def record_use(self, snapshot: Optional[SRZoneSnapshot]) -> bool:
+        """
+        记录 analyze() 是否用上了预计算快照
+
+        Returns
+        -------
+        bool
+            True = 命中 (快照由后台预计算生成)
+        """
+        hit = snapshot is not None and snapshot.origin == "precompute"
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+        return hit
+
+    def get_stats(self) -> Dict[str, Any]:
+        """预计算统计 (submitted / computed / coalesced / skipped / failed / hits / misses + 最近一次)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._thread is not None
+            if self._last is not None:
+                stats["last"] = dict(self._last)
+            return stats
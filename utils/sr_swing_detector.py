@@ -13,10 +13,17 @@ Usage:
     detector = SwingDetector(left_bars=5, right_bars=5, max_age=100)
     candidates = detector.detect(bars_data, current_price, timeframe="4h",
                                   base_weight=1.5, level=SRLevel.INTERMEDIATE)
+
+v6.0: SwingDetector 为有状态的流式检测器 — 每根新 K 线只确认 right_bars 之前的
+那根是否为分形 (O(left + right))，过期 swing 自动移出，成交量百分位使用有序索引
+(二分查找 O(log n))。detect() 只喂入上次之后新增的 K 线，结果与
+detect_swing_points() 对同一窗口的输出一致。
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
 
 from utils.sr_zone_calculator import SRCandidate, SRLevel, SRSourceType
 
@@ -51,7 +58,22 @@ def _volume_weight_factor(bar_volume: float, all_volumes: List[float]) -> float:
 
     # Percentile rank
     rank = sum(1 for v in all_volumes if v <= bar_volume) / len(all_volumes)
+    return _rank_weight(rank)
+
+
+def _sorted_volume_weight_factor(bar_volume: float, sorted_volumes: List[float]) -> float:
+    """
+    v6.0: Same as _volume_weight_factor() with an ascending volume index.
+
+    The percentile rank is a binary search (O(log n)) instead of a full scan.
+    """
+    if not sorted_volumes or bar_volume <= 0:
+        return 0.5  # No data → neutral
+    return _rank_weight(bisect_right(sorted_volumes, bar_volume) / len(sorted_volumes))
+
 
+def _rank_weight(rank: float) -> float:
+    """Map a volume percentile rank to the weight factor [0.3, 1.0]."""
     # Three-tier continuous weighting
     if rank >= 0.7:       # Top 30% high volume
         return 1.0
@@ -61,6 +83,68 @@ def _volume_weight_factor(bar_volume: float, all_volumes: List[float]) -> float:
         return 0.3        # Floor
 
 
+def _append_swing_candidates(
+    candidates: List[SRCandidate],
+    is_swing_high: bool,
+    is_swing_low: bool,
+    bar_high: float,
+    bar_low: float,
+    bar_volume: float,
+    bar_index: int,
+    bars_ago: int,
+    age_factor: float,
+    vol_factor: float,
+    current_price: float,
+    timeframe: str,
+    base_weight: float,
+    level: str,
+) -> None:
+    """Append the swing high/low candidates of one fractal bar."""
+    # Final weight = base × age × volume
+    final_weight = base_weight * age_factor * vol_factor
+    extra = {
+        'bar_index': bar_index,
+        'bars_ago': bars_ago,
+        'age_factor': age_factor,
+        'vol_factor': vol_factor,
+        'volume': bar_volume,
+    }
+
+    if is_swing_high:
+        # S/R Flip: broken resistance becomes support
+        if bar_high >= current_price:
+            side = 'resistance'
+        else:
+            side = 'support'
+        candidates.append(SRCandidate(
+            price=bar_high,
+            source=f"Swing_High_{timeframe.upper()}",
+            weight=final_weight,
+            side=side,
+            extra=dict(extra),
+            level=level,
+            source_type=SRSourceType.STRUCTURAL,
+            timeframe=timeframe,
+        ))
+
+    if is_swing_low:
+        # S/R Flip: broken support becomes resistance
+        if bar_low <= current_price:
+            side = 'support'
+        else:
+            side = 'resistance'
+        candidates.append(SRCandidate(
+            price=bar_low,
+            source=f"Swing_Low_{timeframe.upper()}",
+            weight=final_weight,
+            side=side,
+            extra=dict(extra),
+            level=level,
+            source_type=SRSourceType.STRUCTURAL,
+            timeframe=timeframe,
+        ))
+
+
 def detect_swing_points(
     bars_data: List[Dict[str, Any]],
     current_price: float,
@@ -114,13 +198,14 @@ def detect_swing_points(
         return candidates
 
     # Pre-collect all volumes for percentile calculation
+    # v6.0: 排序一次，每个 swing 的百分位用二分查找 (原为逐个全量扫描)
     all_volumes = []
     if volume_weighting:
-        all_volumes = [
+        all_volumes = sorted(
             float(b.get('volume', 0))
             for b in bars
             if float(b.get('volume', 0)) > 0
-        ]
+        )
 
     for i in range(left_bars, n - right_bars):
         bar = bars[i]
@@ -159,59 +244,208 @@ def detect_swing_points(
         # Volume weighting: Spitsin (2025) percentile continuous scaling
         vol_factor = 1.0
         if volume_weighting and all_volumes:
-            vol_factor = _volume_weight_factor(bar_volume, all_volumes)
-
-        # Final weight = base × age × volume
-        final_weight = base_weight * age_factor * vol_factor
-
-        if is_swing_high:
-            # S/R Flip: broken resistance becomes support
-            if bar_high >= current_price:
-                side = 'resistance'
-            else:
-                side = 'support'
-            candidates.append(SRCandidate(
-                price=bar_high,
-                source=f"Swing_High_{timeframe.upper()}",
-                weight=final_weight,
-                side=side,
-                extra={
-                    'bar_index': i,
-                    'bars_ago': bars_ago,
-                    'age_factor': age_factor,
-                    'vol_factor': vol_factor,
-                    'volume': bar_volume,
-                },
-                level=level,
-                source_type=SRSourceType.STRUCTURAL,
-                timeframe=timeframe,
-            ))
-
-        if is_swing_low:
-            # S/R Flip: broken support becomes resistance
-            if bar_low <= current_price:
-                side = 'support'
-            else:
-                side = 'resistance'
-            candidates.append(SRCandidate(
-                price=bar_low,
-                source=f"Swing_Low_{timeframe.upper()}",
-                weight=final_weight,
-                side=side,
-                extra={
-                    'bar_index': i,
-                    'bars_ago': bars_ago,
-                    'age_factor': age_factor,
-                    'vol_factor': vol_factor,
-                    'volume': bar_volume,
-                },
-                level=level,
-                source_type=SRSourceType.STRUCTURAL,
-                timeframe=timeframe,
-            ))
+            vol_factor = _sorted_volume_weight_factor(bar_volume, all_volumes)
+
+        _append_swing_candidates(
+            candidates, is_swing_high, is_swing_low, bar_high, bar_low, bar_volume,
+            bar_index=i, bars_ago=bars_ago, age_factor=age_factor, vol_factor=vol_factor,
+            current_price=current_price, timeframe=timeframe, base_weight=base_weight, level=level,
+        )
 
     logger.debug(
         f"Swing detection ({timeframe}): found {len(candidates)} points from {n} bars"
         + (f" (vol_weighted)" if volume_weighting else "")
     )
     return candidates
+
+
+def _bar_key(bar: Dict[str, Any]) -> Tuple:
+    """Identity of a bar for incremental sync (timestamp when available)."""
+    timestamp = bar.get('timestamp')
+    if timestamp is not None:
+        return ('ts', timestamp)
+    return (
+        float(bar.get('high', 0)), float(bar.get('low', 0)),
+        float(bar.get('close', 0)), float(bar.get('volume', 0)),
+    )
+
+
+class SwingDetector:
+    """
+    v6.0: Streaming Williams Fractal swing detector (one instance per timeframe).
+
+    State per window of the last `max_age` bars:
+    - raw high/low/volume of each bar;
+    - confirmed swings: a bar is confirmed once `right_bars` newer bars have
+      arrived (only that bar is checked, O(left + right) per new bar), and is
+      dropped once its left neighbours leave the window;
+    - an ascending index of positive volumes (percentile rank by binary search).
+
+    candidates() therefore equals detect_swing_points() on the same window.
+    detect() feeds only the bars that are new since the previous call and
+    rebuilds from the window when the history does not line up (gap, revision).
+    """
+
+    # 增量对齐时校验的末尾 K 线数量
+    _SYNC_CHECK_BARS = 3
+
+    def __init__(
+        self,
+        left_bars: int = 5,
+        right_bars: int = 5,
+        max_age: int = 100,
+        volume_weighting: bool = True,
+    ):
+        self.left_bars = left_bars
+        self.right_bars = right_bars
+        self.max_age = max_age
+        self.volume_weighting = volume_weighting
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all bars and swings."""
+        self._bars: deque = deque()          # (high, low, volume, key)
+        self._count = 0                      # bars fed since reset (global index base)
+        self._swings: deque = deque()        # (global_index, is_high, is_low)
+        self._sorted_volumes: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    @property
+    def swing_count(self) -> int:
+        """Number of confirmed swings in the window."""
+        return len(self._swings)
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        """Feed one closed bar (oldest first)."""
+        high = float(bar.get('high', 0))
+        low = float(bar.get('low', 0))
+        volume = float(bar.get('volume', 0))
+
+        if len(self._bars) >= self.max_age:
+            _, _, old_volume, _ = self._bars.popleft()
+            if old_volume > 0:
+                del self._sorted_volumes[bisect_left(self._sorted_volumes, old_volume)]
+        self._bars.append((high, low, volume, _bar_key(bar)))
+        self._count += 1
+        if volume > 0:
+            insort(self._sorted_volumes, volume)
+
+        self._confirm_newest_fractal()
+
+        # Age out: a swing needs its left_bars neighbours inside the window
+        window_start = self._count - len(self._bars)
+        while self._swings and self._swings[0][0] - self.left_bars < window_start:
+            self._swings.popleft()
+
+    def sync(self, bars_data: List[Dict[str, Any]]) -> int:
+        """
+        Feed the bars of bars_data that are newer than the last fed bar.
+
+        Returns
+        -------
+        int
+            Number of bars fed (a rebuild feeds the whole window).
+        """
+        if not bars_data:
+            self.reset()
+            return 0
+
+        start = self._sync_start(bars_data)
+        if start is None or len(bars_data) - start >= self.max_age:
+            self.reset()
+            start = max(0, len(bars_data) - self.max_age)
+        for bar in bars_data[start:]:
+            self.update(bar)
+        return len(bars_data) - start
+
+    def candidates(
+        self,
+        current_price: float,
+        timeframe: str = "15m",
+        base_weight: float = 0.8,
+        level: str = SRLevel.MINOR,
+    ) -> List[SRCandidate]:
+        """Candidates of the confirmed swings (same output as detect_swing_points())."""
+        candidates: List[SRCandidate] = []
+        n = len(self._bars)
+        window_start = self._count - n
+        for global_index, is_high, is_low in self._swings:
+            bar_high, bar_low, bar_volume, _ = self._bars[global_index - window_start]
+            bars_ago = self._count - 1 - global_index
+            age_factor = max(0.5, 1.0 - (bars_ago / self.max_age) * 0.5)
+            vol_factor = 1.0
+            if self.volume_weighting and self._sorted_volumes:
+                vol_factor = _sorted_volume_weight_factor(bar_volume, self._sorted_volumes)
+            _append_swing_candidates(
+                candidates, is_high, is_low, bar_high, bar_low, bar_volume,
+                bar_index=global_index - window_start, bars_ago=bars_ago,
+                age_factor=age_factor, vol_factor=vol_factor,
+                current_price=current_price, timeframe=timeframe,
+                base_weight=base_weight, level=level,
+            )
+        return candidates
+
+    def detect(
+        self,
+        bars_data: List[Dict[str, Any]],
+        current_price: float,
+        timeframe: str = "15m",
+        base_weight: float = 0.8,
+        level: str = SRLevel.MINOR,
+    ) -> List[SRCandidate]:
+        """sync() then candidates() — drop-in for detect_swing_points() per cycle."""
+        self.sync(bars_data)
+        candidates = self.candidates(current_price, timeframe, base_weight, level)
+        logger.debug(
+            f"Swing detection ({timeframe}, streaming): {len(candidates)} points "
+            f"from {len(self._bars)} bars"
+        )
+        return candidates
+
+    def _confirm_newest_fractal(self) -> None:
+        """Check the bar that just got its right_bars neighbours."""
+        n = len(self._bars)
+        position = n - 1 - self.right_bars
+        if position < self.left_bars:
+            return
+        bar_high, bar_low, _, _ = self._bars[position]
+        if bar_high <= 0 or bar_low <= 0:
+            return
+
+        is_swing_high = True
+        is_swing_low = True
+        for j in range(position - self.left_bars, position + self.right_bars + 1):
+            if j == position:
+                continue
+            high, low, _, _ = self._bars[j]
+            if high > bar_high:
+                is_swing_high = False
+            if low < bar_low:
+                is_swing_low = False
+            if not is_swing_high and not is_swing_low:
+                return
+
+        self._swings.append((self._count - n + position, is_swing_high, is_swing_low))
+
+    def _sync_start(self, bars_data: List[Dict[str, Any]]) -> Optional[int]:
+        """Index of the first unseen bar in bars_data, or None if a rebuild is needed."""
+        if not self._bars:
+            return None
+        last_key = self._bars[-1][3]
+        lowest = max(0, len(bars_data) - self.max_age - 1)
+        for index in range(len(bars_data) - 1, lowest - 1, -1):
+            if _bar_key(bars_data[index]) != last_key:
+                continue
+            # 窗口长度需与 bars_data[-max_age:] 一致 (历史变短时重建)
+            fed = min(self.max_age, len(self._bars) + len(bars_data) - index - 1)
+            if fed != min(self.max_age, len(bars_data)):
+                return None
+            # 校验末尾若干根 K 线一致，避免无时间戳时的偶然相等
+            check = min(self._SYNC_CHECK_BARS, len(self._bars), index + 1)
+            for offset in range(1, check):
+                if _bar_key(bars_data[index - offset]) != self._bars[-1 - offset][3]:
+                    return None
+            return index + 1
+        return None
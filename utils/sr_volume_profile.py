@@ -6,17 +6,250 @@ Independent data source from detection layer (1D/4H swing points).
 
 Produces VPOC (Volume Point of Control), VAH (Value Area High), VAL (Value Area Low).
 
+v6.0: 向量化引擎 — 每根 K 线的成交量在 [low, high] 上均匀分布，其累计分布函数
+是分段线性的，因此每个 bin 的成交量等于相邻两条 bin 边界上累计函数之差。
+对按 low / high 排序的前缀和做 searchsorted，整体复杂度 O((bars + bins) log bars)，
+取代原来的 O(bars × bins) 双重循环。输出与逐 bin 重叠计算一致 (浮点误差内)。
+
+- calculate_volume_profile(): 单一窗口 (签名和行为不变)
+- calculate_volume_profiles(): 一次数组转换，同时计算多个回看窗口 (24h / 3d / 7d)
+- RollingVolumeProfile: 滚动窗口，新 K 线插入 / 最旧 K 线移出，无需整体重建
+
 Reference: CME Market Profile, SHS (2021) — VPOC 90% reaction rate (WIG20)
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from collections import deque
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+import numpy as np
 
 from utils.sr_zone_calculator import SRCandidate, SRLevel, SRSourceType
 
 
 logger = logging.getLogger(__name__)
 
+# v6.0: 多窗口默认回看 (15M bars): 24h / 3d / 7d
+DEFAULT_LOOKBACKS = (96, 288, 672)
+
+_MIN_BARS = 10
+
+
+def _bars_to_arrays(bars: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert bar dicts to float arrays (high, low, volume)."""
+    highs = np.fromiter((float(b.get('high', 0)) for b in bars), dtype=float, count=len(bars))
+    lows = np.fromiter((float(b.get('low', 0)) for b in bars), dtype=float, count=len(bars))
+    volumes = np.fromiter((float(b.get('volume', 0)) for b in bars), dtype=float, count=len(bars))
+    return highs, lows, volumes
+
+
+def _prefix_sum(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum with a leading zero (prefix[k] = sum of the first k values)."""
+    prefix = np.zeros(len(values) + 1)
+    np.cumsum(values, out=prefix[1:])
+    return prefix
+
+
+def _bin_volumes(
+    bin_edges: np.ndarray,
+    by_low: np.ndarray,
+    by_high: np.ndarray,
+    doji: np.ndarray,
+) -> np.ndarray:
+    """
+    Distribute bar volumes over price bins (Range Uniform Distribution).
+
+    For a bar with range r = high - low > 0, the volume below price x is
+    G(x) = v                         if x >= high
+         = v * (x - low) / r         if low < x < high
+         = 0                         otherwise,
+    so the volume in bin [e_j, e_j+1] is G(e_j+1) - G(e_j) summed over bars.
+    Summing G over bars only needs prefix sums over bars sorted by low and by high.
+
+    Doji bars (r = 0) contribute their full volume to every bin touching the
+    price (two bins when the price sits exactly on an edge), like the original loop.
+
+    Parameters
+    ----------
+    bin_edges : np.ndarray
+        num_bins + 1 ascending edges.
+    by_low : np.ndarray
+        (3, n) rows high/low/volume of non-doji bars, sorted by low.
+    by_high : np.ndarray
+        (3, n) rows high/low/volume of the same bars, sorted by high.
+    doji : np.ndarray
+        (2, m) rows price/volume of doji bars.
+
+    Returns
+    -------
+    np.ndarray
+        Volume per bin.
+    """
+    num_bins = len(bin_edges) - 1
+    # 以最低边界为原点，避免 x * Σ(v/r) 与 Σ(v*low/r) 相减时的精度损失
+    origin = bin_edges[0]
+    x = bin_edges - origin
+
+    cum = np.zeros(num_bins + 1)
+    if by_low.shape[1]:
+        low_l = by_low[1] - origin
+        rate_l = by_low[2] / (by_low[0] - by_low[1])
+        rate_prefix_l = _prefix_sum(rate_l)
+        offset_prefix_l = _prefix_sum(rate_l * low_l)
+
+        high_h = by_high[0] - origin
+        low_h = by_high[1] - origin
+        rate_h = by_high[2] / (by_high[0] - by_high[1])
+        vol_prefix_h = _prefix_sum(by_high[2])
+        rate_prefix_h = _prefix_sum(rate_h)
+        offset_prefix_h = _prefix_sum(rate_h * low_h)
+
+        started = np.searchsorted(low_l, x, side='left')    # low < x
+        finished = np.searchsorted(high_h, x, side='right')  # high <= x
+        # 活跃 K 线 (low < x < high) = 已开始 - 已结束 (high <= x 必然 low < x)
+        cum = (
+            vol_prefix_h[finished]
+            + x * (rate_prefix_l[started] - rate_prefix_h[finished])
+            - (offset_prefix_l[started] - offset_prefix_h[finished])
+        )
+    volumes = np.maximum(np.diff(cum), 0.0)
+
+    if doji.shape[1]:
+        first = np.searchsorted(bin_edges[1:], doji[0], side='left')
+        last = np.searchsorted(bin_edges[:-1], doji[0], side='right') - 1
+        hit = first <= last
+        delta = np.zeros(num_bins + 1)
+        np.add.at(delta, first[hit], doji[1][hit])
+        np.add.at(delta, last[hit] + 1, -doji[1][hit])
+        volumes += np.cumsum(delta[:-1])
+
+    return volumes
+
+
+def _split_bars(
+    highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Filter tradable bars and build the sorted inputs of _bin_volumes()."""
+    valid = (highs > 0) & (lows > 0) & (volumes > 0)
+    highs, lows, volumes = highs[valid], lows[valid], volumes[valid]
+    ranged = highs != lows
+    # high < low 的异常 K 线直接忽略
+    ranged_rows = np.vstack((highs[ranged], lows[ranged], volumes[ranged]))
+    ranged_rows = ranged_rows[:, ranged_rows[0] > ranged_rows[1]]
+    by_low = ranged_rows[:, np.argsort(ranged_rows[1], kind='stable')]
+    by_high = ranged_rows[:, np.argsort(ranged_rows[0], kind='stable')]
+    doji = np.vstack((lows[~ranged], volumes[~ranged]))
+    return by_low, by_high, doji
+
+
+def _profile_candidates(
+    price_low: float,
+    price_high: float,
+    by_low: np.ndarray,
+    by_high: np.ndarray,
+    doji: np.ndarray,
+    current_price: float,
+    value_area_pct: int,
+    min_bins: int,
+    max_bins: int,
+) -> List[SRCandidate]:
+    """Bin the volume between price_low/price_high and build VPOC/VAH/VAL candidates."""
+    price_range = price_high - price_low
+    if price_range <= 0:
+        return []
+
+    # Determine number of bins
+    num_bins = max(min_bins, min(max_bins, int(price_range / (current_price * 0.001))))
+    bin_size = price_range / num_bins
+    bin_edges = price_low + np.arange(num_bins + 1) * bin_size
+
+    vol_bins = _bin_volumes(bin_edges, by_low, by_high, doji)
+    total_volume = float(np.cumsum(vol_bins)[-1])
+    if total_volume <= 0:
+        return []
+
+    # Find VPOC (bin with highest volume)
+    vpoc_idx = int(np.argmax(vol_bins))
+    vpoc_price = float((bin_edges[vpoc_idx] + bin_edges[vpoc_idx + 1]) / 2)
+
+    # Value Area: bins by volume (descending, stable), accumulate until value_area_pct reached
+    order = np.argsort(-vol_bins, kind='stable')
+    va_cumulative = np.cumsum(vol_bins[order])
+    reached = va_cumulative >= total_volume * (value_area_pct / 100.0)
+    va_count = int(np.argmax(reached)) + 1 if reached.any() else num_bins
+    va_bins = order[:va_count]
+
+    # VAH = highest price in value area, VAL = lowest price in value area
+    vah_price = float(bin_edges[va_bins.max() + 1])  # Upper edge of highest VA bin
+    val_price = float(bin_edges[va_bins.min()])  # Lower edge of lowest VA bin
+
+    # Build candidates
+    candidates = []
+
+    # VPOC — most traded price level
+    vpoc_side = 'support' if vpoc_price < current_price else 'resistance'
+    candidates.append(SRCandidate(
+        price=round(vpoc_price, 2),
+        source='VP_VPOC',
+        weight=1.3,
+        side=vpoc_side,
+        extra={'total_bins': num_bins, 'vpoc_volume_pct': float(vol_bins[vpoc_idx] / total_volume) * 100},
+        level=SRLevel.INTERMEDIATE,
+        source_type=SRSourceType.STRUCTURAL,
+        timeframe="15m_vp",
+    ))
+
+    # VAH — upper edge of value area (resistance)
+    if vah_price > current_price:
+        candidates.append(SRCandidate(
+            price=round(vah_price, 2),
+            source='VP_VAH',
+            weight=1.0,
+            side='resistance',
+            level=SRLevel.INTERMEDIATE,
+            source_type=SRSourceType.STRUCTURAL,
+            timeframe="15m_vp",
+        ))
+
+    # VAL — lower edge of value area (support)
+    if val_price < current_price:
+        candidates.append(SRCandidate(
+            price=round(val_price, 2),
+            source='VP_VAL',
+            weight=1.0,
+            side='support',
+            level=SRLevel.INTERMEDIATE,
+            source_type=SRSourceType.STRUCTURAL,
+            timeframe="15m_vp",
+        ))
+
+    return candidates
+
+
+def _profile_from_arrays(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    volumes: np.ndarray,
+    current_price: float,
+    value_area_pct: int,
+    min_bins: int,
+    max_bins: int,
+) -> List[SRCandidate]:
+    """Volume profile of one window given as arrays."""
+    if len(highs) < _MIN_BARS:
+        return []
+    # 价格区间: 与原实现一致，high/low 分别只过滤非正值 (不要求成交量 > 0)
+    positive_highs = highs[highs > 0]
+    positive_lows = lows[lows > 0]
+    if not positive_highs.size or not positive_lows.size:
+        return []
+    by_low, by_high, doji = _split_bars(highs, lows, volumes)
+    return _profile_candidates(
+        float(positive_lows.min()), float(positive_highs.max()),
+        by_low, by_high, doji,
+        current_price, value_area_pct, min_bins, max_bins,
+    )
+
 
 def calculate_volume_profile(
     bars_15m: List[Dict[str, Any]],
@@ -32,6 +265,8 @@ def calculate_volume_profile(
     based on the overlap between the bar's H-L range and each bin's range.
     This avoids the close-only bias of simple volume profiling.
 
+    v6.0: 向量化实现 (见模块说明)，结果与逐 bin 循环一致。
+
     Parameters
     ----------
     bars_15m : List[Dict]
@@ -50,123 +285,217 @@ def calculate_volume_profile(
     List[SRCandidate]
         VPOC, VAH, VAL candidates.
     """
-    if not bars_15m or len(bars_15m) < 10:
+    if not bars_15m or len(bars_15m) < _MIN_BARS:
         return []
 
     try:
-        # Collect all highs and lows to determine price range
-        highs = [float(b.get('high', 0)) for b in bars_15m if float(b.get('high', 0)) > 0]
-        lows = [float(b.get('low', 0)) for b in bars_15m if float(b.get('low', 0)) > 0]
-
-        if not highs or not lows:
-            return []
+        highs, lows, volumes = _bars_to_arrays(bars_15m)
+        return _profile_from_arrays(
+            highs, lows, volumes, current_price, value_area_pct, min_bins, max_bins,
+        )
 
-        price_high = max(highs)
-        price_low = min(lows)
-        price_range = price_high - price_low
-
-        if price_range <= 0:
-            return []
-
-        # Determine number of bins
-        num_bins = max(min_bins, min(max_bins, int(price_range / (current_price * 0.001))))
-        bin_size = price_range / num_bins
+    except Exception as e:
+        logger.warning(f"Volume Profile calculation failed: {e}")
+        return []
 
-        # Create bins
-        bin_edges = [price_low + i * bin_size for i in range(num_bins + 1)]
-        vol_bins = [0.0] * num_bins
 
-        # Distribute volume using Range Uniform Distribution
-        for bar in bars_15m:
-            high = float(bar.get('high', 0))
-            low = float(bar.get('low', 0))
-            volume = float(bar.get('volume', 0))
+def calculate_volume_profiles(
+    bars_15m: List[Dict[str, Any]],
+    current_price: float,
+    lookbacks: Sequence[int] = DEFAULT_LOOKBACKS,
+    value_area_pct: int = 70,
+    min_bins: int = 30,
+    max_bins: int = 80,
+) -> Dict[int, List[SRCandidate]]:
+    """
+    v6.0: Volume profiles for several lookback windows in one pass.
 
-            if high <= 0 or low <= 0 or volume <= 0:
-                continue
+    Bars are converted to arrays once; each window is the trailing slice of
+    the same arrays, so calculate_volume_profiles(bars, p, [96])[96] equals
+    calculate_volume_profile(bars[-96:], p).
 
-            bar_range = high - low
+    Parameters
+    ----------
+    bars_15m : List[Dict]
+        15M bars, oldest first, covering at least the longest lookback.
+    current_price : float
+        Current market price.
+    lookbacks : Sequence[int]
+        Window lengths in bars (default 24h / 3d / 7d of 15M bars).
+    value_area_pct, min_bins, max_bins
+        Same as calculate_volume_profile().
 
-            for j in range(num_bins):
-                b_low = bin_edges[j]
-                b_high = bin_edges[j + 1]
+    Returns
+    -------
+    Dict[int, List[SRCandidate]]
+        Candidates per lookback ([] when the window has < 10 bars or fails).
+    """
+    profiles: Dict[int, List[SRCandidate]] = {lookback: [] for lookback in lookbacks}
+    if not bars_15m:
+        return profiles
 
-                # Check overlap
-                if low <= b_high and high >= b_low:
-                    if bar_range > 0:
-                        overlap = (min(high, b_high) - max(low, b_low)) / bar_range
-                    else:
-                        overlap = 1.0  # Doji bar
-                    vol_bins[j] += volume * max(0, overlap)
+    try:
+        longest = max(lookbacks) if lookbacks else 0
+        highs, lows, volumes = _bars_to_arrays(bars_15m[-longest:] if longest else [])
+    except Exception as e:
+        logger.warning(f"Volume Profile calculation failed: {e}")
+        return profiles
+
+    for lookback in lookbacks:
+        if lookback <= 0:
+            continue
+        try:
+            profiles[lookback] = _profile_from_arrays(
+                highs[-lookback:], lows[-lookback:], volumes[-lookback:],
+                current_price, value_area_pct, min_bins, max_bins,
+            )
+        except Exception as e:
+            logger.warning(f"Volume Profile calculation failed (lookback={lookback}): {e}")
+    return profiles
+
+
+class RollingVolumeProfile:
+    """
+    v6.0: Rolling-window volume profile with incremental updates.
+
+    push() inserts the newest bar into the low/high sorted arrays and removes
+    the oldest bar once the window is full — no per-bar dict conversion or
+    re-sort of the whole window. profile() then bins the window in
+    O((bars + bins) log bars). Insert/remove shift the sorted arrays
+    (memmove, O(window)), which is negligible for windows of a few hundred bars.
+
+    profile() returns the same candidates as calculate_volume_profile() on the
+    last `window` bars (within floating-point rounding).
+
+    Usage:
+        rolling = RollingVolumeProfile(window=96)
+        rolling.extend(bars_15m)
+        rolling.push(new_bar)            # on bar close
+        candidates = rolling.profile(current_price)
+    """
 
-        total_volume = sum(vol_bins)
-        if total_volume <= 0:
+    def __init__(
+        self,
+        window: int = 96,
+        value_area_pct: int = 70,
+        min_bins: int = 30,
+        max_bins: int = 80,
+    ):
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self.value_area_pct = value_area_pct
+        self.min_bins = min_bins
+        self.max_bins = max_bins
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all bars."""
+        self._bars: deque = deque()
+        # 价格区间 (high/low 各自只过滤非正值)
+        self._range_highs = np.empty(0)
+        self._range_lows = np.empty(0)
+        # 有效 K 线: 按 low / 按 high 排序的 (high, low, volume) 以及十字星 (price, volume)
+        self._by_low = np.empty((3, 0))
+        self._by_high = np.empty((3, 0))
+        self._doji = np.empty((2, 0))
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def push(self, bar: Dict[str, Any]) -> None:
+        """Append the newest bar, dropping the oldest one when the window is full."""
+        row = (float(bar.get('high', 0)), float(bar.get('low', 0)), float(bar.get('volume', 0)))
+        if len(self._bars) >= self.window:
+            self._remove(self._bars.popleft())
+        self._bars.append(row)
+        self._insert(row)
+
+    def extend(self, bars: List[Dict[str, Any]]) -> None:
+        """Push bars in order (oldest first)."""
+        for bar in bars[-self.window:]:
+            self.push(bar)
+
+    def profile(self, current_price: float) -> List[SRCandidate]:
+        """
+        VPOC/VAH/VAL candidates of the current window.
+
+        Parameters
+        ----------
+        current_price : float
+            Current market price.
+
+        Returns
+        -------
+        List[SRCandidate]
+            Same as calculate_volume_profile() on the window bars.
+        """
+        if len(self._bars) < _MIN_BARS or not self._range_highs.size or not self._range_lows.size:
+            return []
+        try:
+            return _profile_candidates(
+                float(self._range_lows[0]), float(self._range_highs[-1]),
+                self._by_low, self._by_high, self._doji,
+                current_price, self.value_area_pct, self.min_bins, self.max_bins,
+            )
+        except Exception as e:
+            logger.warning(f"Volume Profile calculation failed: {e}")
             return []
 
-        # Find VPOC (bin with highest volume)
-        vpoc_idx = vol_bins.index(max(vol_bins))
-        vpoc_price = (bin_edges[vpoc_idx] + bin_edges[vpoc_idx + 1]) / 2
-
-        # Calculate Value Area (VAH, VAL)
-        # Sort bins by volume (descending), accumulate until value_area_pct reached
-        sorted_bins = sorted(range(num_bins), key=lambda i: vol_bins[i], reverse=True)
-        va_volume_target = total_volume * (value_area_pct / 100.0)
-        va_volume = 0.0
-        va_bins = set()
-
-        for idx in sorted_bins:
-            va_bins.add(idx)
-            va_volume += vol_bins[idx]
-            if va_volume >= va_volume_target:
-                break
-
-        # VAH = highest price in value area, VAL = lowest price in value area
-        va_indices = sorted(va_bins)
-        vah_price = bin_edges[va_indices[-1] + 1]  # Upper edge of highest VA bin
-        val_price = bin_edges[va_indices[0]]  # Lower edge of lowest VA bin
-
-        # Build candidates
-        candidates = []
-
-        # VPOC — most traded price level
-        vpoc_side = 'support' if vpoc_price < current_price else 'resistance'
-        candidates.append(SRCandidate(
-            price=round(vpoc_price, 2),
-            source='VP_VPOC',
-            weight=1.3,
-            side=vpoc_side,
-            extra={'total_bins': num_bins, 'vpoc_volume_pct': (vol_bins[vpoc_idx] / total_volume) * 100},
-            level=SRLevel.INTERMEDIATE,
-            source_type=SRSourceType.STRUCTURAL,
-            timeframe="15m_vp",
-        ))
-
-        # VAH — upper edge of value area (resistance)
-        if vah_price > current_price:
-            candidates.append(SRCandidate(
-                price=round(vah_price, 2),
-                source='VP_VAH',
-                weight=1.0,
-                side='resistance',
-                level=SRLevel.INTERMEDIATE,
-                source_type=SRSourceType.STRUCTURAL,
-                timeframe="15m_vp",
-            ))
-
-        # VAL — lower edge of value area (support)
-        if val_price < current_price:
-            candidates.append(SRCandidate(
-                price=round(val_price, 2),
-                source='VP_VAL',
-                weight=1.0,
-                side='support',
-                level=SRLevel.INTERMEDIATE,
-                source_type=SRSourceType.STRUCTURAL,
-                timeframe="15m_vp",
-            ))
-
-        return candidates
-
-    except Exception as e:
-        logger.warning(f"Volume Profile calculation failed: {e}")
-        return []
+    @staticmethod
+    def _classify(row: Tuple[float, float, float]) -> Optional[str]:
+        """Which sorted structure a bar belongs to (None: carries no volume)."""
+        high, low, volume = row
+        if high <= 0 or low <= 0 or volume <= 0:
+            return None
+        if high == low:
+            return 'doji'
+        return 'ranged' if high > low else None
+
+    def _insert(self, row: Tuple[float, float, float]) -> None:
+        high, low, _ = row
+        if high > 0:
+            self._range_highs = np.insert(
+                self._range_highs, np.searchsorted(self._range_highs, high), high)
+        if low > 0:
+            self._range_lows = np.insert(
+                self._range_lows, np.searchsorted(self._range_lows, low), low)
+
+        kind = self._classify(row)
+        column = np.array(row)
+        if kind == 'ranged':
+            position = np.searchsorted(self._by_low[1], low, side='right')
+            self._by_low = np.insert(self._by_low, position, column, axis=1)
+            position = np.searchsorted(self._by_high[0], high, side='right')
+            self._by_high = np.insert(self._by_high, position, column, axis=1)
+        elif kind == 'doji':
+            self._doji = np.append(self._doji, column[1:, None], axis=1)
+
+    def _remove(self, row: Tuple[float, float, float]) -> None:
+        high, low, _ = row
+        if high > 0:
+            self._range_highs = np.delete(
+                self._range_highs, np.searchsorted(self._range_highs, high))
+        if low > 0:
+            self._range_lows = np.delete(
+                self._range_lows, np.searchsorted(self._range_lows, low))
+
+        kind = self._classify(row)
+        column = np.array(row)
+        if kind == 'ranged':
+            self._by_low = self._delete_column(self._by_low, 1, column)
+            self._by_high = self._delete_column(self._by_high, 0, column)
+        elif kind == 'doji':
+            self._doji = self._delete_column(self._doji, None, column[1:])
+
+    @staticmethod
+    def _delete_column(rows: np.ndarray, key_row: Optional[int], column: np.ndarray) -> np.ndarray:
+        """Delete one column equal to `column` (located by binary search on key_row if sorted)."""
+        if key_row is None:
+            start, stop = 0, rows.shape[1]
+        else:
+            key = column[key_row]
+            start = np.searchsorted(rows[key_row], key, side='left')
+            stop = np.searchsorted(rows[key_row], key, side='right')
+        matches = np.flatnonzero((rows[:, start:stop] == column[:, None]).all(axis=0))
+        return np.delete(rows, start + matches[0], axis=1)
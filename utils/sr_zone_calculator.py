@@ -37,9 +37,11 @@ Version: 3.1
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 # =============================================================================
 # v2.0: Level and Source Type Enums
@@ -61,6 +63,48 @@ class SRSourceType:
     PSYCHOLOGICAL = "PSYCHOLOGICAL" # v4.0: 心理关口 (Round Numbers)
 
 
+def count_zone_touches(
+    zone_lows: np.ndarray,
+    zone_highs: np.ndarray,
+    bar_highs: np.ndarray,
+    bar_lows: np.ndarray,
+) -> np.ndarray:
+    """
+    v6.0: Enter events of price intervals over a bar sequence (vectorized).
+
+    A bar is "in" a zone when its [low, high] range overlaps the zone; a touch
+    is a run of consecutive in-zone bars, counted at the bar that enters it.
+    Bars with non-positive high/low are skipped (they do not break a run).
+
+    Builds one zone × bar overlap mask and counts run starts (in-zone bars
+    whose previous valid bar was outside), O(zones × bars) in NumPy.
+
+    Parameters
+    ----------
+    zone_lows, zone_highs : np.ndarray
+        Zone bounds (already expanded by the touch distance).
+    bar_highs, bar_lows : np.ndarray
+        Bar highs/lows, oldest first.
+
+    Returns
+    -------
+    np.ndarray
+        Touch count per zone (int).
+    """
+    zone_lows = np.asarray(zone_lows, dtype=float)
+    zone_highs = np.asarray(zone_highs, dtype=float)
+    valid = (bar_highs > 0) & (bar_lows > 0)
+    highs = bar_highs[valid]
+    lows = bar_lows[valid]
+    if not highs.size:
+        return np.zeros(len(zone_lows), dtype=int)
+
+    in_zone = (lows[None, :] <= zone_highs[:, None]) & (highs[None, :] >= zone_lows[:, None])
+    entered = in_zone.copy()
+    entered[:, 1:] &= ~in_zone[:, :-1]
+    return entered.sum(axis=1)
+
+
 @dataclass
 class SRCandidate:
     """S/R 候选价位"""
@@ -248,6 +292,8 @@ class SRZoneCalculator:
         self.WEIGHTS = dict(self.WEIGHTS)  # Instance copy
         self.WEIGHTS['Swing_High'] = swing_weight
         self.WEIGHTS['Swing_Low'] = swing_weight
+        # v6.0: 每个时间框架一个流式 SwingDetector，跨周期只增量处理新 K 线
+        self._swing_detectors: Dict[str, Any] = {}
 
         # v3.0: ATR adaptive clustering
         self.use_atr_adaptive = use_atr_adaptive
@@ -275,6 +321,23 @@ class SRZoneCalculator:
     # v3.0: Swing Point Detection (Williams Fractal / N-bar Pivot)
     # =========================================================================
 
+    def _swing_detector(self, timeframe: str):
+        """
+        v6.0: Streaming swing detector for one timeframe (created on first use).
+
+        The detector keeps confirmed fractals between cycles, so each
+        calculate() only processes the bars closed since the previous one.
+        """
+        detector = self._swing_detectors.get(timeframe)
+        if detector is None:
+            from utils.sr_swing_detector import SwingDetector
+            detector = SwingDetector(
+                left_bars=self.swing_left_bars, right_bars=self.swing_right_bars,
+                max_age=self.swing_max_age, volume_weighting=True,
+            )
+            self._swing_detectors[timeframe] = detector
+        return detector
+
     def _detect_swing_points(
         self,
         bars_data: List[Dict[str, Any]],
@@ -582,6 +645,36 @@ class SRZoneCalculator:
 
         return touches
 
+    def _count_zone_touches_batch(
+        self,
+        zones: Sequence['SRZone'],
+        bars_data: List[Dict[str, Any]],
+        atr_value: float,
+    ) -> List[int]:
+        """
+        v6.0: Count discrete touches of all zones in one pass.
+
+        Same definition as _count_zone_touches() (enter events of the expanded
+        zone, bars with non-positive high/low skipped), computed for every zone
+        at once by count_zone_touches().
+
+        Returns
+        -------
+        List[int]
+            Touch count per zone, in the order of `zones`.
+        """
+        if not zones:
+            return []
+        if not bars_data or atr_value <= 0:
+            return [0] * len(zones)
+
+        touch_distance = atr_value * self.touch_threshold_atr
+        bar_highs = np.fromiter((float(b.get('high', 0)) for b in bars_data), dtype=float, count=len(bars_data))
+        bar_lows = np.fromiter((float(b.get('low', 0)) for b in bars_data), dtype=float, count=len(bars_data))
+        zone_lows = np.array([z.price_low for z in zones], dtype=float) - touch_distance
+        zone_highs = np.array([z.price_high for z in zones], dtype=float) + touch_distance
+        return count_zone_touches(zone_lows, zone_highs, bar_highs, bar_lows).tolist()
+
     def _touch_weight_bonus(self, touch_count: int) -> float:
         """
         Calculate weight bonus based on touch count.
@@ -710,12 +803,12 @@ class SRZoneCalculator:
         )
 
         # Step 3.5: v3.0 Touch Count scoring
+        # v6.0: 所有 zone 一次向量化计数 (与逐 zone 的 _count_zone_touches 结果一致)
         if self.touch_count_enabled and bars_data and effective_atr > 0:
-            for zone in support_zones + resistance_zones:
-                zone.touch_count = self._count_zone_touches(
-                    zone.price_center, zone.price_low, zone.price_high,
-                    bars_data, effective_atr,
-                )
+            all_zones = support_zones + resistance_zones
+            touch_counts = self._count_zone_touches_batch(all_zones, bars_data, effective_atr)
+            for zone, touch_count in zip(all_zones, touch_counts):
+                zone.touch_count = touch_count
                 # Apply touch weight bonus
                 bonus = self._touch_weight_bonus(zone.touch_count)
                 if bonus > 0:
@@ -811,20 +904,18 @@ class SRZoneCalculator:
         # v4.0: Uses sr_swing_detector with Spitsin (2025) volume weighting
         if self.swing_detection_enabled:
             try:
-                from utils.sr_swing_detector import detect_swing_points
+                from utils.sr_swing_detector import SwingDetector
             except ImportError:
-                detect_swing_points = None
+                SwingDetector = None
                 self.logger.warning("sr_swing_detector not available, using legacy swing detection")
 
             # v4.0: 1D Swing (highest weight, MAJOR level)
             if bars_data_1d:
                 try:
-                    if detect_swing_points:
-                        candidates.extend(detect_swing_points(
+                    if SwingDetector:
+                        candidates.extend(self._swing_detector("1d").detect(
                             bars_data_1d, current_price, timeframe="1d",
                             base_weight=2.0, level=SRLevel.MAJOR,
-                            left_bars=self.swing_left_bars, right_bars=self.swing_right_bars,
-                            max_age=self.swing_max_age, volume_weighting=True,
                         ))
                     else:
                         for c in self._detect_swing_points(bars_data_1d, current_price):
@@ -838,12 +929,10 @@ class SRZoneCalculator:
             # v4.0: 4H Swing (intermediate weight)
             if bars_data_4h:
                 try:
-                    if detect_swing_points:
-                        candidates.extend(detect_swing_points(
+                    if SwingDetector:
+                        candidates.extend(self._swing_detector("4h").detect(
                             bars_data_4h, current_price, timeframe="4h",
                             base_weight=1.5, level=SRLevel.INTERMEDIATE,
-                            left_bars=self.swing_left_bars, right_bars=self.swing_right_bars,
-                            max_age=self.swing_max_age, volume_weighting=True,
                         ))
                     else:
                         for c in self._detect_swing_points(bars_data_4h, current_price):
@@ -857,12 +946,10 @@ class SRZoneCalculator:
             # 15M Swing (volume-weighted if available)
             if bars_data:
                 try:
-                    if detect_swing_points:
-                        candidates.extend(detect_swing_points(
+                    if SwingDetector:
+                        candidates.extend(self._swing_detector("15m").detect(
                             bars_data, current_price, timeframe="15m",
                             base_weight=0.8, level=SRLevel.MINOR,
-                            left_bars=self.swing_left_bars, right_bars=self.swing_right_bars,
-                            max_age=self.swing_max_age, volume_weighting=True,
                         ))
                     else:
                         swing_candidates = self._detect_swing_points(bars_data, current_price)
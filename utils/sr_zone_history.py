@@ -0,0 +1,292 @@
+"""
+v6.0: S/R Zone History — historical batch mode of SRZoneCalculator.
+
+Replays full 15M/4H/1D bar arrays and emits the zone set after every 15M bar
+close, exactly as the live cycle would have computed it at that time
+(same 200/50/120-bar windows, daily bar = last closed 1D bar, weekly bar
+aggregated from the 1D window, ATR from the 15M window). Every point is one
+calculator.calculate() call, so there is a single zone pipeline; the
+incremental state is what calculate() already keeps between calls:
+
+- swing points: the calculator's streaming SwingDetector per timeframe
+  (one new bar per step; 4H/1D windows only change when such a bar closes)
+- 4H/1D windows: located once for the whole history (searchsorted on close times)
+- weekly pivot bar: aggregated once per 1D window
+
+zone_hit_rates() then scores every emitted zone against the following K bars
+(tested / held / broken), so zone parameters (cluster_pct,
+atr_cluster_multiplier, touch_threshold_atr, ...) can be tuned offline
+(grid runner: scripts/evaluate_sr_zones.py).
+
+Usage:
+    calculator = SRZoneCalculator(atr_cluster_multiplier=0.8)
+    history = calculate_zone_history(calculator, bars_15m, bars_4h, bars_1d)
+    stats = zone_hit_rates(history, bars_15m, horizon_bars=16)
+    stats['groups']['nearest_support']['hold_rate']
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.sr_pivot_calculator import aggregate_weekly_bar
+from utils.sr_zone_calculator import SRLevel, SRZone, SRZoneCalculator
+
+
+logger = logging.getLogger(__name__)
+
+# 与 on_timer 相同的回看窗口 (K 线数)
+DEFAULT_LOOKBACK_15M = 200
+DEFAULT_LOOKBACK_4H = 50
+DEFAULT_LOOKBACK_1D = 120
+
+# 高周期 K 线周期 = 15M 周期的倍数
+_BARS_PER_4H = 16
+_BARS_PER_1D = 96
+
+
+@dataclass
+class HistoricalZoneSet:
+    """某根 15M K 线收盘后的 zone 集合"""
+    index: int                     # 15M K 线下标 (计算使用截至该根的已收盘 K 线)
+    timestamp: Optional[int]       # 该 K 线的 timestamp (开盘时间，与输入同单位)
+    price: float                   # 该 K 线收盘价 (计算时的 current_price)
+    atr: float                     # 15M ATR
+    support_zones: List[SRZone] = field(default_factory=list)      # 按距离排序
+    resistance_zones: List[SRZone] = field(default_factory=list)   # 按距离排序
+
+    @property
+    def nearest_support(self) -> Optional[SRZone]:
+        return self.support_zones[0] if self.support_zones else None
+
+    @property
+    def nearest_resistance(self) -> Optional[SRZone]:
+        return self.resistance_zones[0] if self.resistance_zones else None
+
+
+def _column(bars: List[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.fromiter((float(b.get(key, 0)) for b in bars), dtype=float, count=len(bars))
+
+
+def _closed_counts(
+    bars: Optional[List[Dict[str, Any]]], bar_interval: float, close_times: np.ndarray,
+) -> Optional[np.ndarray]:
+    """Number of higher-timeframe bars closed at each 15M close time."""
+    if not bars:
+        return None
+    open_times = np.array([float(b['timestamp']) for b in bars])
+    return np.searchsorted(open_times + bar_interval, close_times, side='right')
+
+
+def calculate_zone_history(
+    calculator: SRZoneCalculator,
+    bars_15m: List[Dict[str, Any]],
+    bars_4h: Optional[List[Dict[str, Any]]] = None,
+    bars_1d: Optional[List[Dict[str, Any]]] = None,
+    lookback: int = DEFAULT_LOOKBACK_15M,
+    lookback_4h: int = DEFAULT_LOOKBACK_4H,
+    lookback_1d: int = DEFAULT_LOOKBACK_1D,
+    start: Optional[int] = None,
+    step: int = 1,
+) -> List[HistoricalZoneSet]:
+    """
+    Zone set after every `step`-th 15M bar close.
+
+    Each result matches calculator.calculate() for the same point in time
+    (current_price = bar close, bars_data = last `lookback` 15M bars, 4H/1D
+    windows of bars closed by then, atr_value = ATR of the 15M window).
+    Order-book walls are not replayed.
+
+    Parameters
+    ----------
+    calculator : SRZoneCalculator
+        Calculator with the parameters under evaluation. Its swing detectors
+        are reused across bars (do not share with a live cycle meanwhile).
+    bars_15m : List[Dict]
+        15M OHLCV bars, oldest first, with 'timestamp' (open time) when
+        bars_4h / bars_1d are given.
+    bars_4h, bars_1d : List[Dict], optional
+        Higher-timeframe bars (same timestamp unit), oldest first.
+    lookback, lookback_4h, lookback_1d : int
+        Window lengths (default: the live cycle's 200 / 50 / 120).
+    start : int, optional
+        First 15M index to evaluate (default: first full window, lookback - 1).
+    step : int
+        Evaluate every `step` bars.
+
+    Returns
+    -------
+    List[HistoricalZoneSet]
+        One entry per evaluated 15M bar, in time order.
+    """
+    n = len(bars_15m)
+    if n == 0:
+        return []
+    lookback = max(1, int(lookback))
+    step = max(1, int(step))
+    start = lookback - 1 if start is None else max(0, int(start))
+
+    # 高周期窗口: 每根 15M 收盘时已收盘的 4H / 1D K 线数
+    counts_4h = counts_1d = None
+    timestamps: Optional[np.ndarray] = None
+    if 'timestamp' in bars_15m[0]:
+        timestamps = np.array([float(b['timestamp']) for b in bars_15m])
+    if bars_4h or bars_1d:
+        if timestamps is None or n < 2:
+            raise ValueError("bars_15m need 'timestamp' (and >= 2 bars) to align 4H/1D bars")
+        interval = float(np.median(np.diff(timestamps)))
+        close_times = timestamps + interval
+        counts_4h = _closed_counts(bars_4h, interval * _BARS_PER_4H, close_times)
+        counts_1d = _closed_counts(bars_1d, interval * _BARS_PER_1D, close_times)
+
+    pivot_cache: Dict[int, tuple] = {}
+    history: List[HistoricalZoneSet] = []
+
+    for i in range(start, n, step):
+        window_start = max(0, i - lookback + 1)
+        window = bars_15m[window_start:i + 1]
+        price = float(bars_15m[i].get('close', 0))
+        if price <= 0:
+            continue
+        atr = SRZoneCalculator._calculate_atr_from_bars(window)
+
+        window_4h = window_1d = None
+        if counts_4h is not None:
+            end_4h = int(counts_4h[i])
+            window_4h = bars_4h[max(0, end_4h - lookback_4h):end_4h] or None
+        daily_bar = weekly_bar = None
+        if counts_1d is not None:
+            end_1d = int(counts_1d[i])
+            window_1d = bars_1d[max(0, end_1d - lookback_1d):end_1d] or None
+            if window_1d:
+                if end_1d not in pivot_cache:
+                    pivot_cache.clear()
+                    pivot_cache[end_1d] = (window_1d[-1], aggregate_weekly_bar(window_1d))
+                daily_bar, weekly_bar = pivot_cache[end_1d]
+
+        result = calculator.calculate(
+            current_price=price,
+            bars_data=window,
+            atr_value=atr,
+            bars_data_4h=window_4h,
+            bars_data_1d=window_1d,
+            daily_bar=daily_bar,
+            weekly_bar=weekly_bar,
+        )
+        history.append(HistoricalZoneSet(
+            index=i,
+            timestamp=int(timestamps[i]) if timestamps is not None else None,
+            price=price,
+            atr=atr,
+            support_zones=result['support_zones'],
+            resistance_zones=result['resistance_zones'],
+        ))
+
+    return history
+
+
+def _group_stats(tested: int, held: int, broken: int, zones: int) -> Dict[str, Any]:
+    return {
+        'zones': zones,
+        'tested': tested,
+        'held': held,
+        'broken': broken,
+        'test_rate': round(tested / zones, 4) if zones else 0.0,
+        'hold_rate': round(held / tested, 4) if tested else 0.0,
+    }
+
+
+def zone_hit_rates(
+    history: List[HistoricalZoneSet],
+    bars_15m: List[Dict[str, Any]],
+    horizon_bars: int = 16,
+) -> Dict[str, Any]:
+    """
+    Held / broken statistics of the emitted zones over the next K bars.
+
+    For the K bars after the evaluation bar:
+    - support: tested if a low reaches the zone (low <= price_high);
+      broken if a close ends below it (close < price_low)
+    - resistance: tested if a high reaches the zone (high >= price_low);
+      broken if a close ends above it (close > price_high)
+    - held = tested and not broken
+
+    Evaluation points without K following bars are skipped.
+
+    Parameters
+    ----------
+    history : List[HistoricalZoneSet]
+        calculate_zone_history() output for the same bars_15m.
+    bars_15m : List[Dict]
+        15M bars the history was computed on.
+    horizon_bars : int
+        K — number of following 15M bars (default 16 = 4h).
+
+    Returns
+    -------
+    Dict
+        {'horizon_bars', 'evaluations', 'groups': {name: stats}} where groups are
+        support / resistance / nearest_support / nearest_resistance, per strength
+        (HIGH / MEDIUM / LOW) and per level (MAJOR / INTERMEDIATE / MINOR);
+        stats = zones, tested, held, broken, test_rate, hold_rate.
+    """
+    horizon_bars = max(1, int(horizon_bars))
+    n = len(bars_15m)
+    group_names = (
+        ['support', 'resistance', 'nearest_support', 'nearest_resistance']
+        + ['HIGH', 'MEDIUM', 'LOW']
+        + [SRLevel.MAJOR, SRLevel.INTERMEDIATE, SRLevel.MINOR]
+    )
+    counts = {name: [0, 0, 0, 0] for name in group_names}  # tested, held, broken, zones
+    evaluations = 0
+
+    if n > horizon_bars:
+        windows = np.lib.stride_tricks.sliding_window_view
+        lows = _column(bars_15m, 'low')[1:]
+        highs = _column(bars_15m, 'high')[1:]
+        closes = _column(bars_15m, 'close')[1:]
+        # 第 i 个元素 = K 线 i 之后 K 根的极值
+        future_low = windows(lows, horizon_bars).min(axis=1)
+        future_high = windows(highs, horizon_bars).max(axis=1)
+        future_min_close = windows(closes, horizon_bars).min(axis=1)
+        future_max_close = windows(closes, horizon_bars).max(axis=1)
+
+        def _add(names, tested, broken):
+            for name in names:
+                row = counts.get(name)
+                if row is None:
+                    continue
+                row[3] += 1
+                if tested:
+                    row[0] += 1
+                    if broken:
+                        row[2] += 1
+                    else:
+                        row[1] += 1
+
+        for entry in history:
+            i = entry.index
+            if i >= len(future_low):
+                continue
+            evaluations += 1
+            for rank, zone in enumerate(entry.support_zones):
+                tested = future_low[i] <= zone.price_high
+                broken = future_min_close[i] < zone.price_low
+                names = ['support', zone.strength, zone.level] + (['nearest_support'] if rank == 0 else [])
+                _add(names, tested, broken)
+            for rank, zone in enumerate(entry.resistance_zones):
+                tested = future_high[i] >= zone.price_low
+                broken = future_max_close[i] > zone.price_high
+                names = ['resistance', zone.strength, zone.level] + (['nearest_resistance'] if rank == 0 else [])
+                _add(names, tested, broken)
+
+    return {
+        'horizon_bars': horizon_bars,
+        'evaluations': evaluations,
+        'groups': {
+            name: _group_stats(tested, held, broken, zones)
+            for name, (tested, held, broken, zones) in counts.items()
+        },
+    }
@@ -0,0 +1,497 @@
+"""
+v6.0: S/R Zone Service — process-wide cache of SRZoneCalculator results.
+
+S/R zones only change when an input bar closes (15M/4H/1D, daily/weekly
+pivot bar), when the order-book walls change, when the calculator config
+changes, or when price moves far enough to reclassify zones. Every other
+cycle can reuse the previous result.
+
+Key = (bar signature per timeframe, pivot bars, candidate walls, ATR,
+       price bucket, calculator config hash)
+- bar signature: (bar count, first/last bar timestamp — or OHLCV without timestamps)
+- candidate walls: only walls passing the calculator's size/distance filters
+  become zone candidates; other order-book changes only refresh the report text
+- BB/SMA values are not zone candidates (since v4.2) and only appear in the
+  detailed report: a change regenerates the report text, the zones are reused
+- price bucket: log-scale buckets of `price_bucket_pct` width
+- a hit is additionally rejected when price crossed a zone boundary since the
+  snapshot was computed (side / nearest zone / hard control may change)
+
+Results are returned as immutable SRZoneSnapshot objects: the result mapping
+is read-only and zone lists are tuples. The SRZone objects inside are shared
+between readers and must not be modified.
+
+Usage:
+    service = get_sr_zone_service()
+    snapshot = service.get(calculator, current_price=price, bars_data=bars_15m, ...)
+    zones = snapshot.result            # Mapping, same keys as calculate_with_detailed_report()
+"""
+
+import bisect
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from utils.sr_swing_detector import _bar_key
+
+
+# 默认价格分桶宽度 (%)
+DEFAULT_PRICE_BUCKET_PCT = 0.05
+
+# SRZoneCalculator 的运行时状态 (不属于配置)
+_CALCULATOR_STATE_ATTRS = frozenset({'logger', '_swing_detectors'})
+
+
+@dataclass(frozen=True)
+class SRZoneSnapshot:
+    """不可变 S/R 计算结果快照"""
+    key: Tuple
+    result: Mapping[str, Any]     # 只读: calculate_with_detailed_report() 结果 + zone_summary
+    price: float                  # 计算时的价格
+    computed_at: float            # time.time()
+    compute_ms: float             # 计算耗时 (毫秒)
+    boundaries: Tuple[float, ...] = field(default=(), repr=False)  # 所有 zone 边界 (升序)
+    report_key: Optional[Tuple] = field(default=None, repr=False)  # 详细报告依赖的原始墙 / BB / SMA 数据
+    origin: str = "analysis"      # 计算来源: analysis (分析周期内) / precompute (K 线收盘后台预计算)
+
+    @property
+    def age_sec(self) -> float:
+        return time.time() - self.computed_at
+
+    def crosses_boundary(self, price: float) -> bool:
+        """price 与快照价格之间是否跨过任一 zone 边界"""
+        return (bisect.bisect_right(self.boundaries, price)
+                != bisect.bisect_right(self.boundaries, self.price))
+
+
+def zone_summary(result: Mapping[str, Any], limit: int = 3) -> Dict[str, Any]:
+    """
+    Display dicts of the nearest zones (heartbeat / Telegram format).
+
+    Parameters
+    ----------
+    result : Mapping
+        SRZoneCalculator.calculate() result.
+    limit : int
+        Zones per side.
+
+    Returns
+    -------
+    Dict
+        {'support_zones': [...], 'resistance_zones': [...]} with price, bounds,
+        strength, level, sources, touch_count and flags per zone.
+    """
+    def _zone_to_dict(zone) -> Dict[str, Any]:
+        return {
+            'price': zone.price_center,
+            'price_low': zone.price_low,
+            'price_high': zone.price_high,
+            'strength': getattr(zone, 'strength', 'LOW'),
+            'level': getattr(zone, 'level', 'MINOR'),
+            'sources': list(getattr(zone, 'sources', [])),
+            'touch_count': getattr(zone, 'touch_count', 0),
+            'has_swing_point': getattr(zone, 'has_swing_point', False),
+            'has_order_wall': getattr(zone, 'has_order_wall', False),
+            'distance_pct': getattr(zone, 'distance_pct', 0),
+        }
+
+    return {
+        'support_zones': [_zone_to_dict(z) for z in list(result.get('support_zones') or [])[:limit]],
+        'resistance_zones': [_zone_to_dict(z) for z in list(result.get('resistance_zones') or [])[:limit]],
+    }
+
+
+def report_inputs(
+    technical_data: Optional[Mapping[str, Any]],
+    orderbook_data: Optional[Mapping[str, Any]],
+) -> Dict[str, Optional[Dict]]:
+    """
+    BB / SMA / order-book wall inputs of SRZoneCalculator from the cycle reports.
+
+    Parameters
+    ----------
+    technical_data : Mapping, optional
+        Technical indicator data (bb_upper / bb_lower / bb_middle / sma_50 / sma_200).
+    orderbook_data : Mapping, optional
+        Order book report containing 'anomalies' (walls).
+
+    Returns
+    -------
+    Dict
+        {'bb_data', 'sma_data', 'orderbook_anomalies'}, each None when unavailable.
+    """
+    bb_data = None
+    sma_data = None
+    if technical_data:
+        bb_upper = technical_data.get('bb_upper')
+        bb_lower = technical_data.get('bb_lower')
+        if bb_upper and bb_lower:
+            bb_data = {
+                'upper': bb_upper,
+                'lower': bb_lower,
+                'middle': technical_data.get('bb_middle'),
+            }
+        sma_50 = technical_data.get('sma_50')
+        sma_200 = technical_data.get('sma_200')
+        if sma_50 or sma_200:
+            sma_data = {
+                'sma_50': sma_50,
+                'sma_200': sma_200,
+            }
+
+    orderbook_anomalies = None
+    if orderbook_data:
+        anomalies = orderbook_data.get('anomalies', {})
+        if anomalies:
+            orderbook_anomalies = {
+                'bid_anomalies': anomalies.get('bid_anomalies', []),
+                'ask_anomalies': anomalies.get('ask_anomalies', []),
+            }
+
+    return {'bb_data': bb_data, 'sma_data': sma_data, 'orderbook_anomalies': orderbook_anomalies}
+
+
+def _bars_signature(bars: Optional[List[Dict[str, Any]]]) -> Optional[Tuple]:
+    if not bars:
+        return None
+    return (len(bars), _bar_key(bars[0]), _bar_key(bars[-1]))
+
+
+def _bar_signature(bar: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    if not bar:
+        return None
+    return tuple(sorted((k, str(v)) for k, v in bar.items()))
+
+
+def _walls_signature(orderbook_anomalies: Optional[Dict]) -> Optional[Tuple]:
+    """All walls as shown in the detailed report."""
+    if not orderbook_anomalies:
+        return None
+    return tuple(
+        (side, tuple(
+            (w.get('price'), w.get('volume_btc'), w.get('multiplier'))
+            for w in orderbook_anomalies.get(side) or []
+        ))
+        for side in ('bid_anomalies', 'ask_anomalies')
+    )
+
+
+def candidate_walls_signature(
+    orderbook_anomalies: Optional[Dict], calculator, current_price: float,
+) -> Optional[Tuple]:
+    """
+    Walls that become zone candidates (same filters as SRZoneCalculator._collect_candidates).
+
+    Part of the cache key: two input sets with different signatures never
+    share a snapshot. Used by the precompute worker to tell whether its
+    snapshot can still be hit by the current cycle.
+
+    Returns
+    -------
+    Tuple or None
+        (side, price, size, multiplier) per candidate wall; None when no wall qualifies.
+    """
+    if not orderbook_anomalies:
+        return None
+    thresholds = calculator.ORDER_WALL_THRESHOLDS
+    signature = []
+    for side, below in (('bid_anomalies', True), ('ask_anomalies', False)):
+        for wall in orderbook_anomalies.get(side) or []:
+            price = wall.get('price', 0)
+            size = wall.get('volume_btc', 0)
+            if price <= 0 or (price >= current_price if below else price <= current_price):
+                continue
+            if size < thresholds['min_btc']:
+                continue
+            if abs(current_price - price) / current_price * 100 < thresholds['min_distance_pct']:
+                continue
+            signature.append((side, price, size, wall.get('multiplier', 1)))
+    # 无候选墙与无订单簿数据等价 (zones 相同)
+    return tuple(signature) or None
+
+
+def _values_signature(values: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    if not values:
+        return None
+    return tuple(sorted((k, v) for k, v in values.items()))
+
+
+def calculator_config_hash(calculator) -> str:
+    """
+    Fingerprint of the calculator configuration.
+
+    Includes every scalar / tuple / scalar-valued dict attribute (thresholds,
+    weights, swing and clustering parameters); runtime state is ignored.
+    """
+    def _plain(value) -> bool:
+        return value is None or isinstance(value, (bool, int, float, str))
+
+    config = {}
+    for name, value in sorted(vars(calculator).items()):
+        if name in _CALCULATOR_STATE_ATTRS:
+            continue
+        if _plain(value):
+            config[name] = value
+        elif isinstance(value, (tuple, list)) and all(_plain(v) for v in value):
+            config[name] = list(value)
+        elif isinstance(value, dict) and all(_plain(v) for v in value.values()):
+            config[name] = {str(k): v for k, v in value.items()}
+    return json.dumps(config, sort_keys=True)
+
+
+class SRZoneService:
+    """
+    S/R zone result cache shared by analysis, risk evaluation and SL/TP.
+
+    get() returns the cached snapshot while the inputs (see module docstring)
+    are unchanged; otherwise it runs calculate_with_detailed_report() once
+    and stores the new snapshot (LRU of `max_entries`). `latest` is the most
+    recently returned snapshot for readers outside the analysis cycle.
+    """
+
+    def __init__(
+        self,
+        price_bucket_pct: float = DEFAULT_PRICE_BUCKET_PCT,
+        max_entries: int = 16,
+        enabled: bool = True,
+        logger: logging.Logger = None,
+    ):
+        """
+        Parameters
+        ----------
+        price_bucket_pct : float
+            Price bucket width (%); prices in the same bucket share a snapshot.
+        max_entries : int
+            Number of snapshots kept (LRU).
+        enabled : bool
+            False: every get() recomputes (no reuse).
+        logger : logging.Logger, optional
+            Logger.
+        """
+        self.price_bucket_pct = float(price_bucket_pct)
+        self.max_entries = max(1, int(max_entries))
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._entries: "OrderedDict[Tuple, SRZoneSnapshot]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._latest: Optional[SRZoneSnapshot] = None
+        self._stats = {"hits": 0, "misses": 0, "boundary_misses": 0}
+
+    # =========================================================================
+    # 核心接口
+    # =========================================================================
+
+    def price_bucket(self, price: float) -> int:
+        """Log-scale price bucket index."""
+        if price <= 0 or self.price_bucket_pct <= 0:
+            return 0
+        return int(math.floor(math.log(price) / math.log1p(self.price_bucket_pct / 100.0)))
+
+    def make_key(
+        self,
+        calculator,
+        current_price: float,
+        bb_data: Optional[Dict[str, float]] = None,
+        sma_data: Optional[Dict[str, float]] = None,
+        orderbook_anomalies: Optional[Dict] = None,
+        bars_data: Optional[List[Dict[str, Any]]] = None,
+        atr_value: Optional[float] = None,
+        bars_data_4h: Optional[List[Dict[str, Any]]] = None,
+        bars_data_1d: Optional[List[Dict[str, Any]]] = None,
+        daily_bar: Optional[Dict[str, Any]] = None,
+        weekly_bar: Optional[Dict[str, Any]] = None,
+    ) -> Tuple:
+        """Cache key of one set of calculate() inputs (bb_data / sma_data only affect the report)."""
+        return (
+            _bars_signature(bars_data),
+            _bars_signature(bars_data_4h),
+            _bars_signature(bars_data_1d),
+            _bar_signature(daily_bar),
+            _bar_signature(weekly_bar),
+            candidate_walls_signature(orderbook_anomalies, calculator, current_price),
+            atr_value,
+            self.price_bucket(current_price),
+            calculator_config_hash(calculator),
+        )
+
+    def get(
+        self, calculator, current_price: float, origin: str = "analysis", **inputs,
+    ) -> SRZoneSnapshot:
+        """
+        Snapshot for the given calculator and inputs (cached or recomputed).
+
+        Parameters
+        ----------
+        calculator : SRZoneCalculator
+            Calculator to run on a miss.
+        current_price : float
+            Current market price.
+        origin : str
+            Recorded in a newly computed snapshot ("analysis" / "precompute").
+        **inputs
+            Remaining calculate_with_detailed_report() arguments
+            (bb_data, sma_data, orderbook_anomalies, bars_data, atr_value,
+            bars_data_4h, bars_data_1d, daily_bar, weekly_bar).
+
+        Returns
+        -------
+        SRZoneSnapshot
+        """
+        key = self.make_key(calculator, current_price, **inputs)
+        report_key = (
+            _walls_signature(inputs.get('orderbook_anomalies')),
+            _values_signature(inputs.get('bb_data')),
+            _values_signature(inputs.get('sma_data')),
+        )
+        with self._lock:
+            if self.enabled:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    if not cached.crosses_boundary(current_price):
+                        if cached.report_key != report_key:
+                            # 只有报告中的原始墙 / BB / SMA 数据变化: 复用 zones，重新生成报告文本
+                            cached = self._refresh_report(calculator, cached, current_price, report_key, inputs)
+                            self._entries[key] = cached
+                        self._entries.move_to_end(key)
+                        self._stats["hits"] += 1
+                        self._latest = cached
+                        return cached
+                    self._stats["boundary_misses"] += 1
+            self._stats["misses"] += 1
+
+            start = time.perf_counter()
+            result = calculator.calculate_with_detailed_report(current_price=current_price, **inputs)
+            compute_ms = (time.perf_counter() - start) * 1000
+            snapshot = self._make_snapshot(key, result, current_price, compute_ms, report_key, origin)
+
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._latest = snapshot
+
+        self.logger.debug(
+            f"S/R zones recomputed in {compute_ms:.1f}ms "
+            f"({len(snapshot.boundaries) // 2} zones, {origin})"
+        )
+        return snapshot
+
+    @property
+    def latest(self) -> Optional[SRZoneSnapshot]:
+        """Most recently returned snapshot (None before the first get())."""
+        return self._latest
+
+    def invalidate(self) -> None:
+        """Drop all cached snapshots (the latest one stays readable)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中 / 未命中统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / total if total else 0.0
+        if self._latest is not None:
+            stats["latest_age_sec"] = round(self._latest.age_sec, 1)
+            stats["latest_compute_ms"] = round(self._latest.compute_ms, 1)
+        return stats
+
+    @staticmethod
+    def _refresh_report(
+        calculator, snapshot: SRZoneSnapshot, current_price: float,
+        report_key: Optional[Tuple], inputs: Dict[str, Any],
+    ) -> SRZoneSnapshot:
+        """Same zones, detailed report regenerated for the new order-book walls / BB / SMA."""
+        result = dict(snapshot.result)
+        result['ai_detailed_report'] = calculator.generate_ai_detailed_report(
+            current_price=snapshot.price,
+            bb_data=inputs.get('bb_data'),
+            sma_data=inputs.get('sma_data'),
+            orderbook_anomalies=inputs.get('orderbook_anomalies'),
+            support_zones=list(result['support_zones']),
+            resistance_zones=list(result['resistance_zones']),
+            nearest_support=result.get('nearest_support'),
+            nearest_resistance=result.get('nearest_resistance'),
+            bars_data=inputs.get('bars_data'),
+        )
+        if isinstance(result.get('raw_data'), Mapping):
+            result['raw_data'] = MappingProxyType(dict(
+                result['raw_data'],
+                bb_data=inputs.get('bb_data'),
+                sma_data=inputs.get('sma_data'),
+                orderbook_anomalies=inputs.get('orderbook_anomalies'),
+            ))
+        return SRZoneSnapshot(
+            key=snapshot.key,
+            result=MappingProxyType(result),
+            price=snapshot.price,
+            computed_at=snapshot.computed_at,
+            compute_ms=snapshot.compute_ms,
+            boundaries=snapshot.boundaries,
+            report_key=report_key,
+            origin=snapshot.origin,
+        )
+
+    @staticmethod
+    def _make_snapshot(
+        key: Tuple, result: Dict[str, Any], price: float, compute_ms: float,
+        report_key: Optional[Tuple] = None, origin: str = "analysis",
+    ) -> SRZoneSnapshot:
+        frozen = dict(result)
+        for name in ('support_zones', 'resistance_zones'):
+            frozen[name] = tuple(result.get(name) or ())
+        for name in ('hard_control', 'raw_data'):
+            if isinstance(result.get(name), dict):
+                frozen[name] = MappingProxyType(dict(result[name]))
+        frozen['zone_summary'] = zone_summary(frozen)
+        boundaries = sorted(
+            bound
+            for zone in frozen['support_zones'] + frozen['resistance_zones']
+            for bound in (zone.price_low, zone.price_high)
+        )
+        return SRZoneSnapshot(
+            key=key,
+            result=MappingProxyType(frozen),
+            price=price,
+            computed_at=time.time(),
+            compute_ms=compute_ms,
+            boundaries=tuple(boundaries),
+            report_key=report_key,
+            origin=origin,
+        )
+
+
+# Singleton instance shared by the analyzer, strategy and diagnostics
+_service_instance: Optional[SRZoneService] = None
+_service_lock = threading.Lock()
+
+
+def get_sr_zone_service(
+    price_bucket_pct: float = DEFAULT_PRICE_BUCKET_PCT,
+    max_entries: int = 16,
+    enabled: bool = True,
+    logger: Optional[logging.Logger] = None,
+) -> SRZoneService:
+    """Get or create the process-wide SRZoneService instance."""
+    global _service_instance
+
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = SRZoneService(
+                    price_bucket_pct=price_bucket_pct,
+                    max_entries=max_entries,
+                    enabled=enabled,
+                    logger=logger,
+                )
+
+    return _service_instance
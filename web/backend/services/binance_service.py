@@ -11,6 +11,12 @@ import httpx
 
 from core.config import settings, load_aitrader_env
 
+# v6.0: Share the Binance request-weight budget with the trading bot (dashboard calls are low priority)
+try:
+    from utils.binance_rate_governor import get_rate_governor, PRIORITY_LOW
+except ImportError:  # trading package not on sys.path
+    get_rate_governor = None
+
 
 class BinanceService:
     """Service for fetching trading data from Binance Futures API"""
@@ -30,6 +36,7 @@ class BinanceService:
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(10.0, connect=5.0),
                 limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                event_hooks=get_rate_governor().httpx_event_hooks(priority=PRIORITY_LOW) if get_rate_governor else None,
             )
         yield self._client
 
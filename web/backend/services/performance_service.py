@@ -44,6 +44,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 
 from dotenv import load_dotenv
 
+# v6.0: Share the Binance request-weight budget with the trading bot (dashboard calls are low priority)
+try:
+    from utils.binance_rate_governor import get_rate_governor, PRIORITY_LOW
+except ImportError:  # trading package not on sys.path
+    get_rate_governor = None
+
 # Load environment variables from multiple possible locations
 env_paths = [
     os.path.expanduser("~/.env.aitrader"),
@@ -85,6 +91,7 @@ class PerformanceService:
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(10.0, connect=5.0),
                 limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                event_hooks=get_rate_governor().httpx_event_hooks(priority=PRIORITY_LOW) if get_rate_governor else None,
             )
         yield self._client
 
@@ -12,6 +12,12 @@ from decimal import Decimal
 
 from core.config import settings, load_aitrader_env
 
+# v6.0: Share the Binance request-weight budget with the trading bot (dashboard calls are low priority)
+try:
+    from utils.binance_rate_governor import get_rate_governor, PRIORITY_LOW
+except ImportError:  # trading package not on sys.path
+    get_rate_governor = None
+
 
 class TradingService:
     """Service for fetching real-time trading data from Binance Futures API"""
@@ -34,6 +40,7 @@ class TradingService:
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(10.0, connect=5.0),
                 limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                event_hooks=get_rate_governor().httpx_event_hooks(priority=PRIORITY_LOW) if get_rate_governor else None,
             )
         yield self._client
 